@@ -0,0 +1,118 @@
+"""
+Actas de examen en PDF guardadas en disco.
+
+El archivo de cada mesa se nombra con un hash del contenido del acta (datos de
+la mesa, tribunal e inscripciones con sus notas), así que cualquier cambio de
+notas o de inscriptos produce otro nombre y el acta anterior se descarta al
+generar la nueva. Obtener el acta vigente cuesta dos consultas (tribunal e
+inscripciones) y, si ya estaba generada, ningún render; el hash sirve además de
+ETag.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+
+from academico.models import CondicionAlumnoMesa, EstadoInscripcionMesa, InscripcionMesaExamen
+from main.pdf import guardar_pdf
+
+# Cambiar al modificar la plantilla para que se regeneren las actas guardadas
+VERSION_PLANTILLA = 1
+PLANTILLA = 'academico/acta_examen_pdf.html'
+
+
+class ActaPDF:
+    """Acta vigente de una mesa: ruta del archivo, hash (ETag) y fecha de generación"""
+
+    def __init__(self, mesa, ruta, hash_contenido):
+        self.mesa = mesa
+        self.ruta = ruta
+        self.hash = hash_contenido
+
+    @property
+    def modificada(self):
+        return datetime.fromtimestamp(os.path.getmtime(self.ruta), tz=dt_timezone.utc)
+
+    @property
+    def nombre_descarga(self):
+        return f'acta_examen_{self.mesa.materia.codigo}_{self.mesa.fecha_examen.strftime("%Y%m%d")}.pdf'
+
+
+def _directorio():
+    directorio = settings.ACTAS_PDF_DIR
+    os.makedirs(directorio, exist_ok=True)
+    return directorio
+
+
+def _hash_contenido(mesa, tribunal, inscripciones):
+    partes = [
+        VERSION_PLANTILLA, mesa.pk, mesa.materia.codigo, mesa.materia.nombre, mesa.anio_academico.nombre,
+        mesa.fecha_examen.isoformat(), mesa.aula, mesa.estado,
+    ]
+    partes += [(docente.pk, docente.nombre, docente.apellido) for docente in tribunal]
+    partes += [
+        (i.pk, i.alumno.legajo, i.alumno.apellido, i.alumno.nombre, i.alumno.dni,
+         i.condicion, i.estado_inscripcion, str(i.nota_examen))
+        for i in inscripciones
+    ]
+    return hashlib.sha256(repr(partes).encode()).hexdigest()[:32]
+
+
+def _contexto(mesa, tribunal, inscripciones):
+    regulares = [i for i in inscripciones if i.condicion == CondicionAlumnoMesa.REGULAR]
+    libres = [i for i in inscripciones if i.condicion == CondicionAlumnoMesa.LIBRE]
+    por_estado = {estado: 0 for estado in EstadoInscripcionMesa.values}
+    for inscripcion in inscripciones:
+        por_estado[inscripcion.estado_inscripcion] += 1
+    return {
+        'mesa': mesa,
+        'tribunal': tribunal,
+        'inscripciones_regulares': regulares,
+        'inscripciones_libres': libres,
+        'total_inscriptos': len(inscripciones),
+        'total_regulares': len(regulares),
+        'total_libres': len(libres),
+        'total_aprobados': por_estado[EstadoInscripcionMesa.APROBADO],
+        'total_desaprobados': por_estado[EstadoInscripcionMesa.DESAPROBADO],
+        'total_ausentes': por_estado[EstadoInscripcionMesa.AUSENTE],
+        'fecha_generacion': timezone.now(),
+    }
+
+
+def _descartar_anteriores(mesa_id, vigente):
+    prefijo = f'acta_{mesa_id}_'
+    for nombre in os.listdir(os.path.dirname(vigente)):
+        ruta = os.path.join(os.path.dirname(vigente), nombre)
+        if nombre.startswith(prefijo) and nombre.endswith('.pdf') and ruta != vigente:
+            try:
+                os.unlink(ruta)
+            except FileNotFoundError:
+                pass
+
+
+def obtener_acta(mesa):
+    """
+    Devuelve el acta vigente de la mesa, generándola solo si cambió su contenido.
+
+    Args:
+        mesa: MesaExamen (conviene traerla con select_related('materia', 'anio_academico'))
+
+    Returns:
+        ActaPDF
+    """
+    from main.utils import generar_certificado_pdf
+
+    tribunal = list(mesa.tribunal.order_by('apellido', 'nombre', 'pk'))
+    inscripciones = list(
+        InscripcionMesaExamen.objects.filter(mesa_examen=mesa)
+        .select_related('alumno').order_by('alumno__apellido', 'alumno__nombre', 'pk')
+    )
+
+    hash_contenido = _hash_contenido(mesa, tribunal, inscripciones)
+    ruta = os.path.join(_directorio(), f'acta_{mesa.pk}_{hash_contenido}.pdf')
+    if not os.path.exists(ruta):
+        guardar_pdf(ruta, generar_certificado_pdf(_contexto(mesa, tribunal, inscripciones), template_name=PLANTILLA))
+        _descartar_anteriores(mesa.pk, ruta)
+    return ActaPDF(mesa, ruta, hash_contenido)
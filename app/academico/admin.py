@@ -1,17 +1,19 @@
 from django.contrib import admin
 from django.http import HttpResponse
+from django.shortcuts import redirect
 from django.contrib import messages
 from django.utils.html import format_html
 
 from academico.models import (
     Alumno, AnioAcademico, Asistencia, CalendarioAcademico, Calificacion, Comision,
-    EstadosAlumno, Materia, InscripcionAlumnoComision, MesaExamen, InscripcionMesaExamen
+    EstadoComision, EstadosAlumno, Materia, InscripcionAlumnoComision, MesaExamen, InscripcionMesaExamen
 )
 from academico.forms import (
-    MateriaAdminForm, CalificacionAdminForm, InscripcionAlumnoComisionAdminForm,
+    AnioAcademicoAdminForm, MateriaAdminForm, CalificacionAdminForm, InscripcionAlumnoComisionAdminForm,
     InscripcionMesaExamenAdminForm, MesaExamenAdminForm
 )
 from administracion.models import Certificado, TipoCertificado
+from administracion.services import certificados_lote, certificados_pdf
 from institucional.models import Institucion
 from institucional.auditoria import AuditoriaMixin
 from main.utils import crear_contexto_certificado, generar_certificado_pdf
@@ -86,28 +88,19 @@ class ComisionAdmin(admin.ModelAdmin):
     estado_display.short_description = 'Estado'
 
     def cerrar_comision_action(self, request, queryset):
-        """Acción para cerrar comisiones seleccionadas"""
-        from academico.services import ServiciosAcademico
+        """Encola el cierre de cursada de las comisiones seleccionadas"""
+        from administracion.services.tareas import encolar
 
-        if queryset.count() > 1:
-            self.message_user(request, 'Solo puede cerrar una comisión a la vez.', level='warning')
+        comision_ids = list(queryset.filter(estado=EstadoComision.EN_CURSO).values_list('pk', flat=True))
+        if not comision_ids:
+            self.message_user(request, 'Las comisiones seleccionadas ya están finalizadas.', level='warning')
             return
 
-        comision = queryset.first()
-
-        if comision.estado == 'FINALIZADA':
-            self.message_user(request, f'La comisión {comision.codigo} ya está finalizada.', level='warning')
-            return
-
-        # Cerrar la comisión
-        resultado = ServiciosAcademico.cerrar_comision(comision, request.user)
-
-        if resultado['success']:
-            self.message_user(request, resultado['mensaje'], level='success')
-        else:
-            self.message_user(request, resultado['mensaje'], level='error')
+        tarea = encolar('cerrar_comisiones', request.user, comision_ids=comision_ids)
+        self.message_user(request, f'Se encoló el cierre de {len(comision_ids)} comisiones.', level='success')
+        return redirect('progreso_tarea', tarea.pk)
 
-    cerrar_comision_action.short_description = "Cerrar comisión y calcular notas finales"
+    cerrar_comision_action.short_description = "Cerrar cursada de las comisiones seleccionadas"
     
 @admin.register(EstadosAlumno)
 class EstadosAlumnoAdmin(admin.ModelAdmin):
@@ -187,27 +180,74 @@ class AsistenciaAdmin(admin.ModelAdmin):
     esta_presente_display.short_description = 'Asistencia'
     
 
+def _avisar_asistencias_conservadas(model_admin, request, objetos):
+    """Advierte los presentes ya tomados que quedaron en fechas que dejaron de ser de clase"""
+    for obj in objetos:
+        resultado = getattr(obj, '_propagacion_calendario', None)
+        if resultado and resultado['conservadas']:
+            fechas = ', '.join(f'{fecha:%d/%m/%Y}' for fecha in resultado['fechas_conservadas'])
+            model_admin.message_user(
+                request,
+                f"Se conservaron {resultado['conservadas']} asistencia(s) con presente ya tomado en fechas "
+                f"que dejaron de ser de clase ({fechas}). Revíselas y elimínelas a mano si corresponde.",
+                level='warning'
+            )
+
+class CalendarioAcademicoInline(admin.TabularInline):
+    model = CalendarioAcademico
+    fields = ('fecha_inicio', 'fecha_fin', 'es_dia_clase', 'descripcion')
+    extra = 0
+
 @admin.register(AnioAcademico)
 class AnioAcademicoAdmin(admin.ModelAdmin):
+    form = AnioAcademicoAdminForm
     list_display = ('nombre', 'fecha_inicio', 'fecha_fin', 'cierre_cursada_habilitado', 'activo_display')
     search_fields = ('nombre',)
     list_filter = ('activo', 'cierre_cursada_habilitado')
     list_per_page = 25
+    inlines = [CalendarioAcademicoInline]
+    actions = ['cerrar_cursadas_action']
 
     def activo_display(self, obj):
         if obj.activo:
             return format_html('<span style="color: green; font-size: 16px;">✓</span> Activo')
         return format_html('<span style="color: gray; font-size: 16px;">✗</span> Inactivo')
-    activo_display.short_description = 'Estado' 
+    activo_display.short_description = 'Estado'
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        _avisar_asistencias_conservadas(self, request, [obj])
+
+    def save_formset(self, request, form, formset, change):
+        super().save_formset(request, form, formset, change)
+        cambiadas = [obj for obj, _ in formset.changed_objects]
+        _avisar_asistencias_conservadas(self, request, formset.new_objects + cambiadas + formset.deleted_objects)
+
+    def cerrar_cursadas_action(self, request, queryset):
+        """Encola el cierre de todas las comisiones EN_CURSO de los años seleccionados"""
+        from administracion.services.tareas import encolar
+
+        tareas = []
+        for anio in queryset:
+            if not anio.cierre_cursada_habilitado:
+                self.message_user(request, f'{anio.nombre}: el cierre de cursada no está habilitado.', level='warning')
+                continue
+            tareas.append(encolar('cerrar_anio_academico', request.user, anio_id=anio.pk))
+            self.message_user(request, f'{anio.nombre}: se encoló el cierre de cursada.', level='success')
+
+        if len(tareas) == 1:
+            return redirect('progreso_tarea', tareas[0].pk)
+
+    cerrar_cursadas_action.short_description = "Cerrar cursada de todas las comisiones del año"
 
 @admin.register(CalendarioAcademico)
 class CalendarioAcademicoAdmin(admin.ModelAdmin):
-    list_display = ('anio_academico', 'fecha', 'es_dia_clase_display', 'descripcion')
+    list_display = ('anio_academico', 'fecha_inicio', 'fecha_fin', 'es_dia_clase_display', 'descripcion')
     search_fields = ('descripcion',)
     list_filter = ('es_dia_clase', 'anio_academico')
     autocomplete_fields = ['anio_academico']
     list_select_related = ('anio_academico',)
-    date_hierarchy = 'fecha'
+    date_hierarchy = 'fecha_inicio'
     list_per_page = 50
     empty_value_display = '—'
 
@@ -215,11 +255,19 @@ class CalendarioAcademicoAdmin(admin.ModelAdmin):
         if obj.es_dia_clase:
             return format_html('<span style="color: green; font-size: 16px;">✓</span> Día de clase')
         return format_html('<span style="color: #dc3545; font-size: 16px;">✗</span> No hay clase')
-    es_dia_clase_display.short_description = 'Tipo de día'
+    es_dia_clase_display.short_description = 'Tipo de excepción'
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        _avisar_asistencias_conservadas(self, request, [obj])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        _avisar_asistencias_conservadas(self, request, [obj])
 
 @admin.register(Alumno)
 class AlumnoAdmin(AuditoriaMixin, admin.ModelAdmin):
-    list_display = ('legajo', 'nombre_completo', 'dni', 'email', 'promedio', 'estado')
+    list_display = ('legajo', 'nombre_completo', 'dni', 'email', 'promedio', 'materias_aprobadas', 'estado')
     list_display_links = ('legajo', 'nombre_completo')
     search_fields = ('nombre', 'apellido', 'dni', 'legajo', 'email')
     list_filter = ('estado', 'plan_estudio')
@@ -228,6 +276,7 @@ class AlumnoAdmin(AuditoriaMixin, admin.ModelAdmin):
     list_per_page = 50
     save_on_top = True
     empty_value_display = '—'
+    readonly_fields = ('promedio', 'cantidad_calificaciones', 'materias_aprobadas', 'materias_regulares', 'materias_libres')
     actions = [
         'generar_certificado_asistencia',
         'generar_certificado_aprobacion',
@@ -241,7 +290,10 @@ class AlumnoAdmin(AuditoriaMixin, admin.ModelAdmin):
             'fields': ('nombre', 'apellido', 'dni', 'fecha_nacimiento')
         }),
         ('Datos Académicos', {
-            'fields': ('legajo', 'plan_estudio', 'estado', 'promedio')
+            'fields': ('legajo', 'plan_estudio', 'estado')
+        }),
+        ('Resumen Académico', {
+            'fields': ('promedio', 'cantidad_calificaciones', 'materias_aprobadas', 'materias_regulares', 'materias_libres')
         }),
         ('Contacto', {
             'fields': ('email', 'telefono', 'domicilio')
@@ -285,25 +337,22 @@ class AlumnoAdmin(AuditoriaMixin, admin.ModelAdmin):
                 )
                 contexto['certificado'] = certificado
                 pdf_content = generar_certificado_pdf(contexto)
+                certificados_pdf.registrar_pdfs([certificado], [pdf_content])
                 response = HttpResponse(pdf_content, content_type='application/pdf')
                 response['Content-Disposition'] = f'attachment; filename="certificado_{alumno.dni}_{tipo_certificado}.pdf"'
                 return response
+            elif queryset.count() <= certificados_lote.LIMITE_ZIP_DIRECTO:
+                return certificados_lote.respuesta_zip(
+                    queryset.values_list('pk', flat=True), tipo_certificado, request.user
+                )
             else:
-                certificados_generados = []
-                for alumno in queryset:
-                    certificado = Certificado.objects.create(
-                        alumno=alumno,
-                        tipo=tipo_certificado,
-                        generado_por=request.user
-                    )
-                    certificados_generados.append(certificado)
-
+                lote = certificados_lote.crear_lote(queryset.values_list('pk', flat=True), tipo_certificado, request.user)
                 self.message_user(
                     request,
-                    f"Se generaron {len(certificados_generados)} certificados de {tipo_certificado}. "
-                    f"Puede descargarlos desde el módulo Administración > Certificados.",
+                    f"Se están generando {lote.total} certificados de {lote.get_tipo_display()} en segundo plano.",
                     messages.SUCCESS
                 )
+                return redirect('progreso_lote_certificados', lote.pk)
 
         except Exception as e:
             self.message_user(
@@ -330,7 +379,7 @@ class MesaExamenAdmin(AuditoriaMixin, admin.ModelAdmin):
     list_per_page = 50
     save_on_top = True
     empty_value_display = '—'
-    actions = ['cerrar_inscripciones', 'finalizar_mesa']
+    actions = ['cerrar_inscripciones', 'finalizar_mesa', 'inscribir_habilitados']
 
     def get_urls(self):
         urls = super().get_urls()
@@ -356,7 +405,7 @@ class MesaExamenAdmin(AuditoriaMixin, admin.ModelAdmin):
             'fields': ('materia', 'anio_academico', 'aula')
         }),
         ('Fechas', {
-            'fields': ('fecha_examen', 'fecha_limite_inscripcion')
+            'fields': ('fecha_examen', 'duracion_minutos', 'fecha_limite_inscripcion')
         }),
         ('Tribunal y Configuración', {
             'fields': ('tribunal', 'cupo_maximo', 'estado')
@@ -391,12 +440,9 @@ class MesaExamenAdmin(AuditoriaMixin, admin.ModelAdmin):
 
     def cerrar_inscripciones(self, request, queryset):
         """Cierra las inscripciones de las mesas seleccionadas"""
-        contador = 0
-        for mesa in queryset:
-            if mesa.estado == 'ABIERTA':
-                mesa.estado = 'CERRADA'
-                mesa.save()
-                contador += 1
+        from academico.ciclo_mesas import cerrar_mesas
+
+        contador = cerrar_mesas(queryset)
 
         self.message_user(
             request,
@@ -408,27 +454,42 @@ class MesaExamenAdmin(AuditoriaMixin, admin.ModelAdmin):
 
     def finalizar_mesa(self, request, queryset):
         """Finaliza las mesas de examen seleccionadas"""
-        from academico.services import ServiciosAcademico
-
-        if queryset.count() > 1:
-            self.message_user(request, 'Solo puede finalizar una mesa a la vez.', messages.WARNING)
-            return
-
-        mesa = queryset.first()
+        from academico.ciclo_mesas import finalizar_mesas
 
-        resultado = ServiciosAcademico.finalizar_mesa_examen(mesa, request.user)
+        resultado = finalizar_mesas(queryset)
+        estadisticas = resultado['estadisticas'].values()
 
         mensaje = (
-            f"Mesa finalizada. "
-            f"Inscriptos: {resultado['total_inscriptos']} | "
-            f"Aprobados: {resultado['aprobados']} | "
-            f"Desaprobados: {resultado['desaprobados']} | "
-            f"Ausentes: {resultado['ausentes']}"
+            f"Mesas finalizadas: {resultado['mesas']}. "
+            f"Inscriptos: {sum(e['total_inscriptos'] for e in estadisticas)} | "
+            f"Aprobados: {sum(e['aprobados'] for e in estadisticas)} | "
+            f"Desaprobados: {sum(e['desaprobados'] for e in estadisticas)} | "
+            f"Ausentes: {sum(e['ausentes'] for e in estadisticas)}"
         )
 
         self.message_user(request, mensaje, messages.SUCCESS)
 
-    finalizar_mesa.short_description = "Finalizar mesa de examen"
+    finalizar_mesa.short_description = "Finalizar mesas de examen"
+
+    def inscribir_habilitados(self, request, queryset):
+        """Inscribe en las mesas seleccionadas a todos los alumnos habilitados"""
+        from academico.services import ServiciosAcademico
+
+        inscriptos = sin_cupo = 0
+        for mesa in queryset:
+            resultado = ServiciosAcademico.inscribir_habilitados_mesa(mesa)
+            inscriptos += resultado['inscriptos']
+            sin_cupo += resultado['sin_cupo']
+
+        self.message_user(request, f'Se inscribieron {inscriptos} alumno(s) habilitado(s).', messages.SUCCESS)
+        if sin_cupo:
+            self.message_user(
+                request,
+                f'{sin_cupo} alumno(s) habilitado(s) quedaron sin inscribir por falta de cupo o mesa cerrada.',
+                messages.WARNING
+            )
+
+    inscribir_habilitados.short_description = "Inscribir a todos los alumnos habilitados"
 
 
 @admin.register(InscripcionMesaExamen)
@@ -0,0 +1,221 @@
+"""
+Analítico del alumno: una fila por materia (MateriaAnalitico) con la mejor
+condición de cursada, notas de cursada y final, fechas, exámenes rendidos y si
+la materia está aprobada.
+
+Se mantiene desde las señales de InscripcionAlumnoComision e
+InscripcionMesaExamen y desde los procesos en bloque (cierre de cursada, carga
+de notas de mesa, finalización de mesas) que escriben sin pasar por save. Cada
+actualización relee solo las cursadas y exámenes del alcance pedido (alumnos x
+materias) y escribe las filas que difieren. El comando recalcular_analitico
+reconstruye la tabla completa.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import F
+
+from academico.models import (
+    CondicionAlumnoMesa, CondicionInscripcion, Comision, EstadoInscripcionMesa, EstadoMateria,
+    InscripcionAlumnoComision, InscripcionMesaExamen, MateriaAnalitico, MesaExamen
+)
+
+CAMPOS_ANALITICO = [
+    'condicion', 'aprobada', 'cursada', 'nota_cursada', 'fecha_regularizacion', 'nota_final',
+    'fecha_aprobacion', 'examenes_aprobados', 'examenes_desaprobados', 'examenes_ausentes',
+    'suma_notas_examen', 'cantidad_notas_examen', 'ultima_nota_examen', 'fecha_ultimo_examen',
+]
+CAMPOS_CURSADA = (
+    'alumno', 'comision', 'condicion', 'estado_inscripcion', 'nota_cursada', 'nota_final',
+    'fecha_regularizacion', 'fecha_cierre',
+)
+CONTADOR_EXAMEN = {
+    EstadoInscripcionMesa.APROBADO: 'examenes_aprobados',
+    EstadoInscripcionMesa.DESAPROBADO: 'examenes_desaprobados',
+    EstadoInscripcionMesa.AUSENTE: 'examenes_ausentes',
+}
+
+
+def _fila_analitico(cursadas, examenes):
+    """
+    Valores de una fila a partir de las cursadas (ordenadas por pk) y los
+    exámenes (ordenados por fecha) del alumno en la materia.
+    """
+    aprobada = next((c for c in cursadas if c['estado_inscripcion'] == EstadoMateria.APROBADA), None)
+    regular = next((c for c in cursadas if c['condicion'] == CondicionInscripcion.REGULAR), None)
+    # La cursada que representa a la materia: la aprobada, si no la regular, si no la última
+    cursada = aprobada or regular or cursadas[-1]
+
+    fila = {
+        'condicion': CondicionAlumnoMesa.REGULAR if regular else CondicionAlumnoMesa.LIBRE,
+        'aprobada': aprobada is not None,
+        'cursada_id': cursada['pk'],
+        'nota_cursada': cursada['nota_cursada'],
+        'fecha_regularizacion': cursada['fecha_regularizacion'],
+        'nota_final': aprobada['nota_final'] if aprobada else None,
+        'fecha_aprobacion': aprobada['fecha_cierre'] if aprobada else None,
+        'examenes_aprobados': 0,
+        'examenes_desaprobados': 0,
+        'examenes_ausentes': 0,
+        'suma_notas_examen': Decimal('0'),
+        'cantidad_notas_examen': 0,
+        'ultima_nota_examen': None,
+        'fecha_ultimo_examen': None,
+    }
+    for examen in examenes:
+        contador = CONTADOR_EXAMEN.get(examen['estado_inscripcion'])
+        if contador:
+            fila[contador] += 1
+            fila['fecha_ultimo_examen'] = examen['fecha_examen']
+            fila['ultima_nota_examen'] = examen['nota_examen']
+        if examen['nota_examen'] is not None:
+            fila['suma_notas_examen'] += examen['nota_examen']
+            fila['cantidad_notas_examen'] += 1
+    return fila
+
+
+def actualizar_analitico(alumnos=None, materias=None):
+    """
+    Recalcula las filas del analítico de los alumnos y materias indicados (ids o
+    queryset de ids; todos por defecto).
+
+    Returns:
+        int: cantidad de filas creadas, modificadas o eliminadas
+    """
+    cursadas = InscripcionAlumnoComision.objects.all()
+    examenes = InscripcionMesaExamen.objects.all()
+    existentes = MateriaAnalitico.objects.all()
+    if alumnos is not None:
+        cursadas = cursadas.filter(alumno_id__in=alumnos)
+        examenes = examenes.filter(alumno_id__in=alumnos)
+        existentes = existentes.filter(alumno_id__in=alumnos)
+    if materias is not None:
+        cursadas = cursadas.filter(comision__materia_id__in=materias)
+        examenes = examenes.filter(mesa_examen__materia_id__in=materias)
+        existentes = existentes.filter(materia_id__in=materias)
+
+    cursadas_por_par = defaultdict(list)
+    for cursada in cursadas.values(
+        'pk', 'alumno_id', 'condicion', 'estado_inscripcion', 'nota_cursada', 'nota_final',
+        'fecha_regularizacion', 'fecha_cierre', materia_id=F('comision__materia_id')
+    ).order_by('pk'):
+        cursadas_por_par[(cursada['alumno_id'], cursada['materia_id'])].append(cursada)
+
+    examenes_por_par = defaultdict(list)
+    for examen in examenes.values(
+        'alumno_id', 'estado_inscripcion', 'nota_examen',
+        materia_id=F('mesa_examen__materia_id'), fecha_examen=F('mesa_examen__fecha_examen')
+    ).order_by('mesa_examen__fecha_examen', 'pk'):
+        examenes_por_par[(examen['alumno_id'], examen['materia_id'])].append(examen)
+
+    # Solo hay fila para las materias que el alumno cursó
+    esperadas = {
+        par: _fila_analitico(filas, examenes_por_par.get(par, []))
+        for par, filas in cursadas_por_par.items()
+    }
+
+    modificadas, eliminadas = [], []
+    for fila in existentes:
+        esperada = esperadas.pop((fila.alumno_id, fila.materia_id), None)
+        if esperada is None:
+            eliminadas.append(fila.pk)
+        elif any(getattr(fila, campo) != valor for campo, valor in esperada.items()):
+            for campo, valor in esperada.items():
+                setattr(fila, campo, valor)
+            modificadas.append(fila)
+    nuevas = [
+        MateriaAnalitico(alumno_id=alumno_id, materia_id=materia_id, **valores)
+        for (alumno_id, materia_id), valores in esperadas.items()
+    ]
+
+    if eliminadas:
+        MateriaAnalitico.objects.filter(pk__in=eliminadas).delete()
+    if modificadas:
+        MateriaAnalitico.objects.bulk_update(modificadas, CAMPOS_ANALITICO, batch_size=1000)
+    if nuevas:
+        MateriaAnalitico.objects.bulk_create(nuevas, batch_size=1000)
+    return len(eliminadas) + len(modificadas) + len(nuevas)
+
+
+def _materias_de_comisiones(comisiones):
+    return Comision.objects.filter(pk__in=comisiones).values('materia_id')
+
+
+def _materias_de_mesas(mesas):
+    return MesaExamen.objects.filter(pk__in=mesas).values('materia_id')
+
+
+def _cambio(anteriores, instancia, campos):
+    """True si la instancia guardada difiere de sus valores previos serializados (auditoría) en los campos dados"""
+    from institucional.auditoria import serializar_valor
+
+    for campo in campos:
+        field = instancia._meta.get_field(campo)
+        if field.is_relation:
+            valor = getattr(instancia, field.attname)
+            actual = None if valor is None else str(valor)
+        else:
+            actual = serializar_valor(getattr(instancia, campo))
+        if anteriores.get(campo) != actual:
+            return True
+    return False
+
+
+def registrar_inscripcion(anteriores, inscripcion):
+    """
+    Actualiza el analítico tras guardar una cursada si cambió algo que lo afecte.
+
+    Args:
+        anteriores: valores previos serializados (auditoría) o None si es nueva
+        inscripcion: InscripcionAlumnoComision ya guardada
+    """
+    alumnos, comisiones = {inscripcion.alumno_id}, {inscripcion.comision_id}
+    if anteriores:
+        if not _cambio(anteriores, inscripcion, CAMPOS_CURSADA):
+            return
+        alumnos.add(int(anteriores['alumno']))
+        comisiones.add(int(anteriores['comision']))
+    actualizar_analitico(alumnos, _materias_de_comisiones(comisiones))
+
+
+def _recalcular_al_borrar(instancia, origen, modelos):
+    """
+    Las bajas en cascada desde el alumno o la materia no se propagan: sus filas
+    del analítico se borran en la misma operación.
+    """
+    origen = instancia if origen is None else origen
+    return getattr(origen, 'model', type(origen)) in modelos
+
+
+def eliminar_inscripcion(inscripcion, origen=None):
+    if _recalcular_al_borrar(inscripcion, origen, (InscripcionAlumnoComision, Comision)):
+        actualizar_analitico([inscripcion.alumno_id], _materias_de_comisiones([inscripcion.comision_id]))
+
+
+def registrar_examen(anterior, inscripcion):
+    """
+    Actualiza el analítico tras guardar una inscripción a mesa. Las inscripciones
+    nuevas sin resultado no lo afectan y no se procesan.
+
+    Args:
+        anterior: (alumno_id, mesa_examen_id, estado_inscripcion, nota_examen) previos o None si es nueva
+        inscripcion: InscripcionMesaExamen ya guardada
+    """
+    actual = (inscripcion.alumno_id, inscripcion.mesa_examen_id, inscripcion.estado_inscripcion, inscripcion.nota_examen)
+    if anterior == actual:
+        return
+    if anterior is None and inscripcion.estado_inscripcion == EstadoInscripcionMesa.INSCRIPTO and inscripcion.nota_examen is None:
+        return
+    alumnos, mesas = {inscripcion.alumno_id}, {inscripcion.mesa_examen_id}
+    if anterior:
+        alumnos.add(anterior[0])
+        mesas.add(anterior[1])
+    actualizar_analitico(alumnos, _materias_de_mesas(mesas))
+
+
+def eliminar_examen(inscripcion, origen=None):
+    if inscripcion.estado_inscripcion == EstadoInscripcionMesa.INSCRIPTO and inscripcion.nota_examen is None:
+        return
+    if not _recalcular_al_borrar(inscripcion, origen, (InscripcionMesaExamen, MesaExamen)):
+        return
+    actualizar_analitico([inscripcion.alumno_id], _materias_de_mesas([inscripcion.mesa_examen_id]))
@@ -0,0 +1,167 @@
+"""
+Calendario académico basado en reglas.
+
+Cada AnioAcademico define qué días de la semana son de clase. Las entradas de
+CalendarioAcademico son excepciones por rango de fechas (feriados, recesos o
+clases recuperatorias) que se superponen a esa regla. Este módulo expande la
+representación compacta y mantiene una vista materializada en caché.
+"""
+import threading
+import uuid
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.cache import cache
+
+DIAS_SEMANA_DEFAULT = '1,2,3,4,5'
+
+_propagacion = threading.local()
+
+
+def nueva_version_calendario():
+    """Token que identifica una versión del calendario en la caché"""
+    return uuid.uuid4().hex
+
+
+@contextmanager
+def propagacion_suspendida():
+    """
+    Dentro del bloque las señales no propagan a las asistencias los cambios de
+    excepciones; quien lo usa propaga una única vez al terminar.
+    """
+    _propagacion.suspendida = True
+    try:
+        yield
+    finally:
+        _propagacion.suspendida = False
+
+
+def propagacion_activa():
+    return not getattr(_propagacion, 'suspendida', False)
+
+
+def parsear_dias_semana(valor):
+    """Convierte '1,2,3' en {1, 2, 3} (1 = Lunes ... 7 = Domingo)"""
+    if not valor:
+        return set()
+    return {int(dia) for dia in str(valor).split(',') if dia.strip()}
+
+
+class ReglaCalendario:
+    """
+    Regla semanal más excepciones por rango de un año académico.
+
+    Las excepciones no se superponen entre sí (lo valida CalendarioAcademico.clean),
+    por lo que alcanza con una búsqueda binaria sobre los inicios de rango.
+    """
+
+    def __init__(self, fecha_inicio, fecha_fin, dias_semana, excepciones=()):
+        self.fecha_inicio = fecha_inicio
+        self.fecha_fin = fecha_fin
+        self.dias_semana = set(dias_semana)
+        # (fecha_inicio, fecha_fin, es_dia_clase, descripcion)
+        self.excepciones = sorted(excepciones, key=lambda excepcion: excepcion[0])
+        self._inicios = [excepcion[0] for excepcion in self.excepciones]
+
+    @classmethod
+    def para_anio(cls, anio_academico):
+        """Construye la regla de un año académico con una única consulta"""
+        from academico.models import CalendarioAcademico
+
+        excepciones = CalendarioAcademico.objects.filter(
+            anio_academico=anio_academico
+        ).values_list('fecha_inicio', 'fecha_fin', 'es_dia_clase', 'descripcion')
+
+        return cls(
+            anio_academico.fecha_inicio,
+            anio_academico.fecha_fin,
+            parsear_dias_semana(anio_academico.dias_semana_clase),
+            list(excepciones)
+        )
+
+    def excepcion(self, fecha):
+        """Retorna la excepción que cubre la fecha, o None"""
+        posicion = bisect_right(self._inicios, fecha) - 1
+        if posicion >= 0:
+            excepcion = self.excepciones[posicion]
+            if excepcion[0] <= fecha <= excepcion[1]:
+                return excepcion
+        return None
+
+    def es_dia_clase(self, fecha):
+        if not (self.fecha_inicio <= fecha <= self.fecha_fin):
+            return False
+        excepcion = self.excepcion(fecha)
+        if excepcion is not None:
+            return excepcion[2]
+        return fecha.weekday() + 1 in self.dias_semana
+
+    def descripcion(self, fecha):
+        """Motivo por el que una fecha es (o no es) día de clase"""
+        if not (self.fecha_inicio <= fecha <= self.fecha_fin):
+            return 'Fuera del año académico'
+        excepcion = self.excepcion(fecha)
+        if excepcion is not None:
+            return excepcion[3] or ''
+        if fecha.weekday() + 1 not in self.dias_semana:
+            return 'Sin clases según la regla semanal'
+        return ''
+
+    def iter_fechas_clase(self, desde=None, hasta=None, dia_semana=None):
+        """
+        Genera de forma perezosa las fechas de clase en orden ascendente.
+
+        Args:
+            desde, hasta: límites opcionales (se recortan al año académico)
+            dia_semana: int opcional (1 = Lunes) para recorrer solo ese día
+        """
+        inicio = max(desde, self.fecha_inicio) if desde else self.fecha_inicio
+        fin = min(hasta, self.fecha_fin) if hasta else self.fecha_fin
+
+        if dia_semana is None:
+            paso = timedelta(days=1)
+            fecha = inicio
+        else:
+            paso = timedelta(days=7)
+            fecha = inicio + timedelta(days=(dia_semana - 1 - inicio.weekday()) % 7)
+
+        while fecha <= fin:
+            if self.es_dia_clase(fecha):
+                yield fecha
+            fecha += paso
+
+
+def _clave_cache(anio_academico):
+    return 'calendario:{}:{}:{}:{}:{}'.format(
+        anio_academico.pk,
+        anio_academico.calendario_version,
+        anio_academico.fecha_inicio.isoformat(),
+        anio_academico.fecha_fin.isoformat(),
+        anio_academico.dias_semana_clase,
+    )
+
+
+def fechas_clase(anio_academico, dia_semana=None):
+    """
+    Vista materializada de las fechas de clase de un año académico.
+
+    Se guarda en caché agrupada por día de la semana; la clave incluye la regla del
+    año y el token de versión, que se renueva cada vez que cambia una excepción.
+
+    Returns:
+        tuple de fechas en orden ascendente
+    """
+    clave = _clave_cache(anio_academico)
+    por_dia = cache.get(clave)
+    if por_dia is None:
+        por_dia = {}
+        for fecha in ReglaCalendario.para_anio(anio_academico).iter_fechas_clase():
+            por_dia.setdefault(fecha.weekday() + 1, []).append(fecha)
+        por_dia = {dia: tuple(fechas) for dia, fechas in por_dia.items()}
+        cache.set(clave, por_dia, None)
+
+    if dia_semana is not None:
+        return por_dia.get(dia_semana, ())
+    return tuple(sorted(fecha for fechas in por_dia.values() for fecha in fechas))
+
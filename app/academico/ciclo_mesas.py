@@ -0,0 +1,120 @@
+"""
+Transiciones de estado de las mesas de examen en bloque.
+
+ABIERTA -> CERRADA al vencer fecha_limite_inscripcion y -> FINALIZADA pasado el
+examen (con unos días de gracia para cargar las notas, porque una mesa
+finalizada ya no las acepta). Los cambios se hacen con UPDATE por conjunto; al
+finalizar, los inscriptos sin nota pasan a AUSENTE con su DVH recalculado en
+memoria y guardado con bulk_update, la auditoría se inserta en bloque y el DVV
+se actualiza una sola vez. Las estadísticas de todas las mesas salen de una
+consulta agregada.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from academico.models import EstadoInscripcionMesa, EstadoMesaExamen, InscripcionMesaExamen, MesaExamen
+
+DIAS_GRACIA_NOTAS = 7
+TAMANIO_LOTE = 500
+
+CAMPOS_DVH_MESA = ['nota_examen', 'condicion', 'estado_inscripcion']
+
+
+def cerrar_mesas(mesas):
+    """
+    Cierra las inscripciones de las mesas ABIERTA del queryset.
+
+    Returns:
+        int: cantidad de mesas cerradas
+    """
+    return mesas.filter(estado=EstadoMesaExamen.ABIERTA).update(estado=EstadoMesaExamen.CERRADA)
+
+
+def estadisticas_mesas(mesa_ids):
+    """
+    Returns:
+        dict {mesa_id: {'total_inscriptos', 'aprobados', 'desaprobados', 'ausentes'}}
+    """
+    filas = InscripcionMesaExamen.objects.filter(mesa_examen_id__in=mesa_ids).values('mesa_examen_id').annotate(
+        total_inscriptos=Count('id'),
+        aprobados=Count('id', filter=Q(estado_inscripcion=EstadoInscripcionMesa.APROBADO)),
+        desaprobados=Count('id', filter=Q(estado_inscripcion=EstadoInscripcionMesa.DESAPROBADO)),
+        ausentes=Count('id', filter=Q(estado_inscripcion=EstadoInscripcionMesa.AUSENTE)),
+    ).order_by()
+    vacias = {'total_inscriptos': 0, 'aprobados': 0, 'desaprobados': 0, 'ausentes': 0}
+    estadisticas = {mesa_id: dict(vacias) for mesa_id in mesa_ids}
+    for fila in filas:
+        estadisticas[fila.pop('mesa_examen_id')] = fila
+    return estadisticas
+
+
+def _finalizar_lote(mesa_ids):
+    from academico.analitico import actualizar_analitico
+    from institucional.auditoria import obtener_valores_modelo, registrar_cambios
+    from institucional.digitos_verificadores import GestorDigitosVerificadores
+    from institucional.models import TipoAccionDatos
+
+    ausentes, alumnos, cambios = [], set(), []
+    # Con el alumno y la materia ya cargados para la descripción de la auditoría
+    for inscripcion in InscripcionMesaExamen.objects.filter(
+        mesa_examen_id__in=mesa_ids, estado_inscripcion=EstadoInscripcionMesa.INSCRIPTO
+    ).select_related('alumno', 'mesa_examen__materia'):
+        alumnos.add(inscripcion.alumno_id)
+        anteriores = obtener_valores_modelo(inscripcion)
+        inscripcion.estado_inscripcion = EstadoInscripcionMesa.AUSENTE
+        inscripcion.dvh = GestorDigitosVerificadores.calcular_dvh(inscripcion, CAMPOS_DVH_MESA)
+        ausentes.append(inscripcion)
+        cambios.append((inscripcion, TipoAccionDatos.MODIFICAR, anteriores, obtener_valores_modelo(inscripcion)))
+
+    with transaction.atomic():
+        if ausentes:
+            InscripcionMesaExamen.objects.bulk_update(ausentes, ['estado_inscripcion', 'dvh'], batch_size=TAMANIO_LOTE)
+            registrar_cambios(cambios, detalles="Finalización de mesa: ausente por no tener nota")
+        # Sin inscriptos pendientes, no quedan cupos ocupados
+        MesaExamen.objects.filter(pk__in=mesa_ids).update(estado=EstadoMesaExamen.FINALIZADA, inscriptos=0)
+        if alumnos:
+            actualizar_analitico(alumnos, MesaExamen.objects.filter(pk__in=mesa_ids).values('materia_id'))
+    return len(ausentes)
+
+
+def finalizar_mesas(mesas):
+    """
+    Finaliza las mesas del queryset que no lo estén, marcando AUSENTE a los
+    inscriptos sin nota. Cada lote de mesas es una transacción.
+
+    Returns:
+        dict con 'mesas' (cantidad finalizada), 'ausentes' y 'estadisticas'
+        ({mesa_id: dict}, ver estadisticas_mesas)
+    """
+    from institucional.digitos_verificadores import GestorDigitosVerificadores
+
+    mesa_ids = list(mesas.exclude(estado=EstadoMesaExamen.FINALIZADA).order_by('pk').values_list('pk', flat=True))
+    ausentes, estadisticas = 0, {}
+    for inicio in range(0, len(mesa_ids), TAMANIO_LOTE):
+        lote = mesa_ids[inicio:inicio + TAMANIO_LOTE]
+        ausentes += _finalizar_lote(lote)
+        estadisticas.update(estadisticas_mesas(lote))
+
+    if ausentes:
+        GestorDigitosVerificadores.actualizar_dvv('InscripcionMesaExamen', 'academico')
+
+    return {'mesas': len(mesa_ids), 'ausentes': ausentes, 'estadisticas': estadisticas}
+
+
+def avanzar_ciclo_mesas(ahora=None, dias_gracia=DIAS_GRACIA_NOTAS):
+    """
+    Cierra las mesas con la inscripción vencida y finaliza las que rindieron
+    hace más de dias_gracia días.
+
+    Returns:
+        dict con 'cerradas', 'finalizadas' y 'ausentes'
+    """
+    ahora = ahora or timezone.now()
+    cerradas = cerrar_mesas(MesaExamen.objects.filter(fecha_limite_inscripcion__lte=ahora))
+    resultado = finalizar_mesas(
+        MesaExamen.objects.filter(fecha_examen__lte=ahora - timedelta(days=dias_gracia))
+    )
+    return {'cerradas': cerradas, 'finalizadas': resultado['mesas'], 'ausentes': resultado['ausentes']}
@@ -0,0 +1,181 @@
+"""
+Cierre de cursada de todas las comisiones EN_CURSO de un año académico.
+
+Cada comisión se cierra en su propia transacción (regularizar_comision) dentro de
+un pool de hilos; un fallo no afecta a las demás. Como las comisiones cerradas
+quedan FINALIZADA, volver a ejecutar el cierre retoma solo las pendientes o
+fallidas. El progreso se guarda en CierreAnioAcademico, cuya fila hace además
+de bloqueo entre procesos (servidor y workers de procesar_tareas) para evitar
+dos ejecuciones simultáneas del mismo año, y al final se devuelve un reporte
+consolidado.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+
+from django.db import OperationalError, close_old_connections, connections
+from django.db.models import Q
+from django.utils import timezone
+
+from academico.models import CierreAnioAcademico, Comision, EstadoCierreAnio, EstadoComision
+
+TRABAJADORES = 4
+
+# Un cierre EN_CURSO sin avances durante este plazo se considera abandonado
+# (el proceso murió) y se puede volver a iniciar
+DURACION_BLOQUEO = timedelta(minutes=30)
+
+# Reintentos ante bloqueos de escritura (SQLite serializa las transacciones)
+REINTENTOS = 8
+ESPERA_REINTENTO = 0.05
+
+
+class CierreEnCursoError(Exception):
+    """Ya hay un cierre en ejecución para el año académico"""
+
+
+CAMPOS_PROGRESO = ('estado', 'inicio', 'fin', 'total', 'procesadas', 'cerradas', 'regulares', 'libres', 'fallidas')
+
+
+def obtener_progreso_cierre(anio):
+    """Progreso del cierre en curso (o del último) del año, o None"""
+    return CierreAnioAcademico.objects.filter(anio_academico=anio).values(*CAMPOS_PROGRESO).first()
+
+
+def _tomar_cierre(anio):
+    """
+    Marca el cierre del año EN_CURSO con un UPDATE condicional: de dos procesos
+    que lo intentan a la vez, solo uno actualiza la fila.
+    """
+    CierreAnioAcademico.objects.get_or_create(anio_academico=anio)
+    ahora = timezone.now()
+    tomado = CierreAnioAcademico.objects.filter(anio_academico=anio).filter(
+        ~Q(estado=EstadoCierreAnio.EN_CURSO) | Q(actualizado__lt=ahora - DURACION_BLOQUEO)
+    ).update(
+        estado=EstadoCierreAnio.EN_CURSO, inicio=ahora, fin=None, actualizado=ahora, total=None,
+        procesadas=0, cerradas=0, regulares=0, libres=0, fallidas=0
+    )
+    if not tomado:
+        raise CierreEnCursoError(f'Ya hay un cierre en curso para {anio.nombre}.')
+
+
+def comisiones_pendientes(anio):
+    return Comision.objects.filter(
+        anio_academico=anio, estado=EstadoComision.EN_CURSO
+    ).select_related('anio_academico', 'materia').order_by('codigo')
+
+
+def _cerrar_comision(comision, usuario, en_hilo):
+    from academico.services import ServiciosAcademico
+    from institucional.auditoria import get_current_user, set_current_user
+
+    # La auditoría toma el usuario del hilo; los trabajadores no lo heredan
+    usuario_anterior = get_current_user()
+    set_current_user(usuario)
+    try:
+        for intento in range(REINTENTOS):
+            try:
+                resultado = ServiciosAcademico.regularizar_comision(comision, usuario)
+                break
+            except OperationalError as error:
+                if 'locked' not in str(error) or intento == REINTENTOS - 1:
+                    raise
+                time.sleep(ESPERA_REINTENTO * 2 ** intento)
+    except Exception as error:
+        resultado = {'success': False, 'mensaje': f'Error inesperado: {error}'}
+    finally:
+        set_current_user(usuario_anterior)
+        if en_hilo:
+            connections.close_all()
+    return comision, resultado
+
+
+def cerrar_comisiones(comisiones, usuario=None, trabajadores=TRABAJADORES, al_avanzar=None, progreso=None):
+    """
+    Cierra la cursada de las comisiones indicadas, cada una en su transacción.
+
+    Args:
+        comisiones: iterable de Comision
+        usuario: User que realiza el cierre
+        trabajadores: hilos en paralelo (1 ejecuta en el hilo actual)
+        al_avanzar: callable(comision, resultado, procesadas, total) opcional
+        progreso: callable(procesadas, total) opcional para publicar el avance
+
+    Returns:
+        dict con 'total', 'cerradas', 'regulares', 'libres', 'fallidas'
+        (lista de (codigo, mensaje)) y 'comisiones' (resultado por código)
+    """
+    comisiones = [comision for comision in comisiones if comision.estado == EstadoComision.EN_CURSO]
+    reporte = {
+        'total': len(comisiones),
+        'cerradas': 0,
+        'regulares': 0,
+        'libres': 0,
+        'fallidas': [],
+        'comisiones': {},
+    }
+
+    def registrar(comision, resultado):
+        if resultado['success']:
+            reporte['cerradas'] += 1
+            reporte['regulares'] += resultado['regulares']
+            reporte['libres'] += resultado['libres']
+        else:
+            reporte['fallidas'].append((comision.codigo, resultado['mensaje']))
+        reporte['comisiones'][comision.codigo] = resultado
+        procesadas = len(reporte['comisiones'])
+        if progreso:
+            progreso(procesadas, reporte['total'])
+        if al_avanzar:
+            al_avanzar(comision, resultado, procesadas, reporte['total'])
+
+    if trabajadores <= 1 or len(comisiones) <= 1:
+        for comision in comisiones:
+            registrar(*_cerrar_comision(comision, usuario, en_hilo=False))
+    else:
+        close_old_connections()
+        with ThreadPoolExecutor(max_workers=trabajadores) as pool:
+            futuros = [pool.submit(_cerrar_comision, comision, usuario, True) for comision in comisiones]
+            for futuro in as_completed(futuros):
+                registrar(*futuro.result())
+
+    reporte['fallidas'].sort()
+    return reporte
+
+
+def cerrar_anio_academico(anio, usuario=None, trabajadores=TRABAJADORES, al_avanzar=None):
+    """
+    Cierra todas las comisiones EN_CURSO del año (ver cerrar_comisiones).
+
+    Raises:
+        CierreEnCursoError: si otro proceso ya está cerrando el año
+    """
+    _tomar_cierre(anio)
+    cierre = CierreAnioAcademico.objects.filter(anio_academico=anio)
+
+    def publicar(procesadas, total):
+        cierre.update(procesadas=procesadas, total=total, actualizado=timezone.now())
+
+    resultado = {}
+    try:
+        reporte = cerrar_comisiones(
+            comisiones_pendientes(anio), usuario, trabajadores, al_avanzar, progreso=publicar
+        )
+        resultado = {campo: reporte[campo] for campo in ('total', 'cerradas', 'regulares', 'libres')}
+        resultado['fallidas'] = len(reporte['fallidas'])
+        return reporte
+    finally:
+        ahora = timezone.now()
+        cierre.update(estado=EstadoCierreAnio.FINALIZADO, fin=ahora, actualizado=ahora, **resultado)
+
+
+def resumen_cierre(reporte):
+    """Texto del reporte consolidado para mensajes del admin y del comando"""
+    texto = (
+        f"Comisiones cerradas: {reporte['cerradas']}/{reporte['total']} | "
+        f"Alumnos Regulares: {reporte['regulares']} | Alumnos Libres: {reporte['libres']}"
+    )
+    if reporte['fallidas']:
+        detalle = "; ".join(f"{codigo}: {mensaje}" for codigo, mensaje in reporte['fallidas'])
+        texto += f" | Sin cerrar ({len(reporte['fallidas'])}): {detalle}"
+    return texto
@@ -0,0 +1,87 @@
+"""
+Contador de inscriptos de MesaExamen (inscripciones en estado INSCRIPTO).
+
+El contador se mantiene con UPDATE atómicos sobre la fila de la mesa: ocupar un
+cupo solo incrementa si todavía hay lugar (inscriptos < cupo_maximo) y liberarlo
+solo decrementa si es mayor que cero, así dos inscripciones simultáneas no pueden
+superar el cupo. Las propiedades de MesaExamen leen la columna sin consultar.
+reconciliar_inscriptos corrige cualquier desvío (comando reconciliar_inscriptos_mesa).
+"""
+from django.db.models import Count, F, Q, Value
+from django.db.models.functions import Greatest
+
+from academico.models import EstadoInscripcionMesa, MesaExamen
+
+
+def ocupa_cupo(estado_inscripcion):
+    return estado_inscripcion == EstadoInscripcionMesa.INSCRIPTO
+
+
+def reservar_cupo(mesa_id):
+    """
+    Ocupa un cupo de la mesa si queda alguno.
+
+    Returns:
+        bool: False si la mesa estaba completa
+    """
+    return MesaExamen.objects.filter(
+        pk=mesa_id, inscriptos__lt=F('cupo_maximo')
+    ).update(inscriptos=F('inscriptos') + 1) == 1
+
+
+def liberar_cupo(mesa_id):
+    MesaExamen.objects.filter(pk=mesa_id, inscriptos__gt=0).update(inscriptos=F('inscriptos') - 1)
+
+
+def descontar_inscriptos(mesa_id, cantidad):
+    """Libera varios cupos con un solo UPDATE (cargas en bloque)"""
+    if cantidad:
+        MesaExamen.objects.filter(pk=mesa_id).update(inscriptos=Greatest(F('inscriptos') - cantidad, Value(0)))
+
+
+def actualizar_inscriptos(anterior, inscripcion):
+    """
+    Ajusta el contador tras guardar una inscripción.
+
+    Args:
+        anterior: (mesa_examen_id, estado_inscripcion) previos o None si es nueva
+        inscripcion: InscripcionMesaExamen ya guardada
+
+    Returns:
+        bool: False si había que ocupar un cupo y la mesa estaba completa
+    """
+    ocupaba = anterior is not None and ocupa_cupo(anterior[1])
+    ocupa = ocupa_cupo(inscripcion.estado_inscripcion)
+    if ocupaba and ocupa and anterior[0] == inscripcion.mesa_examen_id:
+        return True
+
+    if ocupaba:
+        liberar_cupo(anterior[0])
+    if ocupa:
+        return reservar_cupo(inscripcion.mesa_examen_id)
+    return True
+
+
+def reconciliar_inscriptos(mesas=None):
+    """
+    Recalcula el contador de las mesas del queryset (todas por defecto) y guarda
+    las que difieren.
+
+    Returns:
+        int: cantidad de mesas corregidas
+    """
+    if mesas is None:
+        mesas = MesaExamen.objects.all()
+
+    desviadas = list(
+        mesas.annotate(
+            reales=Count(
+                'inscripciones_mesa',
+                filter=Q(inscripciones_mesa__estado_inscripcion=EstadoInscripcionMesa.INSCRIPTO)
+            )
+        ).exclude(inscriptos=F('reales')).only('id', 'inscriptos')
+    )
+    for mesa in desviadas:
+        mesa.inscriptos = mesa.reales
+    MesaExamen.objects.bulk_update(desviadas, ['inscriptos'], batch_size=1000)
+    return len(desviadas)
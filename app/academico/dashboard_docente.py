@@ -0,0 +1,115 @@
+"""
+Datos del panel del docente calculados con una cantidad fija de consultas.
+
+Las comisiones del docente se leen en una sola consulta anotada (alumnos
+inscriptos y tipos de evaluación por subconsulta) y la cantidad de notas por
+inscripción en otra agrupada; el resto se arma en memoria. El resultado se
+guarda en caché por docente y día, y las señales de calificaciones,
+inscripciones y comisiones lo invalidan.
+"""
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from academico.models import Calificacion, Comision, EstadoComision
+
+DURACION_CACHE = 10 * 60
+
+
+def _clave_cache(docente_id, fecha):
+    return f'dashboard_docente:{docente_id}:{fecha.isoformat()}'
+
+
+def invalidar_dashboard_docente(docente_id):
+    if docente_id is not None:
+        cache.delete(_clave_cache(docente_id, timezone.localdate()))
+
+
+def invalidar_dashboard_comisiones(**filtros):
+    """Invalida el panel de los docentes de las comisiones que cumplen los filtros"""
+    for docente_id in Comision.objects.filter(**filtros).values_list('docente_id', flat=True).distinct():
+        invalidar_dashboard_docente(docente_id)
+
+
+def construir_dashboard_docente(docente):
+    """
+    Returns:
+        dict con 'comisiones_con_stats' (activas, con 'total_alumnos',
+        'calificaciones_pendientes' y 'tiene_pendientes'), 'comisiones_finalizadas',
+        'comisiones_hoy', 'clases_hoy', 'total_alumnos' y 'total_comisiones'
+    """
+    tipos_evaluacion = Calificacion.objects.filter(
+        alumno_comision__comision=OuterRef('pk')
+    ).order_by().values('alumno_comision__comision').annotate(
+        cantidad=Count('tipo', distinct=True)
+    ).values('cantidad')
+
+    comisiones = list(
+        Comision.objects.filter(docente=docente)
+        .select_related('materia', 'anio_academico')
+        .annotate(
+            total_alumnos=Count('inscripcionalumnocomision'),
+            tipos_evaluacion=Coalesce(Subquery(tipos_evaluacion, output_field=IntegerField()), Value(0)),
+        )
+    )
+
+    # Notas cargadas por inscripción de las comisiones activas
+    calificaciones_por_inscripcion = Calificacion.objects.filter(
+        alumno_comision__comision__docente=docente,
+        alumno_comision__comision__estado=EstadoComision.EN_CURSO,
+    ).values('alumno_comision_id', 'alumno_comision__comision_id').annotate(
+        cantidad=Count('id')
+    ).order_by()
+
+    tipos_por_comision = {comision.pk: comision.tipos_evaluacion for comision in comisiones}
+    completas = {}
+    for fila in calificaciones_por_inscripcion:
+        comision_id = fila['alumno_comision__comision_id']
+        if fila['cantidad'] >= tipos_por_comision.get(comision_id, 0):
+            completas[comision_id] = completas.get(comision_id, 0) + 1
+
+    dia_hoy = timezone.now().weekday() + 1
+    activas = [comision for comision in comisiones if comision.estado == EstadoComision.EN_CURSO]
+
+    comisiones_con_stats = []
+    for comision in activas:
+        if comision.tipos_evaluacion > 0:
+            pendientes = comision.total_alumnos - completas.get(comision.pk, 0)
+        else:
+            pendientes = comision.total_alumnos
+        comisiones_con_stats.append({
+            'comision': comision,
+            'total_alumnos': comision.total_alumnos,
+            'calificaciones_pendientes': pendientes,
+            'tiene_pendientes': pendientes > 0
+        })
+
+    finalizadas = sorted(
+        (comision for comision in comisiones if comision.estado == EstadoComision.FINALIZADA),
+        key=lambda comision: (comision.anio_academico.nombre, comision.materia.nombre),
+        reverse=True
+    )
+    hoy = sorted(
+        (comision for comision in activas if comision.dia_cursado == dia_hoy),
+        key=lambda comision: comision.horario_inicio
+    )
+
+    return {
+        'comisiones_con_stats': comisiones_con_stats,
+        'comisiones_finalizadas': finalizadas,
+        'comisiones_hoy': hoy,
+        'clases_hoy': sum(1 for comision in comisiones if comision.dia_cursado == dia_hoy),
+        'total_alumnos': sum(comision.total_alumnos for comision in comisiones),
+        'total_comisiones': len(activas),
+    }
+
+
+def obtener_dashboard_docente(docente):
+    """Panel del docente desde la caché (se calcula si no está o fue invalidado)"""
+    clave = _clave_cache(docente.pk, timezone.localdate())
+    datos = cache.get(clave)
+    if datos is None:
+        datos = construir_dashboard_docente(docente)
+        cache.set(clave, datos, DURACION_CACHE)
+    return datos
@@ -34,3 +34,8 @@ class AsistenciaNoExisteError(AcademicoException):
 class FechaNoClaseError(AcademicoException):
     """Se lanza cuando se intenta registrar asistencia en un día que no es de clase"""
     pass
+
+
+class PlanillaInvalidaError(AcademicoException):
+    """Se lanza cuando una planilla importada no tiene el formato esperado"""
+    pass
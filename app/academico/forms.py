@@ -1,11 +1,35 @@
 from django import forms
 from django.utils import timezone
 
+from academico.calendario import parsear_dias_semana
+from academico.horarios_mesa import validar_horario_mesa
 from academico.models import (
-    InscripcionAlumnoComision, Materia, TipoCalificacion,
+    AnioAcademico, Dia, InscripcionAlumnoComision, Materia, TipoCalificacion,
     Calificacion, InscripcionMesaExamen, MesaExamen
 )
 
+class AnioAcademicoAdminForm(forms.ModelForm):
+    dias_semana_clase = forms.TypedMultipleChoiceField(
+        choices=Dia.choices,
+        coerce=int,
+        widget=forms.CheckboxSelectMultiple,
+        label='Días de clase',
+        help_text='Días de la semana con clases; los feriados y recesos se cargan como excepciones'
+    )
+
+    class Meta:
+        model = AnioAcademico
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.initial['dias_semana_clase'] = sorted(
+            parsear_dias_semana(self.instance.dias_semana_clase)
+        )
+
+    def clean_dias_semana_clase(self):
+        return ','.join(str(dia) for dia in sorted(self.cleaned_data['dias_semana_clase']))
+
 class MateriaAdminForm(forms.ModelForm):
     class Meta:
         model = Materia
@@ -109,6 +133,25 @@ class CalificacionForm(forms.Form):
         return fecha
 
 
+class ImportarCalificacionesForm(CalificacionForm):
+    """Formulario para importar las notas de una instancia de evaluación desde una planilla"""
+    numero = forms.IntegerField(min_value=1, initial=1)
+    archivo = forms.FileField(
+        required=True,
+        error_messages={'required': 'Debe seleccionar una planilla (XLSX o CSV).'}
+    )
+
+    def clean_archivo(self):
+        from academico.importacion_calificaciones import EXTENSIONES_PERMITIDAS
+
+        archivo = self.cleaned_data.get('archivo')
+        if archivo and not archivo.name.lower().endswith(EXTENSIONES_PERMITIDAS):
+            raise forms.ValidationError(
+                f"Formato no soportado. Extensiones permitidas: {', '.join(EXTENSIONES_PERMITIDAS)}"
+            )
+        return archivo
+
+
 class NotaIndividualForm(forms.Form):
     """Formulario para validar una calificación individual"""
     nota = forms.DecimalField(
@@ -227,10 +270,17 @@ class MesaExamenAdminForm(forms.ModelForm):
             fecha_examen=fecha_examen,
             fecha_limite_inscripcion=fecha_limite,
             estado=cleaned_data.get('estado', 'ABIERTA'),
-            cupo_maximo=cleaned_data.get('cupo_maximo', 50)
+            cupo_maximo=cleaned_data.get('cupo_maximo', 50),
+            duracion_minutos=cleaned_data.get('duracion_minutos') or 180,
+            aula=cleaned_data.get('aula')
         )
         if self.instance.pk:
             instance.pk = self.instance.pk
         # Ejecutar validaciones del modelo
         instance.clean()
+
+        # Aula y tribunal libres en ese horario, con el tribunal elegido en el form
+        tribunal = list(cleaned_data.get('tribunal') or [])
+        validar_horario_mesa(instance, tribunal)
+        self.instance._tribunal_pendiente = tribunal
         return cleaned_data
\ No newline at end of file
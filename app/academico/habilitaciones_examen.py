@@ -0,0 +1,62 @@
+"""
+Habilitación para examen: quién puede rendir una mesa y con qué condición.
+
+Sale del analítico (MateriaAnalitico, mantenido por academico.analitico): por
+(alumno, materia), la mejor condición de sus cursadas y si la materia ya está
+aprobada, así que listar los habilitados de una mesa es una consulta sobre un
+índice.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from academico.models import InscripcionMesaExamen, MateriaAnalitico, MesaExamen
+
+CAMPOS_DVH_MESA = ['nota_examen', 'condicion', 'estado_inscripcion']
+
+
+def habilitados_para_mesa(mesa):
+    """Filas del analítico de los alumnos que pueden inscribirse a la mesa y todavía no lo hicieron"""
+    return MateriaAnalitico.objects.filter(
+        materia_id=mesa.materia_id, aprobada=False
+    ).exclude(
+        alumno_id__in=InscripcionMesaExamen.objects.filter(mesa_examen_id=mesa.pk).values('alumno_id')
+    ).select_related('alumno').order_by('alumno__apellido', 'alumno__nombre', 'alumno_id')
+
+
+def inscribir_habilitados(mesa):
+    """
+    Inscribe en la mesa a todos los alumnos habilitados, hasta completar el cupo.
+
+    Los cupos se reservan con un único UPDATE condicional y las inscripciones se
+    insertan con bulk_create (DVH por registro, DVV una vez), en una transacción.
+
+    Returns:
+        dict con 'inscriptos' y 'sin_cupo' (habilitados que no entraron)
+    """
+    from institucional.digitos_verificadores import GestorDigitosVerificadores
+
+    with transaction.atomic():
+        mesa.refresh_from_db(fields=['estado', 'fecha_limite_inscripcion', 'cupo_maximo', 'inscriptos'])
+        habilitados = list(habilitados_para_mesa(mesa).values_list('alumno_id', 'condicion'))
+        if not mesa.puede_inscribirse:
+            return {'inscriptos': 0, 'sin_cupo': len(habilitados)}
+
+        cantidad = min(len(habilitados), mesa.cupos_disponibles)
+        reservados = MesaExamen.objects.filter(
+            pk=mesa.pk, inscriptos__lte=F('cupo_maximo') - cantidad
+        ).update(inscriptos=F('inscriptos') + cantidad)
+        if not cantidad or not reservados:
+            return {'inscriptos': 0, 'sin_cupo': len(habilitados)}
+
+        inscripciones = InscripcionMesaExamen.objects.bulk_create([
+            InscripcionMesaExamen(mesa_examen=mesa, alumno_id=alumno_id, condicion=condicion)
+            for alumno_id, condicion in habilitados[:cantidad]
+        ])
+        # El DVH incluye la PK, que recién se conoce después del INSERT
+        for inscripcion in inscripciones:
+            inscripcion.dvh = GestorDigitosVerificadores.calcular_dvh(inscripcion, CAMPOS_DVH_MESA)
+        InscripcionMesaExamen.objects.bulk_update(inscripciones, ['dvh'], batch_size=1000)
+        GestorDigitosVerificadores.actualizar_dvv('InscripcionMesaExamen', 'academico')
+
+    mesa.inscriptos += cantidad
+    return {'inscriptos': cantidad, 'sin_cupo': len(habilitados) - cantidad}
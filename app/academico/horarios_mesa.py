@@ -0,0 +1,193 @@
+"""
+Conflictos de horario entre mesas de examen: un docente no puede integrar dos
+tribunales superpuestos y dos mesas no pueden compartir aula al mismo tiempo.
+
+Cada mesa ocupa el intervalo [fecha_examen, fecha_examen + duracion_minutos).
+Como la duración está acotada (DURACION_MAXIMA), los intervalos que se
+superponen con [inicio, fin) son los que empiezan en (inicio - DURACION_MAXIMA,
+fin): un rango sobre el índice de inicio, sea el índice (aula, fecha_examen) de
+la base al validar una mesa o las listas ordenadas de IndiceIntervalos (búsqueda
+binaria) al armar el reporte de un período o proponer un cronograma.
+"""
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, namedtuple
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+
+from academico.models import MesaExamen
+
+DURACION_MAXIMA_MINUTOS = 8 * 60
+DURACION_MAXIMA = timedelta(minutes=DURACION_MAXIMA_MINUTOS)
+
+Intervalo = namedtuple('Intervalo', 'inicio fin mesa_id')
+
+
+def intervalo_mesa(fecha_examen, duracion_minutos):
+    return fecha_examen, fecha_examen + timedelta(minutes=duracion_minutos)
+
+
+class IndiceIntervalos:
+    """Intervalos por recurso (('aula', nombre) o ('docente', id)) ordenados por inicio"""
+
+    def __init__(self):
+        self._intervalos = defaultdict(list)
+        self._inicios = defaultdict(list)
+
+    def agregar(self, recurso, inicio, fin, mesa_id):
+        intervalo = Intervalo(inicio, fin, mesa_id)
+        posicion = bisect_right(self._intervalos[recurso], intervalo)
+        self._intervalos[recurso].insert(posicion, intervalo)
+        self._inicios[recurso].insert(posicion, inicio)
+
+    def superpuestos(self, recurso, inicio, fin):
+        """Intervalos del recurso que se superponen con [inicio, fin)"""
+        inicios = self._inicios.get(recurso)
+        if not inicios:
+            return []
+        desde = bisect_right(inicios, inicio - DURACION_MAXIMA)
+        hasta = bisect_left(inicios, fin)
+        return [
+            intervalo for intervalo in self._intervalos[recurso][desde:hasta]
+            if intervalo.fin > inicio
+        ]
+
+    def libre(self, recursos, inicio, fin):
+        return not any(self.superpuestos(recurso, inicio, fin) for recurso in recursos)
+
+
+def _recursos(aula, docentes):
+    recursos = [('docente', docente_id) for docente_id in docentes]
+    if aula:
+        recursos.append(('aula', aula))
+    return recursos
+
+
+def _en_rango(mesas, inicio, fin):
+    return mesas.filter(fecha_examen__gt=inicio - DURACION_MAXIMA, fecha_examen__lt=fin)
+
+
+def validar_horario_mesa(mesa, tribunal=None, validar_aula=True):
+    """
+    Verifica que el aula y los docentes del tribunal estén libres en el horario de la mesa.
+
+    Args:
+        mesa: MesaExamen (puede no estar guardada)
+        tribunal: docentes (Persona o ids) a verificar; por defecto el tribunal guardado
+        validar_aula: False para verificar solo el tribunal (al sumar docentes)
+
+    Raises:
+        ValidationError con un mensaje por conflicto
+    """
+    if not mesa.fecha_examen or not mesa.duracion_minutos:
+        return
+    inicio, fin = intervalo_mesa(mesa.fecha_examen, mesa.duracion_minutos)
+    if tribunal is None:
+        tribunal = list(mesa.tribunal.values_list('pk', flat=True)) if mesa.pk else []
+    docentes = {getattr(docente, 'pk', docente) for docente in tribunal}
+
+    otras = MesaExamen.objects.exclude(pk=mesa.pk)
+    errores = []
+    if validar_aula and mesa.aula:
+        for otra in _en_rango(otras.filter(aula=mesa.aula), inicio, fin).select_related('materia'):
+            if intervalo_mesa(otra.fecha_examen, otra.duracion_minutos)[1] > inicio:
+                errores.append(f'El aula {mesa.aula} ya está ocupada por la mesa {otra} en ese horario.')
+    if docentes:
+        for integrante in MesaExamen.tribunal.through.objects.filter(
+            persona_id__in=docentes, mesaexamen__in=_en_rango(otras, inicio, fin)
+        ).select_related('persona', 'mesaexamen__materia'):
+            otra = integrante.mesaexamen
+            if intervalo_mesa(otra.fecha_examen, otra.duracion_minutos)[1] > inicio:
+                errores.append(f'{integrante.persona} ya integra el tribunal de la mesa {otra} en ese horario.')
+    if errores:
+        raise ValidationError(errores)
+
+
+def _cargar_mesas(mesas):
+    """[(mesa_id, inicio, fin, aula)] y {mesa_id: [docente_id]} con dos consultas"""
+    filas = [
+        (pk, *intervalo_mesa(fecha, duracion), aula)
+        for pk, fecha, duracion, aula in mesas.values_list('pk', 'fecha_examen', 'duracion_minutos', 'aula')
+    ]
+    tribunales = defaultdict(list)
+    for mesa_id, docente_id in MesaExamen.tribunal.through.objects.filter(
+        mesaexamen_id__in=[fila[0] for fila in filas]
+    ).values_list('mesaexamen_id', 'persona_id'):
+        tribunales[mesa_id].append(docente_id)
+    return filas, tribunales
+
+
+def reporte_conflictos(mesas):
+    """
+    Conflictos de aula y de tribunal entre las mesas del queryset.
+
+    Returns:
+        list de dicts con 'tipo' ('aula'|'docente'), 'recurso' (aula o id del
+        docente) y 'mesas' (par de ids), ordenada por inicio
+    """
+    filas, tribunales = _cargar_mesas(mesas)
+    indice = IndiceIntervalos()
+    conflictos = []
+    for mesa_id, inicio, fin, aula in sorted(filas, key=lambda fila: (fila[1], fila[0])):
+        for recurso in _recursos(aula, tribunales[mesa_id]):
+            for otro in indice.superpuestos(recurso, inicio, fin):
+                conflictos.append({'tipo': recurso[0], 'recurso': recurso[1], 'mesas': (otro.mesa_id, mesa_id)})
+            indice.agregar(recurso, inicio, fin, mesa_id)
+    return conflictos
+
+
+def proponer_cronograma(mesas, horarios, aulas=None):
+    """
+    Propone horarios sin conflictos para las mesas del queryset.
+
+    Las mesas con tribunales más grandes se ubican primero, cada una en el
+    primer horario en el que su tribunal y su aula están libres. Si la mesa no
+    tiene aula y se indican aulas, se elige la primera libre. Las demás mesas
+    del período quedan fijas y se respetan.
+
+    Args:
+        mesas: queryset de MesaExamen a ubicar
+        horarios: inicios posibles (datetime)
+        aulas: aulas disponibles para las mesas sin aula
+
+    Returns:
+        dict con 'propuesta' ({mesa_id: {'fecha_examen', 'aula'}}) y 'sin_lugar' (ids)
+    """
+    horarios = sorted(horarios)
+    if not horarios:
+        return {'propuesta': {}, 'sin_lugar': list(mesas.values_list('pk', flat=True))}
+
+    filas, tribunales = _cargar_mesas(mesas)
+    ultima = max((fin - inicio for _, inicio, fin, _ in filas), default=timedelta(0))
+
+    indice = IndiceIntervalos()
+    fijas = _en_rango(
+        MesaExamen.objects.exclude(pk__in=[fila[0] for fila in filas]), horarios[0], horarios[-1] + ultima
+    )
+    filas_fijas, tribunales_fijos = _cargar_mesas(fijas)
+    for mesa_id, inicio, fin, aula in filas_fijas:
+        for recurso in _recursos(aula, tribunales_fijos[mesa_id]):
+            indice.agregar(recurso, inicio, fin, mesa_id)
+
+    propuesta, sin_lugar = {}, []
+    for mesa_id, inicio, fin, aula in sorted(filas, key=lambda fila: (-len(tribunales[fila[0]]), fila[0])):
+        duracion = fin - inicio
+        docentes = _recursos(None, tribunales[mesa_id])
+        opciones_aula = [aula] if aula or not aulas else list(aulas)
+        for horario in horarios:
+            inicio, fin = horario, horario + duracion
+            if not indice.libre(docentes, inicio, fin):
+                continue
+            elegida = next(
+                (opcion for opcion in opciones_aula if not opcion or indice.libre([('aula', opcion)], inicio, fin)),
+                False
+            )
+            if elegida is False:
+                continue
+            for recurso in _recursos(elegida, tribunales[mesa_id]):
+                indice.agregar(recurso, inicio, fin, mesa_id)
+            propuesta[mesa_id] = {'fecha_examen': horario, 'aula': elegida}
+            break
+        else:
+            sin_lugar.append(mesa_id)
+    return {'propuesta': propuesta, 'sin_lugar': sin_lugar}
@@ -0,0 +1,199 @@
+"""
+Importación de calificaciones desde planillas (XLSX o CSV).
+
+La planilla se lee fila por fila (openpyxl en modo read_only o csv), cada fila
+se identifica por DNI o legajo contra las inscripciones de la comisión cargadas
+con una sola consulta, y las notas válidas se aplican con
+ServiciosAcademico.crear_calificaciones_bulk. Si alguna fila tiene errores no se
+guarda nada y se devuelve el detalle por fila.
+"""
+import codecs
+import csv
+import io
+import zipfile
+from decimal import Decimal, InvalidOperation
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+from academico.exceptions import PlanillaInvalidaError
+from academico.models import InscripcionAlumnoComision
+
+EXTENSIONES_PERMITIDAS = ('.xlsx', '.csv')
+
+COLUMNAS_IDENTIFICADOR = ('dni', 'legajo')
+COLUMNA_NOTA = 'nota'
+
+# Excel en Windows guarda los CSV en cp1252 salvo que se elija UTF-8
+CODIFICACIONES_CSV = ('utf-8-sig', 'cp1252')
+
+
+def _normalizar(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, float) and valor.is_integer():
+        valor = int(valor)
+    return str(valor).strip()
+
+
+def _filas_xlsx(archivo):
+    try:
+        libro = load_workbook(archivo, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, InvalidFileException, KeyError, OSError) as e:
+        raise PlanillaInvalidaError(
+            'El archivo no es una planilla XLSX válida: puede estar dañado o tener otro formato.'
+        ) from e
+    try:
+        for fila in libro.active.iter_rows(values_only=True):
+            yield fila
+    finally:
+        libro.close()
+
+
+def _codificacion_csv(binario):
+    """Primera codificación de CODIFICACIONES_CSV que decodifica todo el archivo (leído por bloques)"""
+    for codificacion in CODIFICACIONES_CSV:
+        decodificador = codecs.getincrementaldecoder(codificacion)()
+        binario.seek(0)
+        try:
+            for bloque in iter(lambda: binario.read(64 * 1024), b''):
+                decodificador.decode(bloque)
+            decodificador.decode(b'', final=True)
+        except UnicodeDecodeError:
+            continue
+        finally:
+            binario.seek(0)
+        return codificacion
+    raise PlanillaInvalidaError('No se pudo leer el CSV: guárdelo con codificación UTF-8.')
+
+
+def _filas_csv(archivo):
+    # UploadedFile envuelve al archivo binario real
+    binario = getattr(archivo, 'file', archivo)
+    texto = io.TextIOWrapper(binario, encoding=_codificacion_csv(binario), newline='')
+    try:
+        muestra = texto.read(2048)
+        texto.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=',;\t')
+        except csv.Error:
+            dialecto = csv.excel
+        yield from csv.reader(texto, dialecto)
+    except csv.Error as e:
+        raise PlanillaInvalidaError(f'El CSV no se pudo leer: {e}') from e
+    finally:
+        # No cerrar el archivo subido junto con el wrapper
+        texto.detach()
+
+
+def leer_planilla(archivo):
+    """
+    Genera (numero_fila, {columna: valor}) para cada fila de datos de la planilla.
+    Los encabezados se comparan sin distinguir mayúsculas.
+    """
+    nombre = (getattr(archivo, 'name', '') or '').lower()
+    if nombre.endswith('.xlsx'):
+        filas = _filas_xlsx(archivo)
+    elif nombre.endswith('.csv'):
+        filas = _filas_csv(archivo)
+    else:
+        raise PlanillaInvalidaError(
+            f"Formato no soportado. Extensiones permitidas: {', '.join(EXTENSIONES_PERMITIDAS)}"
+        )
+
+    encabezados = None
+    for numero_fila, fila in enumerate(filas, start=1):
+        valores = [_normalizar(valor) for valor in fila]
+        if encabezados is None:
+            if not any(valores):
+                continue
+            encabezados = [valor.lower() for valor in valores]
+            if COLUMNA_NOTA not in encabezados or not set(COLUMNAS_IDENTIFICADOR) & set(encabezados):
+                raise PlanillaInvalidaError(
+                    "La planilla debe tener una columna 'Nota' y una columna 'DNI' o 'Legajo'."
+                )
+            continue
+        if not any(valores):
+            continue
+        yield numero_fila, dict(zip(encabezados, valores))
+
+
+def _parsear_nota(valor):
+    try:
+        nota = Decimal(valor.replace(',', '.'))
+    except (InvalidOperation, AttributeError):
+        return None
+    return nota.quantize(Decimal('0.01')) if nota.is_finite() else None
+
+
+def validar_planilla(comision, archivo):
+    """
+    Valida todas las filas de la planilla contra las inscripciones de la comisión.
+
+    Returns:
+        tuple (notas, errores): notas es {alumno_id: Decimal} y errores una lista
+        de dicts {'fila', 'identificador', 'error'}
+    """
+    por_dni, por_legajo = {}, {}
+    for alumno_id, dni, legajo in InscripcionAlumnoComision.objects.filter(
+        comision=comision
+    ).values_list('alumno_id', 'alumno__dni', 'alumno__legajo'):
+        por_dni[_normalizar(dni)] = alumno_id
+        if legajo:
+            por_legajo[_normalizar(legajo)] = alumno_id
+
+    notas, errores, filas_por_alumno = {}, [], {}
+
+    for numero_fila, fila in leer_planilla(archivo):
+        dni, legajo = fila.get('dni', ''), fila.get('legajo', '')
+        identificador = dni or legajo
+
+        def error(mensaje):
+            errores.append({'fila': numero_fila, 'identificador': identificador, 'error': mensaje})
+
+        if not identificador:
+            error("Falta el DNI o el legajo.")
+            continue
+
+        alumno_id = por_dni.get(dni) if dni else por_legajo.get(legajo)
+        if alumno_id is None:
+            error("El alumno no está inscripto en la comisión.")
+            continue
+
+        nota = _parsear_nota(fila.get(COLUMNA_NOTA, ''))
+        if nota is None:
+            error(f"Nota inválida: '{fila.get(COLUMNA_NOTA, '')}'.")
+            continue
+        if nota < 0 or nota > 10:
+            error(f"La nota debe estar entre 0 y 10 (recibido {nota}).")
+            continue
+
+        if alumno_id in filas_por_alumno:
+            error(f"Alumno repetido (ya figura en la fila {filas_por_alumno[alumno_id]}).")
+            continue
+
+        filas_por_alumno[alumno_id] = numero_fila
+        notas[alumno_id] = nota
+
+    return notas, errores
+
+
+def importar_calificaciones(comision, archivo, tipo_calificacion, numero, fecha):
+    """
+    Importa las notas de una instancia de evaluación desde una planilla.
+
+    Returns:
+        dict con 'errores' (lista por fila), 'creadas' y 'actualizadas'. Si hay
+        errores no se guarda ninguna nota.
+    """
+    from academico.services import ServiciosAcademico
+
+    notas, errores = validar_planilla(comision, archivo)
+    if errores:
+        return {'errores': errores, 'creadas': [], 'actualizadas': []}
+
+    resultado = ServiciosAcademico.crear_calificaciones_bulk(
+        comision, tipo_calificacion, numero, fecha, notas
+    )
+    resultado['errores'] = []
+    return resultado
@@ -0,0 +1,130 @@
+"""
+Inscripción a mesas de examen bajo alta concurrencia.
+
+El cupo se reserva con el UPDATE condicional de cupos_mesa (compara y descuenta
+en una sola sentencia), dentro de la misma transacción que el INSERT, así que la
+mesa nunca supera cupo_maximo. Antes de escribir se relee el contador para
+rechazar sin bloqueos las mesas ya completas.
+
+Cuando SQLite informa la base bloqueada el intento se repite una cantidad acotada
+de veces con espera exponencial y aleatoria. Una mesa con contención queda
+marcada como "caliente" por unos segundos: mientras tanto las inscripciones de
+este proceso a esa mesa pasan por una cola FIFO, de a una, en lugar de competir
+por el bloqueo de escritura.
+"""
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, OperationalError
+
+from academico.models import InscripcionMesaExamen
+
+REINTENTOS = 6
+ESPERA_REINTENTO = 0.02
+SEGUNDOS_CALIENTE = 30
+
+MENSAJE_EXITO = "Inscripción realizada con éxito."
+MENSAJE_SIN_CUPO = "No hay cupos disponibles en esta mesa."
+MENSAJE_DUPLICADA = "El alumno ya está inscripto en esta mesa."
+MENSAJE_OCUPADA = "La mesa está recibiendo muchas inscripciones. Intente nuevamente en unos segundos."
+
+
+class _ColaJusta:
+    """Turnos por orden de llegada (número de ticket) para una mesa"""
+
+    def __init__(self):
+        self._condicion = threading.Condition()
+        self._proximo_ticket = 0
+        self._atendiendo = 0
+
+    @contextmanager
+    def turno(self):
+        with self._condicion:
+            ticket = self._proximo_ticket
+            self._proximo_ticket += 1
+            while ticket != self._atendiendo:
+                self._condicion.wait()
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._atendiendo += 1
+                self._condicion.notify_all()
+
+
+_colas = {}
+_calientes = {}
+_lock_registro = threading.Lock()
+
+
+def _cola(mesa_id):
+    with _lock_registro:
+        return _colas.setdefault(mesa_id, _ColaJusta())
+
+
+def _marcar_caliente(mesa_id):
+    with _lock_registro:
+        _calientes[mesa_id] = time.monotonic() + SEGUNDOS_CALIENTE
+
+
+def es_mesa_caliente(mesa_id):
+    with _lock_registro:
+        hasta = _calientes.get(mesa_id)
+        if hasta is not None and hasta < time.monotonic():
+            del _calientes[mesa_id]
+            hasta = None
+        return hasta is not None
+
+
+def _mensaje_validacion(error):
+    if hasattr(error, 'message_dict'):
+        return " | ".join(mensajes[0] for mensajes in error.message_dict.values())
+    return error.messages[0]
+
+
+def _guardar(inscripcion):
+    mesa_id = inscripcion.mesa_examen_id
+    if es_mesa_caliente(mesa_id):
+        with _cola(mesa_id).turno():
+            inscripcion.save()
+    else:
+        inscripcion.save()
+
+
+def inscribir(alumno, mesa):
+    """
+    Inscribe al alumno en la mesa validando las reglas de negocio.
+
+    Returns:
+        tuple: (success: bool, mensaje: str)
+    """
+    # El contador en memoria puede estar desactualizado
+    mesa.refresh_from_db(fields=['estado', 'cupo_maximo', 'inscriptos'])
+
+    inscripcion = InscripcionMesaExamen(alumno=alumno, mesa_examen=mesa)
+    try:
+        inscripcion.clean()
+    except ValidationError as error:
+        return False, _mensaje_validacion(error)
+
+    for intento in range(REINTENTOS):
+        try:
+            _guardar(inscripcion)
+            return True, MENSAJE_EXITO
+        except ValidationError as error:
+            return False, _mensaje_validacion(error)
+        except IntegrityError:
+            return False, MENSAJE_DUPLICADA
+        except OperationalError as error:
+            if 'locked' not in str(error):
+                raise
+            _marcar_caliente(mesa.pk)
+            # La transacción se revirtió: volver a insertar desde cero
+            inscripcion.pk = None
+            inscripcion._state.adding = True
+            time.sleep(ESPERA_REINTENTO * 2 ** intento * random.uniform(0.5, 1.5))
+
+    return False, MENSAJE_OCUPADA
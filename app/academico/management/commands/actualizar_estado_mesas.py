@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from academico.ciclo_mesas import DIAS_GRACIA_NOTAS, avanzar_ciclo_mesas
+
+class Command(BaseCommand):
+    help = (
+        'Cierra las mesas de examen con la inscripción vencida y finaliza las ya rendidas. '
+        'Pensado para ejecutarse periódicamente (cron)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dias-gracia',
+            type=int,
+            default=DIAS_GRACIA_NOTAS,
+            help=f'Días después del examen antes de finalizar la mesa (default: {DIAS_GRACIA_NOTAS})',
+        )
+
+    def handle(self, *args, **options):
+        resultado = avanzar_ciclo_mesas(dias_gracia=options['dias_gracia'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Mesas cerradas: {resultado['cerradas']} | "
+            f"Mesas finalizadas: {resultado['finalizadas']} | "
+            f"Inscriptos marcados ausentes: {resultado['ausentes']}"
+        ))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from academico.cierre_anual import TRABAJADORES, CierreEnCursoError, resumen_cierre
+from academico.models import AnioAcademico
+from academico.services import ServiciosAcademico
+
+class Command(BaseCommand):
+    help = (
+        'Cierra la cursada de todas las comisiones EN_CURSO de un año académico. '
+        'Si se interrumpe, volver a ejecutarlo retoma las comisiones pendientes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--anio',
+            type=int,
+            help='ID del año académico a cerrar (por defecto el activo)',
+        )
+        parser.add_argument(
+            '--trabajadores',
+            type=int,
+            default=TRABAJADORES,
+            help=f'Comisiones a cerrar en paralelo (por defecto {TRABAJADORES})',
+        )
+
+    def handle(self, *args, **options):
+        anio_id = options.get('anio')
+        if anio_id:
+            anio_academico = AnioAcademico.objects.filter(id=anio_id).first()
+        else:
+            anio_academico = AnioAcademico.objects.filter(activo=True).first()
+
+        if not anio_academico:
+            raise CommandError('No se encontró el año académico')
+        if not anio_academico.cierre_cursada_habilitado:
+            raise CommandError(f'El cierre de cursada no está habilitado para {anio_academico.nombre}')
+
+        self.stdout.write(f"Cerrando cursadas de: {anio_academico.nombre}")
+
+        def al_avanzar(comision, resultado, procesadas, total):
+            marca = '✓' if resultado['success'] else '✗'
+            detalle = (
+                f"{resultado['regulares']} regulares, {resultado['libres']} libres"
+                if resultado['success'] else resultado['mensaje']
+            )
+            self.stdout.write(f"[{procesadas}/{total}] {marca} {comision.codigo}: {detalle}")
+
+        try:
+            reporte = ServiciosAcademico.cerrar_anio_academico(
+                anio_academico, trabajadores=options['trabajadores'], al_avanzar=al_avanzar
+            )
+        except CierreEnCursoError as error:
+            raise CommandError(str(error))
+
+        estilo = self.style.SUCCESS if not reporte['fallidas'] else self.style.WARNING
+        self.stdout.write(estilo(f"Cierre finalizado. {resumen_cierre(reporte)}"))
@@ -0,0 +1,45 @@
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from academico.models import MesaExamen
+from academico.services import ServiciosAcademico
+from institucional.models import Persona
+
+class Command(BaseCommand):
+    help = 'Informa las mesas de examen de un período que comparten aula o docente del tribunal en horarios superpuestos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde', required=True, help='Primer día del período (AAAA-MM-DD)')
+        parser.add_argument('--hasta', required=True, help='Último día del período (AAAA-MM-DD)')
+
+    def handle(self, *args, **options):
+        try:
+            desde = datetime.strptime(options['desde'], '%Y-%m-%d').date()
+            hasta = datetime.strptime(options['hasta'], '%Y-%m-%d').date()
+        except ValueError:
+            raise CommandError('Las fechas deben tener el formato AAAA-MM-DD')
+
+        conflictos = ServiciosAcademico.conflictos_mesas_examen(
+            timezone.make_aware(datetime.combine(desde, time.min)),
+            timezone.make_aware(datetime.combine(hasta + timedelta(days=1), time.min)),
+        )
+        if not conflictos:
+            self.stdout.write(self.style.SUCCESS('✅ No hay conflictos de horario en el período'))
+            return
+
+        mesas = MesaExamen.objects.select_related('materia').in_bulk(
+            {mesa_id for conflicto in conflictos for mesa_id in conflicto['mesas']}
+        )
+        docentes = Persona.objects.in_bulk(
+            {conflicto['recurso'] for conflicto in conflictos if conflicto['tipo'] == 'docente'}
+        )
+        for conflicto in conflictos:
+            primera, segunda = (mesas[mesa_id] for mesa_id in conflicto['mesas'])
+            if conflicto['tipo'] == 'aula':
+                recurso = f"Aula {conflicto['recurso']}"
+            else:
+                recurso = str(docentes[conflicto['recurso']])
+            self.stdout.write(self.style.WARNING(f'✗ {recurso}: {primera} / {segunda}'))
+
+        self.stdout.write(self.style.ERROR(f'Conflictos encontrados: {len(conflictos)}'))
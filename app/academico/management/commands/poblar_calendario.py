@@ -1,10 +1,11 @@
 from django.core.management.base import BaseCommand
-from django.utils import timezone
-from datetime import date, timedelta
+from datetime import date
+from academico.calendario import parsear_dias_semana
 from academico.models import AnioAcademico, CalendarioAcademico
+from academico.services import ServiciosAcademico
 
 class Command(BaseCommand):
-    help = 'Pobla el calendario académico con días lectivos, feriados y recesos'
+    help = 'Carga los feriados y recesos del año académico como excepciones del calendario'
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -54,67 +55,57 @@ class Command(BaseCommand):
             (date(2025, 11, 25), date(2025, 11, 29), 'Semana de examen final'),
         ]
 
-        fecha_actual = anio_academico.fecha_inicio
-        dias_procesados = 0
-        dias_clase = 0
-        feriados_creados = 0
-        recesos_creados = 0
-
-        while fecha_actual <= anio_academico.fecha_fin:
-            # Determinar tipo de día
-            es_dia_clase = fecha_actual.weekday() < 5  # Lunes a Viernes
-            descripcion = ''
-            tipo_dia = 'NORMAL'
-
-            # Verificar feriados
-            for feriado_anio, feriado_mes, feriado_dia, feriado_nombre in feriados:
-                if (fecha_actual.year == feriado_anio and 
-                    fecha_actual.month == feriado_mes and 
-                    fecha_actual.day == feriado_dia):
-                    es_dia_clase = False
-                    tipo_dia = 'FERIADO'
-                    descripcion = feriado_nombre
-                    feriados_creados += 1
-                    break
+        dias_semana = parsear_dias_semana(anio_academico.dias_semana_clase)
+        inicio_anio, fin_anio = anio_academico.fecha_inicio, anio_academico.fecha_fin
 
-            # Verificar recesos (solo si no es feriado)
-            if es_dia_clase:
-                for inicio_receso, fin_receso, nombre_receso in recesos:
-                    if inicio_receso <= fecha_actual <= fin_receso:
-                        es_dia_clase = False
-                        tipo_dia = 'RECESO'
-                        descripcion = nombre_receso
-                        recesos_creados += 1
-                        break
+        # Los recesos se guardan como un único rango, recortado al año académico
+        excepciones = []
+        for inicio_receso, fin_receso, nombre_receso in recesos:
+            inicio_receso, fin_receso = max(inicio_receso, inicio_anio), min(fin_receso, fin_anio)
+            if inicio_receso <= fin_receso:
+                excepciones.append(CalendarioAcademico(
+                    anio_academico=anio_academico,
+                    fecha_inicio=inicio_receso,
+                    fecha_fin=fin_receso,
+                    es_dia_clase=False,
+                    descripcion=nombre_receso
+                ))
+        recesos_creados = len(excepciones)
 
-            # Crear o actualizar registro
-            calendario, created = CalendarioAcademico.objects.get_or_create(
+        # Solo importan los feriados que caen en días de clase fuera de un receso
+        feriados_creados = 0
+        for feriado_anio, feriado_mes, feriado_dia, feriado_nombre in feriados:
+            fecha = date(feriado_anio, feriado_mes, feriado_dia)
+            if not (inicio_anio <= fecha <= fin_anio) or fecha.weekday() + 1 not in dias_semana:
+                continue
+            if any(inicio <= fecha <= fin for inicio, fin, _ in recesos):
+                continue
+            excepciones.append(CalendarioAcademico(
                 anio_academico=anio_academico,
-                fecha=fecha_actual,
-                defaults={
-                    'es_dia_clase': es_dia_clase,
-                    'descripcion': descripcion,
-                }
-            )
+                fecha_inicio=fecha,
+                fecha_fin=fecha,
+                es_dia_clase=False,
+                descripcion=feriado_nombre
+            ))
+            feriados_creados += 1
 
-            if not created:
-                # Actualizar si ya existe
-                calendario.es_dia_clase = es_dia_clase
-                calendario.descripcion = descripcion
-                calendario.save()
-
-            if es_dia_clase:
-                dias_clase += 1
-
-            dias_procesados += 1
-            fecha_actual += timedelta(days=1)
+        excepciones.sort(key=lambda excepcion: excepcion.fecha_inicio)
+        resultado = ServiciosAcademico.reemplazar_excepciones_calendario(anio_academico, excepciones)
 
         self.stdout.write(
             self.style.SUCCESS(
                 f'✅ Calendario poblado exitosamente!\n'
-                f'• Días procesados: {dias_procesados}\n'
-                f'• Días de clase: {dias_clase}\n'
+                f'• Días de clase: {len(anio_academico.fechas_clase())}\n'
                 f'• Feriados: {feriados_creados}\n'
-                f'• Días de receso: {recesos_creados}'
+                f'• Recesos: {recesos_creados}\n'
+                f'• Asistencias ajustadas: {resultado["eliminadas"]} eliminadas, {resultado["creadas"]} creadas'
+            )
+        )
+        if resultado['conservadas']:
+            fechas = ', '.join(fecha.isoformat() for fecha in resultado['fechas_conservadas'])
+            self.stdout.write(
+                self.style.WARNING(
+                    f'⚠️  Se conservaron {resultado["conservadas"]} asistencias con presente ya tomado '
+                    f'en fechas que dejaron de ser de clase: {fechas}'
+                )
             )
-        )
\ No newline at end of file
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from academico.analitico import actualizar_analitico
+
+class Command(BaseCommand):
+    help = 'Reconstruye el analítico de los alumnos (una fila por materia) desde sus cursadas y exámenes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alumno',
+            type=int,
+            action='append',
+            help='ID del alumno a recalcular (se puede repetir; por defecto todos)',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            corregidas = actualizar_analitico(options.get('alumno') or None)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Analítico recalculado. Filas corregidas: {corregidas}'))
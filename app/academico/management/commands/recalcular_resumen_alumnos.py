@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from academico.models import Alumno
+from academico.resumen_alumno import recalcular_resumenes
+
+class Command(BaseCommand):
+    help = 'Reconstruye el promedio y los contadores de materias de los alumnos desde calificaciones e inscripciones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--alumno',
+            type=int,
+            action='append',
+            help='ID del alumno a recalcular (se puede repetir; por defecto todos)',
+        )
+
+    def handle(self, *args, **options):
+        alumnos = None
+        if options.get('alumno'):
+            alumnos = Alumno.objects.filter(pk__in=options['alumno'])
+
+        with transaction.atomic():
+            corregidos = recalcular_resumenes(alumnos)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Resumen recalculado. Alumnos corregidos: {corregidos}'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from academico.cupos_mesa import reconciliar_inscriptos
+from academico.models import MesaExamen
+
+class Command(BaseCommand):
+    help = 'Recalcula el contador de inscriptos de las mesas de examen desde sus inscripciones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mesa',
+            type=int,
+            action='append',
+            help='ID de la mesa a reconciliar (se puede repetir; por defecto todas)',
+        )
+
+    def handle(self, *args, **options):
+        mesas = None
+        if options.get('mesa'):
+            mesas = MesaExamen.objects.filter(pk__in=options['mesa'])
+
+        with transaction.atomic():
+            corregidas = reconciliar_inscriptos(mesas)
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Contadores reconciliados. Mesas corregidas: {corregidas}'))
@@ -103,21 +103,7 @@ class Command(BaseCommand):
             cierre_cursada_habilitado=True # Habilitado para pruebas
         )
         
-        # Crear calendario básico (Lunes a Viernes clase)
-        inicio = anio.fecha_inicio
-        fin = anio.fecha_fin
-        delta = timedelta(days=1)
-        
-        fechas = []
-        while inicio <= fin:
-            if inicio.weekday() < 5: # Lunes a Viernes
-                fechas.append(CalendarioAcademico(
-                    anio_academico=anio,
-                    fecha=inicio,
-                    es_dia_clase=True
-                ))
-            inicio += delta
-        CalendarioAcademico.objects.bulk_create(fechas, ignore_conflicts=True)
+        # El calendario (Lunes a Viernes + feriados) lo genera la regla del año académico
 
         # Plan
         plan = PlanEstudio.objects.create(nombre="Tecnicatura en Software", codigo="TS-2025")
@@ -220,16 +206,15 @@ class Command(BaseCommand):
                 
                 # Generar Asistencias
                 # (Simulado: solo algunas fechas recientes)
-                fechas_clase = CalendarioAcademico.objects.filter(
-                    anio_academico=anio, 
-                    fecha__week_day=comision.dia_cursado + 1,
-                    fecha__lte=timezone.now().date()
-                ).order_by('-fecha')[:5] # Últimas 5 clases
+                hoy = timezone.now().date()
+                fechas_clase = [
+                    fecha for fecha in anio.fechas_clase(comision.dia_cursado) if fecha <= hoy
+                ][-5:] # Últimas 5 clases
                 
-                for fecha_obj in fechas_clase:
+                for fecha in fechas_clase:
                     Asistencia.objects.update_or_create(
                         alumno_comision=inscripcion,
-                        fecha_asistencia=fecha_obj.fecha,
+                        fecha_asistencia=fecha,
                         defaults={'esta_presente': random.choice([True, True, True, False])} # 75% asistencia prob
                     )
                 
@@ -172,22 +172,7 @@ class Command(BaseCommand):
             }
         )
         
-        # Si el año es nuevo, o el calendario está vacío, poblarlo
-        if created or not CalendarioAcademico.objects.filter(anio_academico=anio).exists():
-            inicio = anio.fecha_inicio
-            fin = anio.fecha_fin
-            delta = timedelta(days=1)
-            
-            fechas = []
-            while inicio <= fin:
-                if inicio.weekday() < 5: # Lunes a Viernes
-                    fechas.append(CalendarioAcademico(
-                        anio_academico=anio,
-                        fecha=inicio,
-                        es_dia_clase=True
-                    ))
-                inicio += delta
-            CalendarioAcademico.objects.bulk_create(fechas, ignore_conflicts=True)
+        # El calendario (Lunes a Viernes + feriados) lo genera la regla del año académico
         return anio
 
     def crear_alumnos_para_anio(self, year, anios_existentes, alumnos_existentes_por_anio):
@@ -337,17 +322,16 @@ class Command(BaseCommand):
 
                     # Generar Asistencias (si la comisión no ha finalizado o si ya se generaron)
                     if comision.estado == EstadoComision.EN_CURSO or random.random() < 0.8: # Generar asistencias históricas
-                        fechas_clase = CalendarioAcademico.objects.filter(
-                            anio_academico=anio_academico, 
-                            fecha__week_day=comision.dia_cursado + 1,
-                            fecha__lte=timezone.now().date() if comision.estado == EstadoComision.EN_CURSO else anio_academico.fecha_fin
-                        ).order_by('fecha')
+                        limite = timezone.now().date() if comision.estado == EstadoComision.EN_CURSO else anio_academico.fecha_fin
+                        fechas_clase = [
+                            fecha for fecha in anio_academico.fechas_clase(comision.dia_cursado) if fecha <= limite
+                        ]
                         
-                        num_clases_simuladas = min(fechas_clase.count(), random.randint(5, 15)) # Simular algunas clases
-                        for fecha_obj in random.sample(list(fechas_clase), num_clases_simuladas):
+                        num_clases_simuladas = min(len(fechas_clase), random.randint(5, 15)) # Simular algunas clases
+                        for fecha in random.sample(fechas_clase, num_clases_simuladas):
                             Asistencia.objects.update_or_create(
                                 alumno_comision=inscripcion,
-                                fecha_asistencia=fecha_obj.fecha,
+                                fecha_asistencia=fecha,
                                 defaults={'esta_presente': random.choice([True, True, True, False])} # 75% presente
                             )
                     
@@ -191,21 +191,7 @@ class Command(BaseCommand):
             cierre_cursada_habilitado=True
         )
         
-        # Calendario básico para el año de prueba
-        inicio = anio.fecha_inicio
-        fin = anio.fecha_fin
-        delta = timedelta(days=1)
-        
-        fechas = []
-        while inicio <= fin:
-            if inicio.weekday() < 5: # Lunes a Viernes
-                fechas.append(CalendarioAcademico(
-                    anio_academico=anio,
-                    fecha=inicio,
-                    es_dia_clase=True
-                ))
-            inicio += delta
-        CalendarioAcademico.objects.bulk_create(fechas, ignore_conflicts=True)
+        # El calendario (Lunes a Viernes + feriados) lo genera la regla del año académico
 
         PlanEstudio.objects.create(nombre="Plan de Prueba", codigo="PLAN-TEST")
         
@@ -0,0 +1,225 @@
+"""
+Matriz de asistencia alumnos × fechas de clase.
+
+Se arma a partir de una única consulta values_list sobre las inscripciones
+(con sus asistencias unidas por LEFT JOIN, así aparecen también los alumnos sin
+registros) y todas las métricas (porcentajes, rachas de ausencias, tendencia y
+concurrencia por fecha) se calculan de forma vectorizada con NumPy, sin recorrer
+las asistencias en Python.
+"""
+from datetime import date
+
+import numpy as np
+from django.db.models import FilteredRelation, Q
+from django.utils import timezone
+
+from academico.models import InscripcionAlumnoComision
+
+# Cantidad de clases recientes usadas para la tendencia
+CLASES_TENDENCIA = 8
+
+_CAMPOS = (
+    'comision_id',
+    'id',
+    'alumno__dni',
+    'alumno__apellido',
+    'alumno__nombre',
+    'asistencia__fecha_asistencia',
+    'asistencia__esta_presente',
+)
+
+
+def _porcentaje(numerador, denominador):
+    """Porcentaje elemento a elemento; 0 donde no hay registros"""
+    resultado = np.zeros(numerador.shape, dtype=float)
+    np.divide(numerador * 100.0, denominador, out=resultado, where=denominador > 0)
+    return np.round(resultado, 2)
+
+
+def racha_maxima(matriz):
+    """
+    Longitud de la racha más larga de True consecutivos por fila.
+
+    Acumula los True y, en cada posición, le resta el acumulado que había en el
+    último False; el máximo de esa diferencia es la racha más larga.
+    """
+    if matriz.size == 0:
+        return np.zeros(matriz.shape[0], dtype=int)
+    acumulado = np.cumsum(matriz, axis=1)
+    reinicio = np.maximum.accumulate(np.where(matriz, 0, acumulado), axis=1)
+    return (acumulado - reinicio).max(axis=1)
+
+
+def pendiente_tendencia(matriz, registradas, ultimas=CLASES_TENDENCIA):
+    """
+    Pendiente de la recta de mínimos cuadrados de la asistencia (0/1) en las
+    últimas clases registradas de cada fila. Positiva: el alumno viene asistiendo más.
+    """
+    pendientes = np.zeros(matriz.shape[0], dtype=float)
+    if matriz.shape[1] < 2:
+        return pendientes
+
+    # Clases registradas desde cada columna hasta el final de su fila: se toman
+    # las columnas registradas de cada fila que están entre sus 'ultimas'
+    restantes = np.cumsum(registradas[:, ::-1], axis=1)[:, ::-1]
+    valores = matriz.astype(float)
+    pesos = (registradas & (restantes <= ultimas)).astype(float)
+    x = np.arange(valores.shape[1], dtype=float)
+
+    n = pesos.sum(axis=1)
+    validas = n >= 2
+    x_media = np.divide(pesos @ x, n, out=np.zeros_like(n), where=validas)
+    y_media = np.divide((pesos * valores).sum(axis=1), n, out=np.zeros_like(n), where=validas)
+    x_centrado = (x[np.newaxis, :] - x_media[:, np.newaxis]) * pesos
+    covarianza = (x_centrado * (valores - y_media[:, np.newaxis])).sum(axis=1)
+    varianza = (x_centrado ** 2).sum(axis=1)
+
+    np.divide(covarianza, varianza, out=pendientes, where=validas & (varianza > 0))
+    return np.round(pendientes, 4)
+
+
+class MatrizAsistencia:
+    """
+    Asistencia de una comisión como matriz booleana.
+
+    Atributos:
+        inscripciones: array de ids de InscripcionAlumnoComision (filas)
+        alumnos: lista de (dni, apellido, nombre) alineada con las filas
+        fechas: lista de fechas de clase (columnas), en orden ascendente
+        presentes: matriz bool, True si el alumno estuvo presente
+        registradas: matriz bool, True si existe el registro de asistencia
+    """
+
+    def __init__(self, inscripciones, alumnos, fechas, presentes, registradas):
+        self.inscripciones = inscripciones
+        self.alumnos = alumnos
+        self.fechas = fechas
+        self.presentes = presentes
+        self.registradas = registradas
+
+    @classmethod
+    def desde_filas(cls, filas):
+        """
+        Construye la matriz a partir de tuplas (inscripcion_id, dni, apellido,
+        nombre, fecha, esta_presente). Una inscripción sin asistencias llega con
+        fecha None y queda como fila sin registros.
+        """
+        if not filas:
+            vacia = np.zeros((0, 0), dtype=bool)
+            return cls(np.zeros(0, dtype=int), [], [], vacia, vacia.copy())
+
+        inscripcion_ids, dnis, apellidos, nombres, fechas, estados = zip(*filas)
+        inscripciones, fila = np.unique(np.fromiter(inscripcion_ids, dtype=np.int64), return_inverse=True)
+        con_fecha = np.fromiter((fecha is not None for fecha in fechas), dtype=bool, count=len(filas))
+        ordinales, columna = np.unique(
+            np.fromiter((fecha.toordinal() for fecha in fechas if fecha is not None), dtype=np.int64),
+            return_inverse=True
+        )
+
+        forma = (len(inscripciones), len(ordinales))
+        presentes = np.zeros(forma, dtype=bool)
+        registradas = np.zeros(forma, dtype=bool)
+        presentes[fila[con_fecha], columna] = np.fromiter(
+            (estado for fecha, estado in zip(fechas, estados) if fecha is not None), dtype=bool
+        )
+        registradas[fila[con_fecha], columna] = True
+
+        # Primera aparición de cada inscripción para recuperar los datos del alumno
+        primera = np.full(len(inscripciones), len(filas), dtype=np.int64)
+        np.minimum.at(primera, fila, np.arange(len(filas)))
+        alumnos = [(dnis[i], apellidos[i], nombres[i]) for i in primera]
+
+        # Filas ordenadas por apellido y nombre
+        orden = sorted(range(len(alumnos)), key=lambda i: (alumnos[i][1] or '', alumnos[i][2] or ''))
+        return cls(
+            inscripciones[orden],
+            [alumnos[i] for i in orden],
+            [date.fromordinal(int(ordinal)) for ordinal in ordinales],
+            presentes[orden],
+            registradas[orden],
+        )
+
+    @property
+    def ausentes(self):
+        return self.registradas & ~self.presentes
+
+    def porcentajes(self):
+        """Porcentaje de asistencia de cada alumno sobre sus clases registradas"""
+        return _porcentaje(self.presentes.sum(axis=1), self.registradas.sum(axis=1))
+
+    def rachas_ausencia(self):
+        """Racha más larga de ausencias consecutivas de cada alumno"""
+        return racha_maxima(self.ausentes)
+
+    def tendencias(self, ultimas=CLASES_TENDENCIA):
+        return pendiente_tendencia(self.presentes, self.registradas, ultimas)
+
+    def concurrencia(self):
+        """Porcentaje de alumnos presentes en cada fecha"""
+        return _porcentaje(self.presentes.sum(axis=0), self.registradas.sum(axis=0))
+
+    def resumen(self, porcentaje_requerido=None):
+        """Filas listas para la plantilla: alumno, celdas y métricas"""
+        porcentajes = self.porcentajes()
+        # Sin clases registradas todavía no hay porcentaje con el cual evaluar el riesgo
+        con_registros = self.registradas.any(axis=1)
+        rachas = self.rachas_ausencia()
+        tendencias = self.tendencias()
+        celdas = np.where(self.registradas, np.where(self.presentes, 'P', 'A'), '')
+
+        return [
+            {
+                'inscripcion_id': int(self.inscripciones[i]),
+                'dni': dni,
+                'apellido': apellido,
+                'nombre': nombre,
+                'celdas': celdas[i].tolist(),
+                'porcentaje': float(porcentajes[i]),
+                'racha_ausencias': int(rachas[i]),
+                'tendencia': float(tendencias[i]),
+                'en_riesgo': (
+                    porcentaje_requerido is not None and bool(con_registros[i])
+                    and porcentajes[i] < porcentaje_requerido
+                ),
+            }
+            for i, (dni, apellido, nombre) in enumerate(self.alumnos)
+        ]
+
+
+def _filas(comisiones_ids, hasta):
+    """Una fila por inscripción y asistencia hasta la fecha; sin asistencias, una con fecha None"""
+    return InscripcionAlumnoComision.objects.filter(
+        comision_id__in=comisiones_ids
+    ).annotate(
+        asistencia=FilteredRelation('asistencias', condition=Q(asistencias__fecha_asistencia__lte=hasta))
+    ).values_list(*_CAMPOS)
+
+
+def construir_matriz_asistencia(comision, hasta=None):
+    """
+    Matriz de asistencia de una comisión hasta la fecha indicada (por defecto hoy),
+    con una fila por inscripción. Las asistencias futuras ya materializadas no se incluyen.
+    """
+    hasta = hasta or timezone.now().date()
+    filas = [fila[1:] for fila in _filas([comision.pk], hasta)]
+    return MatrizAsistencia.desde_filas(filas)
+
+
+def construir_matrices_asistencia(comisiones, hasta=None):
+    """
+    Matrices de varias comisiones (p. ej. todas las de un año) con una única consulta.
+
+    Returns:
+        dict comision_id -> MatrizAsistencia (vacía si la comisión no tiene inscripciones)
+    """
+    hasta = hasta or timezone.now().date()
+    comisiones_ids = [getattr(comision, 'pk', comision) for comision in comisiones]
+
+    por_comision = {comision_id: [] for comision_id in comisiones_ids}
+    for fila in _filas(comisiones_ids, hasta).iterator(chunk_size=5000):
+        por_comision[fila[0]].append(fila[1:])
+
+    return {
+        comision_id: MatrizAsistencia.desde_filas(filas)
+        for comision_id, filas in por_comision.items()
+    }
@@ -0,0 +1,183 @@
+"""
+Matriz de calificaciones alumnos × (tipo, número) de una comisión.
+
+Todas las notas de la comisión se leen en un único recorrido y, en esa misma
+pasada, se arman las celdas y se acumulan los promedios por alumno, por tipo,
+por instancia y general. La usan la vista del curso y su exportación a Excel.
+"""
+import io
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Count, Q
+from django.utils import timezone
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from academico.models import Asistencia, Calificacion, InscripcionAlumnoComision
+
+
+def _promedio(suma, cantidad):
+    return round(float(suma) / cantidad, 2) if cantidad else 0
+
+
+class _Acumulador:
+    __slots__ = ('suma', 'cantidad')
+
+    def __init__(self):
+        self.suma = Decimal('0')
+        self.cantidad = 0
+
+    def agregar(self, nota):
+        self.suma += nota
+        self.cantidad += 1
+
+    @property
+    def promedio(self):
+        return _promedio(self.suma, self.cantidad)
+
+
+class MatrizCalificaciones:
+    """
+    Atributos:
+        filas: una por inscripción, ordenadas por apellido y nombre, con
+            'calificaciones' {tipo: [notas]}, 'celdas' {(tipo, numero): nota},
+            'promedio', 'total_calificaciones', 'condicion' y 'asistencia'
+        tipos: tipos de calificación presentes en la comisión
+        columnas: pares (tipo, numero) presentes, ordenados
+        promedios_por_tipo / promedios_por_columna / promedio_general
+    """
+
+    def __init__(self, filas, tipos, columnas, promedios_por_tipo, promedios_por_columna, promedio_general):
+        self.filas = filas
+        self.tipos = tipos
+        self.columnas = columnas
+        self.promedios_por_tipo = promedios_por_tipo
+        self.promedios_por_columna = promedios_por_columna
+        self.promedio_general = promedio_general
+
+
+def _porcentajes_asistencia(comision, hasta):
+    """Porcentaje de asistencia por inscripción (clases anteriores a 'hasta') en una consulta"""
+    totales = Asistencia.objects.filter(
+        alumno_comision__comision=comision,
+        fecha_asistencia__lt=hasta
+    ).values('alumno_comision_id').annotate(
+        total=Count('id'),
+        presentes=Count('id', filter=Q(esta_presente=True))
+    )
+    return {
+        fila['alumno_comision_id']: round(fila['presentes'] * 100 / fila['total'], 2)
+        for fila in totales
+    }
+
+
+def construir_matriz_calificaciones(comision):
+    inscripciones = list(
+        InscripcionAlumnoComision.objects.filter(comision=comision)
+        .select_related('alumno')
+        .order_by('alumno__apellido', 'alumno__nombre')
+    )
+    asistencias = _porcentajes_asistencia(comision, timezone.now().date())
+
+    filas = {}
+    por_alumno = {}
+    for inscripcion in inscripciones:
+        filas[inscripcion.pk] = {
+            'inscripcion': inscripcion,
+            'alumno': inscripcion.alumno,
+            'calificaciones': {},
+            'celdas': {},
+            'promedio': 0,
+            'total_calificaciones': 0,
+            'condicion': inscripcion.get_condicion_display(),
+            'asistencia': asistencias.get(inscripcion.pk, 0),
+        }
+        por_alumno[inscripcion.pk] = _Acumulador()
+
+    por_tipo = defaultdict(_Acumulador)
+    por_columna = defaultdict(_Acumulador)
+    general = _Acumulador()
+
+    calificaciones = Calificacion.objects.filter(
+        alumno_comision__comision=comision
+    ).order_by('tipo', 'numero').values_list(
+        'alumno_comision_id', 'id', 'tipo', 'numero', 'nota', 'fecha_creacion'
+    )
+    for inscripcion_id, calificacion_id, tipo, numero, nota, fecha in calificaciones:
+        fila = filas[inscripcion_id]
+        nota_dict = {'id': calificacion_id, 'nota': nota, 'fecha': fecha, 'numero': numero}
+        fila['calificaciones'].setdefault(tipo, []).append(nota_dict)
+        fila['celdas'][(tipo, numero)] = nota_dict
+
+        por_alumno[inscripcion_id].agregar(nota)
+        por_tipo[tipo].agregar(nota)
+        por_columna[(tipo, numero)].agregar(nota)
+        general.agregar(nota)
+
+    for inscripcion_id, fila in filas.items():
+        acumulador = por_alumno[inscripcion_id]
+        fila['promedio'] = acumulador.promedio
+        fila['total_calificaciones'] = acumulador.cantidad
+
+    return MatrizCalificaciones(
+        filas=list(filas.values()),
+        tipos=sorted(por_tipo),
+        columnas=sorted(por_columna),
+        promedios_por_tipo={tipo: acumulador.promedio for tipo, acumulador in por_tipo.items()},
+        promedios_por_columna={columna: acumulador.promedio for columna, acumulador in por_columna.items()},
+        promedio_general=general.promedio,
+    )
+
+
+def generar_excel_calificaciones(comision, matriz):
+    """Planilla de calificaciones de la comisión, una columna por instancia de evaluación"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Calificaciones"
+
+    header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+    header_font = Font(bold=True, color='FFFFFF', size=12)
+
+    ws['A1'] = f"{comision.materia.nombre} - {comision.codigo}"
+    ws['A1'].font = Font(bold=True, size=14)
+    ws['A2'] = f"Generado: {timezone.localtime().strftime('%d/%m/%Y %H:%M')}"
+
+    encabezados = ['#', 'Apellido', 'Nombre', 'DNI']
+    encabezados += [f"{tipo} {numero}" for tipo, numero in matriz.columnas]
+    encabezados += ['Asistencia %', 'Condición', 'Promedio']
+
+    fila_encabezado = 4
+    for columna, titulo in enumerate(encabezados, start=1):
+        celda = ws.cell(row=fila_encabezado, column=columna, value=titulo)
+        celda.fill = header_fill
+        celda.font = header_font
+        celda.alignment = Alignment(horizontal='center')
+
+    for numero_fila, fila in enumerate(matriz.filas, start=1):
+        alumno = fila['alumno']
+        valores = [numero_fila, alumno.apellido, alumno.nombre, alumno.dni]
+        valores += [
+            float(fila['celdas'][columna]['nota']) if columna in fila['celdas'] else None
+            for columna in matriz.columnas
+        ]
+        valores += [fila['asistencia'], fila['condicion'], fila['promedio'] or None]
+        ws.append(valores)
+
+    pie = ['', 'Promedio', '', '']
+    pie += [matriz.promedios_por_columna[columna] for columna in matriz.columnas]
+    pie += ['', '', matriz.promedio_general]
+    ws.append(pie)
+    for celda in ws[ws.max_row]:
+        celda.font = Font(bold=True)
+
+    ws.column_dimensions['B'].width = 20
+    ws.column_dimensions['C'].width = 20
+    ws.column_dimensions['D'].width = 12
+    for columna in range(5, len(encabezados) + 1):
+        ws.column_dimensions[get_column_letter(columna)].width = 14
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
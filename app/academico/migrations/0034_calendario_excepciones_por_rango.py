@@ -0,0 +1,151 @@
+from datetime import timedelta
+
+import academico.calendario
+from django.db import migrations, models
+
+
+def _dias_regla(anio):
+    return academico.calendario.parsear_dias_semana(anio.dias_semana_clase)
+
+
+def compactar_calendario(apps, schema_editor):
+    """
+    Convierte el calendario día por día en excepciones por rango.
+
+    Solo se conservan los días cuyo estado difiere de la regla semanal del año
+    (un día sin registro no era de clase). Los días consecutivos con el mismo
+    estado y descripción se agrupan en un rango, que puede atravesar días en los
+    que la regla ya coincide (p. ej. un receso que incluye un fin de semana).
+    """
+    AnioAcademico = apps.get_model('academico', 'AnioAcademico')
+    CalendarioAcademico = apps.get_model('academico', 'CalendarioAcademico')
+
+    for anio in AnioAcademico.objects.all():
+        dias_regla = _dias_regla(anio)
+        registros = {
+            fecha: (es_dia_clase, descripcion or '')
+            for fecha, es_dia_clase, descripcion in CalendarioAcademico.objects.filter(
+                anio_academico=anio
+            ).values_list('fecha_inicio', 'es_dia_clase', 'descripcion')
+        }
+
+        excepciones = []
+        actual = None
+        fecha = anio.fecha_inicio
+        while fecha <= anio.fecha_fin:
+            es_dia_clase, descripcion = registros.get(fecha, (False, ''))
+            segun_regla = fecha.weekday() + 1 in dias_regla
+
+            if es_dia_clase != segun_regla:
+                if actual and (actual.es_dia_clase, actual.descripcion or '') == (es_dia_clase, descripcion):
+                    actual.fecha_fin = fecha
+                else:
+                    actual = CalendarioAcademico(
+                        anio_academico=anio,
+                        fecha_inicio=fecha,
+                        fecha_fin=fecha,
+                        es_dia_clase=es_dia_clase,
+                        descripcion=descripcion
+                    )
+                    excepciones.append(actual)
+            elif actual and actual.es_dia_clase != segun_regla:
+                actual = None
+
+            fecha += timedelta(days=1)
+
+        CalendarioAcademico.objects.filter(anio_academico=anio).delete()
+        CalendarioAcademico.objects.bulk_create(excepciones)
+
+
+def expandir_calendario(apps, schema_editor):
+    """Vuelve a generar un registro por día a partir de la regla y sus excepciones"""
+    AnioAcademico = apps.get_model('academico', 'AnioAcademico')
+    CalendarioAcademico = apps.get_model('academico', 'CalendarioAcademico')
+
+    for anio in AnioAcademico.objects.all():
+        regla = academico.calendario.ReglaCalendario(
+            anio.fecha_inicio,
+            anio.fecha_fin,
+            _dias_regla(anio),
+            list(CalendarioAcademico.objects.filter(anio_academico=anio).values_list(
+                'fecha_inicio', 'fecha_fin', 'es_dia_clase', 'descripcion'
+            ))
+        )
+
+        dias = []
+        fecha = anio.fecha_inicio
+        while fecha <= anio.fecha_fin:
+            excepcion = regla.excepcion(fecha)
+            dias.append(CalendarioAcademico(
+                anio_academico=anio,
+                fecha_inicio=fecha,
+                fecha_fin=fecha,
+                es_dia_clase=regla.es_dia_clase(fecha),
+                descripcion=excepcion[3] if excepcion else ''
+            ))
+            fecha += timedelta(days=1)
+
+        CalendarioAcademico.objects.filter(anio_academico=anio).delete()
+        CalendarioAcademico.objects.bulk_create(dias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0033_alter_mesaexamen_tribunal'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='calendarioacademico',
+            name='cal_anio_fecha_clase_idx',
+        ),
+        migrations.AlterUniqueTogether(
+            name='calendarioacademico',
+            unique_together=set(),
+        ),
+        migrations.RenameField(
+            model_name='calendarioacademico',
+            old_name='fecha',
+            new_name='fecha_inicio',
+        ),
+        migrations.AddField(
+            model_name='calendarioacademico',
+            name='fecha_fin',
+            field=models.DateField(null=True),
+        ),
+        migrations.AddField(
+            model_name='anioacademico',
+            name='calendario_version',
+            field=models.CharField(default=academico.calendario.nueva_version_calendario, editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='anioacademico',
+            name='dias_semana_clase',
+            field=models.CharField(default='1,2,3,4,5', help_text='Días de la semana con clase (1=Lunes ... 7=Domingo), separados por coma', max_length=20),
+        ),
+        migrations.RunPython(compactar_calendario, expandir_calendario),
+        migrations.AlterField(
+            model_name='calendarioacademico',
+            name='fecha_fin',
+            field=models.DateField(),
+        ),
+        migrations.AlterField(
+            model_name='calendarioacademico',
+            name='fecha_inicio',
+            field=models.DateField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='calendarioacademico',
+            name='es_dia_clase',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AlterModelOptions(
+            name='calendarioacademico',
+            options={'ordering': ['fecha_inicio'], 'verbose_name': 'Excepción del Calendario', 'verbose_name_plural': 'Calendario Académico'},
+        ),
+        migrations.AddIndex(
+            model_name='calendarioacademico',
+            index=models.Index(fields=['anio_academico', 'fecha_inicio', 'fecha_fin'], name='cal_anio_rango_idx'),
+        ),
+    ]
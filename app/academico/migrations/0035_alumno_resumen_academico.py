@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:45
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, Q, Sum
+
+
+def inicializar_resumen(apps, schema_editor):
+    """Calcula el resumen de los alumnos existentes (mismas reglas que academico.resumen_alumno)"""
+    Alumno = apps.get_model('academico', 'Alumno')
+    Calificacion = apps.get_model('academico', 'Calificacion')
+    InscripcionAlumnoComision = apps.get_model('academico', 'InscripcionAlumnoComision')
+
+    notas = {
+        fila['alumno_comision__alumno_id']: fila
+        for fila in Calificacion.objects.values('alumno_comision__alumno_id').annotate(
+            suma=Sum('nota', output_field=DecimalField(max_digits=10, decimal_places=2)),
+            cantidad=Count('id')
+        )
+    }
+    aprobada = Q(estado_inscripcion='APROBADA')
+    libre = Q(condicion='LIBRE') | Q(estado_inscripcion='LIBRE')
+    materias = {
+        fila['alumno_id']: fila
+        for fila in InscripcionAlumnoComision.objects.values('alumno_id').annotate(
+            aprobadas=Count('id', filter=aprobada),
+            libres=Count('id', filter=~aprobada & libre),
+            regulares=Count('id', filter=~aprobada & ~libre & Q(condicion='REGULAR')),
+        )
+    }
+
+    alumnos = []
+    for alumno in Alumno.objects.filter(pk__in=set(notas) | set(materias)):
+        fila_notas = notas.get(alumno.pk)
+        if fila_notas:
+            alumno.suma_notas = fila_notas['suma']
+            alumno.cantidad_calificaciones = fila_notas['cantidad']
+            alumno.promedio = round(fila_notas['suma'] / fila_notas['cantidad'], 2)
+        else:
+            alumno.promedio = None
+        fila_materias = materias.get(alumno.pk, {})
+        alumno.materias_aprobadas = fila_materias.get('aprobadas', 0)
+        alumno.materias_libres = fila_materias.get('libres', 0)
+        alumno.materias_regulares = fila_materias.get('regulares', 0)
+        alumnos.append(alumno)
+
+    Alumno.objects.bulk_update(alumnos, [
+        'promedio', 'suma_notas', 'cantidad_calificaciones',
+        'materias_aprobadas', 'materias_regulares', 'materias_libres',
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0034_calendario_excepciones_por_rango'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alumno',
+            name='cantidad_calificaciones',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='alumno',
+            name='materias_aprobadas',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='alumno',
+            name='materias_libres',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='alumno',
+            name='materias_regulares',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='alumno',
+            name='suma_notas',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=10),
+        ),
+        migrations.AlterField(
+            model_name='alumno',
+            name='promedio',
+            field=models.DecimalField(blank=True, db_index=True, decimal_places=2, editable=False, max_digits=4, null=True),
+        ),
+        migrations.RunPython(inicializar_resumen, migrations.RunPython.noop),
+    ]
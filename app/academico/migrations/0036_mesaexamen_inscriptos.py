@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 23:54
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def inicializar_inscriptos(apps, schema_editor):
+    """Cuenta las inscripciones INSCRIPTO de las mesas existentes (mismas reglas que academico.cupos_mesa)"""
+    MesaExamen = apps.get_model('academico', 'MesaExamen')
+    mesas = list(MesaExamen.objects.annotate(
+        reales=Count('inscripciones_mesa', filter=Q(inscripciones_mesa__estado_inscripcion='INSCRIPTO'))
+    ).filter(reales__gt=0))
+    for mesa in mesas:
+        mesa.inscriptos = mesa.reales
+    MesaExamen.objects.bulk_update(mesas, ['inscriptos'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0035_alumno_resumen_academico'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mesaexamen',
+            name='inscriptos',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(inicializar_inscriptos, migrations.RunPython.noop),
+    ]
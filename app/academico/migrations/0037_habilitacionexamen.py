@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, Q
+
+
+def inicializar_habilitaciones(apps, schema_editor):
+    """Resume las cursadas existentes (mismas reglas que academico.habilitaciones_examen)"""
+    InscripcionAlumnoComision = apps.get_model('academico', 'InscripcionAlumnoComision')
+    HabilitacionExamen = apps.get_model('academico', 'HabilitacionExamen')
+    filas = InscripcionAlumnoComision.objects.values('alumno_id', materia=F('comision__materia_id')).annotate(
+        aprobadas=Count('id', filter=Q(estado_inscripcion='APROBADA')),
+        regulares=Count('id', filter=Q(condicion='REGULAR')),
+    ).order_by()
+    HabilitacionExamen.objects.bulk_create([
+        HabilitacionExamen(
+            alumno_id=fila['alumno_id'],
+            materia_id=fila['materia'],
+            condicion='REGULAR' if fila['regulares'] else 'LIBRE',
+            aprobada=fila['aprobadas'] > 0,
+        )
+        for fila in filas
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0036_mesaexamen_inscriptos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HabilitacionExamen',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('condicion', models.CharField(choices=[('REGULAR', 'Regular (aprobó cursada)'), ('LIBRE', 'Libre (no aprobó cursada o perdió regularidad)')], help_text='REGULAR si alguna cursada de la materia es regular', max_length=20)),
+                ('aprobada', models.BooleanField(default=False, help_text='Alguna cursada de la materia está aprobada')),
+                ('alumno', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='habilitaciones_examen', to='academico.alumno')),
+                ('materia', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='habilitaciones_examen', to='academico.materia')),
+            ],
+            options={
+                'verbose_name': 'Habilitación para examen',
+                'verbose_name_plural': 'Habilitaciones para examen',
+                'db_table': 'academico_habilitaciones_examen',
+                'indexes': [models.Index(fields=['materia', 'aprobada', 'condicion'], name='habilitacion_materia_idx')],
+                'unique_together': {('alumno', 'materia')},
+            },
+        ),
+        migrations.RunPython(inicializar_habilitaciones, migrations.RunPython.noop),
+    ]
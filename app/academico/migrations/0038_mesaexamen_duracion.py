@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:08
+
+import django.core.validators
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0037_habilitacionexamen'),
+        ('institucional', '0019_alter_usuario_managers'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mesaexamen',
+            name='duracion_minutos',
+            field=models.PositiveIntegerField(default=180, help_text='Duración del examen en minutos (para detectar superposiciones de aula y tribunal)', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(480)]),
+        ),
+        migrations.AddIndex(
+            model_name='mesaexamen',
+            index=models.Index(fields=['aula', 'fecha_examen'], name='mesa_aula_fecha_idx'),
+        ),
+    ]
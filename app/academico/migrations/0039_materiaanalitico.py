@@ -0,0 +1,163 @@
+# Generated by Django 5.2.18 on 2026-10-19 02:10
+
+import django.db.models.deletion
+from collections import defaultdict
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import F
+
+CONTADOR_EXAMEN = {
+    'APROBADO': 'examenes_aprobados',
+    'DESAPROBADO': 'examenes_desaprobados',
+    'AUSENTE': 'examenes_ausentes',
+}
+
+
+def reconstruir_analitico(apps, schema_editor):
+    """Arma el analítico desde las cursadas y exámenes existentes (mismas reglas que academico.analitico)"""
+    InscripcionAlumnoComision = apps.get_model('academico', 'InscripcionAlumnoComision')
+    InscripcionMesaExamen = apps.get_model('academico', 'InscripcionMesaExamen')
+    MateriaAnalitico = apps.get_model('academico', 'MateriaAnalitico')
+
+    cursadas = defaultdict(list)
+    for cursada in InscripcionAlumnoComision.objects.values(
+        'pk', 'alumno_id', 'condicion', 'estado_inscripcion', 'nota_cursada', 'nota_final',
+        'fecha_regularizacion', 'fecha_cierre', materia_id=F('comision__materia_id')
+    ).order_by('pk'):
+        cursadas[(cursada['alumno_id'], cursada['materia_id'])].append(cursada)
+
+    examenes = defaultdict(list)
+    for examen in InscripcionMesaExamen.objects.values(
+        'alumno_id', 'estado_inscripcion', 'nota_examen',
+        materia_id=F('mesa_examen__materia_id'), fecha_examen=F('mesa_examen__fecha_examen')
+    ).order_by('mesa_examen__fecha_examen', 'pk'):
+        examenes[(examen['alumno_id'], examen['materia_id'])].append(examen)
+
+    filas = []
+    for (alumno_id, materia_id), lista in cursadas.items():
+        aprobada = next((c for c in lista if c['estado_inscripcion'] == 'APROBADA'), None)
+        regular = next((c for c in lista if c['condicion'] == 'REGULAR'), None)
+        cursada = aprobada or regular or lista[-1]
+        fila = MateriaAnalitico(
+            alumno_id=alumno_id,
+            materia_id=materia_id,
+            condicion='REGULAR' if regular else 'LIBRE',
+            aprobada=aprobada is not None,
+            cursada_id=cursada['pk'],
+            nota_cursada=cursada['nota_cursada'],
+            fecha_regularizacion=cursada['fecha_regularizacion'],
+            nota_final=aprobada['nota_final'] if aprobada else None,
+            fecha_aprobacion=aprobada['fecha_cierre'] if aprobada else None,
+            suma_notas_examen=Decimal('0'),
+        )
+        for examen in examenes.get((alumno_id, materia_id), []):
+            contador = CONTADOR_EXAMEN.get(examen['estado_inscripcion'])
+            if contador:
+                setattr(fila, contador, getattr(fila, contador) + 1)
+                fila.fecha_ultimo_examen = examen['fecha_examen']
+                fila.ultima_nota_examen = examen['nota_examen']
+            if examen['nota_examen'] is not None:
+                fila.suma_notas_examen += examen['nota_examen']
+                fila.cantidad_notas_examen += 1
+        filas.append(fila)
+
+    MateriaAnalitico.objects.all().delete()
+    MateriaAnalitico.objects.bulk_create(filas, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0038_mesaexamen_duracion'),
+    ]
+
+    operations = [
+        migrations.RenameModel(
+            old_name='HabilitacionExamen',
+            new_name='MateriaAnalitico',
+        ),
+        migrations.AlterModelTable(
+            name='materiaanalitico',
+            table='academico_analitico_materias',
+        ),
+        migrations.AlterModelOptions(
+            name='materiaanalitico',
+            options={'verbose_name': 'Materia del analítico', 'verbose_name_plural': 'Analítico de alumnos'},
+        ),
+        migrations.RenameIndex(
+            model_name='materiaanalitico',
+            new_name='analitico_materia_idx',
+            old_name='habilitacion_materia_idx',
+        ),
+        migrations.AlterField(
+            model_name='materiaanalitico',
+            name='alumno',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='analitico', to='academico.alumno'),
+        ),
+        migrations.AlterField(
+            model_name='materiaanalitico',
+            name='materia',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='analitico', to='academico.materia'),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='cursada',
+            field=models.ForeignKey(blank=True, help_text='Cursada que representa a la materia: la aprobada, si no la regular, si no la última', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='academico.inscripcionalumnocomision'),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='nota_cursada',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='fecha_regularizacion',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='nota_final',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='fecha_aprobacion',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='examenes_aprobados',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='examenes_desaprobados',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='examenes_ausentes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='suma_notas_examen',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=8),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='cantidad_notas_examen',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='ultima_nota_examen',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=4, null=True),
+        ),
+        migrations.AddField(
+            model_name='materiaanalitico',
+            name='fecha_ultimo_examen',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(reconstruir_analitico, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0039_materiaanalitico'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CierreAnioAcademico',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('estado', models.CharField(choices=[('EN_CURSO', 'En curso'), ('FINALIZADO', 'Finalizado')], default='FINALIZADO', max_length=20)),
+                ('inicio', models.DateTimeField(blank=True, null=True)),
+                ('fin', models.DateTimeField(blank=True, null=True)),
+                ('actualizado', models.DateTimeField(blank=True, help_text='Último avance; un cierre sin avances por mucho tiempo se da por abandonado', null=True)),
+                ('total', models.PositiveIntegerField(blank=True, null=True)),
+                ('procesadas', models.PositiveIntegerField(default=0)),
+                ('cerradas', models.PositiveIntegerField(default=0)),
+                ('regulares', models.PositiveIntegerField(default=0)),
+                ('libres', models.PositiveIntegerField(default=0)),
+                ('fallidas', models.PositiveIntegerField(default=0)),
+                ('anio_academico', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cierre', to='academico.anioacademico')),
+            ],
+            options={
+                'verbose_name': 'Cierre de año académico',
+                'verbose_name_plural': 'Cierres de años académicos',
+                'db_table': 'academico_cierres_anio',
+            },
+        ),
+    ]
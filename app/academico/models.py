@@ -1,10 +1,12 @@
 import datetime
 from django.db import models, transaction
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.conf import settings
 
+from academico.calendario import DIAS_SEMANA_DEFAULT, nueva_version_calendario
 from administracion.models import PlanEstudio
 from institucional.models import Persona
 
@@ -52,6 +54,14 @@ class AnioAcademico(models.Model):
     porcentaje_asistencia_req = models.PositiveIntegerField(default=75, help_text="Porcentaje mínimo de asistencia para regularizar")
     cierre_cursada_habilitado = models.BooleanField(default=False, help_text="Habilita a los docentes para cerrar notas de cursada")
     fecha_limite_cierre = models.DateField(null=True, blank=True, help_text="Fecha límite para cierre de notas")
+
+    # Calendario: regla semanal + excepciones por rango (CalendarioAcademico)
+    dias_semana_clase = models.CharField(
+        max_length=20,
+        default=DIAS_SEMANA_DEFAULT,
+        help_text="Días de la semana con clase (1=Lunes ... 7=Domingo), separados por coma"
+    )
+    calendario_version = models.CharField(max_length=32, default=nueva_version_calendario, editable=False)
     
     class Meta:
         verbose_name = 'Año Académico'
@@ -64,6 +74,15 @@ class AnioAcademico(models.Model):
         if self.fecha_fin <= self.fecha_inicio:
             raise ValidationError("La fecha de fin debe ser mayor a la fecha de inicio.")
 
+    def regla_calendario(self):
+        from academico.calendario import ReglaCalendario
+        return ReglaCalendario.para_anio(self)
+
+    def fechas_clase(self, dia_semana=None):
+        """Fechas de clase del año (opcionalmente de un día de la semana), cacheadas"""
+        from academico.calendario import fechas_clase
+        return fechas_clase(self, dia_semana)
+
 class Comision(models.Model):
     codigo = models.CharField(max_length=20, db_index=True)  # Índice para búsquedas por código
     horario_inicio = models.TimeField()
@@ -97,7 +116,13 @@ class EstadosAlumno(models.Model):
         return self.descripcion
 
 class Alumno(Persona):
-    promedio = models.DecimalField(decimal_places=2, max_digits=4, null=True, blank=True)
+    # Resumen académico mantenido por academico.resumen_alumno (no se edita a mano)
+    promedio = models.DecimalField(decimal_places=2, max_digits=4, null=True, blank=True, db_index=True, editable=False)
+    suma_notas = models.DecimalField(decimal_places=2, max_digits=10, default=0, editable=False)
+    cantidad_calificaciones = models.PositiveIntegerField(default=0, editable=False)
+    materias_aprobadas = models.PositiveIntegerField(default=0, db_index=True, editable=False)
+    materias_regulares = models.PositiveIntegerField(default=0, editable=False)
+    materias_libres = models.PositiveIntegerField(default=0, editable=False)
     estado = models.ForeignKey(EstadosAlumno, on_delete=models.SET_NULL, null=True, blank=True)
     legajo = models.CharField(max_length=20, unique=True, null=True, blank=True)
     plan_estudio = models.ForeignKey('administracion.PlanEstudio', on_delete=models.SET_NULL, null=True, blank=True, related_name='alumnos')
@@ -118,10 +143,22 @@ class Alumno(Persona):
     def __str__(self):
         return f"{self.dni} - {self.nombre} {self.apellido}"
 
+    CAMPOS_RESUMEN = (
+        'promedio', 'suma_notas', 'cantidad_calificaciones',
+        'materias_aprobadas', 'materias_regulares', 'materias_libres',
+    )
+
     def save(self, *args, **kwargs):
         # Generar legajo automáticamente si no tiene
         if not self.legajo:
             self.legajo = self._generar_legajo()
+        # Los contadores se actualizan en la base con UPDATE atómicos; guardar una
+        # instancia cargada antes no debe pisarlos con valores viejos
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.CAMPOS_RESUMEN
+            ]
         super().save(*args, **kwargs)
 
     def _generar_legajo(self):
@@ -266,22 +303,17 @@ class InscripcionAlumnoComision(models.Model):
     
     def crear_asistencias_automaticas(self):
         comision = self.comision
-        dias_clase = CalendarioAcademico.objects.filter(
-            anio_academico=comision.anio_academico,
-            fecha__week_day=comision.dia_cursado + 1,
-            es_dia_clase=True,
-            fecha__gte=comision.anio_academico.fecha_inicio,
-            fecha__lte=comision.anio_academico.fecha_fin
+        dias_clase = comision.anio_academico.fechas_clase(comision.dia_cursado)
+
+        Asistencia.objects.bulk_create(
+            [
+                Asistencia(alumno_comision=self, fecha_asistencia=fecha, esta_presente=False)
+                for fecha in dias_clase
+            ],
+            ignore_conflicts=True
         )
         
-        for dia_clase in dias_clase:
-            Asistencia.objects.get_or_create(
-                alumno_comision=self,
-                fecha_asistencia=dia_clase.fecha,
-                defaults={'esta_presente': False}
-            )
-        
-        return dias_clase.count()
+        return len(dias_clase)
 
 @receiver(post_save, sender=InscripcionAlumnoComision)
 @transaction.atomic
@@ -393,6 +425,11 @@ class MesaExamen(models.Model):
         help_text='Docentes que conforman el tribunal',
         limit_choices_to={'empleado__usuario__groups__name': 'Docente'}
     )
+    duracion_minutos = models.PositiveIntegerField(
+        default=180,
+        validators=[MinValueValidator(1), MaxValueValidator(8 * 60)],  # horarios_mesa.DURACION_MAXIMA_MINUTOS
+        help_text='Duración del examen en minutos (para detectar superposiciones de aula y tribunal)'
+    )
     aula = models.CharField(max_length=50, blank=True, null=True)
     estado = models.CharField(
         max_length=20,
@@ -403,6 +440,8 @@ class MesaExamen(models.Model):
         default=50,
         help_text='Cantidad máxima de alumnos que pueden rendir'
     )
+    # Inscripciones en estado INSCRIPTO, mantenido por academico.cupos_mesa
+    inscriptos = models.PositiveIntegerField(default=0, editable=False)
     creado_por = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -419,6 +458,7 @@ class MesaExamen(models.Model):
         indexes = [
             models.Index(fields=['materia', 'fecha_examen'], name='mesa_materia_fecha_idx'),
             models.Index(fields=['estado', 'fecha_examen'], name='mesa_estado_fecha_idx'),
+            models.Index(fields=['aula', 'fecha_examen'], name='mesa_aula_fecha_idx'),
         ]
 
     def __str__(self):
@@ -438,15 +478,56 @@ class MesaExamen(models.Model):
                 'No se puede crear una mesa de examen con fecha pasada.'
             )
 
+    CAMPOS_HORARIO = ('fecha_examen', 'duracion_minutos', 'aula')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        mesa = super().from_db(db, field_names, values)
+        mesa._horario_guardado = mesa._horario()
+        return mesa
+
+    def _horario(self):
+        # Un campo diferido cuenta como cambiado: se valida de más, nunca de menos
+        return tuple(self.__dict__.get(campo) for campo in self.CAMPOS_HORARIO)
+
+    def save(self, *args, **kwargs):
+        from academico.horarios_mesa import validar_horario_mesa
+
+        # Aula y tribunal no pueden estar en otra mesa al mismo tiempo. Se valida
+        # solo si la mesa es nueva o cambia su horario: una mesa que ya está en
+        # conflicto se puede seguir guardando (p. ej. para cambiar su estado).
+        # El form del admin deja el tribunal que se va a guardar en _tribunal_pendiente
+        update_fields = kwargs.get('update_fields')
+        tribunal = getattr(self, '_tribunal_pendiente', None)
+        if update_fields is None or set(self.CAMPOS_HORARIO).intersection(update_fields):
+            if self._state.adding or self._horario() != getattr(self, '_horario_guardado', None):
+                validar_horario_mesa(self, tribunal)
+            elif tribunal is not None:
+                # Sin cambio de horario solo hace falta verificar los docentes que se suman
+                actuales = set(self.tribunal.values_list('pk', flat=True))
+                nuevos = {getattr(docente, 'pk', docente) for docente in tribunal} - actuales
+                if nuevos:
+                    validar_horario_mesa(self, nuevos, validar_aula=False)
+
+        # El contador se actualiza en la base con UPDATE atómicos; guardar una
+        # instancia cargada antes no debe pisarlo con un valor viejo
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'inscriptos'
+            ]
+        super().save(*args, **kwargs)
+        self._horario_guardado = self._horario()
+
     @property
     def inscripciones_count(self):
         """Cantidad de alumnos inscriptos"""
-        return self.inscripciones_mesa.filter(estado_inscripcion='INSCRIPTO').count()
+        return self.inscriptos
 
     @property
     def cupos_disponibles(self):
         """Cupos disponibles"""
-        return self.cupo_maximo - self.inscripciones_count
+        return max(self.cupo_maximo - self.inscriptos, 0)
 
     @property
     def puede_inscribirse(self):
@@ -519,10 +600,28 @@ class InscripcionMesaExamen(models.Model):
     def __str__(self):
         return f"{self.alumno} - {self.mesa_examen.materia.nombre} ({self.condicion})"
 
+    def save(self, *args, **kwargs):
+        """
+        Guarda la inscripción y ocupa o libera el cupo de la mesa en la misma
+        transacción; si cambió el resultado, actualiza el analítico del alumno.
+        """
+        from academico import analitico
+        from academico.cupos_mesa import actualizar_inscriptos
+
+        with transaction.atomic():
+            anterior = None
+            if not self._state.adding:
+                anterior = InscripcionMesaExamen.objects.filter(pk=self.pk).values_list(
+                    'alumno_id', 'mesa_examen_id', 'estado_inscripcion', 'nota_examen'
+                ).first()
+            super().save(*args, **kwargs)
+            if not actualizar_inscriptos(anterior[1:3] if anterior else None, self):
+                raise ValidationError('No hay cupos disponibles en esta mesa.')
+            analitico.registrar_examen(anterior, self)
+
     def clean(self):
         """Validaciones de inscripción"""
         from django.utils import timezone
-        from academico.models import CondicionInscripcion # Importar la nueva CondicionInscripcion
 
         # Validar nota de examen si se proporciona
         if self.nota_examen is not None:
@@ -541,26 +640,82 @@ class InscripcionMesaExamen(models.Model):
             if self.mesa_examen.cupos_disponibles <= 0:
                 raise ValidationError('No hay cupos disponibles en esta mesa.')
 
-            # Validar que el alumno tenga cursada para esta materia
-            cursada = InscripcionAlumnoComision.objects.filter(
-                alumno=self.alumno,
-                comision__materia=self.mesa_examen.materia
-            ).first()
+            # Validar que el alumno tenga cursada para esta materia (analítico)
+            habilitacion = MateriaAnalitico.objects.filter(
+                alumno_id=self.alumno_id,
+                materia_id=self.mesa_examen.materia_id
+            ).values_list('condicion', 'aprobada').first()
 
-            if not cursada:
+            if not habilitacion:
                 raise ValidationError(
                     f'El alumno no tiene cursada registrada para {self.mesa_examen.materia.nombre}.'
                 )
 
-            # Determinar automáticamente la condición según el estado de la cursada
-            if cursada.estado_inscripcion == EstadoMateria.APROBADA: # Estado final de la MATERIA
+            # La condición sale de la mejor cursada del alumno en la materia
+            condicion, aprobada = habilitacion
+            if aprobada: # Estado final de la MATERIA
                 raise ValidationError(
                     'El alumno ya aprobó esta materia y no puede inscribirse al examen.'
                 )
-            elif cursada.condicion == CondicionInscripcion.REGULAR: # Estado de la CURSADA
-                self.condicion = CondicionAlumnoMesa.REGULAR
-            else: # Condicion CURSANDO o LIBRE para la cursada
-                self.condicion = CondicionAlumnoMesa.LIBRE
+            self.condicion = condicion
+
+
+class MateriaAnalitico(models.Model):
+    """
+    Analítico del alumno: una fila por materia cursada con la mejor condición,
+    la cursada que la representa, notas, fechas, exámenes rendidos y si está
+    aprobada. Mantenida por academico.analitico (no se edita a mano); de acá
+    salen el histórico del alumno, los certificados y la habilitación para rendir.
+    """
+    alumno = models.ForeignKey(Alumno, on_delete=models.CASCADE, related_name='analitico')
+    materia = models.ForeignKey(Materia, on_delete=models.CASCADE, related_name='analitico')
+    condicion = models.CharField(
+        max_length=20,
+        choices=CondicionAlumnoMesa.choices,
+        help_text='REGULAR si alguna cursada de la materia es regular'
+    )
+    aprobada = models.BooleanField(default=False, help_text='Alguna cursada de la materia está aprobada')
+    cursada = models.ForeignKey(
+        InscripcionAlumnoComision,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text='Cursada que representa a la materia: la aprobada, si no la regular, si no la última'
+    )
+    nota_cursada = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    fecha_regularizacion = models.DateTimeField(null=True, blank=True)
+    nota_final = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    fecha_aprobacion = models.DateTimeField(null=True, blank=True)
+    examenes_aprobados = models.PositiveIntegerField(default=0)
+    examenes_desaprobados = models.PositiveIntegerField(default=0)
+    examenes_ausentes = models.PositiveIntegerField(default=0)
+    suma_notas_examen = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+    cantidad_notas_examen = models.PositiveIntegerField(default=0)
+    ultima_nota_examen = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=True)
+    fecha_ultimo_examen = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'academico_analitico_materias'
+        verbose_name = 'Materia del analítico'
+        verbose_name_plural = 'Analítico de alumnos'
+        unique_together = ('alumno', 'materia')
+        indexes = [
+            models.Index(fields=['materia', 'aprobada', 'condicion'], name='analitico_materia_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.alumno} - {self.materia} ({self.condicion})"
+
+    @property
+    def intentos_examen(self):
+        return self.examenes_aprobados + self.examenes_desaprobados + self.examenes_ausentes
+
+    @property
+    def promedio_examenes(self):
+        if not self.cantidad_notas_examen:
+            return None
+        return round(self.suma_notas_examen / self.cantidad_notas_examen, 2)
 
 @receiver(models.signals.pre_save, sender=InscripcionMesaExamen)
 def calcular_dvh_inscripcion_mesa(sender, instance, **kwargs):
@@ -576,6 +731,21 @@ def actualizar_dvv_inscripcion_mesa(sender, instance, **kwargs):
     GestorDigitosVerificadores.actualizar_dvv('InscripcionMesaExamen', 'academico')
 
 
+@receiver(models.signals.post_delete, sender=InscripcionMesaExamen)
+def liberar_cupo_inscripcion_mesa(sender, instance, **kwargs):
+    """Libera el cupo de la mesa si la inscripción lo ocupaba"""
+    from academico.cupos_mesa import liberar_cupo, ocupa_cupo
+    if ocupa_cupo(instance.estado_inscripcion):
+        liberar_cupo(instance.mesa_examen_id)
+
+
+@receiver(models.signals.post_delete, sender=InscripcionMesaExamen)
+def actualizar_analitico_inscripcion_mesa(sender, instance, **kwargs):
+    """Descuenta del analítico el examen eliminado"""
+    from academico.analitico import eliminar_examen
+    eliminar_examen(instance, kwargs.get('origin'))
+
+
 @receiver(models.signals.post_save, sender=InscripcionMesaExamen)
 def sincronizar_nota_examen(sender, instance, **kwargs):
     """
@@ -638,18 +808,79 @@ def sincronizar_nota_examen(sender, instance, **kwargs):
 
 
 class CalendarioAcademico(models.Model):
+    """
+    Excepción por rango a la regla semanal del año académico: feriados y recesos
+    (es_dia_clase=False) o clases recuperatorias (es_dia_clase=True).
+    """
     anio_academico = models.ForeignKey(AnioAcademico, on_delete=models.CASCADE)
-    fecha = models.DateField(db_index=True)
-    es_dia_clase = models.BooleanField(default=True, db_index=True)
+    fecha_inicio = models.DateField(db_index=True)
+    fecha_fin = models.DateField()
+    es_dia_clase = models.BooleanField(default=False, db_index=True)
     descripcion = models.CharField(max_length=200, blank=True, null=True)
 
     class Meta:
-        verbose_name = 'Calendario Académico'
+        verbose_name = 'Excepción del Calendario'
         verbose_name_plural = 'Calendario Académico'
-        unique_together = ('anio_academico', 'fecha')
+        ordering = ['fecha_inicio']
         indexes = [
-            models.Index(fields=['anio_academico', 'fecha', 'es_dia_clase'], name='cal_anio_fecha_clase_idx'),
+            models.Index(fields=['anio_academico', 'fecha_inicio', 'fecha_fin'], name='cal_anio_rango_idx'),
         ]
 
     def __str__(self):
-        return f"{self.fecha} - {'Clase' if self.es_dia_clase else 'No Clase'}"
+        tipo = 'Clase' if self.es_dia_clase else 'No Clase'
+        if self.fecha_inicio == self.fecha_fin:
+            return f"{self.fecha_inicio} - {tipo}"
+        return f"{self.fecha_inicio} a {self.fecha_fin} - {tipo}"
+
+    def clean(self):
+        super().clean()
+        if not (self.fecha_inicio and self.fecha_fin and self.anio_academico_id):
+            return
+
+        if self.fecha_fin < self.fecha_inicio:
+            raise ValidationError('La fecha de fin debe ser igual o posterior a la fecha de inicio.')
+
+        anio = self.anio_academico
+        if self.fecha_inicio < anio.fecha_inicio or self.fecha_fin > anio.fecha_fin:
+            raise ValidationError('El rango debe estar dentro del año académico.')
+
+        superpuestas = CalendarioAcademico.objects.filter(
+            anio_academico=anio,
+            fecha_inicio__lte=self.fecha_fin,
+            fecha_fin__gte=self.fecha_inicio
+        ).exclude(pk=self.pk)
+        if superpuestas.exists():
+            raise ValidationError(
+                f'El rango se superpone con otra excepción del calendario: {superpuestas.first()}.'
+            )
+
+
+class EstadoCierreAnio(models.TextChoices):
+    EN_CURSO = 'EN_CURSO', 'En curso'
+    FINALIZADO = 'FINALIZADO', 'Finalizado'
+
+
+class CierreAnioAcademico(models.Model):
+    """
+    Cierre de cursada de un año académico (ver cierre_anual): la fila hace de
+    bloqueo entre procesos y guarda el avance y el resultado del último cierre.
+    """
+    anio_academico = models.OneToOneField(AnioAcademico, on_delete=models.CASCADE, related_name='cierre')
+    estado = models.CharField(max_length=20, choices=EstadoCierreAnio.choices, default=EstadoCierreAnio.FINALIZADO)
+    inicio = models.DateTimeField(null=True, blank=True)
+    fin = models.DateTimeField(null=True, blank=True)
+    actualizado = models.DateTimeField(null=True, blank=True, help_text='Último avance; un cierre sin avances por mucho tiempo se da por abandonado')
+    total = models.PositiveIntegerField(null=True, blank=True)
+    procesadas = models.PositiveIntegerField(default=0)
+    cerradas = models.PositiveIntegerField(default=0)
+    regulares = models.PositiveIntegerField(default=0)
+    libres = models.PositiveIntegerField(default=0)
+    fallidas = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = 'academico_cierres_anio'
+        verbose_name = 'Cierre de año académico'
+        verbose_name_plural = 'Cierres de años académicos'
+
+    def __str__(self):
+        return f"Cierre {self.anio_academico.nombre} - {self.get_estado_display()}"
@@ -0,0 +1,214 @@
+"""
+Carga en bloque de las notas de examen de una mesa.
+
+Lee de una vez las inscripciones a la mesa, las cursadas de esos alumnos en la
+materia y sus calificaciones FINAL; calcula el resultado de cada examen en
+memoria y escribe con bulk_update/bulk_create las inscripciones a la mesa, las
+cursadas y las calificaciones FINAL (lo mismo que hacían, fila por fila,
+cargar_nota_examen_final y la señal sincronizar_nota_examen). El DVH se calcula
+por registro, el DVV de cada tabla una sola vez y la auditoría va en un INSERT.
+"""
+from datetime import timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.utils import timezone
+
+from academico.models import (
+    Calificacion, CondicionInscripcion, EstadoInscripcionMesa, EstadoMateria,
+    InscripcionAlumnoComision, InscripcionMesaExamen, TipoCalificacion
+)
+
+CAMPOS_DVH_MESA = ['nota_examen', 'condicion', 'estado_inscripcion']
+CAMPOS_DVH_CALIFICACION = ['nota', 'tipo', 'numero', 'fecha_creacion']
+CAMPOS_CURSADA = ['nota_final', 'estado_inscripcion', 'fecha_cierre', 'cerrada_por']
+
+
+def _validar_nota(valor):
+    """Devuelve (nota, error)"""
+    try:
+        nota = Decimal(str(valor).strip().replace(',', '.')).quantize(Decimal('0.01'))
+    except (InvalidOperation, ValueError):
+        return None, 'Formato de nota inválido'
+    if nota < 0 or nota > 10:
+        return None, 'La nota debe estar entre 0 y 10'
+    return nota, None
+
+
+def _cursadas_por_alumno(mesa, alumno_ids):
+    """Primera cursada de cada alumno en la materia de la mesa (como .first())"""
+    cursadas = {}
+    for cursada in InscripcionAlumnoComision.objects.filter(
+        alumno_id__in=alumno_ids, comision__materia_id=mesa.materia_id
+    ).select_related('alumno', 'comision').order_by('pk'):
+        cursadas.setdefault(cursada.alumno_id, cursada)
+    return cursadas
+
+
+def _actualizar_cursada(cursada, nota, aprobado, usuario, ahora):
+    """Aplica a la cursada el resultado del examen. Devuelve True si cambió"""
+    if aprobado:
+        if (cursada.estado_inscripcion, cursada.nota_final) == (EstadoMateria.APROBADA, nota):
+            return False
+        cursada.nota_final = nota
+        cursada.estado_inscripcion = EstadoMateria.APROBADA
+        cursada.fecha_cierre = ahora
+        cursada.cerrada_por = usuario
+        return True
+
+    # Si desaprueba y figuraba aprobada se vuelve a la condición de la cursada
+    if cursada.estado_inscripcion != EstadoMateria.APROBADA:
+        return False
+    if cursada.condicion == CondicionInscripcion.REGULAR:
+        cursada.estado_inscripcion = EstadoMateria.REGULAR
+    else:
+        cursada.estado_inscripcion = EstadoMateria.LIBRE
+    cursada.nota_final = None
+    cursada.fecha_cierre = None
+    return True
+
+
+def cargar_notas_mesa(mesa, notas, usuario=None):
+    """
+    Carga las notas de examen de una mesa.
+
+    Args:
+        mesa: MesaExamen
+        notas: dict {inscripcion_mesa_id: nota} (las notas vacías se ignoran)
+        usuario: User que carga las notas (queda como cerrada_por de la cursada)
+
+    Returns:
+        dict con 'cargadas', 'aprobados', 'desaprobados', 'resultados'
+        ({inscripcion_id: 'APROBADO'|'DESAPROBADO'}) y 'errores' (mensajes por fila)
+    """
+    from academico.cupos_mesa import descontar_inscriptos, ocupa_cupo
+    from academico.dashboard_docente import invalidar_dashboard_comisiones
+    from academico.analitico import actualizar_analitico
+    from academico.models import Alumno
+    from academico.resumen_alumno import recalcular_resumenes
+    from institucional.auditoria import obtener_valores_modelo, registrar_cambios
+    from institucional.digitos_verificadores import GestorDigitosVerificadores
+    from institucional.models import TipoAccionDatos
+
+    resultado = {'cargadas': 0, 'aprobados': 0, 'desaprobados': 0, 'resultados': {}, 'errores': []}
+
+    ids = {}
+    for clave, valor in notas.items():
+        if valor is None or not str(valor).strip():
+            continue
+        try:
+            ids[int(clave)] = valor
+        except (TypeError, ValueError):
+            resultado['errores'].append(f'Inscripción {clave} no encontrada')
+
+    inscripciones = {
+        inscripcion.pk: inscripcion
+        for inscripcion in InscripcionMesaExamen.objects.filter(
+            mesa_examen=mesa, pk__in=ids
+        ).select_related('alumno')
+    }
+    for inscripcion_id in sorted(set(ids) - set(inscripciones)):
+        resultado['errores'].append(f'Inscripción {inscripcion_id} no encontrada')
+
+    validas = {}
+    for inscripcion_id, inscripcion in inscripciones.items():
+        nota, error = _validar_nota(ids[inscripcion_id])
+        if error:
+            resultado['errores'].append(f'{inscripcion.alumno}: {error}')
+        else:
+            validas[inscripcion_id] = nota
+    if not validas:
+        return resultado
+
+    cursadas = _cursadas_por_alumno(mesa, [inscripciones[pk].alumno_id for pk in validas])
+    cursadas_por_id = {cursada.pk: cursada for cursada in cursadas.values()}
+    finales = {
+        calificacion.alumno_comision_id: calificacion
+        for calificacion in Calificacion.objects.filter(
+            alumno_comision__in=cursadas.values(), tipo=TipoCalificacion.FINAL, numero=1
+        )
+    }
+    for final in finales.values():
+        final.alumno_comision = cursadas_por_id[final.alumno_comision_id]
+
+    nota_aprobacion = mesa.anio_academico.nota_aprobacion
+    fecha_examen = mesa.fecha_examen.astimezone(dt_timezone.utc)
+    ahora = timezone.now()
+
+    filas_mesa, cursadas_modificadas, finales_nuevas, finales_modificadas = [], [], [], []
+    cambios, cupos_liberados = [], 0
+    for inscripcion_id, nota in validas.items():
+        inscripcion = inscripciones[inscripcion_id]
+        aprobado = nota >= nota_aprobacion
+        estado = EstadoInscripcionMesa.APROBADO if aprobado else EstadoInscripcionMesa.DESAPROBADO
+        resultado['cargadas'] += 1
+        resultado['aprobados' if aprobado else 'desaprobados'] += 1
+        resultado['resultados'][inscripcion_id] = estado
+
+        if (inscripcion.nota_examen, inscripcion.estado_inscripcion) != (nota, estado):
+            if ocupa_cupo(inscripcion.estado_inscripcion):
+                cupos_liberados += 1
+            inscripcion.nota_examen = nota
+            inscripcion.estado_inscripcion = estado
+            inscripcion.dvh = GestorDigitosVerificadores.calcular_dvh(inscripcion, CAMPOS_DVH_MESA)
+            filas_mesa.append(inscripcion)
+
+        cursada = cursadas.get(inscripcion.alumno_id)
+        if cursada is None:
+            continue
+
+        anteriores = obtener_valores_modelo(cursada)
+        if _actualizar_cursada(cursada, nota, aprobado, usuario, ahora):
+            cursadas_modificadas.append(cursada)
+            cambios.append((cursada, TipoAccionDatos.MODIFICAR, anteriores, obtener_valores_modelo(cursada)))
+
+        final = finales.get(cursada.pk)
+        if final is None:
+            finales_nuevas.append(Calificacion(
+                alumno_comision=cursada, tipo=TipoCalificacion.FINAL, numero=1,
+                nota=nota, fecha_creacion=fecha_examen
+            ))
+        elif (final.nota, final.fecha_creacion) != (nota, fecha_examen):
+            anteriores = obtener_valores_modelo(final)
+            final.nota = nota
+            final.fecha_creacion = fecha_examen
+            final.dvh = GestorDigitosVerificadores.calcular_dvh(final, CAMPOS_DVH_CALIFICACION)
+            finales_modificadas.append(final)
+            cambios.append((final, TipoAccionDatos.MODIFICAR, anteriores, obtener_valores_modelo(final)))
+
+    with transaction.atomic():
+        if filas_mesa:
+            InscripcionMesaExamen.objects.bulk_update(filas_mesa, ['nota_examen', 'estado_inscripcion', 'dvh'])
+            descontar_inscriptos(mesa.pk, cupos_liberados)
+            GestorDigitosVerificadores.actualizar_dvv('InscripcionMesaExamen', 'academico')
+
+        if cursadas_modificadas:
+            InscripcionAlumnoComision.objects.bulk_update(cursadas_modificadas, CAMPOS_CURSADA)
+
+        if finales_nuevas:
+            Calificacion.objects.bulk_create(finales_nuevas)
+            # El DVH incluye la PK, que recién se conoce después del INSERT
+            for final in finales_nuevas:
+                final.dvh = GestorDigitosVerificadores.calcular_dvh(final, CAMPOS_DVH_CALIFICACION)
+            Calificacion.objects.bulk_update(finales_nuevas, ['dvh'])
+            cambios.extend(
+                (final, TipoAccionDatos.CREAR, None, obtener_valores_modelo(final)) for final in finales_nuevas
+            )
+        if finales_modificadas:
+            Calificacion.objects.bulk_update(finales_modificadas, ['nota', 'fecha_creacion', 'dvh'])
+
+        if finales_nuevas or finales_modificadas:
+            GestorDigitosVerificadores.actualizar_dvv('Calificacion', 'academico')
+            invalidar_dashboard_comisiones(pk__in={cursada.comision_id for cursada in cursadas.values()})
+
+        if cambios:
+            registrar_cambios(cambios, detalles=f"Carga de notas de la mesa {mesa.pk}")
+            recalcular_resumenes(Alumno.objects.filter(pk__in=list(cursadas)))
+
+        if filas_mesa or cursadas_modificadas:
+            actualizar_analitico(
+                {fila.alumno_id for fila in filas_mesa} | {cursada.alumno_id for cursada in cursadas_modificadas},
+                [mesa.materia_id]
+            )
+
+    return resultado
@@ -0,0 +1,265 @@
+"""
+Motor de regularización (cierre de cursada) compartido por la vista previa y el cierre.
+
+El promedio de cursada (PARCIAL y TP) y la asistencia de todos los alumnos se
+obtienen con dos consultas agregadas y se arma la tabla de decisiones
+(Regular/Libre). La tabla lleva un token de versión: una huella de los datos
+que usa el cálculo (cantidades, máximos y sumas de inscripciones activas, notas
+de cursada y asistencias, más la fecha de corte y los umbrales del año) que se
+obtiene con una sola consulta. La vista previa guarda la tabla en caché bajo ese
+token; el cierre solo vuelve a calcular la huella y, si no cambió, aplica la
+tabla de la caché con bulk_update sin repetir el cálculo. El cierre usa la fecha
+de corte de la vista previa: si se confirma pasada la medianoche, el token no
+cambia solo porque cambió el día.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, FloatField, Max, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from academico.models import (
+    Asistencia, Calificacion, Comision, CondicionInscripcion, EstadoMateria, InscripcionAlumnoComision,
+    TipoCalificacion
+)
+
+DURACION_CACHE = 30 * 60
+
+# Antigüedad máxima de la fecha de corte que se acepta de una vista previa
+ANTIGUEDAD_MAXIMA_CORTE = timedelta(days=1)
+
+CAMPOS_CIERRE = ['condicion', 'nota_cursada', 'fecha_regularizacion', 'estado_inscripcion']
+
+TIPOS_CURSADA = [TipoCalificacion.PARCIAL, TipoCalificacion.TRABAJO_PRACTICO]
+
+
+class TablaRegularizacion:
+    """
+    Atributos:
+        filas: una por inscripción activa, con 'inscripcion', 'alumno',
+            'promedio', 'asistencia', 'condicion', 'motivo' y 'mensaje'
+        version: token que identifica los datos con los que se calculó
+        hasta: fecha de corte de asistencia con la que se calculó
+    """
+
+    def __init__(self, comision_id, filas, version, hasta):
+        self.comision_id = comision_id
+        self.filas = filas
+        self.version = version
+        self.hasta = hasta
+
+    @property
+    def regulares(self):
+        return sum(1 for fila in self.filas if fila['condicion'] == CondicionInscripcion.REGULAR)
+
+    @property
+    def libres(self):
+        return len(self.filas) - self.regulares
+
+
+def _clave_cache(comision_id, version):
+    return f'regularizacion:{comision_id}:{version}'
+
+
+def _inscripciones_activas(comision):
+    return InscripcionAlumnoComision.objects.filter(
+        comision=comision,
+        # Los que siguen activos: los recién inscriptos quedan en CURSANDO
+        estado_inscripcion__in=[EstadoMateria.CURSANDO, EstadoMateria.REGULAR]
+    )
+
+
+def _escalar(queryset, comision, agregado):
+    """Subconsulta con un agregado del queryset, para resolver varios en una sola consulta"""
+    return Subquery(
+        queryset.filter(**{comision: OuterRef('pk')}).order_by().values(comision).annotate(
+            valor=agregado
+        ).values('valor')
+    )
+
+
+def version_datos(comision, hasta):
+    """
+    Token de los datos que usa calcular_regularizacion, con una única consulta.
+
+    Cambia si se agrega, quita o modifica una inscripción activa, una nota de
+    cursada o una asistencia anterior al corte: las sumas ponderadas por
+    inscripción detectan también notas o presentes que pasan de un alumno a otro.
+    """
+    anio = comision.anio_academico
+    activas = _inscripciones_activas(comision)
+    notas = Calificacion.objects.filter(alumno_comision__in=activas, tipo__in=TIPOS_CURSADA)
+    asistencias = Asistencia.objects.filter(alumno_comision__in=activas, fecha_asistencia__lt=hasta)
+    presentes = asistencias.filter(esta_presente=True)
+    cursada = 'alumno_comision__comision'
+
+    huella = Comision.objects.filter(pk=comision.pk).annotate(
+        inscripciones=_escalar(activas, 'comision', Count('id')),
+        inscripciones_suma=_escalar(activas, 'comision', Sum('id')),
+        notas=_escalar(notas, cursada, Count('id')),
+        notas_max=_escalar(notas, cursada, Max('id')),
+        notas_suma=_escalar(notas, cursada, Sum('nota')),
+        notas_ponderadas=_escalar(notas, cursada, Sum(F('nota') * F('alumno_comision_id'), output_field=FloatField())),
+        asistencias=_escalar(asistencias, cursada, Count('id')),
+        asistencias_max=_escalar(asistencias, cursada, Max('id')),
+        presentes=_escalar(presentes, cursada, Count('id')),
+        presentes_suma=_escalar(presentes, cursada, Sum('alumno_comision_id')),
+    ).values_list(
+        'inscripciones', 'inscripciones_suma', 'notas', 'notas_max', 'notas_suma', 'notas_ponderadas',
+        'asistencias', 'asistencias_max', 'presentes', 'presentes_suma'
+    ).first()
+
+    firma = [str(hasta), str(anio.nota_aprobacion), str(anio.porcentaje_asistencia_req), *map(str, huella or ())]
+    return hashlib.sha1("|".join(firma).encode()).hexdigest()[:16]
+
+
+def _decidir(promedio, asistencia, nota_aprobacion, porcentaje_asistencia_req):
+    """
+    Devuelve (condicion, motivo, mensaje): el motivo es el texto corto de la
+    vista previa y el mensaje el detalle que devolvía regularizar_alumno.
+    """
+    cumple_nota = promedio is not None and promedio >= nota_aprobacion
+    cumple_asistencia = asistencia >= porcentaje_asistencia_req
+
+    motivo = []
+    if not cumple_nota:
+        motivo.append("Nota insuficiente.")
+    if not cumple_asistencia:
+        motivo.append("Faltas.")
+    motivo = " ".join(motivo)
+
+    if promedio is None:
+        return CondicionInscripcion.LIBRE, motivo, "Libre por falta de calificaciones."
+    if cumple_nota and cumple_asistencia:
+        return CondicionInscripcion.REGULAR, motivo, f"Regular (Prom: {promedio}, Asist: {asistencia}%)"
+
+    detalle = []
+    if not cumple_nota:
+        detalle.append(f"Nota insuficiente ({promedio})")
+    if not cumple_asistencia:
+        detalle.append(f"Faltas ({asistencia}%)")
+    return CondicionInscripcion.LIBRE, motivo, f"Libre por: {', '.join(detalle)}"
+
+
+def calcular_regularizacion(comision, hasta=None):
+    """
+    Calcula la tabla de decisiones de la comisión.
+
+    Args:
+        comision: Comision
+        hasta: fecha de corte de asistencia (exclusiva), por defecto hoy
+    """
+    hasta = hasta or timezone.now().date()
+    anio = comision.anio_academico
+    inscripciones = list(_inscripciones_activas(comision).select_related('alumno').order_by(
+        'alumno__apellido', 'alumno__nombre'
+    ))
+
+    promedios = dict(
+        Calificacion.objects.filter(
+            alumno_comision__in=inscripciones,
+            tipo__in=TIPOS_CURSADA
+        ).values('alumno_comision_id').annotate(promedio=Avg('nota')).values_list('alumno_comision_id', 'promedio')
+    )
+    asistencias = {
+        fila['alumno_comision_id']: (fila['presentes'], fila['total'])
+        for fila in Asistencia.objects.filter(
+            alumno_comision__in=inscripciones,
+            fecha_asistencia__lt=hasta
+        ).values('alumno_comision_id').annotate(
+            total=Count('id'),
+            presentes=Count('id', filter=Q(esta_presente=True))
+        )
+    }
+
+    filas = []
+    for inscripcion in inscripciones:
+        promedio = promedios.get(inscripcion.pk)
+        promedio = round(promedio, 2) if promedio is not None else None
+        presentes, total = asistencias.get(inscripcion.pk, (0, 0))
+        asistencia = round(presentes * 100 / total, 2) if total else 0
+
+        condicion, motivo, mensaje = _decidir(
+            promedio, asistencia, anio.nota_aprobacion, anio.porcentaje_asistencia_req
+        )
+        filas.append({
+            'inscripcion': inscripcion,
+            'alumno': inscripcion.alumno,
+            'promedio': promedio,
+            'asistencia': asistencia,
+            'condicion': condicion,
+            'motivo': motivo,
+            'mensaje': mensaje,
+        })
+
+    return TablaRegularizacion(comision.pk, filas, version_datos(comision, hasta), hasta)
+
+
+def corte_vigente(hasta):
+    """Si la fecha de corte de una vista previa todavía se puede usar para cerrar"""
+    hoy = timezone.now().date()
+    return hoy - ANTIGUEDAD_MAXIMA_CORTE <= hasta <= hoy
+
+
+def previsualizar_regularizacion(comision, hasta=None):
+    """Calcula la tabla y la deja en caché para el cierre"""
+    tabla = calcular_regularizacion(comision, hasta)
+    cache.set(_clave_cache(comision.pk, tabla.version), tabla, DURACION_CACHE)
+    return tabla
+
+
+def obtener_tabla_vigente(comision, version=None, hasta=None):
+    """
+    Tabla a aplicar al cerrar. Si se indica la versión de la vista previa y los
+    datos cambiaron desde entonces devuelve None; si no cambiaron se usa la tabla
+    de la caché y solo se recalcula cuando ya no está.
+
+    Args:
+        hasta: fecha de corte de la vista previa (por defecto hoy)
+    """
+    if version is None:
+        return calcular_regularizacion(comision, hasta)
+    if version_datos(comision, hasta or timezone.now().date()) != version:
+        return None
+    tabla = cache.get(_clave_cache(comision.pk, version))
+    return tabla if tabla is not None else calcular_regularizacion(comision, hasta)
+
+
+def aplicar_regularizacion(tabla):
+    """
+    Guarda las decisiones con un bulk_update y registra la auditoría en bloque.
+    Los contadores del alumno se recalculan para los afectados.
+
+    Returns:
+        list de inscripciones actualizadas
+    """
+    from academico.analitico import actualizar_analitico
+    from academico.models import Alumno, Comision
+    from academico.resumen_alumno import recalcular_resumenes
+    from institucional.auditoria import obtener_valores_modelo, registrar_cambios
+    from institucional.models import TipoAccionDatos
+
+    ahora = timezone.now()
+    inscripciones, cambios = [], []
+    for fila in tabla.filas:
+        inscripcion = fila['inscripcion']
+        valores_anteriores = obtener_valores_modelo(inscripcion)
+        inscripcion.condicion = fila['condicion']
+        inscripcion.nota_cursada = fila['promedio']
+        inscripcion.fecha_regularizacion = ahora
+        inscripcion.estado_inscripcion = (
+            'REGULAR' if fila['condicion'] == CondicionInscripcion.REGULAR else 'LIBRE'
+        )
+        inscripciones.append(inscripcion)
+        cambios.append((inscripcion, TipoAccionDatos.MODIFICAR, valores_anteriores, obtener_valores_modelo(inscripcion)))
+
+    InscripcionAlumnoComision.objects.bulk_update(inscripciones, CAMPOS_CIERRE)
+    registrar_cambios(cambios, detalles="Cierre de cursada")
+    recalcular_resumenes(Alumno.objects.filter(pk__in=[i.alumno_id for i in inscripciones]))
+    actualizar_analitico(
+        [i.alumno_id for i in inscripciones],
+        Comision.objects.filter(pk=tabla.comision_id).values('materia_id')
+    )
+    cache.delete(_clave_cache(tabla.comision_id, tabla.version))
+    return inscripciones
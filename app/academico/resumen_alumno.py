@@ -0,0 +1,195 @@
+"""
+Resumen académico por alumno: promedio de calificaciones y cantidad de materias
+aprobadas, regulares y libres, guardados en Alumno.
+
+Los valores se mantienen de forma incremental desde las señales de Calificacion e
+InscripcionAlumnoComision (las notas de mesa de examen llegan por esas mismas
+vías) con UPDATE atómicos sobre la fila del alumno, sin volver a agregar. La carga
+masiva de notas aplica todos sus deltas en un único UPDATE. recalcular_resumenes
+reconstruye todo desde cero (comando recalcular_resumen_alumnos).
+"""
+from decimal import Decimal
+
+from django.db.models import Case, Count, DecimalField, F, FloatField, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Cast
+from django.db.models.lookups import GreaterThan
+
+from academico.models import (
+    Alumno, Calificacion, CondicionInscripcion, EstadoMateria, InscripcionAlumnoComision
+)
+
+CAMPOS_MATERIAS = ('materias_aprobadas', 'materias_regulares', 'materias_libres')
+
+
+def campo_materia(estado_inscripcion, condicion):
+    """Contador del alumno en el que cuenta una inscripción (None si sigue cursando)"""
+    if estado_inscripcion == EstadoMateria.APROBADA:
+        return 'materias_aprobadas'
+    if condicion == CondicionInscripcion.LIBRE or estado_inscripcion == EstadoMateria.LIBRE:
+        return 'materias_libres'
+    if condicion == CondicionInscripcion.REGULAR:
+        return 'materias_regulares'
+    return None
+
+
+def _decimal(valor):
+    return Decimal(str(valor)) if valor is not None else None
+
+
+def _expresiones_notas(suma, cantidad):
+    """Valores nuevos de suma, cantidad y promedio calculados por la base sobre la fila actual"""
+    nueva_suma = F('suma_notas') + suma
+    nueva_cantidad = F('cantidad_calificaciones') + cantidad
+    return {
+        'suma_notas': nueva_suma,
+        'cantidad_calificaciones': nueva_cantidad,
+        'promedio': Case(
+            When(GreaterThan(nueva_cantidad, 0), then=Cast(nueva_suma, FloatField()) / nueva_cantidad),
+            default=None,
+            output_field=DecimalField(),
+        ),
+    }
+
+
+def _sumar_notas_inscripcion(inscripcion_id, suma, cantidad):
+    Alumno.objects.filter(inscripcionalumnocomision__id=inscripcion_id).update(
+        **_expresiones_notas(Value(suma, output_field=DecimalField()), Value(cantidad))
+    )
+
+
+def sumar_notas_alumnos(deltas):
+    """
+    Aplica deltas de notas a varios alumnos con un solo UPDATE.
+
+    Args:
+        deltas: dict {alumno_id: (suma, cantidad)}
+    """
+    deltas = {alumno_id: delta for alumno_id, delta in deltas.items() if delta != (0, 0)}
+    if not deltas:
+        return
+    suma = Case(
+        *[When(pk=alumno_id, then=Value(delta[0])) for alumno_id, delta in deltas.items()],
+        default=Value(Decimal('0')),
+        output_field=DecimalField(),
+    )
+    cantidad = Case(
+        *[When(pk=alumno_id, then=Value(delta[1])) for alumno_id, delta in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    Alumno.objects.filter(pk__in=deltas).update(**_expresiones_notas(suma, cantidad))
+
+
+def registrar_calificacion(anteriores, calificacion):
+    """
+    Aplica el cambio de una calificación guardada.
+
+    Args:
+        anteriores: valores previos serializados (auditoría) o None si es nueva
+        calificacion: Calificacion ya guardada
+    """
+    nueva = (calificacion.alumno_comision_id, _decimal(calificacion.nota))
+    anterior = None
+    if anteriores:
+        anterior = (int(anteriores['alumno_comision']), _decimal(anteriores['nota']))
+
+    if anterior == nueva:
+        return
+    if anterior and anterior[0] == nueva[0]:
+        _sumar_notas_inscripcion(nueva[0], nueva[1] - anterior[1], 0)
+        return
+    if anterior:
+        _sumar_notas_inscripcion(anterior[0], -anterior[1], -1)
+    _sumar_notas_inscripcion(nueva[0], nueva[1], 1)
+
+
+def eliminar_calificacion(calificacion):
+    _sumar_notas_inscripcion(calificacion.alumno_comision_id, -_decimal(calificacion.nota), -1)
+
+
+def _sumar_materia(alumno_id, campo, cantidad):
+    Alumno.objects.filter(pk=alumno_id).update(**{campo: F(campo) + cantidad})
+
+
+def registrar_inscripcion(anteriores, inscripcion):
+    """Mueve la inscripción entre los contadores de materias si cambió su estado o condición"""
+    nueva = (inscripcion.alumno_id, campo_materia(inscripcion.estado_inscripcion, inscripcion.condicion))
+    anterior = (None, None)
+    if anteriores:
+        anterior = (
+            int(anteriores['alumno']),
+            campo_materia(anteriores['estado_inscripcion'], anteriores['condicion']),
+        )
+
+    if anterior == nueva:
+        return
+    if anterior[1]:
+        _sumar_materia(anterior[0], anterior[1], -1)
+    if nueva[1]:
+        _sumar_materia(nueva[0], nueva[1], 1)
+
+
+def eliminar_inscripcion(inscripcion):
+    campo = campo_materia(inscripcion.estado_inscripcion, inscripcion.condicion)
+    if campo:
+        _sumar_materia(inscripcion.alumno_id, campo, -1)
+
+
+def recalcular_resumenes(alumnos=None, tamanio_lote=1000):
+    """
+    Reconstruye el resumen de los alumnos del queryset (todos por defecto) con
+    dos consultas agregadas y guarda solo los que difieren.
+
+    Returns:
+        int: cantidad de alumnos corregidos
+    """
+    calificaciones = Calificacion.objects.all()
+    inscripciones = InscripcionAlumnoComision.objects.all()
+    if alumnos is None:
+        alumnos = Alumno.objects.all()
+    else:
+        calificaciones = calificaciones.filter(alumno_comision__alumno__in=alumnos)
+        inscripciones = inscripciones.filter(alumno__in=alumnos)
+
+    notas = {
+        fila['alumno_comision__alumno_id']: (fila['suma'], fila['cantidad'])
+        for fila in calificaciones.values('alumno_comision__alumno_id').annotate(
+            suma=Sum('nota', output_field=DecimalField(max_digits=10, decimal_places=2)),
+            cantidad=Count('id')
+        )
+    }
+
+    aprobada = Q(estado_inscripcion=EstadoMateria.APROBADA)
+    libre = Q(condicion=CondicionInscripcion.LIBRE) | Q(estado_inscripcion=EstadoMateria.LIBRE)
+    materias = {
+        fila['alumno_id']: fila
+        for fila in inscripciones.values('alumno_id').annotate(
+            materias_aprobadas=Count('id', filter=aprobada),
+            materias_libres=Count('id', filter=~aprobada & libre),
+            materias_regulares=Count('id', filter=~aprobada & ~libre & Q(condicion=CondicionInscripcion.REGULAR)),
+        )
+    }
+
+    corregidos, lote = 0, []
+    for alumno in alumnos.only('id', *Alumno.CAMPOS_RESUMEN).iterator(chunk_size=tamanio_lote):
+        suma, cantidad = notas.get(alumno.pk, (Decimal('0'), 0))
+        esperado = {
+            'suma_notas': _decimal(suma),
+            'cantidad_calificaciones': cantidad,
+            'promedio': round(_decimal(suma) / cantidad, 2) if cantidad else None,
+        }
+        fila_materias = materias.get(alumno.pk, {})
+        esperado.update({campo: fila_materias.get(campo, 0) for campo in CAMPOS_MATERIAS})
+
+        if any(getattr(alumno, campo) != valor for campo, valor in esperado.items()):
+            for campo, valor in esperado.items():
+                setattr(alumno, campo, valor)
+            lote.append(alumno)
+            corregidos += 1
+        if len(lote) >= tamanio_lote:
+            Alumno.objects.bulk_update(lote, Alumno.CAMPOS_RESUMEN)
+            lote = []
+
+    if lote:
+        Alumno.objects.bulk_update(lote, Alumno.CAMPOS_RESUMEN)
+    return corregidos
@@ -32,13 +32,13 @@ class ServiciosAcademico:
     
     @staticmethod
     def obtener_fechas_clases(comision):
-        fechas_clase = CalendarioAcademico.objects.filter(
-        anio_academico=comision.anio_academico,
-        fecha__week_day=comision.dia_cursado + 1,
-        es_dia_clase=True,
-        fecha__lte=timezone.now().date()
-        ).order_by('-fecha')
-        fecha_seleccionada = fechas_clase.first().fecha if fechas_clase.exists() else None
+        """Fechas de clase de la comisión hasta hoy, de la más reciente a la más antigua"""
+        hoy = timezone.now().date()
+        fechas_clase = [
+            fecha for fecha in reversed(comision.anio_academico.fechas_clase(comision.dia_cursado))
+            if fecha <= hoy
+        ]
+        fecha_seleccionada = fechas_clase[0] if fechas_clase else None
         return fechas_clase, fecha_seleccionada
 
     @staticmethod
@@ -66,21 +66,26 @@ class ServiciosAcademico:
                 presentes += 1
         return round(presentes * 100 / total_asistencias, 2)
     
+    @staticmethod
+    def obtener_matriz_asistencia(comision, hasta=None):
+        """Matriz alumnos × fechas de clase con métricas vectorizadas (ver matriz_asistencia)"""
+        from academico.matriz_asistencia import construir_matriz_asistencia
+        return construir_matriz_asistencia(comision, hasta)
+
+    @staticmethod
+    def obtener_matriz_calificaciones(comision):
+        """Notas de la comisión pivoteadas por alumno y (tipo, número), con promedios"""
+        from academico.matriz_calificaciones import construir_matriz_calificaciones
+        return construir_matriz_calificaciones(comision)
+
     @staticmethod
     def registrar_asistencia(alumno, comision, esta_presente, fecha_asistencia):
         # Verificar que la fecha sea un día de clase
-        try:
-            dia_calendario = CalendarioAcademico.objects.get(
-                anio_academico=comision.anio_academico,
-                fecha=fecha_asistencia
-            )
-            if not dia_calendario.es_dia_clase:
-                raise FechaNoClaseError(
-                    f"La fecha {fecha_asistencia} no es un día de clase. Motivo: {dia_calendario.descripcion}"
-                )
-        except CalendarioAcademico.DoesNotExist:
+        anio = comision.anio_academico
+        if fecha_asistencia not in anio.fechas_clase(fecha_asistencia.weekday() + 1):
+            motivo = anio.regla_calendario().descripcion(fecha_asistencia)
             raise FechaNoClaseError(
-                f"La fecha {fecha_asistencia} no existe en el calendario académico"
+                f"La fecha {fecha_asistencia} no es un día de clase. Motivo: {motivo}"
             )
 
         inscripcion = get_object_or_404(
@@ -97,7 +102,141 @@ class ServiciosAcademico:
         asistencia.save()
 
         return asistencia, fecha_asistencia
-    
+
+    @staticmethod
+    def propagar_cambio_calendario(anio_academico, regla_anterior, origen=None):
+        """
+        Sincroniza las asistencias ya generadas cuando cambia el calendario de un año
+        (feriado sorpresivo, paro, receso o cambio de la regla semanal).
+
+        Compara las fechas de clase antes y después del cambio: las que pasan a serlo
+        se crean en bloque para las comisiones en curso que cursan ese día. De las que
+        dejan de ser de clase se eliminan las asistencias futuras y las que siguen en
+        ausente (valor generado); los presentes ya tomados hasta hoy se conservan y se
+        informan para que se revisen a mano.
+
+        Args:
+            anio_academico: AnioAcademico ya actualizado
+            regla_anterior: ReglaCalendario vigente antes del cambio
+            origen: instancia sobre la que se registra la auditoría (opcional)
+
+        Returns:
+            dict con la cantidad de asistencias eliminadas, creadas y conservadas, y
+            las fechas sin clase que conservan presentes ('fechas_conservadas')
+        """
+        from django.db import transaction
+        from django.db.models import Count, Q
+        from academico.calendario import ReglaCalendario
+        from academico.models import EstadoComision
+        from institucional.auditoria import registrar_cambio
+        from institucional.models import TipoAccionDatos
+
+        resultado = {'eliminadas': 0, 'creadas': 0, 'conservadas': 0, 'fechas_conservadas': []}
+
+        antes = set(regla_anterior.iter_fechas_clase())
+        despues = set(ReglaCalendario.para_anio(anio_academico).iter_fechas_clase())
+        removidas = antes - despues
+        agregadas = despues - antes
+        if not removidas and not agregadas:
+            return resultado
+
+        inscripciones = InscripcionAlumnoComision.objects.filter(
+            comision__anio_academico=anio_academico,
+            comision__estado=EstadoComision.EN_CURSO
+        )
+
+        with transaction.atomic():
+            if removidas:
+                asistencias = Asistencia.objects.filter(
+                    alumno_comision__in=inscripciones,
+                    fecha_asistencia__in=removidas
+                )
+                registradas = Q(esta_presente=True, fecha_asistencia__lte=timezone.now().date())
+
+                conservadas = dict(
+                    asistencias.filter(registradas).values_list('fecha_asistencia')
+                    .annotate(cantidad=Count('id')).order_by('fecha_asistencia')
+                )
+                resultado['conservadas'] = sum(conservadas.values())
+                resultado['fechas_conservadas'] = list(conservadas)
+
+                # Cada baja queda en la auditoría de Asistencia (señal post_delete); el
+                # prefetch evita dos consultas por fila al describir el registro borrado
+                resultado['eliminadas'] = asistencias.exclude(registradas).prefetch_related(
+                    'alumno_comision__alumno'
+                ).delete()[0]
+
+            if agregadas:
+                fechas_por_dia = {}
+                for fecha in sorted(agregadas):
+                    fechas_por_dia.setdefault(fecha.weekday() + 1, []).append(fecha)
+
+                existentes = set(Asistencia.objects.filter(
+                    alumno_comision__in=inscripciones,
+                    fecha_asistencia__in=agregadas
+                ).values_list('alumno_comision_id', 'fecha_asistencia'))
+
+                destinatarias = inscripciones.filter(
+                    comision__dia_cursado__in=fechas_por_dia
+                ).values_list('id', 'comision__dia_cursado')
+
+                nuevas = Asistencia.objects.bulk_create(
+                    [
+                        Asistencia(alumno_comision_id=inscripcion_id, fecha_asistencia=fecha, esta_presente=False)
+                        for inscripcion_id, dia in destinatarias
+                        for fecha in fechas_por_dia[dia]
+                        if (inscripcion_id, fecha) not in existentes
+                    ],
+                    batch_size=500
+                )
+                resultado['creadas'] = len(nuevas)
+
+            if origen is not None:
+                detalles = (
+                    f"Cambio de calendario ({len(removidas)} fechas sin clase, {len(agregadas)} con clase). "
+                    f"Asistencias: {resultado['eliminadas']} eliminadas, {resultado['creadas']} creadas"
+                )
+                if resultado['conservadas']:
+                    fechas = ', '.join(fecha.isoformat() for fecha in resultado['fechas_conservadas'])
+                    detalles += f", {resultado['conservadas']} con presente conservadas ({fechas})"
+                registrar_cambio(origen, TipoAccionDatos.MODIFICAR, detalles=detalles)
+
+        return resultado
+
+    @staticmethod
+    def reemplazar_excepciones_calendario(anio_academico, excepciones):
+        """
+        Reemplaza todas las excepciones del calendario de un año en una sola operación
+        y propaga el resultado a las asistencias una única vez.
+
+        Args:
+            anio_academico: AnioAcademico
+            excepciones: lista de CalendarioAcademico sin guardar (sin superposiciones)
+
+        Returns:
+            dict con el resultado de propagar_cambio_calendario
+        """
+        from django.db import transaction
+        from academico.calendario import ReglaCalendario, nueva_version_calendario, propagacion_suspendida
+        from academico.models import AnioAcademico
+
+        with transaction.atomic():
+            regla_anterior = ReglaCalendario.para_anio(anio_academico)
+
+            # Se propaga una sola vez al final, no por cada excepción borrada
+            with propagacion_suspendida():
+                CalendarioAcademico.objects.filter(anio_academico=anio_academico).delete()
+            CalendarioAcademico.objects.bulk_create(excepciones)
+
+            anio_academico.calendario_version = nueva_version_calendario()
+            AnioAcademico.objects.filter(pk=anio_academico.pk).update(
+                calendario_version=anio_academico.calendario_version
+            )
+
+            return ServiciosAcademico.propagar_cambio_calendario(
+                anio_academico, regla_anterior, origen=anio_academico
+            )
+
     @staticmethod
     def crear_calificacion(alumno, fecha, tipo_calificacion, calificacion, numero=1):
         from django.db import IntegrityError
@@ -152,20 +291,164 @@ class ServiciosAcademico:
             return calificacion_existente
     
     @staticmethod
-    def obtener_estadisticas_docente(docente):
-        comisiones = Comision.objects.filter(docente=docente)
-        clases_hoy = comisiones.filter(dia_cursado=timezone.now().weekday() + 1).count()
-        
-        total_alumnos = 0
-        for comision in comisiones:
-            total_alumnos += InscripcionAlumnoComision.objects.filter(comision=comision).count()
-        
-        return {
-            'total_comisiones': comisiones.count(),
-            'clases_hoy': clases_hoy,
-            'total_alumnos': total_alumnos
+    def crear_calificaciones_bulk(comision, tipo_calificacion, numero, fecha, notas):
+        """
+        Carga o actualiza las notas de una instancia de evaluación para toda la comisión.
+
+        Valida todo antes de escribir, lee las calificaciones existentes con una sola
+        consulta y guarda con bulk_create/bulk_update. El DVH se calcula por registro,
+        el DVV de la tabla se recalcula una única vez y la auditoría se inserta en bloque.
+
+        Args:
+            comision: Comision
+            tipo_calificacion: valor de TipoCalificacion
+            numero: número de instancia (1er parcial, 2do parcial, ...)
+            fecha: fecha de la evaluación
+            notas: dict {alumno_id: nota}
+
+        Returns:
+            dict con las listas de calificaciones 'creadas' y 'actualizadas'
+        """
+        from datetime import date, datetime, time, timezone as dt_timezone
+        from decimal import Decimal, InvalidOperation
+        from django.db import transaction
+        from academico.dashboard_docente import invalidar_dashboard_docente
+        from academico.resumen_alumno import sumar_notas_alumnos
+        from institucional.auditoria import obtener_valores_modelo, registrar_cambios
+        from institucional.digitos_verificadores import GestorDigitosVerificadores
+        from institucional.models import TipoAccionDatos
+
+        valores_calificacion = [choice[0] for choice in TipoCalificacion.choices]
+        if tipo_calificacion not in valores_calificacion:
+            raise TipoCalificacionInvalidoError(
+                f"El tipo de calificación '{tipo_calificacion}' no es válido. "
+                f"Valores permitidos: {', '.join(valores_calificacion)}"
+            )
+
+        # Mismo valor que devuelve la base para fecha_creacion, así el DVH calculado
+        # en memoria coincide con el que se verifica después
+        if isinstance(fecha, date) and not isinstance(fecha, datetime):
+            fecha = datetime.combine(fecha, time.min)
+        if timezone.is_naive(fecha):
+            fecha = timezone.make_aware(fecha)
+        fecha = fecha.astimezone(dt_timezone.utc)
+
+        notas_validadas = {}
+        fuera_de_rango = []
+        for alumno_id, nota in notas.items():
+            try:
+                nota = Decimal(str(nota))
+                if not nota.is_finite():
+                    raise InvalidOperation
+                nota = nota.quantize(Decimal('0.01'))
+            except InvalidOperation:
+                raise ValueError(f"La nota del alumno {alumno_id} no es un número válido: {nota}")
+            if nota < 0 or nota > 10:
+                fuera_de_rango.append(f"{alumno_id} ({nota})")
+            notas_validadas[int(alumno_id)] = nota
+
+        if fuera_de_rango:
+            raise RangoCalificacionInvalidoError(
+                f"La calificación debe estar entre 0 y 10. Valores recibidos: {', '.join(fuera_de_rango)}"
+            )
+
+        inscripciones = {
+            inscripcion.alumno_id: inscripcion
+            for inscripcion in InscripcionAlumnoComision.objects.filter(
+                comision=comision,
+                alumno_id__in=notas_validadas
+            ).select_related('alumno')
+        }
+        no_inscriptos = sorted(set(notas_validadas) - set(inscripciones))
+        if no_inscriptos:
+            raise ValueError(
+                f"Los alumnos {', '.join(map(str, no_inscriptos))} no están inscriptos en la comisión {comision.codigo}"
+            )
+
+        existentes = {
+            calificacion.alumno_comision_id: calificacion
+            for calificacion in Calificacion.objects.filter(
+                alumno_comision__in=inscripciones.values(),
+                tipo=tipo_calificacion,
+                numero=numero
+            )
         }
 
+        campos_criticos = ['nota', 'tipo', 'numero', 'fecha_creacion']
+        creadas, actualizadas, cambios = [], [], []
+        # Deltas {alumno_id: (suma, cantidad)} para el promedio del alumno
+        deltas_promedio = {}
+
+        for alumno_id, nota in notas_validadas.items():
+            inscripcion = inscripciones[alumno_id]
+            calificacion = existentes.get(inscripcion.pk)
+            if calificacion is None:
+                creadas.append(Calificacion(
+                    alumno_comision=inscripcion,
+                    tipo=tipo_calificacion,
+                    numero=numero,
+                    nota=nota,
+                    fecha_creacion=fecha
+                ))
+                deltas_promedio[alumno_id] = (nota, 1)
+                continue
+
+            deltas_promedio[alumno_id] = (nota - calificacion.nota, 0)
+            calificacion.alumno_comision = inscripcion
+            valores_anteriores = obtener_valores_modelo(calificacion)
+            calificacion.nota = nota
+            calificacion.fecha_creacion = fecha
+            calificacion.dvh = GestorDigitosVerificadores.calcular_dvh(calificacion, campos_criticos)
+            valores_nuevos = obtener_valores_modelo(calificacion)
+            if valores_anteriores != valores_nuevos:
+                actualizadas.append(calificacion)
+                cambios.append((calificacion, TipoAccionDatos.MODIFICAR, valores_anteriores, valores_nuevos))
+
+        with transaction.atomic():
+            if creadas:
+                Calificacion.objects.bulk_create(creadas)
+                # El DVH incluye la PK, que recién se conoce después del INSERT
+                for calificacion in creadas:
+                    calificacion.dvh = GestorDigitosVerificadores.calcular_dvh(calificacion, campos_criticos)
+                Calificacion.objects.bulk_update(creadas, ['dvh'])
+                cambios.extend(
+                    (calificacion, TipoAccionDatos.CREAR, None, obtener_valores_modelo(calificacion))
+                    for calificacion in creadas
+                )
+
+            if actualizadas:
+                Calificacion.objects.bulk_update(actualizadas, ['nota', 'fecha_creacion', 'dvh'])
+
+            if cambios:
+                sumar_notas_alumnos(deltas_promedio)
+                invalidar_dashboard_docente(comision.docente_id)
+                GestorDigitosVerificadores.actualizar_dvv('Calificacion', 'academico')
+                registrar_cambios(cambios, detalles=f"Carga masiva de {tipo_calificacion} {numero}")
+
+        return {'creadas': creadas, 'actualizadas': actualizadas}
+
+    @staticmethod
+    def importar_calificaciones(comision, archivo, tipo_calificacion, numero, fecha):
+        """Importa una instancia de evaluación desde una planilla (ver importacion_calificaciones)"""
+        from academico.importacion_calificaciones import importar_calificaciones
+        return importar_calificaciones(comision, archivo, tipo_calificacion, numero, fecha)
+
+    @staticmethod
+    def obtener_estadisticas_docente(docente):
+        from django.db.models import Count, Q
+
+        return Comision.objects.filter(docente=docente).aggregate(
+            total_comisiones=Count('id', distinct=True),
+            clases_hoy=Count('id', filter=Q(dia_cursado=timezone.now().weekday() + 1), distinct=True),
+            total_alumnos=Count('inscripcionalumnocomision'),
+        )
+
+    @staticmethod
+    def obtener_dashboard_docente(docente):
+        """Datos del panel del docente, cacheados (ver dashboard_docente)"""
+        from academico.dashboard_docente import obtener_dashboard_docente
+        return obtener_dashboard_docente(docente)
+
     @staticmethod
     def calcular_promedio_cursada(inscripcion):
         """
@@ -256,7 +539,16 @@ class ServiciosAcademico:
         return condicion, mensaje
 
     @staticmethod
-    def regularizar_comision(comision, usuario):
+    def previsualizar_regularizacion(comision):
+        """
+        Tabla de decisiones (Regular/Libre) de la comisión, cacheada bajo su
+        token de versión para que el cierre la reutilice (ver regularizacion).
+        """
+        from academico.regularizacion import previsualizar_regularizacion
+        return previsualizar_regularizacion(comision)
+
+    @staticmethod
+    def regularizar_comision(comision, usuario, version=None, hasta=None):
         """
         Cierra la cursada de una comisión completa, asignando la condición (Regular/Libre)
         a cada alumno basándose en las reglas del Año Académico.
@@ -264,11 +556,15 @@ class ServiciosAcademico:
         Args:
             comision: Comision
             usuario: User que realiza el cierre
+            version: token de la vista previa; si los datos cambiaron desde
+                entonces el cierre no se aplica
+            hasta: fecha de corte de asistencia de la vista previa (por defecto hoy)
 
         Returns:
             dict con estadísticas
         """
-        from academico.models import InscripcionAlumnoComision, EstadoComision, CondicionInscripcion
+        from academico.models import EstadoComision
+        from academico.regularizacion import aplicar_regularizacion, corte_vigente, obtener_tabla_vigente
         from django.db import transaction
 
         # Verificar configuración del año académico
@@ -279,38 +575,33 @@ class ServiciosAcademico:
                 'mensaje': 'El cierre de cursada no está habilitado para este Año Académico.',
             }
 
-        inscripciones = InscripcionAlumnoComision.objects.filter(
-            comision=comision,
-            estado_inscripcion='REGULAR' # Filtramos los que siguen activos
-        )
-
-        if not inscripciones.exists():
+        if hasta is not None and not corte_vigente(hasta):
             return {
                 'success': False,
-                'mensaje': 'No hay alumnos activos para regularizar.',
+                'mensaje': 'La vista previa está vencida. Revise los resultados antes de cerrar.',
             }
 
-        regulares = 0
-        libres = 0
-        
         with transaction.atomic():
-            for inscripcion in inscripciones:
-                condicion, _ = ServiciosAcademico.regularizar_alumno(
-                    inscripcion, 
-                    usuario,
-                    anio.nota_aprobacion,
-                    anio.porcentaje_asistencia_req
-                )
+            tabla = obtener_tabla_vigente(comision, version, hasta)
+            if tabla is None:
+                return {
+                    'success': False,
+                    'mensaje': 'Las notas o asistencias cambiaron desde la vista previa. Revise los resultados antes de cerrar.',
+                }
+
+            if not tabla.filas:
+                return {
+                    'success': False,
+                    'mensaje': 'No hay alumnos activos para regularizar.',
+                }
 
-                if condicion == CondicionInscripcion.REGULAR:
-                    regulares += 1
-                else:
-                    libres += 1
+            aplicar_regularizacion(tabla)
 
             # Actualizar estado de la comisión
             comision.estado = EstadoComision.FINALIZADA
             comision.save()
 
+        regulares, libres = tabla.regulares, tabla.libres
         mensaje = (
             f"Cursada cerrada exitosamente.\n"
             f"Alumnos Regulares: {regulares} | Alumnos Libres: {libres}"
@@ -323,6 +614,18 @@ class ServiciosAcademico:
             'libres': libres
         }
 
+    @staticmethod
+    def cerrar_anio_academico(anio, usuario=None, trabajadores=None, al_avanzar=None):
+        """
+        Cierra en paralelo la cursada de todas las comisiones EN_CURSO del año,
+        cada una en su transacción (ver cierre_anual).
+
+        Returns:
+            dict con el reporte consolidado de regulares, libres y fallidas
+        """
+        from academico.cierre_anual import TRABAJADORES, cerrar_anio_academico
+        return cerrar_anio_academico(anio, usuario, trabajadores or TRABAJADORES, al_avanzar)
+
     @staticmethod
     def cargar_nota_examen_final(inscripcion_mesa, nota, usuario):
         """
@@ -336,61 +639,40 @@ class ServiciosAcademico:
         Returns:
             tuple: (success: bool, mensaje: str)
         """
-        from academico.models import InscripcionAlumnoComision, EstadoMateria
-        from django.utils import timezone
-
         if nota < 0 or nota > 10:
             return False, "La nota debe estar entre 0 y 10."
 
-        # Obtener nota de aprobación del año académico correspondiente a la mesa
-        nota_aprobacion = inscripcion_mesa.mesa_examen.anio_academico.nota_aprobacion
-
-        # Actualizar nota en la inscripción a la mesa
-        inscripcion_mesa.nota_examen = nota
-
-        # Determinar resultado del examen
-        aprobado = nota >= nota_aprobacion
-        
-        if aprobado:
-            inscripcion_mesa.estado_inscripcion = 'APROBADO'
-            # Si aprobó el examen, aprueba la materia definitivamente
-            nuevo_estado_materia = EstadoMateria.APROBADA
-        else:
-            inscripcion_mesa.estado_inscripcion = 'DESAPROBADO'
-            # Si desaprobó, la materia queda en su estado anterior (ej: REGULAR) o pasa a DESAPROBADA?
-            # Generalmente si desaprueba el final, sigue debiendo la materia pero mantiene su regularidad
-            # hasta que se venza. Por ahora no tocamos el estado 'REGULAR' de la cursada,
-            # salvo que queramos marcar explícitamente que falló un intento.
-            # Pero el requerimiento dice: "si la nota examen final es mayor o igual a nota de aprobación que marque al alumno como aprobado"
-            # Implica que si no, no lo marca como aprobado.
-            nuevo_estado_materia = None 
-
-        inscripcion_mesa.save()
-
-        # Actualizar el estado de la cursada del alumno SOLO si aprobó
-        cursada = InscripcionAlumnoComision.objects.filter(
-            alumno=inscripcion_mesa.alumno,
-            comision__materia=inscripcion_mesa.mesa_examen.materia
-        ).first()
-
-        if cursada:
-            # La creación/actualización de la Calificación se maneja vía signal (post_save)
-            # en el modelo InscripcionMesaExamen para garantizar consistencia siempre.
-
-            if aprobado:
-                cursada.nota_final = nota
-                cursada.estado_inscripcion = nuevo_estado_materia
-                cursada.fecha_cierre = timezone.now()
-                cursada.cerrada_por = usuario
-                cursada.save()
+        resultado = ServiciosAcademico.cargar_notas_mesa(
+            inscripcion_mesa.mesa_examen, {inscripcion_mesa.pk: nota}, usuario
+        )
+        if resultado['errores']:
+            return False, resultado['errores'][0]
 
+        inscripcion_mesa.refresh_from_db(fields=['nota_examen', 'estado_inscripcion', 'dvh'])
         mensaje = (
             f"Nota cargada: {nota}. "
-            f"Resultado: {'APROBADO' if aprobado else 'DESAPROBADO'}"
+            f"Resultado: {resultado['resultados'][inscripcion_mesa.pk]}"
         )
 
         return True, mensaje
 
+    @staticmethod
+    def cargar_notas_mesa(mesa, notas, usuario=None):
+        """
+        Carga en bloque las notas de examen de una mesa: inscripciones, cursadas
+        y calificaciones FINAL con una lectura y una escritura por tabla (ver notas_mesa).
+
+        Args:
+            mesa: MesaExamen
+            notas: dict {inscripcion_mesa_id: nota}
+            usuario: User que carga las notas
+
+        Returns:
+            dict con 'cargadas', 'aprobados', 'desaprobados', 'resultados' y 'errores'
+        """
+        from academico.notas_mesa import cargar_notas_mesa
+        return cargar_notas_mesa(mesa, notas, usuario)
+
     @staticmethod
     def finalizar_mesa_examen(mesa, usuario):
         """
@@ -403,45 +685,22 @@ class ServiciosAcademico:
         Returns:
             dict con estadísticas
         """
-        from academico.models import InscripcionMesaExamen, EstadoMesaExamen
+        from academico.ciclo_mesas import estadisticas_mesas, finalizar_mesas
+        from academico.models import MesaExamen
 
-        inscripciones = InscripcionMesaExamen.objects.filter(
-            mesa_examen=mesa,
-            estado_inscripcion='INSCRIPTO'  # Solo los que no tienen nota
-        )
-
-        ausentes = 0
-        for inscripcion in inscripciones:
-            inscripcion.estado_inscripcion = 'AUSENTE'
-            inscripcion.save()
-            ausentes += 1
-
-        # Cambiar estado de la mesa
-        mesa.estado = EstadoMesaExamen.FINALIZADA
-        mesa.save()
-
-        total_inscriptos = InscripcionMesaExamen.objects.filter(mesa_examen=mesa).count()
-        aprobados = InscripcionMesaExamen.objects.filter(
-            mesa_examen=mesa,
-            estado_inscripcion='APROBADO'
-        ).count()
-        desaprobados = InscripcionMesaExamen.objects.filter(
-            mesa_examen=mesa,
-            estado_inscripcion='DESAPROBADO'
-        ).count()
+        resultado = finalizar_mesas(MesaExamen.objects.filter(pk=mesa.pk))
+        mesa.refresh_from_db(fields=['estado', 'inscriptos'])
 
-        return {
-            'success': True,
-            'total_inscriptos': total_inscriptos,
-            'aprobados': aprobados,
-            'desaprobados': desaprobados,
-            'ausentes': ausentes
-        }
+        # Una mesa ya finalizada no se vuelve a procesar, pero igual se informan sus números
+        estadisticas = resultado['estadisticas'].get(mesa.pk) or estadisticas_mesas([mesa.pk])[mesa.pk]
+        return {'success': True, **estadisticas}
 
     @staticmethod
     def inscribir_alumno_mesa(alumno, mesa):
         """
         Inscribe un alumno a una mesa de examen validando las reglas de negocio.
+        El cupo se reserva de forma atómica y los bloqueos de la base se
+        reintentan (ver inscripcion_mesa).
 
         Args:
             alumno: Alumno
@@ -450,30 +709,59 @@ class ServiciosAcademico:
         Returns:
             tuple: (success: bool, mensaje: str)
         """
-        from academico.models import InscripcionMesaExamen, EstadoMateria, CondicionAlumnoMesa
-        from django.core.exceptions import ValidationError
+        from academico.inscripcion_mesa import inscribir
 
         try:
-            # Crear instancia (se ejecutará clean() automáticamente al guardar o manual)
-            inscripcion = InscripcionMesaExamen(
-                alumno=alumno,
-                mesa_examen=mesa
-            )
-            
-            # Ejecutar validaciones de modelo (clean)
-            inscripcion.clean()
-
-            # Si pasó validaciones, guardar
-            inscripcion.save()
-            
-            return True, "Inscripción realizada con éxito."
-
-        except ValidationError as e:
-            # Extraer mensajes de error
-            if hasattr(e, 'message_dict'):
-                errores = [v[0] for k, v in e.message_dict.items()]
-                return False, " | ".join(errores)
-            else:
-                return False, str(e.message)
+            return inscribir(alumno, mesa)
         except Exception as e:
-            return False, f"Error inesperado: {str(e)}"
\ No newline at end of file
+            return False, f"Error inesperado: {str(e)}"
+
+    @staticmethod
+    def inscribir_habilitados_mesa(mesa):
+        """
+        Inscribe a la mesa a todos los alumnos habilitados para rendirla (con la
+        condición de su mejor cursada) hasta completar el cupo.
+
+        Args:
+            mesa: MesaExamen
+
+        Returns:
+            dict con 'inscriptos' y 'sin_cupo'
+        """
+        from academico.habilitaciones_examen import inscribir_habilitados
+
+        return inscribir_habilitados(mesa)
+
+    @staticmethod
+    def conflictos_mesas_examen(desde, hasta):
+        """
+        Conflictos de aula y de tribunal entre las mesas que se toman en un período.
+
+        Args:
+            desde, hasta: datetime que delimitan el período
+
+        Returns:
+            list de dicts con 'tipo', 'recurso' y 'mesas' (ver horarios_mesa.reporte_conflictos)
+        """
+        from academico.horarios_mesa import reporte_conflictos
+        from academico.models import MesaExamen
+
+        return reporte_conflictos(MesaExamen.objects.filter(fecha_examen__gte=desde, fecha_examen__lt=hasta))
+
+    @staticmethod
+    def proponer_cronograma_mesas(mesas, horarios, aulas=None):
+        """
+        Propone un horario (y un aula si la mesa no tiene) sin conflictos para cada mesa.
+        No modifica las mesas.
+
+        Args:
+            mesas: queryset de MesaExamen
+            horarios: inicios posibles (datetime)
+            aulas: aulas disponibles para las mesas sin aula
+
+        Returns:
+            dict con 'propuesta' y 'sin_lugar' (ver horarios_mesa.proponer_cronograma)
+        """
+        from academico.horarios_mesa import proponer_cronograma
+
+        return proponer_cronograma(mesas, horarios, aulas)
\ No newline at end of file
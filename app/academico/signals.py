@@ -1,10 +1,14 @@
-from django.db.models.signals import post_save, pre_save, post_delete
+from django.db.models.signals import m2m_changed, post_save, pre_save, post_delete, pre_delete
 from django.dispatch import receiver
 from django.db import transaction
 from datetime import timedelta, date
 import holidays
 
-from .models import AnioAcademico, CalendarioAcademico, Calificacion, Asistencia, InscripcionAlumnoComision
+from .models import AnioAcademico, CalendarioAcademico, Calificacion, Comision, Asistencia, InscripcionAlumnoComision, MesaExamen
+from .calendario import ReglaCalendario, nueva_version_calendario, parsear_dias_semana, propagacion_activa
+from . import analitico, resumen_alumno
+from .horarios_mesa import validar_horario_mesa
+from .dashboard_docente import invalidar_dashboard_comisiones, invalidar_dashboard_docente
 from institucional.models import TipoAccionDatos
 from institucional.auditoria import registrar_cambio, obtener_valores_modelo
 
@@ -43,35 +47,152 @@ def auditoria_post_delete(sender, instance, **kwargs):
         valores_anteriores = obtener_valores_modelo(instance)
         registrar_cambio(instance, TipoAccionDatos.ELIMINAR, valores_anteriores=valores_anteriores)
 
+# Resumen académico del alumno. Los valores anteriores los captura auditoria_pre_save.
+@receiver(post_save, sender=Calificacion)
+def resumen_calificacion_guardada(sender, instance, created, **kwargs):
+    anteriores = None if created else getattr(instance, '_valores_anteriores', None)
+    resumen_alumno.registrar_calificacion(anteriores, instance)
+
+@receiver(post_delete, sender=Calificacion)
+def resumen_calificacion_eliminada(sender, instance, **kwargs):
+    resumen_alumno.eliminar_calificacion(instance)
+
+@receiver(post_save, sender=InscripcionAlumnoComision)
+def resumen_inscripcion_guardada(sender, instance, created, **kwargs):
+    anteriores = None if created else getattr(instance, '_valores_anteriores', None)
+    resumen_alumno.registrar_inscripcion(anteriores, instance)
+
+@receiver(post_delete, sender=InscripcionAlumnoComision)
+def resumen_inscripcion_eliminada(sender, instance, **kwargs):
+    resumen_alumno.eliminar_inscripcion(instance)
+
+# Analítico del alumno (una fila por materia); los exámenes se registran en InscripcionMesaExamen.save
+@receiver(post_save, sender=InscripcionAlumnoComision)
+def analitico_inscripcion_guardada(sender, instance, created, **kwargs):
+    anteriores = None if created else getattr(instance, '_valores_anteriores', None)
+    analitico.registrar_inscripcion(anteriores, instance)
+
+@receiver(post_delete, sender=InscripcionAlumnoComision)
+def analitico_inscripcion_eliminada(sender, instance, **kwargs):
+    analitico.eliminar_inscripcion(instance, kwargs.get('origin'))
+
+# Un docente no puede sumarse a un tribunal que se superpone con otro suyo
+@receiver(m2m_changed, sender=MesaExamen.tribunal.through)
+def validar_tribunal_mesa(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_add' and not reverse and pk_set:
+        validar_horario_mesa(instance, pk_set, validar_aula=False)
+
+# Panel del docente: se invalida cuando cambian notas, inscripciones o comisiones
+@receiver(post_save, sender=Calificacion)
+@receiver(post_delete, sender=Calificacion)
+def invalidar_dashboard_calificacion(sender, instance, **kwargs):
+    invalidar_dashboard_comisiones(inscripcionalumnocomision=instance.alumno_comision_id)
+
+@receiver(post_save, sender=InscripcionAlumnoComision)
+@receiver(post_delete, sender=InscripcionAlumnoComision)
+def invalidar_dashboard_inscripcion(sender, instance, **kwargs):
+    invalidar_dashboard_comisiones(pk=instance.comision_id)
+
+@receiver(pre_save, sender=Comision)
+def capturar_docente_comision(sender, instance, **kwargs):
+    instance._docente_anterior = None
+    if instance.pk:
+        instance._docente_anterior = sender.objects.filter(pk=instance.pk).values_list('docente_id', flat=True).first()
+
+@receiver(post_save, sender=Comision)
+@receiver(post_delete, sender=Comision)
+def invalidar_dashboard_comision(sender, instance, **kwargs):
+    invalidar_dashboard_docente(instance.docente_id)
+    anterior = getattr(instance, '_docente_anterior', None)
+    if anterior != instance.docente_id:
+        invalidar_dashboard_docente(anterior)
+
+def _es_origen_calendario(instance, kwargs):
+    """Las bajas en cascada (p. ej. al borrar el año académico) no se propagan"""
+    origen = kwargs.get('origin', instance)
+    return getattr(origen, 'model', type(origen)) is CalendarioAcademico
+
+@receiver(pre_save, sender=CalendarioAcademico)
+@receiver(pre_delete, sender=CalendarioAcademico)
+def capturar_regla_calendario(sender, instance, **kwargs):
+    """Guarda la regla vigente antes del cambio para poder propagarlo después"""
+    instance._regla_anterior = None
+    if not propagacion_activa() or ('origin' in kwargs and not _es_origen_calendario(instance, kwargs)):
+        return
+    instance._regla_anterior = ReglaCalendario.para_anio(instance.anio_academico)
+
+@receiver(post_save, sender=CalendarioAcademico)
+@receiver(post_delete, sender=CalendarioAcademico)
+def propagar_cambio_calendario(sender, instance, **kwargs):
+    """Invalida la vista materializada y mantiene las asistencias en línea con el calendario"""
+    from .services import ServiciosAcademico
+
+    regla_anterior = getattr(instance, '_regla_anterior', None)
+    if regla_anterior is None:
+        return
+
+    anio = instance.anio_academico
+    anio.calendario_version = nueva_version_calendario()
+    AnioAcademico.objects.filter(pk=anio.pk).update(calendario_version=anio.calendario_version)
+
+    instance._propagacion_calendario = ServiciosAcademico.propagar_cambio_calendario(
+        anio, regla_anterior, origen=instance
+    )
+
+@receiver(pre_save, sender=AnioAcademico)
+def capturar_regla_anio(sender, instance, **kwargs):
+    instance._regla_anterior = None
+    if instance.pk:
+        anterior = sender.objects.filter(pk=instance.pk).first()
+        if anterior and (
+            anterior.fecha_inicio != instance.fecha_inicio or
+            anterior.fecha_fin != instance.fecha_fin or
+            anterior.dias_semana_clase != instance.dias_semana_clase
+        ):
+            instance._regla_anterior = ReglaCalendario.para_anio(anterior)
+
+@receiver(post_save, sender=AnioAcademico)
+def propagar_cambio_regla_anio(sender, instance, created, **kwargs):
+    from .services import ServiciosAcademico
+
+    regla_anterior = getattr(instance, '_regla_anterior', None)
+    if created or regla_anterior is None:
+        return
+
+    instance._propagacion_calendario = ServiciosAcademico.propagar_cambio_calendario(
+        instance, regla_anterior, origen=instance
+    )
+
 @receiver(post_save, sender=AnioAcademico)
 @transaction.atomic
 def crear_calendario_academico(sender, instance, created, **kwargs):
+    """
+    Registra como excepciones los feriados que caen en días de clase según la regla
+    semanal del año. Los feriados consecutivos con el mismo nombre forman un rango.
+    """
     if not created:
         return
 
-    fecha = instance.fecha_inicio
     feriados_arg = holidays.AR(years=range(instance.fecha_inicio.year, instance.fecha_fin.year + 1))
+    dias_semana = parsear_dias_semana(instance.dias_semana_clase)
 
+    excepciones = []
+    for fecha, descripcion in sorted(feriados_arg.items()):
+        if not (instance.fecha_inicio <= fecha <= instance.fecha_fin):
+            continue
+        if fecha.weekday() + 1 not in dias_semana:
+            continue
 
-    while fecha <= instance.fecha_fin:
-        es_fin_de_semana = fecha.weekday() >= 5
-        es_feriado = fecha in feriados_arg
-
-        descripcion = ''
-        if es_feriado:
-            descripcion = feriados_arg.get(fecha)
-        elif es_fin_de_semana:
-            descripcion = 'Fin de semana'
-
-        es_dia_clase = not (es_feriado or es_fin_de_semana)
-
-        CalendarioAcademico.objects.get_or_create(
-            anio_academico=instance,
-            fecha=fecha,
-            defaults={
-                'es_dia_clase': es_dia_clase,
-                'descripcion': descripcion
-            }
-        )
+        ultima = excepciones[-1] if excepciones else None
+        if ultima and ultima.descripcion == descripcion and ultima.fecha_fin + timedelta(days=1) == fecha:
+            ultima.fecha_fin = fecha
+        else:
+            excepciones.append(CalendarioAcademico(
+                anio_academico=instance,
+                fecha_inicio=fecha,
+                fecha_fin=fecha,
+                es_dia_clase=False,
+                descripcion=descripcion
+            ))
 
-        fecha += timedelta(days=1)
+    CalendarioAcademico.objects.bulk_create(excepciones)
@@ -0,0 +1,39 @@
+"""
+Tareas en segundo plano académicas (ver administracion.services.tareas).
+"""
+from administracion.services.tareas import avanzar, registrar_tarea
+
+
+# Un reintento solo cierra las comisiones que sigan EN_CURSO
+@registrar_tarea('cerrar_comisiones')
+def cerrar_comisiones(tarea, comision_ids):
+    from academico.cierre_anual import cerrar_comisiones as cerrar, resumen_cierre
+    from academico.models import Comision
+
+    comisiones = Comision.objects.filter(pk__in=comision_ids).select_related('anio_academico', 'materia').order_by('codigo')
+    reporte = cerrar(
+        comisiones, tarea.creado_por,
+        progreso=lambda procesadas, total: avanzar(tarea, procesadas * 100 / total, f'{procesadas}/{total} comisiones')
+    )
+    reporte['resumen'] = resumen_cierre(reporte)
+    avanzar(tarea, 100, reporte['resumen'])
+    return reporte
+
+
+# Reintentar es seguro: el cierre retoma solo las comisiones que siguen EN_CURSO,
+# y si otro proceso está cerrando el mismo año se reintenta más tarde
+@registrar_tarea('cerrar_anio_academico')
+def cerrar_anio_academico(tarea, anio_id):
+    from academico.cierre_anual import cerrar_anio_academico as cerrar, resumen_cierre
+    from academico.models import AnioAcademico
+
+    anio = AnioAcademico.objects.get(pk=anio_id)
+    reporte = cerrar(
+        anio, tarea.creado_por,
+        al_avanzar=lambda comision, resultado, procesadas, total: avanzar(
+            tarea, procesadas * 100 / total, f'{procesadas}/{total} comisiones'
+        )
+    )
+    reporte['resumen'] = f'{anio.nombre}: {resumen_cierre(reporte)}'
+    avanzar(tarea, 100, reporte['resumen'])
+    return reporte
@@ -0,0 +1,102 @@
+import os
+import pytest
+from datetime import date, time, timedelta
+from django.contrib.auth.models import Group
+from django.urls import reverse
+from django.utils import timezone
+import main.utils
+from academico.models import (
+    AnioAcademico, Comision, InscripcionAlumnoComision, InscripcionMesaExamen,
+    Alumno, Materia, MesaExamen, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from institucional.models import Empleado, Usuario
+
+
+@pytest.mark.django_db
+class TestActasPDF:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client, settings, tmp_path, monkeypatch):
+        settings.ACTAS_PDF_DIR = str(tmp_path)
+        self.directorio = tmp_path
+        self.renders = []
+
+        def generar(contexto, template_name):
+            self.renders.append(contexto)
+            return b'%PDF-1.4 acta'
+        monkeypatch.setattr(main.utils, 'generar_certificado_pdf', generar)
+
+        self.client = client
+        usuario = Usuario.objects.create_user(email='tribunal@test.com', password='x')
+        usuario.groups.add(Group.objects.get_or_create(name='Docente')[0])
+        self.docente = Empleado.objects.create(dni="21000000", nombre="Doc", apellido="Tribunal", usuario=usuario)
+        self.client.force_login(usuario)
+
+        anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-ACT")
+        materia = Materia.objects.create(codigo="ACT1", nombre="Materia", plan_estudio=plan)
+        comision = Comision.objects.create(
+            codigo="ACT-1",
+            materia=materia,
+            anio_academico=anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=1,
+            turno=Turno.MANANA
+        )
+        ahora = timezone.now()
+        self.mesa = MesaExamen.objects.create(
+            materia=materia,
+            anio_academico=anio,
+            fecha_examen=ahora + timedelta(days=10),
+            fecha_limite_inscripcion=ahora + timedelta(days=5),
+        )
+        self.mesa.tribunal.add(self.docente)
+        self.inscripciones = []
+        for i, condicion in enumerate(['REGULAR', 'LIBRE', 'REGULAR']):
+            alumno = Alumno.objects.create(dni=f"39000{i:03d}", nombre=f"A{i}", apellido="Acta")
+            InscripcionAlumnoComision.objects.create(alumno=alumno, comision=comision, condicion=condicion)
+            self.inscripciones.append(
+                InscripcionMesaExamen.objects.create(mesa_examen=self.mesa, alumno=alumno, condicion=condicion)
+            )
+        self.url = reverse('acta_examen_pdf', args=[self.mesa.pk])
+
+    def _archivos(self):
+        return sorted(os.listdir(self.directorio))
+
+    def test_acta_guardada_y_revalidada(self):
+        primera = self.client.get(self.url)
+        assert primera.status_code == 200
+        assert b''.join(primera.streaming_content) == b'%PDF-1.4 acta'
+        assert 'acta_examen_ACT1_' in primera['Content-Disposition']
+        assert len(self.renders) == 1
+        contexto = self.renders[0]
+        assert (contexto['total_inscriptos'], contexto['total_regulares'], contexto['total_libres']) == (3, 2, 1)
+
+        # Sin cambios: se sirve el archivo guardado o se responde 304
+        assert self.client.get(self.url).status_code == 200
+        no_modificada = self.client.get(self.url, HTTP_IF_NONE_MATCH=primera['ETag'])
+        assert no_modificada.status_code == 304
+        assert len(self.renders) == 1
+        assert len(self._archivos()) == 1
+
+        # Cargar notas cambia el contenido: nueva acta y se descarta la anterior
+        ServiciosAcademico.cargar_notas_mesa(self.mesa, {self.inscripciones[0].pk: 8})
+        nueva = self.client.get(self.url, HTTP_IF_NONE_MATCH=primera['ETag'])
+        assert nueva.status_code == 200
+        assert nueva['ETag'] != primera['ETag']
+        assert len(self.renders) == 2
+        assert self.renders[1]['total_aprobados'] == 1
+        assert len(self._archivos()) == 1
+
+    def test_solo_el_tribunal_descarga_el_acta(self):
+        self.mesa.tribunal.clear()
+        respuesta = self.client.get(self.url)
+        assert respuesta.status_code == 302
+        assert self.renders == []
@@ -0,0 +1,143 @@
+import io
+import pytest
+from datetime import date, time, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from academico.models import (
+    AnioAcademico, Comision, InscripcionAlumnoComision, InscripcionMesaExamen,
+    Alumno, Materia, MateriaAnalitico, MesaExamen, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from institucional.models import Empleado, Usuario
+from main.utils import crear_contexto_certificado
+
+
+@pytest.mark.django_db
+class TestAnalitico:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        self.client = client
+        usuario = Usuario.objects.create_user(email='analitico@test.com', password='x')
+        usuario.groups.add(Group.objects.get_or_create(name='Docente')[0])
+        Empleado.objects.create(dni="22000000", nombre="Doc", apellido="Analitico", usuario=usuario)
+        self.client.force_login(usuario)
+
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+            nota_aprobacion=6
+        )
+        self.plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-ANA")
+        self.alumno = Alumno.objects.create(dni="37000001", nombre="Ana", apellido="Litico")
+        self.cantidad = 0
+
+    def _materia(self, condicion='REGULAR'):
+        """Materia con una comisión en la que el alumno cursó"""
+        self.cantidad += 1
+        materia = Materia.objects.create(codigo=f"ANA{self.cantidad}", nombre=f"Materia {self.cantidad}", plan_estudio=self.plan)
+        comision = Comision.objects.create(
+            codigo=f"ANA-{self.cantidad}",
+            materia=materia,
+            anio_academico=self.anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=1,
+            turno=Turno.MANANA
+        )
+        cursada = InscripcionAlumnoComision.objects.create(
+            alumno=self.alumno, comision=comision, condicion=condicion, nota_cursada=Decimal('7.50')
+        )
+        return materia, cursada
+
+    def _mesa(self, materia, dias):
+        ahora = timezone.now()
+        return MesaExamen.objects.create(
+            materia=materia,
+            anio_academico=self.anio,
+            fecha_examen=ahora + timedelta(days=dias),
+            fecha_limite_inscripcion=ahora + timedelta(days=dias - 1),
+        )
+
+    def _fila(self, materia):
+        return MateriaAnalitico.objects.get(alumno=self.alumno, materia=materia)
+
+    def test_se_mantiene_con_cursadas_y_examenes(self):
+        materia, cursada = self._materia()
+        fila = self._fila(materia)
+        assert (fila.condicion, fila.aprobada, fila.cursada_id, fila.nota_cursada) == ('REGULAR', False, cursada.pk, Decimal('7.50'))
+        assert fila.intentos_examen == 0
+
+        # Desaprueba en una mesa (carga en bloque) y aprueba en otra (guardado individual)
+        primera = InscripcionMesaExamen.objects.create(mesa_examen=self._mesa(materia, 10), alumno=self.alumno, condicion='REGULAR')
+        ServiciosAcademico.cargar_notas_mesa(primera.mesa_examen, {primera.pk: 4})
+        segunda = InscripcionMesaExamen.objects.create(mesa_examen=self._mesa(materia, 20), alumno=self.alumno, condicion='REGULAR')
+        assert self._fila(materia).intentos_examen == 1
+
+        segunda.nota_examen = Decimal('8')
+        segunda.estado_inscripcion = 'APROBADO'
+        segunda.save()
+
+        fila = self._fila(materia)
+        assert fila.aprobada and fila.nota_final == Decimal('8')
+        assert (fila.examenes_aprobados, fila.examenes_desaprobados, fila.examenes_ausentes) == (1, 1, 0)
+        assert fila.promedio_examenes == Decimal('6')
+        assert fila.ultima_nota_examen == Decimal('8')
+
+        segunda.delete()
+        fila = self._fila(materia)
+        assert (fila.examenes_aprobados, fila.cantidad_notas_examen) == (0, 1)
+
+        # Lo mantenido incrementalmente coincide con la reconstrucción completa
+        salida = io.StringIO()
+        call_command('recalcular_analitico', stdout=salida)
+        assert 'Filas corregidas: 0' in salida.getvalue()
+
+    def test_historico_con_consultas_constantes(self):
+        url = reverse('historico_mesas_alumno', args=[self.alumno.pk])
+
+        def consultas(cantidad):
+            for _ in range(cantidad):
+                materia, _ = self._materia()
+                inscripcion = InscripcionMesaExamen.objects.create(
+                    mesa_examen=self._mesa(materia, 10 + self.cantidad), alumno=self.alumno, condicion='REGULAR'
+                )
+                ServiciosAcademico.cargar_notas_mesa(inscripcion.mesa_examen, {inscripcion.pk: 3 + self.cantidad})
+            with CaptureQueriesContext(connection) as capturadas:
+                respuesta = self.client.get(url)
+            assert respuesta.status_code == 200
+            return respuesta, len(capturadas)
+
+        _, pocas = consultas(1)
+        respuesta, muchas = consultas(3)
+        assert pocas == muchas
+        # Notas 4, 5, 6 y 7: dos aprobadas, dos desaprobadas
+        assert respuesta.context['total_mesas'] == 4
+        assert (respuesta.context['total_aprobadas'], respuesta.context['total_desaprobadas']) == (2, 2)
+        assert respuesta.context['promedio_examenes'] == Decimal('5.5')
+        assert len(respuesta.context['analitico']) == 4
+
+    def test_certificado_de_aprobacion_lee_el_analitico(self):
+        promocionada, cursada = self._materia()
+        InscripcionAlumnoComision.objects.filter(pk=cursada.pk).update(
+            estado_inscripcion='APROBADA', nota_final=Decimal('9'), fecha_cierre=timezone.now()
+        )
+        self._materia('LIBRE')
+        call_command('recalcular_analitico', stdout=io.StringIO())
+
+        institucion = SimpleNamespace(logo=SimpleNamespace(name='logos/escudo.png'))
+        with CaptureQueriesContext(connection) as capturadas:
+            contexto = crear_contexto_certificado(self.alumno, 'aprobacion', institucion)
+
+        assert len(capturadas) == 1
+        assert contexto['cantidad_aprobadas'] == 1
+        aprobada = contexto['materias_aprobadas'][0]
+        assert (aprobada['materia'], aprobada['nota'], aprobada['comision']) == (promocionada, Decimal('9'), cursada.comision)
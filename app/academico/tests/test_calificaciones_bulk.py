@@ -0,0 +1,121 @@
+import pytest
+from django.contrib.auth.models import Group
+from django.urls import reverse
+from datetime import date, time
+from decimal import Decimal
+from academico.exceptions import RangoCalificacionInvalidoError, TipoCalificacionInvalidoError
+from academico.models import (
+    AnioAcademico, Calificacion, Comision, EstadoComision,
+    InscripcionAlumnoComision, Alumno, Materia, TipoCalificacion, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from institucional.digitos_verificadores import GestorDigitosVerificadores
+from institucional.models import AuditoriaDatos, Empleado, Usuario
+
+CAMPOS_DVH = ['nota', 'tipo', 'numero', 'fecha_creacion']
+
+
+@pytest.mark.django_db
+class TestCalificacionesBulk:
+    """Carga masiva de una instancia de evaluación"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-BULK")
+        materia = Materia.objects.create(codigo="BULK", nombre="Base de Datos", plan_estudio=plan)
+        self.comision = Comision.objects.create(
+            codigo="BULK-1",
+            materia=materia,
+            anio_academico=anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=2,
+            turno=Turno.MANANA,
+            estado=EstadoComision.EN_CURSO
+        )
+        self.alumnos = []
+        for i in range(6):
+            alumno = Alumno.objects.create(dni=f"3300000{i}", nombre=f"A{i}", apellido="Test")
+            InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comision)
+            self.alumnos.append(alumno)
+        self.fecha = date(2030, 4, 2)
+
+    def _cargar(self, notas, tipo=TipoCalificacion.PARCIAL, numero=1):
+        return ServiciosAcademico.crear_calificaciones_bulk(self.comision, tipo, numero, self.fecha, notas)
+
+    def test_crea_calificaciones_con_dvh_y_dvv(self):
+        resultado = self._cargar({alumno.id: 7 for alumno in self.alumnos})
+
+        assert len(resultado['creadas']) == 6
+        calificaciones = Calificacion.objects.filter(alumno_comision__comision=self.comision)
+        assert calificaciones.count() == 6
+        assert all(
+            GestorDigitosVerificadores.verificar_integridad_instancia(calificacion, CAMPOS_DVH)
+            for calificacion in calificaciones
+        )
+        assert GestorDigitosVerificadores.verificar_integridad_tabla('Calificacion')[0]
+        assert AuditoriaDatos.objects.filter(modelo='academico.calificacion', tipo_accion='CREAR').count() == 6
+
+    def test_actualiza_existentes_y_crea_faltantes(self):
+        self._cargar({self.alumnos[0].id: 4, self.alumnos[1].id: 5})
+
+        resultado = self._cargar({self.alumnos[0].id: 8, self.alumnos[1].id: 5, self.alumnos[2].id: '9.5'})
+
+        assert [c.alumno_comision.alumno_id for c in resultado['actualizadas']] == [self.alumnos[0].id]
+        assert [c.alumno_comision.alumno_id for c in resultado['creadas']] == [self.alumnos[2].id]
+        notas = dict(Calificacion.objects.values_list('alumno_comision__alumno_id', 'nota'))
+        assert notas == {self.alumnos[0].id: Decimal('8'), self.alumnos[1].id: Decimal('5'), self.alumnos[2].id: Decimal('9.5')}
+        assert GestorDigitosVerificadores.verificar_integridad_tabla('Calificacion')[0]
+
+    def test_cantidad_de_consultas_no_depende_de_los_alumnos(self, django_assert_max_num_queries):
+        # Incluye el UPDATE único del resumen de los alumnos
+        with django_assert_max_num_queries(14):
+            self._cargar({alumno.id: 6 for alumno in self.alumnos})
+        with django_assert_max_num_queries(14):
+            self._cargar({alumno.id: 9 for alumno in self.alumnos})
+
+    def test_valida_todo_antes_de_escribir(self):
+        with pytest.raises(RangoCalificacionInvalidoError):
+            self._cargar({self.alumnos[0].id: 7, self.alumnos[1].id: 11})
+        with pytest.raises(TipoCalificacionInvalidoError):
+            self._cargar({self.alumnos[0].id: 7}, tipo='OTRO')
+        with pytest.raises(ValueError):
+            self._cargar({self.alumnos[0].id: 7, 999999: 7})
+
+        assert not Calificacion.objects.exists()
+
+    @pytest.mark.parametrize('nota', ['NaN', 'Infinity', '-Infinity', 'sNaN', 'abc'])
+    def test_rechaza_notas_que_no_son_numeros_finitos(self, nota):
+        with pytest.raises(ValueError, match='no es un número válido'):
+            self._cargar({self.alumnos[0].id: 7, self.alumnos[1].id: nota})
+
+        assert not Calificacion.objects.exists()
+
+    def test_mensaje_de_la_vista_distingue_creadas_y_actualizadas(self, client):
+        usuario = Usuario.objects.create_user(email='docente.bulk@test.com', password='x')
+        usuario.groups.add(Group.objects.get_or_create(name='Docente')[0])
+        Empleado.objects.create(dni="20000099", nombre="Doc", apellido="Bulk", usuario=usuario)
+        client.force_login(usuario)
+        url = reverse('crear_calificacion', args=[self.comision.codigo])
+
+        def cargar(notas):
+            # El formulario no acepta fechas futuras
+            datos = {'fecha': date.today().isoformat(), 'tipo': TipoCalificacion.PARCIAL, 'numero': 1}
+            datos.update({f'nota_{alumno.id}': nota for alumno, nota in notas})
+            # Al seguir la redirección los mensajes se muestran y se consumen
+            respuesta = client.post(url, datos, follow=True)
+            return [str(mensaje) for mensaje in respuesta.context['messages']]
+
+        assert cargar([(self.alumnos[0], 7), (self.alumnos[1], 8)]) == [
+            'Se crearon 2 calificaciones y se actualizaron 0 correctamente.'
+        ]
+        # Una sin cambios, una corregida y una nueva
+        assert cargar([(self.alumnos[0], 7), (self.alumnos[1], 9), (self.alumnos[2], 5)]) == [
+            'Se crearon 1 calificaciones y se actualizaron 1 correctamente.'
+        ]
@@ -0,0 +1,92 @@
+import io
+import os
+import zipfile
+import pytest
+from django.urls import reverse
+from academico.models import Alumno
+from administracion.models import Certificado, EstadoLoteCertificados, EstadoTarea, LoteCertificados, Tarea
+from administracion.services import certificados_lote
+from administracion.services.tareas import procesar_pendientes
+from institucional.models import Institucion, Usuario
+from main.pdf import cerrar_pool
+
+
+@pytest.mark.django_db
+class TestCertificadosLote:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client, settings, tmp_path):
+        settings.CERTIFICADOS_LOTE_DIR = str(tmp_path / 'lotes')
+        settings.CERTIFICADOS_PDF_DIR = str(tmp_path / 'pdf')
+        settings.PDF_WORKERS = 2
+        self.client = client
+        self.usuario = Usuario.objects.create_superuser(email='admin@test.com', password='x')
+        self.client.force_login(self.usuario)
+        Institucion.objects.create(nombre="Instituto", direccion="Calle 1", nro_telefono="1", logo='img/logo.png')
+        self.alumnos = [
+            Alumno.objects.create(dni=f"38000{i:03d}", nombre=f"A{i}", apellido="Lote") for i in range(3)
+        ]
+        yield
+        cerrar_pool()
+
+    def _accion(self):
+        return self.client.post(reverse('admin:academico_alumno_changelist'), {
+            'action': 'generar_certificado_aprobacion',
+            '_selected_action': [alumno.pk for alumno in self.alumnos],
+        })
+
+    def _nombres(self, contenido):
+        return sorted(zipfile.ZipFile(io.BytesIO(contenido)).namelist())
+
+    def test_zip_en_streaming(self):
+        respuesta = self._accion()
+
+        assert respuesta.status_code == 200
+        assert respuesta['Content-Type'] == 'application/zip'
+        contenido = b''.join(respuesta.streaming_content)
+        assert self._nombres(contenido) == [f'certificado_{a.dni}_aprobacion.pdf' for a in self.alumnos]
+        archivo_zip = zipfile.ZipFile(io.BytesIO(contenido))
+        assert all(archivo_zip.read(nombre).startswith(b'%PDF') for nombre in archivo_zip.namelist())
+        codigos = Certificado.objects.filter(tipo='aprobacion').values_list('codigo_verificacion', flat=True)
+        assert len(set(codigos)) == 3
+
+    def test_lote_en_segundo_plano(self, monkeypatch):
+        monkeypatch.setattr(certificados_lote, 'LIMITE_ZIP_DIRECTO', 2)
+        monkeypatch.setattr(certificados_lote, 'TAMANIO_TANDA', 2)
+
+        respuesta = self._accion()
+
+        lote = LoteCertificados.objects.get()
+        assert respuesta.status_code == 302
+        assert respuesta['Location'] == reverse('progreso_lote_certificados', args=[lote.pk])
+        assert (lote.estado, lote.total) == (EstadoLoteCertificados.PENDIENTE, 3)
+        assert b'Descargar ZIP' not in self.client.get(respuesta['Location']).content
+
+        # La generación quedó encolada como tarea
+        assert procesar_pendientes() == 1
+        lote.refresh_from_db()
+
+        assert (lote.estado, lote.generados, lote.porcentaje) == (EstadoLoteCertificados.FINALIZADO, 3, 100)
+        assert os.listdir(os.path.dirname(lote.archivo)) == [os.path.basename(lote.archivo)]
+        assert b'Descargar ZIP' in self.client.get(respuesta['Location']).content
+        descarga = self.client.get(reverse('descargar_lote_certificados', args=[lote.pk]))
+        assert len(self._nombres(b''.join(descarga.streaming_content))) == 3
+        assert Certificado.objects.count() == 3
+        assert not Certificado.objects.filter(hash_pdf='').exists()
+
+    def test_lote_fallido_marca_la_tarea_en_error(self, monkeypatch, settings):
+        def falla(*args, **kwargs):
+            raise OSError('disco lleno')
+            yield
+
+        monkeypatch.setattr(certificados_lote, 'certificados_por_tanda', falla)
+        lote = certificados_lote.crear_lote([alumno.pk for alumno in self.alumnos], 'aprobacion', self.usuario)
+
+        assert procesar_pendientes() == 1
+
+        lote.refresh_from_db()
+        tarea = Tarea.objects.get()
+        assert (lote.estado, lote.error) == (EstadoLoteCertificados.ERROR, 'disco lleno')
+        assert (tarea.estado, tarea.mensaje) == (EstadoTarea.ERROR, 'disco lleno')
+        # No queda el ZIP temporal a medio escribir
+        assert os.listdir(settings.CERTIFICADOS_LOTE_DIR) == []
@@ -0,0 +1,67 @@
+import os
+import pytest
+from django.urls import reverse
+import academico.admin
+import main.utils
+from academico.models import Alumno
+from administracion.models import Certificado
+from administracion.services import certificados_pdf
+from institucional.models import Institucion, Usuario
+
+
+@pytest.mark.django_db
+class TestCertificadosPDF:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client, settings, tmp_path, monkeypatch):
+        settings.CERTIFICADOS_PDF_DIR = str(tmp_path)
+        self.renders = 0
+
+        def generar(contexto, template_name='admin/certificado_template.html'):
+            self.renders += 1
+            return f'%PDF-1.4 {contexto["alumno"].apellido} {contexto["certificado"].codigo_verificacion}'.encode()
+        monkeypatch.setattr(main.utils, 'generar_certificado_pdf', generar)
+        monkeypatch.setattr(academico.admin, 'generar_certificado_pdf', generar)
+
+        self.client = client
+        self.client.force_login(Usuario.objects.create_superuser(email='cert@test.com', password='x'))
+        Institucion.objects.create(nombre="Instituto", direccion="Calle 1", nro_telefono="1", logo='img/logo.png')
+        self.alumno = Alumno.objects.create(dni="39900001", nombre="Ana", apellido="Emitida")
+
+    def _descargar(self, certificado):
+        return self.client.get(reverse('admin:certificado_download', args=[certificado.pk]))
+
+    def test_se_sirve_el_pdf_emitido(self):
+        respuesta = self.client.post(reverse('admin:academico_alumno_changelist'), {
+            'action': 'generar_certificado_alumno_regular', '_selected_action': [self.alumno.pk],
+        })
+        emitido = respuesta.content
+        certificado = Certificado.objects.get()
+        assert certificado.hash_pdf and os.path.exists(certificados_pdf.ruta_absoluta(certificado))
+
+        # Aunque cambien los datos del alumno, la descarga es el PDF emitido y no se vuelve a renderizar
+        Alumno.objects.filter(pk=self.alumno.pk).update(apellido="Cambiado")
+        descarga = self._descargar(certificado)
+        assert descarga.status_code == 200
+        assert b''.join(descarga.streaming_content) == emitido
+        assert self.renders == 1
+
+        assert certificados_pdf.verificar_pdf(certificado.codigo_verificacion, emitido)
+        assert not certificados_pdf.verificar_pdf(certificado.codigo_verificacion, emitido + b' ')
+
+        with open(certificados_pdf.ruta_absoluta(certificado), 'ab') as archivo:
+            archivo.write(b'alterado')
+        assert self._descargar(certificado).status_code == 500
+
+    def test_emision_diferida_y_deduplicada(self):
+        anterior = Certificado.objects.create(alumno=self.alumno, tipo='alumno_regular')
+
+        assert self._descargar(anterior).status_code == 200
+        assert self._descargar(anterior).status_code == 200
+        anterior.refresh_from_db()
+        assert anterior.hash_pdf and self.renders == 1
+
+        otros = [Certificado.objects.create(alumno=self.alumno, tipo='otro') for _ in range(2)]
+        certificados_pdf.registrar_pdfs(otros, [b'%PDF-1.4 igual', b'%PDF-1.4 igual'])
+        assert otros[0].archivo_pdf == otros[1].archivo_pdf
+        assert Certificado.objects.filter(hash_pdf=otros[0].hash_pdf).count() == 2
@@ -0,0 +1,121 @@
+import io
+import pytest
+from datetime import date, time, timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from academico.ciclo_mesas import finalizar_mesas
+from academico.models import (
+    AnioAcademico, Comision, EstadoInscripcionMesa, EstadoMesaExamen, InscripcionAlumnoComision,
+    InscripcionMesaExamen, Alumno, Materia, MesaExamen, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from institucional.digitos_verificadores import GestorDigitosVerificadores
+from institucional.models import AuditoriaDatos, TipoAccionDatos
+
+
+@pytest.mark.django_db
+class TestCicloMesas:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+            nota_aprobacion=6
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-CIC")
+        self.materia = Materia.objects.create(codigo="CIC1", nombre="Materia", plan_estudio=plan)
+        self.comision = Comision.objects.create(
+            codigo="CIC-1",
+            materia=self.materia,
+            anio_academico=self.anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=1,
+            turno=Turno.MANANA
+        )
+        self.ahora = timezone.now()
+        self.cantidad = 0
+
+    def _mesa(self, dias_examen, dias_limite, inscriptos=0):
+        mesa = MesaExamen.objects.create(
+            materia=self.materia,
+            anio_academico=self.anio,
+            fecha_examen=self.ahora + timedelta(days=dias_examen),
+            fecha_limite_inscripcion=self.ahora + timedelta(days=dias_limite),
+        )
+        for _ in range(inscriptos):
+            self.cantidad += 1
+            alumno = Alumno.objects.create(dni=f"35000{self.cantidad:03d}", nombre=f"A{self.cantidad}", apellido="Ciclo")
+            InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comision, condicion='REGULAR')
+            InscripcionMesaExamen.objects.create(mesa_examen=mesa, alumno=alumno, condicion='REGULAR')
+        return mesa
+
+    def _estado(self, mesa):
+        return MesaExamen.objects.get(pk=mesa.pk).estado
+
+    def test_comando_avanza_estados(self):
+        abierta = self._mesa(10, 5)
+        vencida = self._mesa(3, -1)
+        rendida = self._mesa(-1, -6, inscriptos=2)
+        en_gracia = self._mesa(-1, -6)
+        antigua = self._mesa(-10, -15, inscriptos=2)
+
+        salida = io.StringIO()
+        call_command('actualizar_estado_mesas', '--dias-gracia', '2', stdout=salida)
+
+        assert 'Mesas cerradas: 4' in salida.getvalue()
+        assert self._estado(abierta) == EstadoMesaExamen.ABIERTA
+        assert self._estado(vencida) == EstadoMesaExamen.CERRADA
+        assert self._estado(rendida) == self._estado(en_gracia) == EstadoMesaExamen.CERRADA
+        assert self._estado(antigua) == EstadoMesaExamen.FINALIZADA
+        assert MesaExamen.objects.get(pk=antigua.pk).inscriptos == 0
+        assert MesaExamen.objects.get(pk=rendida.pk).inscriptos == 2
+
+        ausentes = InscripcionMesaExamen.objects.filter(mesa_examen=antigua)
+        assert {i.estado_inscripcion for i in ausentes} == {EstadoInscripcionMesa.AUSENTE}
+        for inscripcion in ausentes:
+            assert GestorDigitosVerificadores.verificar_integridad_instancia(
+                inscripcion, ['nota_examen', 'condicion', 'estado_inscripcion']
+            )
+        auditorias = AuditoriaDatos.objects.filter(
+            modelo='academico.inscripcionmesaexamen', tipo_accion=TipoAccionDatos.MODIFICAR
+        )
+        assert sorted(auditoria.objeto_id for auditoria in auditorias) == sorted(str(i.pk) for i in ausentes)
+        assert all(auditoria.valores_nuevos['estado_inscripcion'] == EstadoInscripcionMesa.AUSENTE for auditoria in auditorias)
+
+        # Una segunda corrida no tiene nada que hacer
+        salida = io.StringIO()
+        call_command('actualizar_estado_mesas', '--dias-gracia', '2', stdout=salida)
+        assert 'Mesas cerradas: 0 | Mesas finalizadas: 0' in salida.getvalue()
+
+    def test_finalizar_mesa_informa_estadisticas(self):
+        mesa = self._mesa(-1, -6, inscriptos=3)
+        aprobado, desaprobado, _ = InscripcionMesaExamen.objects.filter(mesa_examen=mesa).order_by('pk')
+        ServiciosAcademico.cargar_notas_mesa(mesa, {aprobado.pk: 8, desaprobado.pk: 3})
+
+        resultado = ServiciosAcademico.finalizar_mesa_examen(mesa, None)
+
+        assert resultado == {
+            'success': True, 'total_inscriptos': 3, 'aprobados': 1, 'desaprobados': 1, 'ausentes': 1
+        }
+        assert mesa.estado == EstadoMesaExamen.FINALIZADA
+        assert ServiciosAcademico.finalizar_mesa_examen(mesa, None) == resultado
+        assert GestorDigitosVerificadores.verificar_integridad_tabla('InscripcionMesaExamen')[0]
+
+    def test_consultas_no_dependen_de_la_cantidad_de_mesas(self):
+        def consultas(mesas):
+            with CaptureQueriesContext(connection) as capturadas:
+                resultado = finalizar_mesas(MesaExamen.objects.filter(pk__in=[m.pk for m in mesas]))
+            assert resultado['mesas'] == len(mesas)
+            return len(capturadas)
+
+        # La primera finalización crea el registro de DVV
+        consultas([self._mesa(-10, -15, inscriptos=1)])
+        pocas = consultas([self._mesa(-10, -15, inscriptos=1)])
+        muchas = consultas([self._mesa(-10, -15, inscriptos=3) for _ in range(5)])
+        assert pocas == muchas
@@ -0,0 +1,149 @@
+import io
+import pytest
+from datetime import date, time, timedelta
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from django.urls import reverse
+from academico.cierre_anual import CierreEnCursoError, obtener_progreso_cierre
+from academico.models import (
+    AnioAcademico, Calificacion, CierreAnioAcademico, Comision, CondicionInscripcion, EstadoCierreAnio,
+    EstadoComision, InscripcionAlumnoComision, Alumno, Materia, TipoCalificacion, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import EstadoTarea, PlanEstudio, Tarea
+from administracion.services.tareas import procesar_pendientes
+from institucional.models import Usuario
+
+
+class BaseCierreAnual:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        cache.clear()
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+            nota_aprobacion=6,
+            porcentaje_asistencia_req=0,
+            cierre_cursada_habilitado=True
+        )
+        self.plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-CIE")
+        self.cantidad = 0
+
+    def _comision(self, notas, estado=EstadoComision.EN_CURSO):
+        self.cantidad += 1
+        numero = self.cantidad
+        materia = Materia.objects.create(codigo=f"CIE{numero}", nombre=f"Materia {numero}", plan_estudio=self.plan)
+        comision = Comision.objects.create(
+            codigo=f"CIE-{numero}",
+            materia=materia,
+            anio_academico=self.anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=1,
+            turno=Turno.MANANA,
+            estado=estado
+        )
+        for i, nota in enumerate(notas):
+            alumno = Alumno.objects.create(dni=f"35{numero:03d}{i:03d}", nombre=f"A{i}", apellido="Cierre")
+            inscripcion = InscripcionAlumnoComision.objects.create(alumno=alumno, comision=comision)
+            Calificacion.objects.create(
+                alumno_comision=inscripcion, tipo=TipoCalificacion.PARCIAL, numero=1,
+                nota=nota, fecha_creacion=timezone.now()
+            )
+        return comision
+
+    def _estado(self, comision):
+        return Comision.objects.get(pk=comision.pk).estado
+
+
+@pytest.mark.django_db
+class TestCierreAnual(BaseCierreAnual):
+
+    def test_reporte_consolidado_y_reanudacion(self, monkeypatch):
+        primera = self._comision([8, 4])
+        fallida = self._comision([7])
+        self._comision([9], estado=EstadoComision.FINALIZADA)
+
+        original = ServiciosAcademico.regularizar_comision
+
+        def regularizar(comision, usuario, version=None):
+            if comision.pk == fallida.pk:
+                raise RuntimeError("sin conexión")
+            return original(comision, usuario, version)
+
+        monkeypatch.setattr(ServiciosAcademico, 'regularizar_comision', staticmethod(regularizar))
+        reporte = ServiciosAcademico.cerrar_anio_academico(self.anio, trabajadores=1)
+
+        assert (reporte['total'], reporte['cerradas'], reporte['regulares'], reporte['libres']) == (2, 1, 1, 1)
+        assert reporte['fallidas'] == [(fallida.codigo, 'Error inesperado: sin conexión')]
+        assert (self._estado(primera), self._estado(fallida)) == (EstadoComision.FINALIZADA, EstadoComision.EN_CURSO)
+        progreso = obtener_progreso_cierre(self.anio)
+        assert (progreso['estado'], progreso['procesadas'], progreso['fallidas']) == ('FINALIZADO', 2, 1)
+
+        # Al reintentar solo se procesa la que quedó pendiente
+        monkeypatch.setattr(ServiciosAcademico, 'regularizar_comision', staticmethod(original))
+        reporte = ServiciosAcademico.cerrar_anio_academico(self.anio, trabajadores=1)
+
+        assert (reporte['total'], reporte['cerradas'], reporte['regulares'], reporte['fallidas']) == (1, 1, 1, [])
+        assert self._estado(fallida) == EstadoComision.FINALIZADA
+
+    def test_bloqueo_entre_procesos(self):
+        comision = self._comision([8])
+        # Otro proceso está cerrando el año
+        CierreAnioAcademico.objects.create(
+            anio_academico=self.anio, estado=EstadoCierreAnio.EN_CURSO, actualizado=timezone.now()
+        )
+
+        with pytest.raises(CierreEnCursoError):
+            ServiciosAcademico.cerrar_anio_academico(self.anio, trabajadores=1)
+        assert self._estado(comision) == EstadoComision.EN_CURSO
+
+        # Sin avances durante el plazo de bloqueo se da por abandonado
+        CierreAnioAcademico.objects.update(actualizado=timezone.now() - timedelta(hours=1))
+        reporte = ServiciosAcademico.cerrar_anio_academico(self.anio, trabajadores=1)
+        assert reporte['cerradas'] == 1
+
+    def test_accion_del_admin_encola_el_cierre(self, client):
+        comision = self._comision([8])
+        client.force_login(Usuario.objects.create_superuser(email='cierre@test.com', password='x'))
+
+        respuesta = client.post(reverse('admin:academico_anioacademico_changelist'), {
+            'action': 'cerrar_cursadas_action', '_selected_action': [self.anio.pk],
+        })
+
+        tarea = Tarea.objects.get()
+        assert respuesta['Location'] == reverse('progreso_tarea', args=[tarea.pk])
+        assert self._estado(comision) == EstadoComision.EN_CURSO
+
+        assert procesar_pendientes() == 1
+        tarea.refresh_from_db()
+        assert (tarea.estado, tarea.resultado['cerradas']) == (EstadoTarea.FINALIZADA, 1)
+        assert obtener_progreso_cierre(self.anio)['estado'] == EstadoCierreAnio.FINALIZADO
+
+    def test_comando(self):
+        self._comision([8])
+        self._comision([])
+        salida = io.StringIO()
+
+        call_command('cerrar_anio_academico', anio=self.anio.pk, trabajadores=1, stdout=salida)
+
+        texto = salida.getvalue()
+        assert "[2/2]" in texto
+        assert "No hay alumnos activos para regularizar." in texto
+        assert "Comisiones cerradas: 1/2 | Alumnos Regulares: 1 | Alumnos Libres: 0" in texto
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCierreAnualParalelo(BaseCierreAnual):
+
+    def test_pool_de_trabajadores(self):
+        comisiones = [self._comision([8, 5, 9]) for _ in range(4)]
+
+        reporte = ServiciosAcademico.cerrar_anio_academico(self.anio, trabajadores=3)
+
+        assert (reporte['cerradas'], reporte['regulares'], reporte['libres'], reporte['fallidas']) == (4, 8, 4, [])
+        assert all(self._estado(comision) == EstadoComision.FINALIZADA for comision in comisiones)
+        assert InscripcionAlumnoComision.objects.filter(condicion=CondicionInscripcion.REGULAR).count() == 8
@@ -0,0 +1,85 @@
+import pytest
+from datetime import date, datetime, time
+from decimal import Decimal
+from types import SimpleNamespace
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from academico.models import (
+    AnioAcademico, Asistencia, Calificacion, Comision, InscripcionAlumnoComision, Alumno, Materia, Turno
+)
+from administracion.models import PlanEstudio
+from main.utils import crear_contexto_certificado, crear_contextos_certificado
+
+TIPOS = ['asistencia', 'Certificado de Aprobación', 'examen', 'alumno_regular', 'buen_comportamiento']
+
+
+@pytest.mark.django_db
+class TestContextosCertificado:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-CER")
+        materia = Materia.objects.create(codigo="CER1", nombre="Materia", plan_estudio=plan)
+        self.comision = Comision.objects.create(
+            codigo="CER-1",
+            materia=materia,
+            anio_academico=anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=1,
+            turno=Turno.MANANA
+        )
+        self.institucion = SimpleNamespace(logo=SimpleNamespace(name='img/logo.png'))
+        self.alumnos = []
+
+    def _agregar_alumnos(self, cantidad):
+        for _ in range(cantidad):
+            numero = len(self.alumnos)
+            alumno = Alumno.objects.create(dni=f"39500{numero:03d}", nombre=f"A{numero}", apellido="Cert")
+            cursada = InscripcionAlumnoComision.objects.create(
+                alumno=alumno, comision=self.comision, condicion='REGULAR', estado_inscripcion='REGULAR'
+            )
+            Calificacion.objects.create(
+                alumno_comision=cursada, tipo='PARCIAL', nota=Decimal(4 + numero % 5),
+                fecha_creacion=timezone.make_aware(datetime(2030, 4, 1))
+            )
+            Asistencia.objects.bulk_create([
+                Asistencia(alumno_comision=cursada, fecha_asistencia=date(2030, 3, dia), esta_presente=dia % 2 == 0)
+                for dia in range(4, 8)
+            ])
+            self.alumnos.append(alumno)
+
+    def _consultas(self, tipo):
+        with CaptureQueriesContext(connection) as capturadas:
+            contextos = crear_contextos_certificado(self.alumnos, tipo, self.institucion)
+        assert [contexto['alumno'] for contexto in contextos] == self.alumnos
+        return len(capturadas)
+
+    def test_consultas_fijas_por_tipo(self):
+        self._agregar_alumnos(2)
+        pocas = {tipo: self._consultas(tipo) for tipo in TIPOS}
+        self._agregar_alumnos(6)
+        assert {tipo: self._consultas(tipo) for tipo in TIPOS} == pocas
+        assert max(pocas.values()) <= 2
+
+    def test_mismo_contexto_que_por_alumno(self):
+        self._agregar_alumnos(3)
+        alumno = self.alumnos[1]
+        contexto = crear_contextos_certificado(self.alumnos, 'asistencia', self.institucion)[1]
+
+        asistencias = Asistencia.objects.filter(alumno_comision__alumno=alumno)
+        assert contexto['total_clases'] == asistencias.count()
+        assert contexto['clases_presentes'] == asistencias.filter(esta_presente=True).count() == 2
+        assert [i.alumno_id for i in contexto['materias_cursadas']] == [alumno.pk]
+
+        individual = crear_contexto_certificado(alumno, 'examen', self.institucion)
+        en_bloque = crear_contextos_certificado(self.alumnos, 'examen', self.institucion)[1]
+        assert individual['examenes'] == en_bloque['examenes']
+        assert en_bloque['examenes'][0]['nota'] == Decimal('5')
+        assert en_bloque['examenes'][0]['resultado'] == 'No Aprobado'
@@ -0,0 +1,96 @@
+import io
+import pytest
+from datetime import date, time, timedelta
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.utils import timezone
+from academico.models import (
+    AnioAcademico, Comision, EstadoInscripcionMesa, InscripcionAlumnoComision, InscripcionMesaExamen,
+    Alumno, Materia, MesaExamen, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+
+
+@pytest.mark.django_db
+class TestCuposMesa:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-CUP")
+        materia = Materia.objects.create(codigo="CUP1", nombre="Materia", plan_estudio=plan)
+        comision = Comision.objects.create(
+            codigo="CUP-1",
+            materia=materia,
+            anio_academico=anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=1,
+            turno=Turno.MANANA
+        )
+        self.alumnos = []
+        for i in range(3):
+            alumno = Alumno.objects.create(dni=f"34000{i:03d}", nombre=f"A{i}", apellido="Cupo")
+            InscripcionAlumnoComision.objects.create(alumno=alumno, comision=comision, condicion='REGULAR')
+            self.alumnos.append(alumno)
+        ahora = timezone.now()
+        self.mesa = MesaExamen.objects.create(
+            materia=materia,
+            anio_academico=anio,
+            fecha_examen=ahora + timedelta(days=10),
+            fecha_limite_inscripcion=ahora + timedelta(days=5),
+            cupo_maximo=2
+        )
+
+    def _inscriptos(self):
+        return MesaExamen.objects.get(pk=self.mesa.pk).inscriptos
+
+    def test_contador_sigue_inscripciones(self, django_assert_num_queries):
+        assert ServiciosAcademico.inscribir_alumno_mesa(self.alumnos[0], self.mesa)[0]
+        assert ServiciosAcademico.inscribir_alumno_mesa(self.alumnos[1], self.mesa)[0]
+
+        mesa = MesaExamen.objects.get(pk=self.mesa.pk)
+        with django_assert_num_queries(0):
+            assert (mesa.inscripciones_count, mesa.cupos_disponibles, mesa.puede_inscribirse) == (2, 0, False)
+
+        inscripcion = InscripcionMesaExamen.objects.get(mesa_examen=self.mesa, alumno=self.alumnos[0])
+        inscripcion.estado_inscripcion = EstadoInscripcionMesa.AUSENTE
+        inscripcion.save()
+        assert self._inscriptos() == 1
+
+        InscripcionMesaExamen.objects.filter(alumno=self.alumnos[1]).delete()
+        assert self._inscriptos() == 0
+
+    def test_update_condicional_no_supera_el_cupo(self):
+        # Instancia leída antes de que otros ocupen los cupos: clean() la ve con lugar
+        desactualizada = MesaExamen.objects.get(pk=self.mesa.pk)
+        ServiciosAcademico.inscribir_alumno_mesa(self.alumnos[0], self.mesa)
+        ServiciosAcademico.inscribir_alumno_mesa(self.alumnos[1], self.mesa)
+
+        inscripcion = InscripcionMesaExamen(alumno=self.alumnos[2], mesa_examen=desactualizada)
+        inscripcion.clean()
+        with pytest.raises(ValidationError, match='No hay cupos disponibles en esta mesa.'):
+            inscripcion.save()
+
+        assert not InscripcionMesaExamen.objects.filter(alumno=self.alumnos[2]).exists()
+        assert self._inscriptos() == 2
+
+        # Guardar la instancia vieja de la mesa no pisa el contador
+        desactualizada.aula = "B2"
+        desactualizada.save()
+        assert self._inscriptos() == 2
+
+    def test_comando_reconcilia(self):
+        ServiciosAcademico.inscribir_alumno_mesa(self.alumnos[0], self.mesa)
+        MesaExamen.objects.filter(pk=self.mesa.pk).update(inscriptos=5)
+        salida = io.StringIO()
+
+        call_command('reconciliar_inscriptos_mesa', mesa=[self.mesa.pk], stdout=salida)
+
+        assert self._inscriptos() == 1
+        assert 'Mesas corregidas: 1' in salida.getvalue()
@@ -0,0 +1,120 @@
+import pytest
+from datetime import date, time
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from academico.dashboard_docente import construir_dashboard_docente
+from academico.models import (
+    AnioAcademico, Calificacion, Comision, EstadoComision,
+    InscripcionAlumnoComision, Alumno, Materia, TipoCalificacion, Turno
+)
+from administracion.models import PlanEstudio
+from institucional.models import Empleado, Usuario
+
+
+@pytest.mark.django_db
+class TestDashboardDocente:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client):
+        cache.clear()
+        self.client = client
+        usuario = Usuario.objects.create_user(email='docente@test.com', password='x')
+        usuario.groups.add(Group.objects.get_or_create(name='Docente')[0])
+        self.docente = Empleado.objects.create(dni="20000000", nombre="Doc", apellido="Ente", usuario=usuario)
+        self.client.force_login(usuario)
+
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        self.plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-DOC")
+        self.hoy = timezone.now().weekday() + 1
+        self.cantidad_comisiones = 0
+
+    def _comision(self, alumnos, estado=EstadoComision.EN_CURSO, dia=None):
+        self.cantidad_comisiones += 1
+        numero = self.cantidad_comisiones
+        materia = Materia.objects.create(codigo=f"DOC{numero}", nombre=f"Materia {numero}", plan_estudio=self.plan)
+        comision = Comision.objects.create(
+            codigo=f"DOC-{numero}",
+            materia=materia,
+            anio_academico=self.anio,
+            docente=self.docente,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=dia or (self.hoy % 7) + 1,
+            turno=Turno.MANANA,
+            estado=estado
+        )
+        inscripciones = []
+        for i in range(alumnos):
+            alumno = Alumno.objects.create(dni=f"38{numero:03d}{i:03d}", nombre=f"A{i}", apellido="Test")
+            inscripciones.append(InscripcionAlumnoComision.objects.create(alumno=alumno, comision=comision))
+        return comision, inscripciones
+
+    def _calificar(self, inscripcion, tipo):
+        Calificacion.objects.create(
+            alumno_comision=inscripcion, tipo=tipo, numero=1, nota=7, fecha_creacion=timezone.now()
+        )
+
+    def _consultas_dashboard(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(reverse('docentes'))
+        assert respuesta.status_code == 200
+        # La caché compartida (tabla en la base y el savepoint de su escritura) no cuenta
+        return sum(
+            1 for consulta in consultas.captured_queries
+            if 'cache_compartida' not in consulta['sql'] and 'SAVEPOINT' not in consulta['sql']
+        )
+
+    def test_estadisticas_por_comision(self, django_assert_num_queries):
+        comision, (completo, incompleto, sin_notas) = self._comision(3, dia=self.hoy)
+        self._calificar(completo, TipoCalificacion.PARCIAL)
+        self._calificar(completo, TipoCalificacion.TRABAJO_PRACTICO)
+        self._calificar(incompleto, TipoCalificacion.PARCIAL)
+        self._comision(2)
+        self._comision(4, estado=EstadoComision.FINALIZADA, dia=self.hoy)
+
+        with django_assert_num_queries(2):
+            datos = construir_dashboard_docente(self.docente)
+
+        primera, segunda = datos['comisiones_con_stats']
+        assert (primera['comision'], primera['total_alumnos'], primera['calificaciones_pendientes']) == (comision, 3, 2)
+        assert (segunda['total_alumnos'], segunda['calificaciones_pendientes']) == (2, 2)
+        assert datos['comisiones_hoy'] == [comision]
+        assert len(datos['comisiones_finalizadas']) == 1
+        assert (datos['total_comisiones'], datos['total_alumnos'], datos['clases_hoy']) == (2, 9, 2)
+
+    def test_consultas_no_dependen_de_comisiones_ni_alumnos(self):
+        _, inscripciones = self._comision(2)
+        self._calificar(inscripciones[0], TipoCalificacion.PARCIAL)
+        base = self._consultas_dashboard()
+        # Sesión, usuario, permisos, docente, institución y las 2 del panel
+        assert base <= 9
+
+        for _ in range(7):
+            _, inscripciones = self._comision(10)
+            for inscripcion in inscripciones[:5]:
+                self._calificar(inscripcion, TipoCalificacion.PARCIAL)
+        self._comision(5, estado=EstadoComision.FINALIZADA)
+
+        assert self._consultas_dashboard() == base
+
+    def test_cache_por_docente_e_invalidacion(self):
+        _, (inscripcion,) = self._comision(1)
+        self.client.get(reverse('docentes'))
+
+        with CaptureQueriesContext(connection) as consultas:
+            respuesta = self.client.get(reverse('docentes'))
+        assert not any('institucional_inscripciones_alumnos_comisiones' in q['sql'] for q in consultas.captured_queries)
+        assert respuesta.context['comisiones_con_stats'][0]['calificaciones_pendientes'] == 1
+
+        self._calificar(inscripcion, TipoCalificacion.PARCIAL)
+        respuesta = self.client.get(reverse('docentes'))
+        assert respuesta.context['comisiones_con_stats'][0]['calificaciones_pendientes'] == 0
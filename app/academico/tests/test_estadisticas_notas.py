@@ -0,0 +1,94 @@
+import io
+import pytest
+from datetime import date, time
+from openpyxl import load_workbook
+from academico.models import (
+    AnioAcademico, Comision, EstadoComision,
+    InscripcionAlumnoComision, Alumno, Materia, TipoCalificacion, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from administracion.reportes_utils import generar_excel_reporte_academico, obtener_datos_reporte_academico
+from administracion.services.estadisticas_notas import calcular_estadisticas_notas
+
+
+@pytest.mark.django_db
+class TestEstadisticasNotas:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-EST")
+        materia = Materia.objects.create(codigo="EST", nombre="Estadística", plan_estudio=plan)
+        self.comisiones = []
+        for numero in (1, 2, 3):
+            comision = Comision.objects.create(
+                codigo=f"EST-{numero}",
+                materia=materia,
+                anio_academico=self.anio,
+                horario_inicio=time(8, 0),
+                horario_fin=time(10, 0),
+                dia_cursado=numero,
+                turno=Turno.MANANA,
+                estado=EstadoComision.EN_CURSO
+            )
+            self.comisiones.append(comision)
+
+        notas_por_comision = ([4, 6], [7, 9], [8, 10])
+        for comision, notas in zip(self.comisiones, notas_por_comision):
+            alumnos = []
+            for i in range(len(notas)):
+                alumno = Alumno.objects.create(dni=f"36{comision.dia_cursado}0000{i}", nombre=f"A{i}", apellido="Test")
+                InscripcionAlumnoComision.objects.create(alumno=alumno, comision=comision)
+                alumnos.append(alumno)
+            ServiciosAcademico.crear_calificaciones_bulk(
+                comision, TipoCalificacion.PARCIAL, 1, date(2030, 4, 1),
+                {alumno.id: nota for alumno, nota in zip(alumnos, notas)}
+            )
+
+    def test_estadisticas_del_anio(self, django_assert_num_queries):
+        with django_assert_num_queries(2):
+            estadisticas = calcular_estadisticas_notas({'anio_academico': self.anio.id})
+
+        assert estadisticas['cantidad'] == 6
+        assert estadisticas['promedio'] == 7.33
+        assert estadisticas['desvio'] == 1.97
+        assert estadisticas['minimo'] == 4 and estadisticas['maximo'] == 10
+        assert dict(estadisticas['percentiles'])[50] == 7.5
+        assert estadisticas['tasa_aprobacion'] == 83.33
+        assert dict(estadisticas['distribucion']) == {
+            '0-1': 0, '1-2': 0, '2-3': 0, '3-4': 0, '4-5': 1,
+            '5-6': 0, '6-7': 1, '7-8': 1, '8-9': 1, '9-10': 2,
+        }
+
+        [parcial] = estadisticas['por_tipo']
+        assert parcial['tipo'] == TipoCalificacion.PARCIAL and parcial['tasa_aprobacion'] == 83.33
+
+        # Promedios por comisión 5, 8 y 9: z-scores respecto de su media (7.33)
+        z_scores = {fila['nombre']: fila['z_score'] for fila in estadisticas['por_comision']}
+        assert z_scores == {'Estadística - EST-3': 0.98, 'Estadística - EST-2': 0.39, 'Estadística - EST-1': -1.37}
+
+    def test_filtro_por_comision_y_sin_notas(self):
+        estadisticas = calcular_estadisticas_notas({'comision_id': self.comisiones[0].id})
+        assert estadisticas['cantidad'] == 2 and estadisticas['tasa_aprobacion'] == 50.0
+        assert estadisticas['por_comision'][0]['z_score'] == 0
+
+        otro_anio = AnioAcademico.objects.create(
+            nombre="2031", fecha_inicio=date(2031, 3, 3), fecha_fin=date(2031, 4, 30)
+        )
+        assert calcular_estadisticas_notas({'anio_academico': otro_anio.id}) is None
+
+    def test_alimenta_reporte_y_excel(self):
+        datos = obtener_datos_reporte_academico({'anio_academico': self.anio.id})
+
+        assert datos['estadisticas']['promedio_general'] == 7.33
+        assert datos['estadisticas']['mediana'] == 7.5
+        assert datos['estadisticas_notas']['cantidad'] == 6
+
+        libro = load_workbook(io.BytesIO(generar_excel_reporte_academico(datos)))
+        hoja = libro["Estadísticas de Notas"]
+        assert [hoja['A4'].value, hoja['B4'].value] == ['Promedio', 7.33]
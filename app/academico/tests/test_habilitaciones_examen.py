@@ -0,0 +1,129 @@
+import io
+import pytest
+from datetime import date, time, timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from academico.habilitaciones_examen import habilitados_para_mesa
+from academico.models import (
+    AnioAcademico, Comision, MateriaAnalitico, InscripcionAlumnoComision, InscripcionMesaExamen,
+    Alumno, Materia, MesaExamen, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from institucional.digitos_verificadores import GestorDigitosVerificadores
+
+
+@pytest.mark.django_db
+class TestHabilitacionesExamen:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+            nota_aprobacion=6
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-HAB")
+        self.materia = Materia.objects.create(codigo="HAB1", nombre="Materia", plan_estudio=plan)
+        self.comisiones = [
+            Comision.objects.create(
+                codigo=f"HAB-{i}",
+                materia=self.materia,
+                anio_academico=self.anio,
+                horario_inicio=time(8, 0),
+                horario_fin=time(10, 0),
+                dia_cursado=1,
+                turno=Turno.MANANA
+            )
+            for i in range(2)
+        ]
+        ahora = timezone.now()
+        self.mesa = MesaExamen.objects.create(
+            materia=self.materia,
+            anio_academico=self.anio,
+            fecha_examen=ahora + timedelta(days=10),
+            fecha_limite_inscripcion=ahora + timedelta(days=5),
+            cupo_maximo=3
+        )
+        self.cantidad = 0
+
+    def _alumno(self, *condiciones):
+        self.cantidad += 1
+        alumno = Alumno.objects.create(dni=f"36000{self.cantidad:03d}", nombre=f"A{self.cantidad}", apellido="Hab")
+        for comision, condicion in zip(self.comisiones, condiciones):
+            InscripcionAlumnoComision.objects.create(alumno=alumno, comision=comision, condicion=condicion)
+        return alumno
+
+    def _habilitacion(self, alumno):
+        return MateriaAnalitico.objects.filter(alumno=alumno, materia=self.materia).values_list(
+            'condicion', 'aprobada'
+        ).first()
+
+    def test_tabla_sigue_a_las_cursadas(self):
+        alumno = self._alumno('LIBRE')
+        assert self._habilitacion(alumno) == ('LIBRE', False)
+
+        # Recursa y regulariza: cuenta la mejor condición
+        segunda = InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comisiones[1], condicion='REGULAR')
+        assert self._habilitacion(alumno) == ('REGULAR', False)
+
+        inscripcion = InscripcionMesaExamen(alumno=alumno, mesa_examen=self.mesa)
+        inscripcion.clean()
+        assert inscripcion.condicion == 'REGULAR'
+        inscripcion.save()
+
+        ServiciosAcademico.cargar_notas_mesa(self.mesa, {inscripcion.pk: 8})
+        assert self._habilitacion(alumno) == ('REGULAR', True)
+
+        # El examen aprobó la primera cursada; sin la regular queda libre
+        segunda.delete()
+        assert self._habilitacion(alumno) == ('LIBRE', True)
+
+        MateriaAnalitico.objects.all().delete()
+        salida = io.StringIO()
+        call_command('recalcular_analitico', stdout=salida)
+        assert 'Filas corregidas: 1' in salida.getvalue()
+        assert self._habilitacion(alumno) == ('LIBRE', True)
+
+    def test_inscribir_habilitados_hasta_completar_cupo(self):
+        ya_inscripto = self._alumno('REGULAR')
+        ServiciosAcademico.inscribir_alumno_mesa(ya_inscripto, self.mesa)
+        aprobado = self._alumno('REGULAR')
+        InscripcionAlumnoComision.objects.filter(alumno=aprobado).update(estado_inscripcion='APROBADA')
+        call_command('recalcular_analitico', stdout=io.StringIO())
+        habilitados = [self._alumno('REGULAR'), self._alumno('LIBRE'), self._alumno('CURSANDO')]
+
+        assert set(habilitados_para_mesa(self.mesa).values_list('alumno_id', flat=True)) == {a.pk for a in habilitados}
+
+        resultado = ServiciosAcademico.inscribir_habilitados_mesa(self.mesa)
+
+        assert resultado == {'inscriptos': 2, 'sin_cupo': 1}
+        mesa = MesaExamen.objects.get(pk=self.mesa.pk)
+        assert mesa.inscriptos == 3 == InscripcionMesaExamen.objects.filter(mesa_examen=mesa).count()
+        condiciones = dict(InscripcionMesaExamen.objects.values_list('alumno_id', 'condicion'))
+        assert condiciones[habilitados[0].pk] == 'REGULAR'
+        assert aprobado.pk not in condiciones
+        for inscripcion in InscripcionMesaExamen.objects.exclude(alumno=ya_inscripto):
+            assert GestorDigitosVerificadores.verificar_integridad_instancia(
+                inscripcion, ['nota_examen', 'condicion', 'estado_inscripcion']
+            )
+
+        # Sin cupo no se inscribe a nadie más
+        assert ServiciosAcademico.inscribir_habilitados_mesa(self.mesa) == {'inscriptos': 0, 'sin_cupo': 1}
+
+    def test_consultas_no_dependen_de_la_cantidad(self):
+        MesaExamen.objects.filter(pk=self.mesa.pk).update(cupo_maximo=100)
+
+        def consultas(cantidad):
+            for _ in range(cantidad):
+                self._alumno('REGULAR')
+            with CaptureQueriesContext(connection) as capturadas:
+                assert ServiciosAcademico.inscribir_habilitados_mesa(self.mesa)['inscriptos'] == cantidad
+            return len(capturadas)
+
+        # La primera inscripción crea el registro de DVV
+        consultas(1)
+        assert consultas(2) == consultas(10)
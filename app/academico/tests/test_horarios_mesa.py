@@ -0,0 +1,126 @@
+import io
+import pytest
+from datetime import date, timedelta
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from academico.horarios_mesa import reporte_conflictos
+from academico.models import AnioAcademico, EstadoMesaExamen, Materia, MesaExamen
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from institucional.models import Persona
+
+
+@pytest.mark.django_db
+class TestHorariosMesa:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-HOR")
+        self.materia = Materia.objects.create(codigo="HOR1", nombre="Materia", plan_estudio=plan)
+        self.docentes = [
+            Persona.objects.create(dni=f"37000{i:03d}", nombre=f"D{i}", apellido="Tribunal") for i in range(6)
+        ]
+        self.inicio = (timezone.now() + timedelta(days=30)).replace(hour=8, minute=0, second=0, microsecond=0)
+
+    def _mesa(self, horas, aula=None, duracion=120, guardar=True):
+        mesa = MesaExamen(
+            materia=self.materia,
+            anio_academico=self.anio,
+            fecha_examen=self.inicio + timedelta(hours=horas),
+            fecha_limite_inscripcion=self.inicio - timedelta(days=5),
+            duracion_minutos=duracion,
+            aula=aula,
+        )
+        if guardar:
+            mesa.save()
+        return mesa
+
+    def test_valida_aula_y_tribunal_al_guardar(self):
+        primera = self._mesa(0, aula="101")
+        primera.tribunal.add(self.docentes[0], self.docentes[1])
+
+        with pytest.raises(ValidationError, match="El aula 101 ya está ocupada"), transaction.atomic():
+            self._mesa(1, aula="101")
+        # Intervalos contiguos no se superponen
+        contigua = self._mesa(2, aula="101")
+
+        otra = self._mesa(1, aula="102")
+        with pytest.raises(ValidationError, match="ya integra el tribunal"), transaction.atomic():
+            otra.tribunal.add(self.docentes[1])
+        otra.tribunal.add(self.docentes[2])
+
+        # Mover una mesa con tribunal sobre otra de sus docentes
+        contigua.tribunal.add(self.docentes[0])
+        contigua.fecha_examen = otra.fecha_examen
+        contigua.aula = "103"
+        with pytest.raises(ValidationError, match="ya integra el tribunal"), transaction.atomic():
+            contigua.save()
+
+    def test_mesa_en_conflicto_se_guarda_sin_cambiar_horario(self):
+        # Dos mesas superpuestas en el aula, cargadas sin validar
+        mesas = MesaExamen.objects.bulk_create([self._mesa(0, aula="101", guardar=False), self._mesa(1, aula="101", guardar=False)])
+
+        mesa = MesaExamen.objects.get(pk=mesas[1].pk)
+        mesa.estado = EstadoMesaExamen.CERRADA
+        with CaptureQueriesContext(connection) as capturadas:
+            mesa.save()
+        assert len(capturadas) == 1
+        assert MesaExamen.objects.get(pk=mesa.pk).estado == EstadoMesaExamen.CERRADA
+
+        # Cambiar el horario sigue validando
+        mesa.duracion_minutos = 90
+        with pytest.raises(ValidationError, match="El aula 101 ya está ocupada"), transaction.atomic():
+            mesa.save()
+
+    def test_reporte_de_conflictos_del_periodo(self):
+        # Mesas cargadas sin validar (p. ej. importadas)
+        mesas = MesaExamen.objects.bulk_create([
+            self._mesa(0, aula="101", guardar=False),
+            self._mesa(1, aula="101", guardar=False),
+            self._mesa(1.5, aula="102", guardar=False),
+            self._mesa(4, aula="101", guardar=False),
+        ])
+        mesas[0].tribunal.add(self.docentes[0])
+        MesaExamen.tribunal.through.objects.create(mesaexamen=mesas[2], persona=self.docentes[0])
+
+        conflictos = ServiciosAcademico.conflictos_mesas_examen(self.inicio, self.inicio + timedelta(days=1))
+        assert conflictos == [
+            {'tipo': 'aula', 'recurso': '101', 'mesas': (mesas[0].pk, mesas[1].pk)},
+            {'tipo': 'docente', 'recurso': self.docentes[0].pk, 'mesas': (mesas[0].pk, mesas[2].pk)},
+        ]
+
+        salida = io.StringIO()
+        dia = self.inicio.date().isoformat()
+        call_command('conflictos_mesas_examen', '--desde', dia, '--hasta', dia, stdout=salida)
+        assert 'Aula 101' in salida.getvalue()
+        assert 'Conflictos encontrados: 2' in salida.getvalue()
+
+    def test_propone_cronograma_sin_conflictos(self):
+        mesas = MesaExamen.objects.bulk_create([self._mesa(0, guardar=False) for _ in range(200)])
+        MesaExamen.tribunal.through.objects.bulk_create([
+            MesaExamen.tribunal.through(mesaexamen=mesa, persona=self.docentes[(i + j) % len(self.docentes)])
+            for i, mesa in enumerate(mesas) for j in range(3)
+        ])
+        fija = self._mesa(0, aula="A1")
+        horarios = [self.inicio + timedelta(days=dia, hours=hora) for dia in range(40) for hora in (0, 3, 6)]
+        seleccion = MesaExamen.objects.exclude(pk=fija.pk)
+
+        with CaptureQueriesContext(connection) as capturadas:
+            resultado = ServiciosAcademico.proponer_cronograma_mesas(seleccion, horarios, aulas=["A1", "A2"])
+        assert len(capturadas) == 4
+
+        assert resultado['sin_lugar'] == []
+        assert len(resultado['propuesta']) == 200
+        for mesa in mesas:
+            mesa.fecha_examen = resultado['propuesta'][mesa.pk]['fecha_examen']
+            mesa.aula = resultado['propuesta'][mesa.pk]['aula']
+        MesaExamen.objects.bulk_update(mesas, ['fecha_examen', 'aula'])
+        assert reporte_conflictos(MesaExamen.objects.all()) == []
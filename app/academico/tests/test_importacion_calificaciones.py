@@ -0,0 +1,125 @@
+import io
+import zipfile
+import pytest
+from datetime import date, time
+from decimal import Decimal
+from django.core.files.uploadedfile import SimpleUploadedFile
+from openpyxl import Workbook
+from academico.exceptions import PlanillaInvalidaError
+from academico.importacion_calificaciones import importar_calificaciones
+from academico.models import (
+    AnioAcademico, Calificacion, Comision, EstadoComision,
+    InscripcionAlumnoComision, Alumno, Materia, TipoCalificacion, Turno
+)
+from administracion.models import PlanEstudio
+
+
+def _xlsx(filas, nombre='notas.xlsx'):
+    libro = Workbook()
+    for fila in filas:
+        libro.active.append(fila)
+    buffer = io.BytesIO()
+    libro.save(buffer)
+    return SimpleUploadedFile(nombre, buffer.getvalue())
+
+
+def _csv(texto, nombre='notas.csv'):
+    return SimpleUploadedFile(nombre, texto.encode('utf-8'))
+
+
+@pytest.mark.django_db
+class TestImportacionCalificaciones:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-IMP")
+        materia = Materia.objects.create(codigo="IMP", nombre="Sistemas Operativos", plan_estudio=plan)
+        self.comision = Comision.objects.create(
+            codigo="IMP-1",
+            materia=materia,
+            anio_academico=anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=4,
+            turno=Turno.MANANA,
+            estado=EstadoComision.EN_CURSO
+        )
+        self.alumnos = []
+        for i in range(3):
+            alumno = Alumno.objects.create(dni=f"3500000{i}", nombre=f"A{i}", apellido="Test")
+            InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comision)
+            self.alumnos.append(alumno)
+        Alumno.objects.create(dni="35999999", nombre="Otro", apellido="Comision")
+
+    def _importar(self, archivo):
+        return importar_calificaciones(self.comision, archivo, TipoCalificacion.PARCIAL, 1, date(2030, 4, 3))
+
+    def _notas(self):
+        return dict(Calificacion.objects.values_list('alumno_comision__alumno__dni', 'nota'))
+
+    def test_csv_por_dni_con_punto_y_coma(self):
+        resultado = self._importar(_csv("DNI;Apellido;Nota\n35000000;Test;7,5\n35000001;Test;9\n"))
+
+        assert resultado['errores'] == []
+        assert len(resultado['creadas']) == 2
+        assert self._notas() == {'35000000': Decimal('7.5'), '35000001': Decimal('9')}
+
+    def test_xlsx_por_legajo(self):
+        filas = [['Legajo', 'Nota']] + [[alumno.legajo, 6] for alumno in self.alumnos]
+
+        resultado = self._importar(_xlsx(filas))
+
+        assert resultado['errores'] == []
+        assert self._notas() == {alumno.dni: Decimal('6') for alumno in self.alumnos}
+
+        # Reimportar actualiza las existentes
+        filas[1][1] = 10
+        resultado = self._importar(_xlsx(filas))
+        assert len(resultado['actualizadas']) == 1 and not resultado['creadas']
+
+    def test_reporta_errores_por_fila_sin_guardar(self):
+        planilla = _xlsx([
+            ['DNI', 'Nota'],
+            [35000000, 8],
+            [35999999, 7],
+            [35000001, 'diez'],
+            [35000002, 11],
+            [35000000, 5],
+            [None, 4],
+        ])
+
+        resultado = self._importar(planilla)
+
+        assert [(error['fila'], error['identificador']) for error in resultado['errores']] == [
+            (3, '35999999'), (4, '35000001'), (5, '35000002'), (6, '35000000'), (7, '')
+        ]
+        assert not Calificacion.objects.exists()
+
+    def test_planilla_sin_encabezados_esperados(self):
+        with pytest.raises(PlanillaInvalidaError):
+            self._importar(_csv("Alumno,Puntaje\nx,1\n"))
+        with pytest.raises(PlanillaInvalidaError):
+            self._importar(_csv("DNI,Nota\n", nombre='notas.txt'))
+
+    def test_csv_guardado_en_cp1252(self):
+        texto = f"Apellido;DNI;Nota\nNúñez;{self.alumnos[0].dni};7\n"
+        resultado = self._importar(SimpleUploadedFile('notas.csv', texto.encode('cp1252')))
+
+        assert resultado['errores'] == []
+        assert Calificacion.objects.get().nota == Decimal('7')
+
+    def test_xlsx_danado_o_con_otro_formato(self):
+        with pytest.raises(PlanillaInvalidaError, match="no es una planilla XLSX válida"):
+            self._importar(SimpleUploadedFile('notas.xlsx', b'DNI,Nota\n35000000,7\n'))
+
+        # Un ZIP que no es un libro de Excel
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archivo_zip:
+            archivo_zip.writestr('notas.txt', 'x')
+        with pytest.raises(PlanillaInvalidaError, match="no es una planilla XLSX válida"):
+            self._importar(SimpleUploadedFile('notas.xlsx', buffer.getvalue()))
@@ -0,0 +1,104 @@
+import time as reloj
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time, timedelta
+from threading import Barrier
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+from academico.analitico import actualizar_analitico
+from academico.inscripcion_mesa import MENSAJE_EXITO
+from academico.models import (
+    AnioAcademico, Comision, EstadoInscripcionMesa, InscripcionAlumnoComision, InscripcionMesaExamen,
+    Alumno, Materia, MesaExamen, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+
+ALUMNOS = 500
+CUPO = 120
+HILOS = 50
+
+
+def _lecturas_sin_bloqueo(sender, connection, **kwargs):
+    # La base de test de SQLite en memoria usa caché compartida con bloqueos por
+    # tabla también para lecturas; en disco con WAL las lecturas no bloquean
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA read_uncommitted = 1')
+
+
+@pytest.mark.django_db(transaction=True)
+class TestInscripcionMesaConcurrente:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        connection_created.connect(_lecturas_sin_bloqueo)
+        anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-CON")
+        materia = Materia.objects.create(codigo="CON1", nombre="Materia", plan_estudio=plan)
+        comision = Comision.objects.create(
+            codigo="CON-1",
+            materia=materia,
+            anio_academico=anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=1,
+            turno=Turno.MANANA
+        )
+        self.alumnos = [
+            Alumno.objects.create(dni=f"33{i:06d}", nombre=f"A{i}", apellido="Concurrente", legajo=f"C-{i}")
+            for i in range(ALUMNOS)
+        ]
+        InscripcionAlumnoComision.objects.bulk_create([
+            InscripcionAlumnoComision(alumno=alumno, comision=comision, condicion='REGULAR')
+            for alumno in self.alumnos
+        ])
+        # bulk_create no dispara las señales que mantienen las habilitaciones
+        actualizar_analitico([alumno.pk for alumno in self.alumnos])
+        ahora = timezone.now()
+        self.mesa = MesaExamen.objects.create(
+            materia=materia,
+            anio_academico=anio,
+            fecha_examen=ahora + timedelta(days=10),
+            fecha_limite_inscripcion=ahora + timedelta(days=5),
+            cupo_maximo=CUPO
+        )
+        yield
+        connection_created.disconnect(_lecturas_sin_bloqueo)
+
+    def test_sin_sobreventa_con_inscripciones_simultaneas(self):
+        largada = Barrier(HILOS)
+
+        def inscribir(alumno):
+            try:
+                if alumno.pk <= self.alumnos[HILOS - 1].pk:
+                    largada.wait()
+                inicio = reloj.perf_counter()
+                mesa = MesaExamen.objects.get(pk=self.mesa.pk)
+                exito, mensaje = ServiciosAcademico.inscribir_alumno_mesa(alumno, mesa)
+                return exito, mensaje, reloj.perf_counter() - inicio
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=HILOS) as pool:
+            resultados = list(pool.map(inscribir, self.alumnos))
+
+        exitos = [r for r in resultados if r[0]]
+        assert len(exitos) == CUPO
+        assert {r[1] for r in exitos} == {MENSAJE_EXITO}
+        rechazos = {r[1] for r in resultados if not r[0]}
+        assert rechazos <= {"No hay cupos disponibles en esta mesa.", "Esta mesa no acepta inscripciones."}
+
+        mesa = MesaExamen.objects.get(pk=self.mesa.pk)
+        reales = InscripcionMesaExamen.objects.filter(
+            mesa_examen=mesa, estado_inscripcion=EstadoInscripcionMesa.INSCRIPTO
+        ).count()
+        assert mesa.inscriptos == reales == CUPO
+
+        latencias = sorted(r[2] for r in resultados)
+        p99 = latencias[int(len(latencias) * 0.99) - 1]
+        assert p99 < 5
@@ -0,0 +1,130 @@
+import pytest
+import numpy as np
+from datetime import date, time
+from academico.matriz_asistencia import (
+    construir_matriz_asistencia, construir_matrices_asistencia, racha_maxima, pendiente_tendencia
+)
+from academico.models import (
+    AnioAcademico, Asistencia, Comision, EstadoComision,
+    InscripcionAlumnoComision, Alumno, Materia, Turno
+)
+from administracion.models import PlanEstudio
+
+
+def test_racha_maxima_por_fila():
+    ausentes = np.array([
+        [True, True, False, True, True, True],
+        [False, False, False, False, False, False],
+        [True, False, True, False, True, True],
+    ])
+
+    assert racha_maxima(ausentes).tolist() == [3, 0, 2]
+
+
+def test_pendiente_tendencia_ignora_clases_sin_registro():
+    presentes = np.array([
+        [False, False, True, True],
+        [True, True, False, False],
+        [True, True, True, True],
+    ])
+    registradas = np.ones_like(presentes)
+    registradas[2, :2] = False
+
+    pendientes = pendiente_tendencia(presentes, registradas)
+
+    assert pendientes[0] > 0
+    assert pendientes[1] < 0
+    assert pendientes[2] == 0
+
+
+def test_pendiente_tendencia_usa_las_ultimas_clases_registradas_de_cada_fila():
+    presentes = np.array([
+        [False, True, False, False],
+        [True, False, True, True],
+    ])
+    # La primera fila no tiene registros en las dos últimas clases de la comisión
+    registradas = np.array([
+        [True, True, False, False],
+        [True, True, True, True],
+    ])
+
+    pendientes = pendiente_tendencia(presentes, registradas, ultimas=2)
+
+    assert pendientes[0] > 0
+    assert pendientes[1] == 0
+
+
+@pytest.mark.django_db
+class TestMatrizAsistencia:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-MAT")
+        materia = Materia.objects.create(codigo="MAT", nombre="Matemática", plan_estudio=plan)
+        self.comision = Comision.objects.create(
+            codigo="MAT-1",
+            materia=materia,
+            anio_academico=self.anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=1,  # Lunes
+            turno=Turno.MANANA,
+            estado=EstadoComision.EN_CURSO
+        )
+        self.inscripciones = []
+        for i, apellido in enumerate(["Zapata", "Alvarez"]):
+            alumno = Alumno.objects.create(dni=f"3200000{i}", nombre=f"A{i}", apellido=apellido)
+            self.inscripciones.append(
+                InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comision)
+            )
+
+        # Lunes de clase hasta el 1/4: 11, 18, 25 de marzo y 1 de abril
+        self.hasta = date(2030, 4, 1)
+        Asistencia.objects.filter(alumno_comision=self.inscripciones[0]).update(esta_presente=True)
+        Asistencia.objects.filter(
+            alumno_comision=self.inscripciones[1],
+            fecha_asistencia=date(2030, 3, 11)
+        ).update(esta_presente=True)
+
+    def test_matriz_de_una_comision(self):
+        matriz = construir_matriz_asistencia(self.comision, hasta=self.hasta)
+
+        assert matriz.fechas == [date(2030, 3, 11), date(2030, 3, 18), date(2030, 3, 25), date(2030, 4, 1)]
+        # Filas ordenadas por apellido
+        assert [alumno[1] for alumno in matriz.alumnos] == ["Alvarez", "Zapata"]
+        assert matriz.presentes.tolist() == [
+            [True, False, False, False],
+            [True, True, True, True],
+        ]
+        assert matriz.porcentajes().tolist() == [25.0, 100.0]
+        assert matriz.rachas_ausencia().tolist() == [3, 0]
+        assert matriz.concurrencia().tolist() == [100.0, 50.0, 50.0, 50.0]
+
+        filas = matriz.resumen(porcentaje_requerido=75)
+        assert filas[0]['en_riesgo'] and not filas[1]['en_riesgo']
+        assert filas[0]['tendencia'] < 0
+        assert filas[0]['celdas'] == ['P', 'A', 'A', 'A']
+
+    def test_matrices_de_varias_comisiones_con_una_consulta(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            matrices = construir_matrices_asistencia([self.comision.pk, 0], hasta=self.hasta)
+
+        assert matrices[self.comision.pk].presentes.shape == (2, 4)
+        assert matrices[0].presentes.shape == (0, 0)
+
+    def test_alumno_inscripto_sin_asistencias(self):
+        alumno = Alumno.objects.create(dni="32000009", nombre="N", apellido="Nuevo")
+        inscripcion = InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comision)
+        Asistencia.objects.filter(alumno_comision=inscripcion).delete()
+
+        matriz = construir_matriz_asistencia(self.comision, hasta=self.hasta)
+
+        assert [alumno[1] for alumno in matriz.alumnos] == ["Alvarez", "Nuevo", "Zapata"]
+        assert len(matriz.fechas) == 4
+        fila = matriz.resumen(porcentaje_requerido=75)[1]
+        assert (fila['celdas'], fila['porcentaje'], fila['en_riesgo']) == (['', '', '', ''], 0.0, False)
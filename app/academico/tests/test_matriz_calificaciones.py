@@ -0,0 +1,77 @@
+import io
+import pytest
+from datetime import date, time
+from decimal import Decimal
+from openpyxl import load_workbook
+from academico.matriz_calificaciones import construir_matriz_calificaciones, generar_excel_calificaciones
+from academico.models import (
+    AnioAcademico, Comision, EstadoComision,
+    InscripcionAlumnoComision, Alumno, Materia, TipoCalificacion, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+
+
+@pytest.mark.django_db
+class TestMatrizCalificaciones:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-NOT")
+        materia = Materia.objects.create(codigo="NOT", nombre="Redes", plan_estudio=plan)
+        self.comision = Comision.objects.create(
+            codigo="NOT-1",
+            materia=materia,
+            anio_academico=anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=3,
+            turno=Turno.MANANA,
+            estado=EstadoComision.EN_CURSO
+        )
+        self.alumnos = []
+        for i, apellido in enumerate(["Zapata", "Alvarez", "Moreno"]):
+            alumno = Alumno.objects.create(dni=f"3400000{i}", nombre=f"A{i}", apellido=apellido)
+            InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comision)
+            self.alumnos.append(alumno)
+
+        zapata, alvarez, _ = self.alumnos
+        cargar = ServiciosAcademico.crear_calificaciones_bulk
+        cargar(self.comision, TipoCalificacion.PARCIAL, 1, date(2030, 4, 1), {zapata.id: 8, alvarez.id: 4})
+        cargar(self.comision, TipoCalificacion.PARCIAL, 2, date(2030, 4, 15), {zapata.id: 10})
+        cargar(self.comision, TipoCalificacion.TRABAJO_PRACTICO, 1, date(2030, 4, 8), {alvarez.id: 7})
+
+    def test_pivotea_y_promedia_en_una_pasada(self, django_assert_num_queries):
+        with django_assert_num_queries(3):
+            matriz = construir_matriz_calificaciones(self.comision)
+
+        assert [fila['alumno'].apellido for fila in matriz.filas] == ["Alvarez", "Moreno", "Zapata"]
+        assert matriz.tipos == [TipoCalificacion.PARCIAL, TipoCalificacion.TRABAJO_PRACTICO]
+        assert matriz.columnas == [
+            (TipoCalificacion.PARCIAL, 1), (TipoCalificacion.PARCIAL, 2), (TipoCalificacion.TRABAJO_PRACTICO, 1)
+        ]
+
+        alvarez, moreno, zapata = matriz.filas
+        assert [nota['nota'] for nota in zapata['calificaciones'][TipoCalificacion.PARCIAL]] == [Decimal('8'), Decimal('10')]
+        assert zapata['celdas'][(TipoCalificacion.PARCIAL, 2)]['nota'] == Decimal('10')
+        assert zapata['promedio'] == 9.0 and zapata['total_calificaciones'] == 2
+        assert alvarez['promedio'] == 5.5
+        assert moreno['promedio'] == 0 and moreno['calificaciones'] == {}
+
+        assert matriz.promedios_por_tipo == {TipoCalificacion.PARCIAL: 7.33, TipoCalificacion.TRABAJO_PRACTICO: 7.0}
+        assert matriz.promedios_por_columna[(TipoCalificacion.PARCIAL, 1)] == 6.0
+        assert matriz.promedio_general == 7.25
+
+    def test_excel_usa_la_misma_matriz(self):
+        matriz = construir_matriz_calificaciones(self.comision)
+
+        ws = load_workbook(io.BytesIO(generar_excel_calificaciones(self.comision, matriz))).active
+
+        assert [celda.value for celda in ws[4]][4:7] == ['PARCIAL 1', 'PARCIAL 2', 'TP 1']
+        assert [celda.value for celda in ws[5]][1:7] == ['Alvarez', 'A1', '34000001', 4, None, 7]
+        assert ws.cell(row=ws.max_row, column=ws.max_column).value == 7.25
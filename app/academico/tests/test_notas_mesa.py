@@ -0,0 +1,124 @@
+import pytest
+from datetime import date, time, timedelta
+from decimal import Decimal
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from academico.models import (
+    AnioAcademico, Calificacion, Comision, EstadoMateria, InscripcionAlumnoComision, InscripcionMesaExamen,
+    Alumno, Materia, MesaExamen, TipoCalificacion, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from institucional.digitos_verificadores import GestorDigitosVerificadores
+from institucional.models import Usuario
+
+
+@pytest.mark.django_db
+class TestNotasMesa:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+            nota_aprobacion=6
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-NOT")
+        self.materia = Materia.objects.create(codigo="NOT1", nombre="Materia", plan_estudio=plan)
+        self.comision = Comision.objects.create(
+            codigo="NOT-1",
+            materia=self.materia,
+            anio_academico=self.anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=1,
+            turno=Turno.MANANA
+        )
+        ahora = timezone.now()
+        self.mesa = MesaExamen.objects.create(
+            materia=self.materia,
+            anio_academico=self.anio,
+            fecha_examen=ahora + timedelta(days=10),
+            fecha_limite_inscripcion=ahora + timedelta(days=5),
+        )
+        self.usuario = Usuario.objects.create_user(email='mesa@test.com', password='x')
+        self.cantidad = 0
+
+    def _inscriptos(self, cantidad):
+        inscripciones = []
+        for _ in range(cantidad):
+            self.cantidad += 1
+            alumno = Alumno.objects.create(dni=f"32000{self.cantidad:03d}", nombre=f"A{self.cantidad}", apellido="Mesa")
+            InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comision, condicion='REGULAR')
+            inscripciones.append(InscripcionMesaExamen.objects.create(
+                mesa_examen=self.mesa, alumno=alumno, condicion='REGULAR'
+            ))
+        return inscripciones
+
+    def _cursada(self, inscripcion):
+        return InscripcionAlumnoComision.objects.get(alumno=inscripcion.alumno, comision=self.comision)
+
+    def test_carga_en_bloque(self):
+        aprobado, desaprobado, revertido, sin_nota = self._inscriptos(4)
+        ServiciosAcademico.cargar_nota_examen_final(revertido, 9, self.usuario)
+
+        resultado = ServiciosAcademico.cargar_notas_mesa(self.mesa, {
+            str(aprobado.pk): '8', str(desaprobado.pk): '4,5', str(revertido.pk): '2',
+            str(sin_nota.pk): '', '999999': '7', 'x': '7',
+        }, self.usuario)
+
+        assert (resultado['cargadas'], resultado['aprobados'], resultado['desaprobados']) == (3, 1, 2)
+        assert resultado['errores'] == ['Inscripción x no encontrada', 'Inscripción 999999 no encontrada']
+
+        filas = {i.pk: i for i in InscripcionMesaExamen.objects.filter(mesa_examen=self.mesa)}
+        assert (filas[aprobado.pk].estado_inscripcion, filas[aprobado.pk].nota_examen) == ('APROBADO', Decimal('8'))
+        assert filas[desaprobado.pk].estado_inscripcion == 'DESAPROBADO'
+        assert filas[sin_nota.pk].estado_inscripcion == 'INSCRIPTO'
+        assert MesaExamen.objects.get(pk=self.mesa.pk).inscriptos == 1
+
+        cursada = self._cursada(aprobado)
+        assert (cursada.estado_inscripcion, cursada.nota_final, cursada.cerrada_por) == (
+            EstadoMateria.APROBADA, Decimal('8'), self.usuario
+        )
+        cursada = self._cursada(revertido)
+        assert (cursada.estado_inscripcion, cursada.nota_final, cursada.fecha_cierre) == (EstadoMateria.REGULAR, None, None)
+
+        finales = dict(Calificacion.objects.filter(tipo=TipoCalificacion.FINAL).values_list('alumno_comision__alumno_id', 'nota'))
+        assert finales == {aprobado.alumno_id: Decimal('8'), desaprobado.alumno_id: Decimal('4.5'), revertido.alumno_id: Decimal('2')}
+        assert Alumno.objects.get(pk=aprobado.alumno_id).materias_aprobadas == 1
+        assert Alumno.objects.get(pk=revertido.alumno_id).materias_aprobadas == 0
+
+        # Digitos verificadores consistentes con lo escrito en bloque
+        for fila in (filas[aprobado.pk], filas[desaprobado.pk], filas[revertido.pk]):
+            assert GestorDigitosVerificadores.verificar_integridad_instancia(
+                fila, ['nota_examen', 'condicion', 'estado_inscripcion']
+            )
+        for calificacion in Calificacion.objects.all():
+            assert GestorDigitosVerificadores.verificar_integridad_instancia(
+                calificacion, ['nota', 'tipo', 'numero', 'fecha_creacion']
+            )
+        assert GestorDigitosVerificadores.verificar_integridad_tabla('InscripcionMesaExamen')[0]
+        assert GestorDigitosVerificadores.verificar_integridad_tabla('Calificacion')[0]
+
+    def test_consultas_no_dependen_de_la_cantidad(self):
+        def consultas(inscripciones):
+            notas = {inscripcion.pk: 7 for inscripcion in inscripciones}
+            with CaptureQueriesContext(connection) as capturadas:
+                resultado = ServiciosAcademico.cargar_notas_mesa(self.mesa, notas, self.usuario)
+            assert resultado['cargadas'] == len(inscripciones)
+            return len(capturadas)
+
+        # La primera carga crea los registros de DVV
+        consultas(self._inscriptos(1))
+        pocas = consultas(self._inscriptos(2))
+        muchas = consultas(self._inscriptos(10))
+        assert pocas == muchas
+
+        # Volver a enviar las mismas notas no escribe nada
+        with CaptureQueriesContext(connection) as capturadas:
+            ServiciosAcademico.cargar_notas_mesa(
+                self.mesa, {i.pk: 7 for i in InscripcionMesaExamen.objects.all()}, self.usuario
+            )
+        assert not [q for q in capturadas.captured_queries if q['sql'].startswith(('UPDATE', 'INSERT'))]
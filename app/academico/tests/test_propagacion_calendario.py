@@ -0,0 +1,191 @@
+import pytest
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from academico.calendario import ReglaCalendario
+from academico.exceptions import FechaNoClaseError
+from academico.models import (
+    AnioAcademico, Asistencia, CalendarioAcademico, Comision, EstadoComision,
+    InscripcionAlumnoComision, Alumno, Materia, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from institucional.models import AuditoriaDatos, TipoAccionDatos
+
+
+@pytest.mark.django_db
+class TestPropagacionCalendario:
+    """Cambios del calendario (regla semanal y excepciones) reflejados en las asistencias"""
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-CAL")
+        materia = Materia.objects.create(codigo="CAL", nombre="Cálculo", plan_estudio=plan)
+
+        def crear_comision(codigo, estado):
+            return Comision.objects.create(
+                codigo=codigo,
+                materia=materia,
+                anio_academico=self.anio,
+                horario_inicio=time(8, 0),
+                horario_fin=time(10, 0),
+                dia_cursado=1,  # Lunes
+                turno=Turno.MANANA,
+                estado=estado
+            )
+
+        self.comision = crear_comision("CAL-1", EstadoComision.EN_CURSO)
+        self.comision_cerrada = crear_comision("CAL-2", EstadoComision.FINALIZADA)
+
+        for i in range(3):
+            alumno = Alumno.objects.create(dni=f"3100000{i}", nombre=f"A{i}", apellido="Test")
+            InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comision)
+            InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comision_cerrada)
+
+        # Primer lunes de clase del año (el 4/3 es Carnaval)
+        self.lunes = date(2030, 3, 11)
+
+    def _asistencias(self, comision, fecha=None):
+        return Asistencia.objects.filter(
+            alumno_comision__comision=comision,
+            fecha_asistencia=fecha or self.lunes
+        ).count()
+
+    def _crear_excepcion(self, **kwargs):
+        datos = {
+            'anio_academico': self.anio,
+            'fecha_inicio': self.lunes,
+            'fecha_fin': self.lunes,
+            'es_dia_clase': False,
+            'descripcion': 'Paro docente',
+        }
+        datos.update(kwargs)
+        return CalendarioAcademico.objects.create(**datos)
+
+    def test_regla_semanal_con_feriados(self):
+        fechas = self.anio.fechas_clase(1)
+
+        assert date(2030, 3, 4) not in fechas
+        assert fechas[0] == self.lunes
+        assert all(fecha.weekday() == 0 for fecha in fechas)
+        assert self._asistencias(self.comision) == 3
+        assert self._asistencias(self.comision, date(2030, 3, 4)) == 0
+
+    def test_excepcion_sin_clase_elimina_asistencias_de_comisiones_en_curso(self):
+        self._crear_excepcion()
+
+        assert self.lunes not in self.anio.fechas_clase(1)
+        assert self._asistencias(self.comision) == 0
+        # Las comisiones cerradas conservan su historial
+        assert self._asistencias(self.comision_cerrada) == 3
+        # Las demás fechas no se tocan
+        assert self._asistencias(self.comision, self.lunes + timedelta(days=7)) == 3
+        assert AuditoriaDatos.objects.filter(
+            modelo='academico.calendarioacademico',
+            detalles__contains='3 eliminadas'
+        ).exists()
+
+    def test_presentes_ya_tomados_se_conservan_y_se_informan(self, monkeypatch):
+        # Hoy es el segundo lunes: del primero ya se tomó asistencia
+        monkeypatch.setattr(timezone, 'now', lambda: datetime(2030, 3, 18, 12, tzinfo=dt_timezone.utc))
+        tomadas = Asistencia.objects.filter(
+            alumno_comision__comision=self.comision, fecha_asistencia=self.lunes
+        ).order_by('pk').values_list('pk', flat=True)[:2]
+        Asistencia.objects.filter(pk__in=list(tomadas)).update(esta_presente=True)
+
+        excepcion = self._crear_excepcion(fecha_fin=self.lunes + timedelta(days=14))
+
+        resultado = excepcion._propagacion_calendario
+        assert (resultado['conservadas'], resultado['fechas_conservadas']) == (2, [self.lunes])
+        # Se borran el ausente del primer lunes y las asistencias de hoy y del lunes siguiente
+        assert resultado['eliminadas'] == 7
+        assert self._asistencias(self.comision) == 2
+        assert self._asistencias(self.comision, self.lunes + timedelta(days=7)) == 0
+        assert AuditoriaDatos.objects.filter(
+            modelo='academico.asistencia', tipo_accion=TipoAccionDatos.ELIMINAR
+        ).count() == 7
+        assert AuditoriaDatos.objects.filter(
+            modelo='academico.calendarioacademico',
+            detalles__contains='2 con presente conservadas (2030-03-11)'
+        ).exists()
+
+    def test_reemplazar_excepciones_propaga_una_sola_vez(self):
+        self._crear_excepcion()
+        self._crear_excepcion(fecha_inicio=self.lunes + timedelta(days=7), fecha_fin=self.lunes + timedelta(days=7))
+        AuditoriaDatos.objects.all().delete()
+
+        quincena = self.lunes + timedelta(days=14)
+        resultado = ServiciosAcademico.reemplazar_excepciones_calendario(self.anio, [
+            CalendarioAcademico(anio_academico=self.anio, fecha_inicio=quincena, fecha_fin=quincena, es_dia_clase=False)
+        ])
+
+        # Vuelven a ser de clase los dos lunes y el feriado de Carnaval, que tampoco está en la lista nueva
+        assert (resultado['creadas'], resultado['eliminadas']) == (9, 3)
+        assert self._asistencias(self.comision) == 3
+        assert self._asistencias(self.comision, quincena) == 0
+        assert list(CalendarioAcademico.objects.values_list('fecha_inicio', flat=True)) == [quincena]
+        assert AuditoriaDatos.objects.filter(modelo='academico.anioacademico').count() == 1
+        assert not AuditoriaDatos.objects.filter(modelo='academico.calendarioacademico').exists()
+
+    def test_eliminar_excepcion_recrea_asistencias(self):
+        excepcion = self._crear_excepcion(fecha_fin=self.lunes + timedelta(days=7))
+        assert self._asistencias(self.comision, self.lunes + timedelta(days=7)) == 0
+
+        excepcion.delete()
+
+        assert self._asistencias(self.comision) == 3
+        assert self._asistencias(self.comision, self.lunes + timedelta(days=7)) == 3
+        assert not Asistencia.objects.filter(
+            alumno_comision__comision=self.comision,
+            esta_presente=True
+        ).exists()
+
+    def test_guardar_sin_cambio_no_modifica_asistencias(self):
+        excepcion = self._crear_excepcion()
+        AuditoriaDatos.objects.all().delete()
+
+        excepcion.descripcion = "Paro de transporte"
+        excepcion.save()
+
+        assert self._asistencias(self.comision) == 0
+        assert not AuditoriaDatos.objects.filter(modelo='academico.calendarioacademico').exists()
+
+    def test_cambio_de_regla_semanal(self):
+        self.anio.dias_semana_clase = '2,3,4,5'
+        self.anio.save()
+
+        assert self.anio.fechas_clase(1) == ()
+        assert not Asistencia.objects.filter(alumno_comision__comision=self.comision).exists()
+        assert Asistencia.objects.filter(alumno_comision__comision=self.comision_cerrada).exists()
+
+    def test_clase_recuperatoria_fuera_de_la_regla(self):
+        sabado = date(2030, 3, 16)
+        self._crear_excepcion(fecha_inicio=sabado, fecha_fin=sabado, es_dia_clase=True, descripcion='Recuperatoria')
+
+        regla = ReglaCalendario.para_anio(self.anio)
+        assert regla.es_dia_clase(sabado)
+        assert not regla.es_dia_clase(sabado + timedelta(days=1))
+        assert sabado in self.anio.fechas_clase(6)
+
+    def test_registrar_asistencia_en_dia_sin_clase(self):
+        self._crear_excepcion()
+        alumno = Alumno.objects.get(dni="31000000")
+
+        with pytest.raises(FechaNoClaseError, match="Paro docente"):
+            ServiciosAcademico.registrar_asistencia(alumno, self.comision, True, self.lunes)
+
+    def test_excepciones_superpuestas_no_validan(self):
+        self._crear_excepcion(fecha_fin=self.lunes + timedelta(days=3))
+        superpuesta = CalendarioAcademico(
+            anio_academico=self.anio,
+            fecha_inicio=self.lunes + timedelta(days=2),
+            fecha_fin=self.lunes + timedelta(days=5),
+        )
+
+        with pytest.raises(ValidationError):
+            superpuesta.clean()
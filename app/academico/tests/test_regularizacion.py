@@ -0,0 +1,186 @@
+import pytest
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from academico.models import (
+    AnioAcademico, Asistencia, Calificacion, Comision, CondicionInscripcion, EstadoComision,
+    InscripcionAlumnoComision, Alumno, Materia, TipoCalificacion, Turno
+)
+from academico.regularizacion import (
+    calcular_regularizacion, obtener_tabla_vigente, previsualizar_regularizacion, version_datos
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from institucional.models import AuditoriaDatos
+
+
+@pytest.mark.django_db
+class TestRegularizacion:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        cache.clear()
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+            nota_aprobacion=6,
+            porcentaje_asistencia_req=75,
+            cierre_cursada_habilitado=True
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-REG")
+        materia = Materia.objects.create(codigo="REG1", nombre="Materia", plan_estudio=plan)
+        self.comision = Comision.objects.create(
+            codigo="REG-1",
+            materia=materia,
+            anio_academico=self.anio,
+            horario_inicio=time(8, 0),
+            horario_fin=time(10, 0),
+            dia_cursado=1,
+            turno=Turno.MANANA,
+            estado=EstadoComision.EN_CURSO
+        )
+        self.hoy = timezone.now().date()
+
+    def _alumno(self, apellido, notas, presentes, ausentes):
+        alumno = Alumno.objects.create(dni=f"36{len(apellido):02d}{apellido[:4]}", nombre="A", apellido=apellido)
+        inscripcion = InscripcionAlumnoComision.objects.create(alumno=alumno, comision=self.comision)
+        for numero, (tipo, nota) in enumerate(notas, start=1):
+            Calificacion.objects.create(
+                alumno_comision=inscripcion, tipo=tipo, numero=numero, nota=nota, fecha_creacion=timezone.now()
+            )
+        dias = [True] * presentes + [False] * ausentes
+        Asistencia.objects.bulk_create([
+            Asistencia(alumno_comision=inscripcion, esta_presente=presente,
+                       fecha_asistencia=self.hoy - timedelta(days=dia + 1))
+            for dia, presente in enumerate(dias)
+        ])
+        return inscripcion
+
+    def _cargar_curso(self):
+        return {
+            'regular': self._alumno("Aregular", [(TipoCalificacion.PARCIAL, 8), (TipoCalificacion.TRABAJO_PRACTICO, 7)], 4, 0),
+            'nota': self._alumno("Bnota", [(TipoCalificacion.PARCIAL, 4), (TipoCalificacion.FINAL, 10)], 4, 0),
+            'faltas': self._alumno("Cfaltas", [(TipoCalificacion.PARCIAL, 9)], 1, 3),
+            'sin_notas': self._alumno("Dsin", [], 0, 0),
+        }
+
+    def test_tabla_de_decisiones_con_consultas_fijas(self, django_assert_num_queries):
+        self._cargar_curso()
+
+        # Inscripciones, promedios, asistencias y la huella de la versión
+        with django_assert_num_queries(4):
+            tabla = calcular_regularizacion(self.comision)
+
+        resumen = [(f['alumno'].apellido, f['promedio'], f['asistencia'], f['condicion'], f['motivo']) for f in tabla.filas]
+        assert resumen == [
+            ("Aregular", Decimal('7.5'), 100, CondicionInscripcion.REGULAR, ""),
+            ("Bnota", Decimal('4'), 100, CondicionInscripcion.LIBRE, "Nota insuficiente."),
+            ("Cfaltas", Decimal('9'), 25, CondicionInscripcion.LIBRE, "Faltas."),
+            ("Dsin", None, 0, CondicionInscripcion.LIBRE, "Nota insuficiente. Faltas."),
+        ]
+        assert (tabla.regulares, tabla.libres) == (1, 3)
+        assert calcular_regularizacion(self.comision).version == tabla.version
+
+    def test_cierre_aplica_la_vista_previa(self):
+        inscripciones = self._cargar_curso()
+        tabla = ServiciosAcademico.previsualizar_regularizacion(self.comision)
+        auditorias = AuditoriaDatos.objects.count()
+
+        resultado = ServiciosAcademico.regularizar_comision(self.comision, None, version=tabla.version)
+
+        assert (resultado['success'], resultado['regulares'], resultado['libres']) == (True, 1, 3)
+        regular = InscripcionAlumnoComision.objects.get(pk=inscripciones['regular'].pk)
+        assert (regular.condicion, regular.estado_inscripcion, regular.nota_cursada) == (
+            CondicionInscripcion.REGULAR, 'REGULAR', Decimal('7.5')
+        )
+        assert regular.fecha_regularizacion is not None
+        libre = InscripcionAlumnoComision.objects.get(pk=inscripciones['sin_notas'].pk)
+        assert (libre.condicion, libre.estado_inscripcion, libre.nota_cursada) == (CondicionInscripcion.LIBRE, 'LIBRE', None)
+
+        assert Comision.objects.get(pk=self.comision.pk).estado == EstadoComision.FINALIZADA
+        assert AuditoriaDatos.objects.count() - auditorias >= 4
+        alumno = Alumno.objects.get(pk=regular.alumno_id)
+        assert (alumno.materias_regulares, alumno.materias_libres) == (1, 0)
+        assert Alumno.objects.get(pk=libre.alumno_id).materias_libres == 1
+
+    def test_cierre_rechaza_datos_modificados(self):
+        inscripciones = self._cargar_curso()
+        tabla = ServiciosAcademico.previsualizar_regularizacion(self.comision)
+
+        Calificacion.objects.create(
+            alumno_comision=inscripciones['nota'], tipo=TipoCalificacion.TRABAJO_PRACTICO,
+            numero=3, nota=10, fecha_creacion=timezone.now()
+        )
+        resultado = ServiciosAcademico.regularizar_comision(self.comision, None, version=tabla.version)
+
+        assert resultado['success'] is False
+        assert Comision.objects.get(pk=self.comision.pk).estado == EstadoComision.EN_CURSO
+        assert not InscripcionAlumnoComision.objects.filter(comision=self.comision, condicion=CondicionInscripcion.LIBRE).exists()
+
+    def test_cierre_confirmado_despues_de_medianoche(self, monkeypatch):
+        self._cargar_curso()
+        tabla = ServiciosAcademico.previsualizar_regularizacion(self.comision)
+        # La clase de hoy se carga después de la vista previa; al día siguiente ya entra en el corte
+        Asistencia.objects.create(
+            alumno_comision=InscripcionAlumnoComision.objects.get(alumno__apellido="Aregular"),
+            fecha_asistencia=self.hoy, esta_presente=False
+        )
+
+        manana = datetime.combine(self.hoy + timedelta(days=1), time(0, 5), tzinfo=timezone.get_current_timezone())
+        monkeypatch.setattr(timezone, 'now', lambda: manana)
+
+        assert ServiciosAcademico.regularizar_comision(self.comision, None, version=tabla.version)['success'] is False
+        resultado = ServiciosAcademico.regularizar_comision(
+            self.comision, None, version=tabla.version, hasta=tabla.hasta
+        )
+        assert (resultado['success'], resultado['regulares']) == (True, 1)
+
+    def test_cierre_rechaza_fecha_de_corte_vencida(self):
+        self._cargar_curso()
+        tabla = previsualizar_regularizacion(self.comision, hasta=self.hoy - timedelta(days=2))
+
+        resultado = ServiciosAcademico.regularizar_comision(
+            self.comision, None, version=tabla.version, hasta=tabla.hasta
+        )
+
+        assert resultado['success'] is False
+        assert Comision.objects.get(pk=self.comision.pk).estado == EstadoComision.EN_CURSO
+
+    def test_cierre_usa_la_tabla_de_la_vista_previa_sin_recalcular(self):
+        self._cargar_curso()
+        tabla = ServiciosAcademico.previsualizar_regularizacion(self.comision)
+
+        with CaptureQueriesContext(connection) as capturadas:
+            vigente = obtener_tabla_vigente(self.comision, tabla.version, tabla.hasta)
+
+        # Solo la huella y la lectura de la caché: ni inscripciones ni promedios ni asistencias
+        consultas = [consulta['sql'] for consulta in capturadas.captured_queries if 'cache_compartida' not in consulta['sql']]
+        assert len(consultas) == 1
+        assert 'AVG(' not in consultas[0]
+        assert [fila['condicion'] for fila in vigente.filas] == [fila['condicion'] for fila in tabla.filas]
+
+        resultado = ServiciosAcademico.regularizar_comision(self.comision, None, version=tabla.version, hasta=tabla.hasta)
+        assert (resultado['success'], resultado['regulares'], resultado['libres']) == (True, 1, 3)
+
+    def test_version_detecta_cambios_sin_nuevas_filas(self):
+        inscripciones = self._cargar_curso()
+        version = version_datos(self.comision, self.hoy)
+
+        # Nota corregida con un UPDATE directo (sin señales)
+        nota = Calificacion.objects.filter(alumno_comision=inscripciones['nota'], tipo=TipoCalificacion.PARCIAL)
+        nota.update(nota=9)
+        assert version_datos(self.comision, self.hoy) != version
+        nota.update(nota=4)
+        assert version_datos(self.comision, self.hoy) == version
+
+        # Un presente que pasa de un alumno a otro mantiene cantidades y máximos
+        anteriores = Asistencia.objects.filter(fecha_asistencia__lt=self.hoy).order_by('pk')
+        presente = anteriores.filter(alumno_comision=inscripciones['regular'], esta_presente=True).first()
+        ausente = anteriores.filter(alumno_comision=inscripciones['faltas'], esta_presente=False).first()
+        Asistencia.objects.filter(pk=presente.pk).update(esta_presente=False)
+        Asistencia.objects.filter(pk=ausente.pk).update(esta_presente=True)
+        assert version_datos(self.comision, self.hoy) != version
@@ -0,0 +1,28 @@
+import io
+import pytest
+from django.core.management import call_command
+from main.pdf import cerrar_pool, renderizar_pdfs
+from main.utils import generar_certificado_pdf
+
+
+class TestRenderPDF:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, settings):
+        settings.PDF_WORKERS = 2
+        yield
+        cerrar_pool()
+
+    def test_render_en_memoria_y_en_paralelo(self):
+        contexto = {'alumno': {'nombre': 'Ana', 'apellido': 'Pdf', 'dni': '1'}, 'tipo_certificado': 'regular'}
+        assert generar_certificado_pdf(contexto).startswith(b'%PDF')
+
+        pdfs = renderizar_pdfs(f'<html><body><p>{i}</p></body></html>' for i in range(5))
+        assert len(pdfs) == 5
+        assert all(pdf.startswith(b'%PDF') for pdf in pdfs)
+
+    def test_benchmark(self):
+        salida = io.StringIO()
+        call_command('benchmark_pdf', cantidad=4, workers=2, stdout=salida)
+        assert 'Secuencial: 4 PDFs' in salida.getvalue()
+        assert 'Concurrente (2 workers): 4 PDFs' in salida.getvalue()
@@ -0,0 +1,92 @@
+import pytest
+from datetime import date, time
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from academico.models import (
+    AnioAcademico, Asistencia, Comision, CondicionInscripcion, EstadoComision, EstadoMateria,
+    InscripcionAlumnoComision, Alumno, Materia, TipoCalificacion, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+from administracion.services.report_factory import ReportFactory
+
+
+@pytest.mark.django_db
+class TestReportesConsultas:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 6, 30),
+        )
+        self.plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-REP")
+        self.filtros = {'anio_academico': self.anio.id}
+        self.cantidad = 0
+
+    def _cargar(self, comisiones):
+        """Comisiones con dos alumnos: uno aprobado y presente, otro libre y ausente en mayo"""
+        for _ in range(comisiones):
+            self.cantidad += 1
+            materia = Materia.objects.create(codigo=f"REP{self.cantidad}", nombre=f"Materia {self.cantidad}", plan_estudio=self.plan)
+            comision = Comision.objects.create(
+                codigo=f"REP-{self.cantidad}",
+                materia=materia,
+                anio_academico=self.anio,
+                horario_inicio=time(8, 0),
+                horario_fin=time(10, 0),
+                dia_cursado=1,
+                turno=Turno.MANANA,
+                estado=EstadoComision.EN_CURSO
+            )
+            bueno = Alumno.objects.create(dni=f"39{self.cantidad:03d}001", nombre="Bueno", apellido=f"Rep{self.cantidad}")
+            libre = Alumno.objects.create(dni=f"39{self.cantidad:03d}002", nombre="Libre", apellido=f"Rep{self.cantidad}")
+            cursadas = [
+                InscripcionAlumnoComision.objects.create(
+                    alumno=bueno, comision=comision,
+                    condicion=CondicionInscripcion.REGULAR, estado_inscripcion=EstadoMateria.APROBADA
+                ),
+                InscripcionAlumnoComision.objects.create(alumno=libre, comision=comision, condicion=CondicionInscripcion.LIBRE),
+            ]
+            ServiciosAcademico.crear_calificaciones_bulk(
+                comision, TipoCalificacion.FINAL, 1, date(2030, 6, 1), {bueno.id: 9, libre.id: 2}
+            )
+            # Se reemplazan las asistencias generadas desde el calendario por dos clases conocidas
+            Asistencia.objects.filter(alumno_comision__in=cursadas).delete()
+            for cursada, presente_mayo in zip(cursadas, (True, False)):
+                Asistencia.objects.create(alumno_comision=cursada, fecha_asistencia=date(2030, 4, 1), esta_presente=True)
+                Asistencia.objects.create(alumno_comision=cursada, fecha_asistencia=date(2030, 5, 6), esta_presente=presente_mayo)
+
+    def _generar(self, tipo):
+        with CaptureQueriesContext(connection) as capturadas:
+            datos = ReportFactory.crear_reporte(tipo).generar_datos(self.filtros)
+        return datos, len(capturadas)
+
+    # Notas: una lectura de las calificaciones más los nombres de las comisiones
+    @pytest.mark.parametrize('tipo, consultas', [('inscripciones', 1), ('notas', 2), ('asistencia', 1)])
+    def test_consultas_fijas(self, tipo, consultas):
+        self._cargar(1)
+        assert self._generar(tipo)[1] == consultas
+        self._cargar(4)
+        assert self._generar(tipo)[1] == consultas
+
+    def test_cifras_por_reporte(self):
+        self._cargar(3)
+
+        inscripciones, _ = self._generar('inscripciones')
+        assert inscripciones['estadisticas'] == {
+            'total_alumnos': 6, 'total_materias': 3, 'total_comisiones': 3,
+            'aprobados': 3, 'desaprobados': 3, 'regulares': 0, 'en_curso': 0,
+        }
+        assert inscripciones['estados_academicos'] == (3, 3, 0, 0)
+
+        notas, _ = self._generar('notas')
+        assert [promedio for _, promedio in notas['promedios_materias']] == [5.5] * 3
+        assert notas['alumnos_top_promedio'][:3] == [(f"Rep{i} Bueno", 9) for i in (1, 2, 3)]
+        assert notas['alumnos_materias_aprobadas'] == [(f"Rep{i} Bueno", 1) for i in (1, 2, 3)]
+
+        asistencia, _ = self._generar('asistencia')
+        assert asistencia['asistencias_por_mes'] == {'Abr': 100, 'May': 50}
+        assert asistencia['estadisticas']['porcentaje_asistencia_general'] == 75
+        assert asistencia['alumnos_top_asistencia'][-1] == ("Rep3 Libre", 50)
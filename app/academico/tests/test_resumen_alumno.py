@@ -0,0 +1,128 @@
+import io
+import pytest
+from datetime import date, datetime, time
+from decimal import Decimal
+from django.core.management import call_command
+from django.utils import timezone
+from academico.models import (
+    AnioAcademico, Calificacion, Comision, CondicionInscripcion, EstadoComision, EstadoMateria,
+    InscripcionAlumnoComision, InscripcionMesaExamen, Alumno, Materia, MesaExamen, TipoCalificacion, Turno
+)
+from academico.services import ServiciosAcademico
+from administracion.models import PlanEstudio
+
+
+@pytest.mark.django_db
+class TestResumenAlumno:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.anio = AnioAcademico.objects.create(
+            nombre="2030",
+            fecha_inicio=date(2030, 3, 4),
+            fecha_fin=date(2030, 4, 30),
+        )
+        plan = PlanEstudio.objects.create(nombre="Plan", codigo="P-RES")
+        self.inscripciones = []
+        self.alumno = Alumno.objects.create(dni="37000000", nombre="Ana", apellido="Resumen")
+        for numero in (1, 2):
+            materia = Materia.objects.create(codigo=f"RES{numero}", nombre=f"Materia {numero}", plan_estudio=plan)
+            comision = Comision.objects.create(
+                codigo=f"RES-{numero}",
+                materia=materia,
+                anio_academico=self.anio,
+                horario_inicio=time(8, 0),
+                horario_fin=time(10, 0),
+                dia_cursado=numero,
+                turno=Turno.MANANA,
+                estado=EstadoComision.EN_CURSO
+            )
+            self.inscripciones.append(
+                InscripcionAlumnoComision.objects.create(alumno=self.alumno, comision=comision)
+            )
+
+    def _resumen(self):
+        alumno = Alumno.objects.get(pk=self.alumno.pk)
+        return (
+            alumno.promedio, alumno.cantidad_calificaciones,
+            alumno.materias_aprobadas, alumno.materias_regulares, alumno.materias_libres
+        )
+
+    def _calificar(self, inscripcion, nota, numero=1):
+        return Calificacion.objects.create(
+            alumno_comision=inscripcion, tipo=TipoCalificacion.PARCIAL, numero=numero,
+            nota=nota, fecha_creacion=timezone.now()
+        )
+
+    def test_promedio_incremental(self):
+        assert self._resumen() == (None, 0, 0, 0, 0)
+
+        primera = self._calificar(self.inscripciones[0], Decimal('8'))
+        segunda = self._calificar(self.inscripciones[1], Decimal('5.5'))
+        assert self._resumen()[:2] == (Decimal('6.75'), 2)
+
+        primera.nota = Decimal('10')
+        primera.save()
+        assert self._resumen()[:2] == (Decimal('7.75'), 2)
+
+        segunda.delete()
+        assert self._resumen()[:2] == (Decimal('10'), 1)
+
+        # La carga masiva aplica sus deltas en un solo UPDATE
+        comision = self.inscripciones[0].comision
+        ServiciosAcademico.crear_calificaciones_bulk(
+            comision, TipoCalificacion.PARCIAL, 1, date(2030, 4, 1), {self.alumno.pk: 6}
+        )
+        ServiciosAcademico.crear_calificaciones_bulk(
+            comision, TipoCalificacion.PARCIAL, 2, date(2030, 4, 8), {self.alumno.pk: 9}
+        )
+        assert self._resumen()[:2] == (Decimal('7.5'), 2)
+
+        primera.alumno_comision.delete()
+        assert self._resumen()[:2] == (None, 0)
+
+    def test_contadores_de_materias(self):
+        cursada, otra = self.inscripciones
+        cursada.condicion = CondicionInscripcion.REGULAR
+        cursada.save()
+        otra.condicion = CondicionInscripcion.LIBRE
+        otra.save()
+        assert self._resumen()[2:] == (0, 1, 1)
+
+        # Aprobar el final por mesa de examen mueve la materia de regular a aprobada
+        mesa = MesaExamen.objects.create(
+            materia=cursada.comision.materia,
+            anio_academico=self.anio,
+            fecha_examen=timezone.make_aware(datetime(2030, 7, 1, 9, 0)),
+            fecha_limite_inscripcion=timezone.make_aware(datetime(2030, 6, 28, 9, 0)),
+        )
+        InscripcionMesaExamen.objects.create(
+            mesa_examen=mesa, alumno=self.alumno, condicion='REGULAR', nota_examen=Decimal('9')
+        )
+        assert self._resumen() == (Decimal('9'), 1, 1, 0, 1)
+
+        otra.delete()
+        assert self._resumen()[2:] == (1, 0, 0)
+
+    def test_guardar_alumno_no_pisa_el_resumen(self):
+        alumno = Alumno.objects.get(pk=self.alumno.pk)
+        self._calificar(self.inscripciones[0], Decimal('7'))
+
+        alumno.telefono = "123"
+        alumno.save()
+
+        assert self._resumen()[:2] == (Decimal('7'), 1)
+        assert Alumno.objects.get(pk=self.alumno.pk).telefono == "123"
+
+    def test_comando_reconstruye(self):
+        self._calificar(self.inscripciones[0], Decimal('4'))
+        self._calificar(self.inscripciones[1], Decimal('7'))
+        InscripcionAlumnoComision.objects.filter(pk=self.inscripciones[0].pk).update(
+            estado_inscripcion=EstadoMateria.APROBADA
+        )
+        Alumno.objects.filter(pk=self.alumno.pk).update(promedio=1, cantidad_calificaciones=9, suma_notas=9)
+
+        call_command('recalcular_resumen_alumnos', stdout=io.StringIO())
+
+        assert self._resumen() == (Decimal('5.5'), 2, 1, 0, 0)
+        assert Alumno.objects.get(pk=self.alumno.pk).suma_notas == Decimal('11')
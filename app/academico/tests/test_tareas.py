@@ -0,0 +1,92 @@
+import io
+import pytest
+from datetime import timedelta
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from administracion.models import EstadoTarea, Tarea
+from administracion.services.tareas import encolar, procesar_pendientes, registrar_tarea, tomar_tarea
+from institucional.models import Usuario
+
+
+@registrar_tarea('prueba_falla', max_intentos=2)
+def tarea_que_falla(tarea, motivo):
+    raise ValueError(motivo)
+
+
+@pytest.mark.django_db
+class TestTareas:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, client, settings, tmp_path):
+        settings.TAREAS_RESULTADOS_DIR = str(tmp_path / 'tareas')
+        self.client = client
+        self.usuario = Usuario.objects.create_superuser(email='tareas@test.com', password='x')
+        self.client.force_login(self.usuario)
+
+    def test_reintenta_y_termina_en_error(self):
+        tarea = encolar('prueba_falla', self.usuario, motivo='sin datos')
+
+        assert procesar_pendientes() == 1
+        tarea.refresh_from_db()
+        assert (tarea.estado, tarea.intentos) == (EstadoTarea.PENDIENTE, 1)
+        assert tarea.disponible_desde > timezone.now() and 'sin datos' in tarea.error
+
+        # Durante la espera del reintento no se vuelve a tomar
+        assert procesar_pendientes() == 0
+        Tarea.objects.filter(pk=tarea.pk).update(disponible_desde=timezone.now())
+        assert procesar_pendientes() == 1
+        tarea.refresh_from_db()
+        assert (tarea.estado, tarea.intentos, tarea.mensaje) == (EstadoTarea.ERROR, 2, 'sin datos')
+
+    def test_bloqueo_vencido_se_retoma(self):
+        tarea = encolar('prueba_falla', self.usuario, motivo='x')
+
+        assert tomar_tarea('worker-a') == tarea.pk
+        assert tomar_tarea('worker-b') is None
+
+        # worker-a murió sin renovar el bloqueo
+        Tarea.objects.filter(pk=tarea.pk).update(bloqueada_hasta=timezone.now() - timedelta(seconds=1))
+        assert tomar_tarea('worker-b') == tarea.pk
+        tarea.refresh_from_db()
+        assert (tarea.worker, tarea.intentos) == ('worker-b', 2)
+
+        # Sin intentos restantes, al vencer de nuevo queda en error
+        Tarea.objects.filter(pk=tarea.pk).update(bloqueada_hasta=timezone.now() - timedelta(seconds=1))
+        assert tomar_tarea('worker-c') is None
+        assert Tarea.objects.get(pk=tarea.pk).estado == EstadoTarea.ERROR
+
+    def test_reporte_excel_en_segundo_plano(self):
+        respuesta = self.client.get(reverse('exportar_reporte_excel'), {'segundo_plano': 1})
+
+        tarea = Tarea.objects.get()
+        assert respuesta.status_code == 302
+        assert respuesta['Location'] == reverse('progreso_tarea', args=[tarea.pk])
+        estado_url = reverse('estado_tarea', args=[tarea.pk])
+        assert self.client.get(estado_url).json()['estado'] == EstadoTarea.PENDIENTE
+
+        call_command('procesar_tareas', procesos=0, una_vez=True, stdout=io.StringIO())
+
+        estado = self.client.get(estado_url).json()
+        assert (estado['estado'], estado['progreso']) == (EstadoTarea.FINALIZADA, 100)
+        assert b'Descargar resultado' in self.client.get(respuesta['Location']).content
+        descarga = self.client.get(estado['descarga'])
+        assert descarga['Content-Disposition'].startswith('attachment; filename="reporte_academico_')
+        assert b''.join(descarga.streaming_content).startswith(b'PK')
+
+    def test_verificar_integridad_desde_el_admin(self):
+        from institucional.digitos_verificadores import GestorDigitosVerificadores
+        GestorDigitosVerificadores.actualizar_dvv('Calificacion', 'academico')
+
+        assert self.client.get(reverse('admin_verificar_integridad')).status_code == 302
+        assert not Tarea.objects.exists()
+
+        respuesta = self.client.post(reverse('admin_verificar_integridad'))
+
+        tarea = Tarea.objects.get()
+        assert (tarea.nombre, respuesta['Location']) == ('verificar_integridad', reverse('progreso_tarea', args=[tarea.pk]))
+        assert procesar_pendientes() == 1
+        tarea.refresh_from_db()
+        assert tarea.estado == EstadoTarea.FINALIZADA
+        assert tarea.resultado['tablas']['academico.Calificacion']['ok'] and tarea.resultado['fallidas'] == 0
+        assert tarea.mensaje == '1 tablas íntegras'
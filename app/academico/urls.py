@@ -5,8 +5,11 @@ urlpatterns = [
     path('', views.DashboardProfesoresView.as_view(), name='docentes'),
     path('asistencia/', views.GestionClasesView.as_view(), name='seleccionar_clase_asistencia'),
     path('asistencia/curso/<str:codigo>/', views.GestionAsistenciaView.as_view(), name='asistencia_curso'),
+    path('asistencia/curso/<str:codigo>/grilla/', views.GrillaAsistenciaView.as_view(), name='grilla_asistencia'),
     path('calificaciones/<str:codigo>/', views.CalificacionesCursoView.as_view(), name='calificaciones_curso'),
+    path('calificaciones/<str:codigo>/excel/', views.CalificacionesCursoExcelView.as_view(), name='calificaciones_curso_excel'),
     path('calificaciones/<str:codigo>/crear_calificacion/', views.GestionCalificacionesView.as_view(), name='crear_calificacion'),
+    path('calificaciones/<str:codigo>/importar/', views.ImportarCalificacionesView.as_view(), name='importar_calificaciones'),
     path('calificaciones/editar/<int:id>/', views.EditarCalificacionView.as_view(), name='editar_calificacion'),
     path('comisiones/<str:codigo>/cerrar/', views.CierreCursadaView.as_view(), name='cerrar_cursada'),
     path('mesas-examen/', views.MesasExamenDocenteView.as_view(), name='mesas_examen_docente'),
@@ -1,6 +1,6 @@
 import datetime
+from collections import defaultdict
 from django.utils import timezone
-from django.db.models import Count, Avg
 from django.shortcuts import get_object_or_404, redirect, render
 from django.contrib.auth.decorators import login_required
 from django.views import View
@@ -8,23 +8,27 @@ from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.db import transaction
 from django.contrib import messages
 from django.core.exceptions import ValidationError
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.dateparse import parse_date
+from django.utils.http import http_date
 
 from academico.services import ServiciosAcademico
 from main.services import ActionFlag, LogAction
-from main.utils import group_required, generar_certificado_pdf
+from main.utils import group_required
 from .models import (
     CalendarioAcademico, Calificacion, Materia, Comision, InscripcionAlumnoComision,
-    Asistencia, Alumno, MesaExamen, InscripcionMesaExamen, TipoCalificacion
+    Asistencia, Alumno, MesaExamen, InscripcionMesaExamen, MateriaAnalitico, TipoCalificacion
 )
 from institucional.models import Empleado, Persona
 from .exceptions import (
     TipoCalificacionInvalidoError,
     RangoCalificacionInvalidoError,
     AsistenciaNoExisteError,
-    FechaNoClaseError
+    FechaNoClaseError,
+    PlanillaInvalidaError
 )
-from .forms import RegistroAsistenciaForm, CalificacionForm, NotaIndividualForm
+from .forms import RegistroAsistenciaForm, CalificacionForm, NotaIndividualForm, ImportarCalificacionesForm
 
 
 class DocenteRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
@@ -54,39 +58,13 @@ class CierreCursadaView(DocenteRequiredMixin, View):
             return redirect('docentes')
 
         # Simulación de resultados
-        inscripciones = InscripcionAlumnoComision.objects.filter(
-            comision=comision,
-            estado_inscripcion='REGULAR'
-        ).select_related('alumno')
-
-        anio = comision.anio_academico
-        simulacion = []
-        
-        for inscripcion in inscripciones:
-            promedio = self.servicios_academico.calcular_promedio_cursada(inscripcion)
-            asistencia = self.servicios_academico.obtener_porcentaje_asistencia(
-                inscripcion, timezone.now().date()
-            )
-            
-            cumple_nota = promedio is not None and promedio >= anio.nota_aprobacion
-            cumple_asistencia = asistencia >= anio.porcentaje_asistencia_req
-            
-            condicion = 'REGULAR' if cumple_nota and cumple_asistencia else 'LIBRE'
-            motivo = ""
-            if not cumple_nota: motivo += "Nota insuficiente. "
-            if not cumple_asistencia: motivo += "Faltas."
-
-            simulacion.append({
-                'alumno': inscripcion.alumno,
-                'promedio': promedio,
-                'asistencia': asistencia,
-                'condicion': condicion,
-                'motivo': motivo
-            })
+        tabla = self.servicios_academico.previsualizar_regularizacion(comision)
 
         return render(request, 'academico/cierre_cursada.html', {
             'comision': comision,
-            'simulacion': simulacion
+            'simulacion': tabla.filas,
+            'version': tabla.version,
+            'hasta': tabla.hasta
         })
 
     def post(self, request, codigo):
@@ -97,7 +75,14 @@ class CierreCursadaView(DocenteRequiredMixin, View):
             messages.error(request, "No tiene permiso para cerrar esta comisión.")
             return redirect('docentes')
 
-        resultado = self.servicios_academico.regularizar_comision(comision, request.user)
+        # El cierre usa la fecha de corte de la vista previa, aunque se confirme al día siguiente
+        try:
+            hasta = parse_date(request.POST.get('hasta') or '')
+        except ValueError:
+            hasta = None
+        resultado = self.servicios_academico.regularizar_comision(
+            comision, request.user, version=request.POST.get('version') or None, hasta=hasta
+        )
 
         if resultado['success']:
             messages.success(request, resultado['mensaje'])
@@ -128,54 +113,11 @@ class DashboardProfesoresView(DocenteRequiredMixin, View):
 
     def get(self, request):
         empleado = self.servicios_academico.obtener_docente_actual(request.user)
-        estadisticas = self.servicios_academico.obtener_estadisticas_docente(empleado)
-        # Optimizar query con select_related para evitar N+1
-        comisiones_queryset = self.servicios_academico.obtener_comisiones_docente(empleado).select_related(
-            'materia', 'anio_academico'
-        )
-        
-        comisiones_activas = comisiones_queryset.filter(estado='EN_CURSO')
-        comisiones_finalizadas = comisiones_queryset.filter(estado='FINALIZADA').order_by('-anio_academico__nombre', '-materia__nombre')
-
-        # Obtener comisiones con clases hoy (solo de las activas)
-        dia_hoy = timezone.now().weekday() + 1
-        comisiones_hoy = comisiones_activas.filter(dia_cursado=dia_hoy).order_by('horario_inicio')
-
-        # Calcular estadísticas adicionales por comisión (solo activas)
-        comisiones_con_stats = []
-        for comision in comisiones_activas:
-            inscripciones = InscripcionAlumnoComision.objects.filter(comision=comision)
-            total_alumnos = inscripciones.count()
-
-            # Calificaciones pendientes (alumnos sin todas las evaluaciones)
-            tipos_evaluacion = Calificacion.objects.filter(
-                alumno_comision__comision=comision
-            ).values('tipo').distinct().count()
-
-            alumnos_con_calificaciones_completas = 0
-            if tipos_evaluacion > 0:
-                for inscripcion in inscripciones:
-                    calif_alumno = Calificacion.objects.filter(alumno_comision=inscripcion).count()
-                    if calif_alumno >= tipos_evaluacion:
-                        alumnos_con_calificaciones_completas += 1
-
-            pendientes = total_alumnos - alumnos_con_calificaciones_completas if tipos_evaluacion > 0 else total_alumnos
-
-            comisiones_con_stats.append({
-                'comision': comision,
-                'total_alumnos': total_alumnos,
-                'calificaciones_pendientes': pendientes,
-                'tiene_pendientes': pendientes > 0
-            })
+        dashboard = self.servicios_academico.obtener_dashboard_docente(empleado)
 
         return render(request, 'academico/docentes.html', {
             'docente': empleado,
-            'comisiones_con_stats': comisiones_con_stats,
-            'comisiones_finalizadas': comisiones_finalizadas,
-            'comisiones_hoy': comisiones_hoy,
-            'clases_hoy': estadisticas['clases_hoy'],
-            'total_alumnos': estadisticas['total_alumnos'],
-            'total_comisiones': comisiones_activas.count()
+            **dashboard
         })
 
 class CalificacionesCursoView(DocenteRequiredMixin, View):
@@ -183,84 +125,33 @@ class CalificacionesCursoView(DocenteRequiredMixin, View):
 
     def get(self, request, codigo):
         comision = get_object_or_404(Comision, codigo=codigo)
+        matriz = self.servicios_academico.obtener_matriz_calificaciones(comision)
 
-        # Obtener todas las inscripciones de alumnos
-        inscripciones = InscripcionAlumnoComision.objects.filter(
-            comision=comision
-        ).select_related('alumno').order_by('alumno__apellido', 'alumno__nombre')
-
-        # Obtener todos los tipos de calificación que existen para esta comisión
-        tipos_calificacion = Calificacion.objects.filter(
-            alumno_comision__comision=comision
-        ).values('tipo').distinct().order_by('tipo')
+        return render(request, 'academico/calificaciones_curso.html', {
+            'comision': comision,
+            'matriz_calificaciones': matriz.filas,
+            'tipos_calificacion': matriz.tipos,
+            'promedios_por_tipo': matriz.promedios_por_tipo,
+            'promedio_general': matriz.promedio_general,
+            'total_alumnos': len(matriz.filas)
+        })
 
-        # Crear matriz de calificaciones
-        matriz_calificaciones = []
-        for inscripcion in inscripciones:
-            fila = {
-                'inscripcion': inscripcion,
-                'alumno': inscripcion.alumno,
-                'calificaciones': {},
-                'promedio': 0,
-                'total_calificaciones': 0,
-                'condicion': inscripcion.get_condicion_display(),
-                'asistencia': self.servicios_academico.obtener_porcentaje_asistencia(
-                    inscripcion, timezone.now().date()
-                )
-            }
+class CalificacionesCursoExcelView(DocenteRequiredMixin, View):
+    servicios_academico = ServiciosAcademico()
 
-            # Obtener todas las calificaciones del alumno
-            calificaciones_alumno = Calificacion.objects.filter(
-                alumno_comision=inscripcion
-            )
+    def get(self, request, codigo):
+        from academico.matriz_calificaciones import generar_excel_calificaciones
 
-            suma_notas = 0
-            cantidad_notas = 0
-
-            for calif in calificaciones_alumno:
-                if calif.tipo not in fila['calificaciones']:
-                    fila['calificaciones'][calif.tipo] = []
-                
-                fila['calificaciones'][calif.tipo].append({
-                    'id': calif.id,
-                    'nota': calif.nota,
-                    'fecha': calif.fecha_creacion,
-                    'numero': calif.numero
-                })
-                suma_notas += float(calif.nota)
-                cantidad_notas += 1
-
-            # DEBUG: Print the calificaciones for this student
-            print(f"DEBUG: Alumno {inscripcion.alumno.nombre} {inscripcion.alumno.apellido} - Calificaciones: {fila['calificaciones']}")
-
-            if cantidad_notas > 0:
-                fila['promedio'] = round(suma_notas / cantidad_notas, 2)
-                fila['total_calificaciones'] = cantidad_notas
-
-            matriz_calificaciones.append(fila)
-
-        # Calcular promedios por tipo de evaluación
-        promedios_por_tipo = {}
-        for tipo in tipos_calificacion:
-            promedio = Calificacion.objects.filter(
-                alumno_comision__comision=comision,
-                tipo=tipo['tipo']
-            ).aggregate(promedio=Avg('nota'))
-            promedios_por_tipo[tipo['tipo']] = round(promedio['promedio'], 2) if promedio['promedio'] else 0
-
-        # Calcular promedio general del curso
-        promedio_general = Calificacion.objects.filter(
-            alumno_comision__comision=comision
-        ).aggregate(promedio=Avg('nota'))
+        comision = get_object_or_404(Comision.objects.select_related('materia'), codigo=codigo)
+        matriz = self.servicios_academico.obtener_matriz_calificaciones(comision)
 
-        return render(request, 'academico/calificaciones_curso.html', {
-            'comision': comision,
-            'matriz_calificaciones': matriz_calificaciones,
-            'tipos_calificacion': tipos_calificacion,
-            'promedios_por_tipo': promedios_por_tipo,
-            'promedio_general': round(promedio_general['promedio'], 2) if promedio_general['promedio'] else 0,
-            'total_alumnos': inscripciones.count()
-        })
+        response = HttpResponse(
+            generar_excel_calificaciones(comision, matriz),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+        filename = f"calificaciones_{comision.codigo}_{timezone.now().strftime('%Y%m%d')}.xlsx"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
 
 class GestionAsistenciaView(DocenteRequiredMixin, View):
     servicios_academico = ServiciosAcademico()
@@ -365,6 +256,23 @@ class GestionAsistenciaView(DocenteRequiredMixin, View):
             messages.error(request, f'Error inesperado al registrar asistencias: {str(e)}')
             return redirect('asistencia_curso', codigo=codigo)
 
+class GrillaAsistenciaView(DocenteRequiredMixin, View):
+    """Grilla alumnos × fechas de clase con porcentajes, rachas de ausencia y tendencia"""
+    servicios_academico = ServiciosAcademico()
+
+    def get(self, request, codigo):
+        comision = get_object_or_404(
+            Comision.objects.select_related('materia', 'anio_academico'), codigo=codigo
+        )
+        matriz = self.servicios_academico.obtener_matriz_asistencia(comision)
+
+        return render(request, 'academico/grilla_asistencia.html', {
+            'comision': comision,
+            'fechas': list(zip(matriz.fechas, matriz.concurrencia().tolist())),
+            'filas': matriz.resumen(comision.anio_academico.porcentaje_asistencia_req),
+            'porcentaje_requerido': comision.anio_academico.porcentaje_asistencia_req,
+        })
+
 class GestionClasesView(DocenteRequiredMixin, View):
     servicios_academico = ServiciosAcademico()
     
@@ -382,7 +290,7 @@ class GestionClasesView(DocenteRequiredMixin, View):
             comisiones_con_fechas.append({
                 'comision': comision,
                 'fechas_clase': fechas_clase,
-                'proxima_clase': fechas_clase.first() if fechas_clase else None
+                'proxima_clase': fechas_clase[0] if fechas_clase else None
             })
         
         return render(request, 'academico/seleccionar_clase_asistencia.html', {
@@ -456,8 +364,7 @@ class GestionCalificacionesView(DocenteRequiredMixin, View):
                 numero_instancia = 1
 
             comision = self.servicios_academico.obtener_comision_por_codigo(codigo)
-            alumnos_comision = self.servicios_academico.obtener_alumnos_comision(comision)
-            calificaciones_creadas = 0
+            notas = {}
 
             for dato in datos:
                 if dato.startswith('nota_'):
@@ -470,25 +377,31 @@ class GestionCalificacionesView(DocenteRequiredMixin, View):
                             messages.error(request, f'Alumno ID {alumno_id}: {error}')
                         continue
 
-                    calificacion = nota_form.cleaned_data['nota']
-                    alumno = alumnos_comision.get(alumno__id=alumno_id)
+                    notas[alumno_id] = nota_form.cleaned_data['nota']
 
-                    calificacion_nuevo = self.servicios_academico.crear_calificacion(
-                        alumno, fecha, tipo_calificacion, calificacion, numero=numero_instancia
-                    )
-
-                    LogAction(
-                        user=request.user,
-                        model_instance_or_queryset=calificacion_nuevo,
-                        action=ActionFlag.ADDITION,
-                        change_message="Se crea calificación"
-                    ).log()
+            resultado = self.servicios_academico.crear_calificaciones_bulk(
+                comision, tipo_calificacion, numero_instancia, fecha, notas
+            )
 
-                    calificaciones_creadas += 1
+            if resultado['creadas']:
+                LogAction(
+                    user=request.user,
+                    model_instance_or_queryset=resultado['creadas'],
+                    action=ActionFlag.ADDITION,
+                    change_message="Se crea calificación"
+                ).log()
+            if resultado['actualizadas']:
+                LogAction(
+                    user=request.user,
+                    model_instance_or_queryset=resultado['actualizadas'],
+                    action=ActionFlag.CHANGE,
+                    change_message="Se modifica calificación"
+                ).log()
 
             messages.success(
                 request,
-                f'Se crearon {calificaciones_creadas} calificaciones correctamente.'
+                f"Se crearon {len(resultado['creadas'])} calificaciones y se actualizaron "
+                f"{len(resultado['actualizadas'])} correctamente."
             )
             return redirect('calificaciones_curso', codigo=codigo)
 
@@ -506,6 +419,67 @@ class GestionCalificacionesView(DocenteRequiredMixin, View):
             return redirect('crear_calificacion', codigo=codigo)
 
 
+class ImportarCalificacionesView(DocenteRequiredMixin, View):
+    """Carga de las notas de una instancia de evaluación desde una planilla XLSX o CSV"""
+    servicios_academico = ServiciosAcademico()
+    template_name = 'academico/importar_calificaciones.html'
+
+    def get(self, request, codigo):
+        comision = self.servicios_academico.obtener_comision_por_codigo(codigo)
+        form = ImportarCalificacionesForm(initial={'fecha': timezone.now().date(), 'numero': 1})
+        return render(request, self.template_name, {'comision': comision, 'form': form})
+
+    def post(self, request, codigo):
+        comision = self.servicios_academico.obtener_comision_por_codigo(codigo)
+        form = ImportarCalificacionesForm(request.POST, request.FILES)
+        contexto = {'comision': comision, 'form': form}
+
+        if not form.is_valid():
+            return render(request, self.template_name, contexto)
+
+        try:
+            resultado = self.servicios_academico.importar_calificaciones(
+                comision,
+                form.cleaned_data['archivo'],
+                form.cleaned_data['tipo'],
+                form.cleaned_data['numero'],
+                form.cleaned_data['fecha']
+            )
+        except PlanillaInvalidaError as e:
+            messages.error(request, str(e))
+            return render(request, self.template_name, contexto)
+
+        if resultado['errores']:
+            messages.error(
+                request,
+                f"La planilla tiene {len(resultado['errores'])} filas con errores. No se guardó ninguna nota."
+            )
+            contexto['errores'] = resultado['errores']
+            return render(request, self.template_name, contexto)
+
+        if resultado['creadas']:
+            LogAction(
+                user=request.user,
+                model_instance_or_queryset=resultado['creadas'],
+                action=ActionFlag.ADDITION,
+                change_message="Se crea calificación (importación de planilla)"
+            ).log()
+        if resultado['actualizadas']:
+            LogAction(
+                user=request.user,
+                model_instance_or_queryset=resultado['actualizadas'],
+                action=ActionFlag.CHANGE,
+                change_message="Se modifica calificación (importación de planilla)"
+            ).log()
+
+        messages.success(
+            request,
+            f"Planilla importada: {len(resultado['creadas'])} notas nuevas, "
+            f"{len(resultado['actualizadas'])} actualizadas."
+        )
+        return redirect('calificaciones_curso', codigo=codigo)
+
+
 class EditarCalificacionView(DocenteRequiredMixin, View):
     def get(self, request, id):
         calificacion = get_object_or_404(Calificacion, id=id)
@@ -626,37 +600,13 @@ class DetalleInscriptosMesaView(DocenteRequiredMixin, View):
             return redirect('detalle_inscriptos_mesa', mesa_id=mesa_id)
 
         try:
-            notas_cargadas = 0
-            errores = []
-
-            for key, value in request.POST.items():
-                if key.startswith('nota_'):
-                    inscripcion_id = int(key.replace('nota_', ''))
-
-                    try:
-                        inscripcion = InscripcionMesaExamen.objects.get(id=inscripcion_id)
-
-                        if value and value.strip():
-                            nota = float(value)
-
-                            if nota < 0 or nota > 10:
-                                errores.append(f'{inscripcion.alumno}: La nota debe estar entre 0 y 10')
-                                continue
-
-                            # Cargar nota usando el servicio
-                            success, mensaje = ServiciosAcademico.cargar_nota_examen_final(
-                                inscripcion, nota, request.user
-                            )
-
-                            if success:
-                                notas_cargadas += 1
-                            else:
-                                errores.append(f'{inscripcion.alumno}: {mensaje}')
-
-                    except InscripcionMesaExamen.DoesNotExist:
-                        errores.append(f'Inscripción {inscripcion_id} no encontrada')
-                    except ValueError:
-                        errores.append(f'{inscripcion.alumno}: Formato de nota inválido')
+            notas = {
+                key.replace('nota_', ''): value
+                for key, value in request.POST.items() if key.startswith('nota_')
+            }
+            resultado = ServiciosAcademico.cargar_notas_mesa(mesa, notas, request.user)
+            notas_cargadas = resultado['cargadas']
+            errores = resultado['errores']
 
             if notas_cargadas > 0:
                 messages.success(request, f'Se cargaron {notas_cargadas} notas correctamente.')
@@ -707,30 +657,13 @@ class CargarNotasMesaAdminView(UserPassesTestMixin, View):
             return redirect('admin:academico_mesaexamen_change', mesa_id)
 
         try:
-            notas_cargadas = 0
-            errores = []
-
-            for key, value in request.POST.items():
-                if key.startswith('nota_'):
-                    inscripcion_id = int(key.replace('nota_', ''))
-                    try:
-                        inscripcion = InscripcionMesaExamen.objects.get(id=inscripcion_id)
-                        if value and value.strip():
-                            nota = float(value)
-                            if nota < 0 or nota > 10:
-                                errores.append(f'{inscripcion.alumno}: La nota debe estar entre 0 y 10')
-                                continue
-                                
-                            # Usamos el servicio existente
-                            success, mensaje = ServiciosAcademico.cargar_nota_examen_final(
-                                inscripcion, nota, request.user
-                            )
-                            if success:
-                                notas_cargadas += 1
-                            else:
-                                errores.append(f'{inscripcion.alumno}: {mensaje}')
-                    except Exception as e:
-                        errores.append(f'Error en inscripción {inscripcion_id}: {str(e)}')
+            notas = {
+                key.replace('nota_', ''): value
+                for key, value in request.POST.items() if key.startswith('nota_')
+            }
+            resultado = ServiciosAcademico.cargar_notas_mesa(mesa, notas, request.user)
+            notas_cargadas = resultado['cargadas']
+            errores = resultado['errores']
 
             if notas_cargadas > 0:
                 messages.success(request, f'Se cargaron {notas_cargadas} notas correctamente.')
@@ -750,10 +683,16 @@ class CargarNotasMesaAdminView(UserPassesTestMixin, View):
 
 
 class ActaExamenPDFView(DocenteRequiredMixin, View):
-    """Vista para generar el acta de examen en PDF"""
+    """
+    Vista para descargar el acta de examen en PDF. El acta se guarda en disco y
+    solo se vuelve a generar si cambió su contenido; las descargas repetidas se
+    responden con 304 (ETag / Last-Modified).
+    """
 
     def get(self, request, mesa_id):
-        mesa = get_object_or_404(MesaExamen, id=mesa_id)
+        from academico.actas_pdf import obtener_acta
+
+        mesa = get_object_or_404(MesaExamen.objects.select_related('materia', 'anio_academico'), id=mesa_id)
         docente = get_object_or_404(Empleado, usuario=request.user)
 
         # Verificar que el docente sea parte del tribunal
@@ -761,45 +700,17 @@ class ActaExamenPDFView(DocenteRequiredMixin, View):
             messages.error(request, 'No tiene permisos para generar el acta de esta mesa.')
             return redirect('mesas_examen_docente')
 
-        # Obtener inscripciones
-        inscripciones = InscripcionMesaExamen.objects.filter(
-            mesa_examen=mesa
-        ).select_related('alumno').order_by('alumno__apellido', 'alumno__nombre')
-
-        inscripciones_regulares = inscripciones.filter(condicion='REGULAR')
-        inscripciones_libres = inscripciones.filter(condicion='LIBRE')
-
-        # Calcular estadísticas
-        total_inscriptos = inscripciones.count()
-        total_regulares = inscripciones_regulares.count()
-        total_libres = inscripciones_libres.count()
-        total_aprobados = inscripciones.filter(estado_inscripcion='APROBADO').count()
-        total_desaprobados = inscripciones.filter(estado_inscripcion='DESAPROBADO').count()
-        total_ausentes = inscripciones.filter(estado_inscripcion='AUSENTE').count()
-
-        # Contexto para el template
-        context = {
-            'mesa': mesa,
-            'tribunal': mesa.tribunal.all(),
-            'inscripciones_regulares': inscripciones_regulares,
-            'inscripciones_libres': inscripciones_libres,
-            'total_inscriptos': total_inscriptos,
-            'total_regulares': total_regulares,
-            'total_libres': total_libres,
-            'total_aprobados': total_aprobados,
-            'total_desaprobados': total_desaprobados,
-            'total_ausentes': total_ausentes,
-            'fecha_generacion': timezone.now(),
-        }
-
-        # Generar PDF usando utilidad centralizada
-        pdf = generar_certificado_pdf(context, template_name='academico/acta_examen_pdf.html')
-
-        # Crear respuesta HTTP
-        response = HttpResponse(pdf, content_type='application/pdf')
-        filename = f'acta_examen_{mesa.materia.codigo}_{mesa.fecha_examen.strftime("%Y%m%d")}.pdf'
-        response['Content-Disposition'] = f'inline; filename="{filename}"'
-
+        acta = obtener_acta(mesa)
+        etag = f'"{acta.hash}"'
+        modificada = acta.modificada
+
+        response = get_conditional_response(request, etag=etag, last_modified=modificada.timestamp())
+        if response is None:
+            response = FileResponse(open(acta.ruta, 'rb'), content_type='application/pdf')
+            response['Content-Disposition'] = f'inline; filename="{acta.nombre_descarga}"'
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(modificada.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
         return response
 
 
@@ -809,35 +720,33 @@ class HistoricoMesasAlumnoView(DocenteRequiredMixin, View):
     def get(self, request, alumno_id):
         alumno = get_object_or_404(Alumno, id=alumno_id)
 
-        # Obtener todas las inscripciones a mesas del alumno
-        inscripciones = InscripcionMesaExamen.objects.filter(
+        # Todas las inscripciones a mesas del alumno, en una consulta; las pestañas se arman en memoria
+        inscripciones = list(InscripcionMesaExamen.objects.filter(
             alumno=alumno
-        ).select_related('mesa_examen__materia', 'mesa_examen__anio_academico').order_by('-mesa_examen__fecha_examen')
-
-        # Separar por estado
-        mesas_aprobadas = inscripciones.filter(estado_inscripcion='APROBADO')
-        mesas_desaprobadas = inscripciones.filter(estado_inscripcion='DESAPROBADO')
-        mesas_ausentes = inscripciones.filter(estado_inscripcion='AUSENTE')
-        mesas_inscriptas = inscripciones.filter(estado_inscripcion='INSCRIPTO')
+        ).select_related('mesa_examen__materia', 'mesa_examen__anio_academico').order_by('-mesa_examen__fecha_examen'))
 
-        # Calcular estadísticas
-        total_mesas = inscripciones.count()
-        total_aprobadas = mesas_aprobadas.count()
-        total_desaprobadas = mesas_desaprobadas.count()
-        total_ausentes = mesas_ausentes.count()
+        por_estado = defaultdict(list)
+        for inscripcion in inscripciones:
+            por_estado[inscripcion.estado_inscripcion].append(inscripcion)
 
-        # Calcular promedio de notas en exámenes
-        notas = [i.nota_examen for i in inscripciones if i.nota_examen]
-        promedio_examenes = sum(notas) / len(notas) if notas else 0
+        # Estadísticas desde el analítico (una fila por materia)
+        analitico = list(MateriaAnalitico.objects.filter(alumno=alumno).select_related('materia').order_by('materia__nombre'))
+        total_aprobadas = sum(fila.examenes_aprobados for fila in analitico)
+        total_desaprobadas = sum(fila.examenes_desaprobados for fila in analitico)
+        total_ausentes = sum(fila.examenes_ausentes for fila in analitico)
+        cantidad_notas = sum(fila.cantidad_notas_examen for fila in analitico)
+        suma_notas = sum(fila.suma_notas_examen for fila in analitico)
+        promedio_examenes = suma_notas / cantidad_notas if cantidad_notas else 0
 
         return render(request, 'academico/historico_mesas_alumno.html', {
             'alumno': alumno,
             'inscripciones': inscripciones,
-            'mesas_aprobadas': mesas_aprobadas,
-            'mesas_desaprobadas': mesas_desaprobadas,
-            'mesas_ausentes': mesas_ausentes,
-            'mesas_inscriptas': mesas_inscriptas,
-            'total_mesas': total_mesas,
+            'mesas_aprobadas': por_estado['APROBADO'],
+            'mesas_desaprobadas': por_estado['DESAPROBADO'],
+            'mesas_ausentes': por_estado['AUSENTE'],
+            'mesas_inscriptas': por_estado['INSCRIPTO'],
+            'analitico': analitico,
+            'total_mesas': len(inscripciones),
             'total_aprobadas': total_aprobadas,
             'total_desaprobadas': total_desaprobadas,
             'total_ausentes': total_ausentes,
@@ -1,12 +1,12 @@
 from django.contrib import admin
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse
 from django.shortcuts import get_object_or_404, render
 from django.utils.html import format_html
 from django.contrib import messages
 from django.urls import path
 
 from administracion.models import Certificado, PlanEstudio, TipoCertificado
-from main.utils import crear_contexto_certificado, generar_certificado_pdf
+from administracion.services import certificados_pdf
 
 @admin.register(PlanEstudio)
 class PlanEstudioAdmin(admin.ModelAdmin):
@@ -22,7 +22,7 @@ class CertificadoAdmin(admin.ModelAdmin):
     list_filter = ('tipo', 'fecha_emision')
     search_fields = ('alumno__nombre', 'alumno__apellido', 'alumno__dni', 'codigo_verificacion')
     ordering = ('-fecha_emision',)
-    readonly_fields = ('codigo_verificacion', 'fecha_emision')
+    readonly_fields = ('codigo_verificacion', 'fecha_emision', 'hash_pdf')
     autocomplete_fields = ['alumno', 'generado_por']
     list_select_related = ('alumno', 'generado_por')
     date_hierarchy = 'fecha_emision'
@@ -35,7 +35,7 @@ class CertificadoAdmin(admin.ModelAdmin):
             'fields': ('codigo_verificacion', 'alumno', 'tipo')
         }),
         ('Generación', {
-            'fields': ('generado_por', 'fecha_emision')
+            'fields': ('generado_por', 'fecha_emision', 'hash_pdf')
         }),
     )
 
@@ -70,25 +70,17 @@ class CertificadoAdmin(admin.ModelAdmin):
         return custom_urls + urls
 
     def download_certificado(self, request, object_id):
-        from institucional.models import Institucion
-        certificado = get_object_or_404(Certificado, id=object_id)
+        certificado = get_object_or_404(Certificado.objects.select_related('alumno'), id=object_id)
         try:
-            institucion = Institucion.objects.first()
-            if not institucion:
-                return HttpResponse('Error: No hay institución configurada en el sistema.', status=500)
-
-            contexto = crear_contexto_certificado(
-                certificado.alumno,
-                certificado.get_tipo_display(),
-                institucion
+            # Se sirve el PDF tal como se emitió; los anteriores a guardarse se emiten ahora
+            if certificado.hash_pdf:
+                ruta = certificados_pdf.archivo_verificado(certificado)
+            else:
+                ruta = certificados_pdf.emitir_pdf(certificado)
+            return FileResponse(
+                open(ruta, 'rb'), as_attachment=True, content_type='application/pdf',
+                filename=f'certificado_{certificado.alumno.dni}_{certificado.tipo}.pdf'
             )
-            contexto['certificado'] = certificado
-
-            pdf_content = generar_certificado_pdf(contexto)
-
-            response = HttpResponse(pdf_content, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="certificado_{certificado.alumno.dni}_{certificado.tipo}.pdf"'
-            return response
         except Exception as e:
             messages.error(request, f'Error al generar el certificado: {str(e)}')
             return HttpResponse(f'Error: {str(e)}', status=500)
@@ -0,0 +1,99 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+def _iniciar_proceso():
+    # spawn: el proceso arranca sin Django configurado ni conexiones heredadas
+    import django
+    django.setup()
+
+
+def _ejecutar(tarea_id):
+    from django.db import close_old_connections
+    from administracion.services.tareas import ejecutar_tarea
+
+    try:
+        return ejecutar_tarea(tarea_id).estado
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = (
+        'Ejecuta las tareas encoladas (reportes, certificados, backups, cierres...) '
+        'en un pool de procesos. Queda esperando tareas nuevas hasta que se lo detenga.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--procesos',
+            type=int,
+            default=settings.TAREAS_PROCESOS,
+            help=f'Tareas en paralelo (por defecto {settings.TAREAS_PROCESOS}; 0 ejecuta en este proceso)',
+        )
+        parser.add_argument(
+            '--intervalo',
+            type=float,
+            default=2,
+            help='Segundos entre consultas cuando no hay tareas (por defecto 2)',
+        )
+        parser.add_argument(
+            '--una-vez',
+            action='store_true',
+            help='Termina cuando no quedan tareas disponibles',
+        )
+
+    def handle(self, *args, **options):
+        from administracion.services.tareas import nombre_worker, procesar_pendientes, tareas_registradas, tomar_tarea
+
+        procesos, intervalo, una_vez = options['procesos'], options['intervalo'], options['una_vez']
+        worker = nombre_worker()
+        self.stdout.write(f"Worker {worker} - tareas registradas: {', '.join(sorted(tareas_registradas()))}")
+
+        if procesos <= 0:
+            while True:
+                ejecutadas = procesar_pendientes(worker)
+                if ejecutadas:
+                    self.stdout.write(f'Tareas ejecutadas: {ejecutadas}')
+                elif una_vez:
+                    break
+                else:
+                    time.sleep(intervalo)
+            self.stdout.write(self.style.SUCCESS('✅ No quedan tareas pendientes'))
+            return
+
+        en_curso = {}
+        with ProcessPoolExecutor(
+            max_workers=procesos, mp_context=multiprocessing.get_context('spawn'), initializer=_iniciar_proceso
+        ) as pool:
+            try:
+                while True:
+                    # Se toman solo tantas tareas como procesos libres: el resto queda para otros workers
+                    while len(en_curso) < procesos:
+                        tarea_id = tomar_tarea(worker)
+                        if tarea_id is None:
+                            break
+                        en_curso[pool.submit(_ejecutar, tarea_id)] = tarea_id
+
+                    if not en_curso:
+                        if una_vez:
+                            break
+                        time.sleep(intervalo)
+                        continue
+
+                    terminadas, _ = wait(en_curso, timeout=intervalo, return_when=FIRST_COMPLETED)
+                    for futuro in terminadas:
+                        tarea_id = en_curso.pop(futuro)
+                        try:
+                            self.stdout.write(f'Tarea {tarea_id}: {futuro.result()}')
+                        except Exception as e:
+                            # El proceso murió: la tarea se retoma cuando vence su bloqueo
+                            self.stderr.write(f'Tarea {tarea_id}: el proceso terminó con error ({e})')
+            except KeyboardInterrupt:
+                self.stdout.write('Deteniendo: se esperan las tareas en curso...')
+
+        self.stdout.write(self.style.SUCCESS('✅ Worker detenido'))
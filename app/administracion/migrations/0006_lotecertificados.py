@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administracion', '0005_alter_certificado_tipo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoteCertificados',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('asistencia', 'Certificado de Asistencia'), ('aprobacion', 'Certificado de Aprobación'), ('examen', 'Certificado de Examen'), ('alumno_regular', 'Certificado de Alumno Regular'), ('buen_comportamiento', 'Certificado de Buen Comportamiento'), ('otro', 'Otro Certificado')], max_length=30)),
+                ('alumnos', models.JSONField(help_text='IDs de los alumnos incluidos')),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('generados', models.PositiveIntegerField(default=0)),
+                ('estado', models.CharField(choices=[('PENDIENTE', 'Pendiente'), ('PROCESANDO', 'Procesando'), ('FINALIZADO', 'Finalizado'), ('ERROR', 'Error')], default='PENDIENTE', max_length=20)),
+                ('archivo', models.CharField(blank=True, help_text='Ruta del ZIP generado', max_length=255)),
+                ('error', models.TextField(blank=True)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+                ('creado_por', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Lote de certificados',
+                'verbose_name_plural': 'Lotes de certificados',
+                'db_table': 'administracion_lotes_certificados',
+                'ordering': ['-fecha_creacion'],
+            },
+        ),
+    ]
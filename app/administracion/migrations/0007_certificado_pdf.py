@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 00:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('administracion', '0006_lotecertificados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificado',
+            name='archivo_pdf',
+            field=models.CharField(blank=True, editable=False, help_text='PDF emitido, relativo a CERTIFICADOS_PDF_DIR (ver administracion.services.certificados_pdf)', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='certificado',
+            name='hash_pdf',
+            field=models.CharField(blank=True, db_index=True, editable=False, help_text='SHA-256 del PDF emitido', max_length=64),
+        ),
+    ]
@@ -34,6 +34,11 @@ class TipoCertificado(models.TextChoices):
     BUEN_COMPORTAMIENTO = 'buen_comportamiento', 'Certificado de Buen Comportamiento'
     OTRO = 'otro', 'Otro Certificado'
 
+def generar_codigo_verificacion():
+    import uuid
+    return str(uuid.uuid4())[:8].upper()
+
+
 class Certificado(models.Model):
     alumno = models.ForeignKey('academico.Alumno', on_delete=models.CASCADE)
     tipo = models.CharField(max_length=30, choices=TipoCertificado.choices)
@@ -41,6 +46,11 @@ class Certificado(models.Model):
     codigo_verificacion = models.CharField(max_length=50, unique=True)
     contenido = models.TextField(blank=True)
     generado_por = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
+    archivo_pdf = models.CharField(
+        max_length=255, blank=True, editable=False,
+        help_text='PDF emitido, relativo a CERTIFICADOS_PDF_DIR (ver administracion.services.certificados_pdf)'
+    )
+    hash_pdf = models.CharField(max_length=64, blank=True, db_index=True, editable=False, help_text='SHA-256 del PDF emitido')
 
     class Meta:
         db_table = 'administracion_certificados'
@@ -53,8 +63,97 @@ class Certificado(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.codigo_verificacion:
-            import uuid
-            self.codigo_verificacion = str(uuid.uuid4())[:8].upper()
+            self.codigo_verificacion = generar_codigo_verificacion()
         super().save(*args, **kwargs)
 
 
+class EstadoLoteCertificados(models.TextChoices):
+    PENDIENTE = 'PENDIENTE', 'Pendiente'
+    PROCESANDO = 'PROCESANDO', 'Procesando'
+    FINALIZADO = 'FINALIZADO', 'Finalizado'
+    ERROR = 'ERROR', 'Error'
+
+
+class LoteCertificados(models.Model):
+    """
+    Certificados de muchos alumnos generados en segundo plano en un único ZIP
+    (ver administracion.services.certificados_lote).
+    """
+    tipo = models.CharField(max_length=30, choices=TipoCertificado.choices)
+    alumnos = models.JSONField(help_text='IDs de los alumnos incluidos')
+    total = models.PositiveIntegerField(default=0)
+    generados = models.PositiveIntegerField(default=0)
+    estado = models.CharField(
+        max_length=20, choices=EstadoLoteCertificados.choices, default=EstadoLoteCertificados.PENDIENTE
+    )
+    archivo = models.CharField(max_length=255, blank=True, help_text='Ruta del ZIP generado')
+    error = models.TextField(blank=True)
+    creado_por = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_fin = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'administracion_lotes_certificados'
+        verbose_name = 'Lote de certificados'
+        verbose_name_plural = 'Lotes de certificados'
+        ordering = ['-fecha_creacion']
+
+    def __str__(self):
+        return f"Lote {self.pk} - {self.get_tipo_display()} ({self.generados}/{self.total})"
+
+    @property
+    def porcentaje(self):
+        return round(self.generados * 100 / self.total) if self.total else 100
+
+    @property
+    def terminado(self):
+        return self.estado in (EstadoLoteCertificados.FINALIZADO, EstadoLoteCertificados.ERROR)
+
+
+class EstadoTarea(models.TextChoices):
+    PENDIENTE = 'PENDIENTE', 'Pendiente'
+    EN_CURSO = 'EN_CURSO', 'En curso'
+    FINALIZADA = 'FINALIZADA', 'Finalizada'
+    ERROR = 'ERROR', 'Error'
+
+
+class Tarea(models.Model):
+    """
+    Trabajo encolado para ejecutarse fuera del request, en el comando
+    procesar_tareas (ver administracion.services.tareas).
+    """
+    nombre = models.CharField(max_length=100, help_text='Nombre con el que se registró la tarea')
+    parametros = models.JSONField(default=dict, blank=True)
+    estado = models.CharField(max_length=20, choices=EstadoTarea.choices, default=EstadoTarea.PENDIENTE)
+    intentos = models.PositiveIntegerField(default=0)
+    max_intentos = models.PositiveIntegerField(default=3)
+    disponible_desde = models.DateTimeField(help_text='No se toma antes de este momento (espera entre reintentos)')
+    bloqueada_hasta = models.DateTimeField(
+        null=True, blank=True, help_text='Vencido este plazo sin avances, otro worker puede retomarla'
+    )
+    worker = models.CharField(max_length=100, blank=True)
+    progreso = models.PositiveSmallIntegerField(default=0)
+    mensaje = models.CharField(max_length=255, blank=True)
+    resultado = models.JSONField(null=True, blank=True)
+    archivo = models.CharField(max_length=255, blank=True, help_text='Ruta del archivo generado')
+    error = models.TextField(blank=True)
+    creado_por = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_inicio = models.DateTimeField(null=True, blank=True)
+    fecha_fin = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'administracion_tareas'
+        verbose_name = 'Tarea'
+        verbose_name_plural = 'Tareas'
+        ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'disponible_desde'], name='tarea_disponible_idx'),
+        ]
+
+    def __str__(self):
+        return f"Tarea {self.pk} - {self.nombre} ({self.get_estado_display()})"
+
+    @property
+    def terminada(self):
+        return self.estado in (EstadoTarea.FINALIZADA, EstadoTarea.ERROR)
@@ -228,6 +228,7 @@ def obtener_datos_reporte_academico(filtros=None):
         'promedios_materias': datos_notas.get('promedios_materias'),
         'alumnos_top_promedio': datos_notas.get('alumnos_top_promedio'),
         'alumnos_materias_aprobadas': datos_notas.get('alumnos_materias_aprobadas'),
+        'estadisticas_notas': datos_notas.get('estadisticas_notas'),
 
         # Datos de Inscripciones / Estados
         'estados_academicos': datos_inscripciones.get('estados_academicos'),
@@ -337,8 +338,58 @@ def generar_excel_reporte_academico(datos_reporte):
         ws_alumnos[f'B{row}'] = round(asistencia, 2)
         row += 1
 
+    # HOJA 4: ESTADÍSTICAS DE NOTAS
+    hojas = [ws_resumen, ws_materias, ws_alumnos]
+    estadisticas_notas = datos_reporte.get('estadisticas_notas')
+    if estadisticas_notas:
+        ws_estadisticas = wb.create_sheet("Estadísticas de Notas")
+        hojas.append(ws_estadisticas)
+
+        def encabezado(fila, titulos):
+            for columna, titulo in enumerate(titulos, start=1):
+                celda = ws_estadisticas.cell(row=fila, column=columna, value=titulo)
+                celda.fill = header_fill
+                celda.font = header_font
+
+        ws_estadisticas['A1'] = 'DISTRIBUCIÓN'
+        ws_estadisticas['A1'].font = Font(bold=True, size=12)
+        encabezado(2, ['Medida', 'Valor'])
+        medidas = [
+            ('Cantidad de notas', estadisticas_notas['cantidad']),
+            ('Promedio', estadisticas_notas['promedio']),
+            ('Desvío estándar', estadisticas_notas['desvio']),
+            ('Mínimo', estadisticas_notas['minimo']),
+        ]
+        medidas += [(f"Percentil {p}", valor) for p, valor in estadisticas_notas['percentiles']]
+        medidas += [
+            ('Máximo', estadisticas_notas['maximo']),
+            (f"Aprobación (≥{estadisticas_notas['nota_aprobacion']}) %", estadisticas_notas['tasa_aprobacion']),
+        ]
+        for medida in medidas:
+            ws_estadisticas.append(medida)
+
+        row = ws_estadisticas.max_row + 2
+        encabezado(row, ['Rango', 'Cantidad'])
+        for rango in estadisticas_notas['distribucion']:
+            ws_estadisticas.append(rango)
+
+        row = ws_estadisticas.max_row + 2
+        encabezado(row, ['Tipo', 'Notas', 'Promedio', 'Desvío', 'Aprobación %'])
+        for tipo in estadisticas_notas['por_tipo']:
+            ws_estadisticas.append([
+                tipo['nombre'], tipo['cantidad'], tipo['promedio'], tipo['desvio'], tipo['tasa_aprobacion']
+            ])
+
+        row = ws_estadisticas.max_row + 2
+        encabezado(row, ['Comisión', 'Notas', 'Promedio', 'Desvío', 'Aprobación %', 'Z-score'])
+        for comision in estadisticas_notas['por_comision']:
+            ws_estadisticas.append([
+                comision['nombre'], comision['cantidad'], comision['promedio'],
+                comision['desvio'], comision['tasa_aprobacion'], comision['z_score']
+            ])
+
     # Ajustar anchos de columna
-    for ws in [ws_resumen, ws_materias, ws_alumnos]:
+    for ws in hojas:
         for column in ws.columns:
             max_length = 0
             column_letter = get_column_letter(column[0].column)
@@ -357,3 +408,55 @@ def generar_excel_reporte_academico(datos_reporte):
     buffer.seek(0)
 
     return buffer.getvalue()
+
+
+def generar_pdf_reporte_academico(filtros=None):
+    """
+    Genera el PDF del reporte académico con gráficos embebidos
+
+    Returns:
+        bytes del PDF
+    """
+    from main.utils import generar_certificado_pdf
+
+    # Obtener datos
+    datos_reporte = obtener_datos_reporte_academico(filtros)
+
+    # Generar gráficos en base64
+    graficos = {}
+
+    if datos_reporte['promedios_materias']:
+        titulo = f"Promedios por Alumno - {datos_reporte.get('nombre_comision', '')}" if datos_reporte.get('vista_detalle') else "Promedios por Materia"
+        graficos['distribucion_notas'] = grafico_distribucion_notas(
+            datos_reporte['promedios_materias'],
+            titulo=titulo
+        )
+
+    aprobados, desaprobados, regulares, en_curso = datos_reporte['estados_academicos']
+    if aprobados > 0 or desaprobados > 0 or regulares > 0 or en_curso > 0:
+        graficos['estados'] = grafico_aprobados_desaprobados(
+            aprobados, desaprobados, regulares, en_curso
+        )
+
+    if datos_reporte['asistencias_por_mes']:
+        graficos['asistencias'] = grafico_evolucion_asistencias(
+            datos_reporte['asistencias_por_mes']
+        )
+
+    if datos_reporte['alumnos_top_promedio']:
+        graficos['comparativo_alumnos'] = grafico_comparativo_alumnos(
+            datos_reporte['alumnos_top_promedio'],
+            metrica='promedio'
+        )
+
+    # Contexto para PDF
+    contexto = {
+        'datos': datos_reporte,
+        'graficos': graficos,
+        'fecha_generacion': datetime.now().strftime('%d/%m/%Y %H:%M'),
+    }
+
+    return generar_certificado_pdf(
+        contexto,
+        template_name='administracion/reporte_academico_pdf.html'
+    )
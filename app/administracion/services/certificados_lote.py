@@ -0,0 +1,160 @@
+"""
+Certificados de varios alumnos en un ZIP.
+
+Los alumnos se procesan por tandas: por cada tanda se crean sus Certificado
+con un bulk_create, se arman todos los contextos con una cantidad fija de
+consultas, los PDFs se renderizan en paralelo en el pool de main.pdf y se
+guardan como emitidos (certificados_pdf). Hasta LIMITE_ZIP_DIRECTO alumnos el
+ZIP se arma a medida que salen las tandas y se devuelve en streaming; para más, se registra
+un LoteCertificados y se encola la tarea que lo genera (administracion.tareas),
+que guarda el ZIP en CERTIFICADOS_LOTE_DIR e informa el avance en la página de progreso.
+"""
+import os
+import zipfile
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+from academico.models import Alumno
+from administracion.models import (
+    Certificado, EstadoLoteCertificados, LoteCertificados, TipoCertificado, generar_codigo_verificacion
+)
+from institucional.models import Institucion
+
+LIMITE_ZIP_DIRECTO = 50
+TAMANIO_TANDA = 20
+
+
+def nombre_certificado(alumno, tipo):
+    return f'certificado_{alumno.dni}_{tipo}.pdf'
+
+
+def _institucion():
+    institucion = Institucion.objects.first()
+    if institucion is None:
+        raise ValueError('No hay institución configurada en el sistema.')
+    return institucion
+
+
+def certificados_por_tanda(alumno_ids, tipo, usuario, institucion):
+    """
+    Genera los certificados de los alumnos, una tanda por iteración.
+
+    Yields:
+        list de (nombre_archivo, bytes del PDF)
+    """
+    from administracion.services.certificados_pdf import registrar_pdfs
+    from main.utils import crear_contextos_certificado, generar_certificados_pdf
+
+    etiqueta = TipoCertificado(tipo).label
+
+    alumno_ids = list(alumno_ids)
+    for inicio in range(0, len(alumno_ids), TAMANIO_TANDA):
+        alumnos = list(Alumno.objects.filter(pk__in=alumno_ids[inicio:inicio + TAMANIO_TANDA]).order_by('apellido', 'nombre', 'pk'))
+        certificados = Certificado.objects.bulk_create([
+            Certificado(alumno=alumno, tipo=tipo, generado_por=usuario, codigo_verificacion=generar_codigo_verificacion())
+            for alumno in alumnos
+        ])
+        contextos = crear_contextos_certificado(alumnos, etiqueta, institucion)
+        for contexto, certificado in zip(contextos, certificados):
+            contexto['certificado'] = certificado
+        pdfs = generar_certificados_pdf(contextos)
+        registrar_pdfs(certificados, pdfs)
+        yield [(nombre_certificado(alumno, tipo), pdf) for alumno, pdf in zip(alumnos, pdfs)]
+
+
+class _SalidaZip:
+    """Destino no posicionable para ZipFile: acumula lo escrito hasta que se lo retira"""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def retirar(self):
+        datos = b''.join(self._partes)
+        self._partes = []
+        return datos
+
+
+def zip_en_partes(tandas):
+    """Arma el ZIP a medida que llegan las tandas y devuelve sus bytes por partes"""
+    salida = _SalidaZip()
+    # Los PDFs ya vienen comprimidos: se guardan sin volver a comprimir
+    with zipfile.ZipFile(salida, 'w', zipfile.ZIP_STORED) as archivo_zip:
+        for tanda in tandas:
+            for nombre, pdf in tanda:
+                archivo_zip.writestr(nombre, pdf)
+            yield salida.retirar()
+    yield salida.retirar()
+
+
+def respuesta_zip(alumno_ids, tipo, usuario):
+    """StreamingHttpResponse con el ZIP de los certificados de los alumnos"""
+    # La institución se valida antes de empezar a responder
+    tandas = certificados_por_tanda(alumno_ids, tipo, usuario, _institucion())
+    respuesta = StreamingHttpResponse(zip_en_partes(tandas), content_type='application/zip')
+    respuesta['Content-Disposition'] = f'attachment; filename="certificados_{tipo}_{timezone.now():%Y%m%d_%H%M%S}.zip"'
+    return respuesta
+
+
+def crear_lote(alumno_ids, tipo, usuario):
+    """Registra el lote y encola la tarea que lo genera"""
+    from administracion.services.tareas import encolar
+
+    alumno_ids = list(alumno_ids)
+    lote = LoteCertificados.objects.create(tipo=tipo, alumnos=alumno_ids, total=len(alumno_ids), creado_por=usuario)
+    encolar('certificados_lote', usuario, lote_id=lote.pk)
+    return lote
+
+
+def generar_lote(lote_id, progreso=None):
+    """
+    Genera el ZIP del lote en CERTIFICADOS_LOTE_DIR, actualizando el avance por tanda.
+
+    Args:
+        progreso: callable(generados, total) opcional, llamado al terminar cada tanda
+
+    Returns:
+        LoteCertificados actualizado
+
+    Raises:
+        La excepción de la generación, después de dejar el lote en ERROR, para
+        que la cola de tareas registre la falla
+    """
+    lote = LoteCertificados.objects.select_related('creado_por').get(pk=lote_id)
+    LoteCertificados.objects.filter(pk=lote.pk).update(estado=EstadoLoteCertificados.PROCESANDO, generados=0)
+
+    os.makedirs(settings.CERTIFICADOS_LOTE_DIR, exist_ok=True)
+    ruta = os.path.join(settings.CERTIFICADOS_LOTE_DIR, f'lote_{lote.pk}_{lote.tipo}.zip')
+    temporal = f'{ruta}.tmp'
+    generados = 0
+    try:
+        with zipfile.ZipFile(temporal, 'w', zipfile.ZIP_STORED) as archivo_zip:
+            for tanda in certificados_por_tanda(lote.alumnos, lote.tipo, lote.creado_por, _institucion()):
+                for nombre, pdf in tanda:
+                    archivo_zip.writestr(nombre, pdf)
+                generados += len(tanda)
+                LoteCertificados.objects.filter(pk=lote.pk).update(generados=generados)
+                if progreso:
+                    progreso(generados, lote.total)
+        os.replace(temporal, ruta)
+    except Exception as e:
+        if os.path.exists(temporal):
+            os.unlink(temporal)
+        LoteCertificados.objects.filter(pk=lote.pk).update(
+            estado=EstadoLoteCertificados.ERROR, error=str(e), fecha_fin=timezone.now()
+        )
+        raise
+
+    LoteCertificados.objects.filter(pk=lote.pk).update(
+        estado=EstadoLoteCertificados.FINALIZADO, archivo=ruta, fecha_fin=timezone.now()
+    )
+    lote.refresh_from_db()
+    return lote
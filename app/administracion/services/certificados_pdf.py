@@ -0,0 +1,98 @@
+"""
+PDFs de certificados emitidos.
+
+El PDF se renderiza una sola vez, al emitir el certificado, y se guarda en
+CERTIFICADOS_PDF_DIR con el SHA-256 de su contenido como nombre (dos PDFs
+idénticos comparten archivo). El Certificado guarda la ruta y el hash: la
+descarga sirve el archivo tal como se emitió, aunque después cambien las notas
+del alumno, y cualquier copia se puede verificar contra el hash registrado
+para su código de verificación.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+
+from administracion.models import Certificado, TipoCertificado
+from main.pdf import guardar_pdf
+
+
+class CertificadoAlterado(Exception):
+    """El archivo guardado no coincide con el hash registrado al emitir"""
+
+
+def _hash(contenido):
+    return hashlib.sha256(contenido).hexdigest()
+
+
+def ruta_absoluta(certificado):
+    return os.path.join(settings.CERTIFICADOS_PDF_DIR, certificado.archivo_pdf)
+
+
+def _guardar(contenido):
+    """Guarda el PDF por contenido y devuelve (ruta relativa, hash)"""
+    hash_pdf = _hash(contenido)
+    relativa = os.path.join(hash_pdf[:2], f'{hash_pdf}.pdf')
+    ruta = os.path.join(settings.CERTIFICADOS_PDF_DIR, relativa)
+    if not os.path.exists(ruta):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        guardar_pdf(ruta, contenido)
+    return relativa, hash_pdf
+
+
+def registrar_pdfs(certificados, pdfs):
+    """
+    Guarda los PDFs recién renderizados de los certificados y los vincula con
+    un único bulk_update.
+    """
+    for certificado, contenido in zip(certificados, pdfs):
+        certificado.archivo_pdf, certificado.hash_pdf = _guardar(contenido)
+    Certificado.objects.bulk_update(certificados, ['archivo_pdf', 'hash_pdf'], batch_size=500)
+
+
+def emitir_pdf(certificado, institucion=None):
+    """
+    Renderiza y guarda el PDF de un certificado que todavía no lo tiene (los
+    emitidos antes de guardarse los PDFs se emiten en su primera descarga).
+
+    Returns:
+        ruta absoluta del PDF
+    """
+    from institucional.models import Institucion
+    from main.utils import crear_contexto_certificado, generar_certificado_pdf
+
+    if not certificado.hash_pdf:
+        institucion = institucion or Institucion.objects.first()
+        if institucion is None:
+            raise ValueError('No hay institución configurada en el sistema.')
+        contexto = crear_contexto_certificado(certificado.alumno, TipoCertificado(certificado.tipo).label, institucion)
+        contexto['certificado'] = certificado
+        registrar_pdfs([certificado], [generar_certificado_pdf(contexto)])
+    return ruta_absoluta(certificado)
+
+
+def archivo_verificado(certificado):
+    """
+    Ruta del PDF emitido tras comprobar que no fue modificado.
+
+    Raises:
+        CertificadoAlterado si falta el archivo o su hash no coincide
+    """
+    ruta = ruta_absoluta(certificado)
+    try:
+        with open(ruta, 'rb') as archivo:
+            contenido = archivo.read()
+    except FileNotFoundError:
+        raise CertificadoAlterado(f'Falta el PDF del certificado {certificado.codigo_verificacion}.')
+    if _hash(contenido) != certificado.hash_pdf:
+        raise CertificadoAlterado(f'El PDF del certificado {certificado.codigo_verificacion} fue modificado.')
+    return ruta
+
+
+def verificar_pdf(codigo_verificacion, contenido):
+    """
+    True si el contenido es exactamente el PDF emitido con ese código de verificación.
+    """
+    return Certificado.objects.filter(
+        codigo_verificacion=codigo_verificacion, hash_pdf=_hash(contenido)
+    ).exclude(hash_pdf='').exists()
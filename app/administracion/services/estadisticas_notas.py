@@ -0,0 +1,153 @@
+"""
+Estadísticas de calificaciones calculadas con NumPy.
+
+Las notas del conjunto filtrado se leen con una única consulta columnar
+(values_list) y se convierten en arreglos; distribución, percentiles, desvío,
+aprobación por tipo y z-scores por comisión se calculan vectorizados con
+bincount, sin volver a la base. Lo usan ReporteNotas, el reporte académico y
+sus exportaciones; ReporteNotas lee las filas con columnas extra y calcula sus
+rankings sobre la misma lectura.
+"""
+import numpy as np
+from django.db.models import FloatField
+from django.db.models.functions import Cast
+
+from academico.models import Calificacion, Comision, TipoCalificacion
+
+NOTA_APROBACION = 6
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Intervalos [0, 1), [1, 2), ... [9, 10]; np.histogram incluye el 10 en el último
+LIMITES_DISTRIBUCION = np.arange(0, 11)
+
+
+def _redondear(valor):
+    return round(float(valor), 2)
+
+
+def _filtrar_calificaciones(filtros):
+    calificaciones = Calificacion.objects.all()
+    if filtros.get('comision_id'):
+        calificaciones = calificaciones.filter(alumno_comision__comision_id=filtros['comision_id'])
+    if filtros.get('anio_academico'):
+        calificaciones = calificaciones.filter(alumno_comision__comision__anio_academico=filtros['anio_academico'])
+    return calificaciones
+
+
+def leer_calificaciones(filtros=None, *columnas):
+    """
+    Filas (nota, tipo, comision_id, *columnas) de las calificaciones que cumplen
+    los filtros, en una sola consulta.
+    """
+    # La nota se lee como float para no construir un Decimal por fila
+    return list(
+        _filtrar_calificaciones(filtros or {}).values_list(
+            Cast('nota', FloatField()), 'tipo', 'alumno_comision__comision_id', *columnas
+        )
+    )
+
+
+def _agrupar(codigos, notas, cantidad_grupos, nota_aprobacion):
+    """Cantidad, promedio, desvío y tasa de aprobación por grupo (vectorizado)"""
+    cantidades = np.bincount(codigos, minlength=cantidad_grupos)
+    sumas = np.bincount(codigos, weights=notas, minlength=cantidad_grupos)
+    cuadrados = np.bincount(codigos, weights=notas * notas, minlength=cantidad_grupos)
+    aprobadas = np.bincount(codigos, weights=notas >= nota_aprobacion, minlength=cantidad_grupos)
+
+    promedios = sumas / cantidades
+    varianzas = np.maximum(cuadrados / cantidades - promedios * promedios, 0)
+    return cantidades, promedios, np.sqrt(varianzas), aprobadas * 100 / cantidades
+
+
+def calcular_estadisticas_notas(filtros=None, nota_aprobacion=NOTA_APROBACION, filas=None):
+    """
+    Calcula las estadísticas de las calificaciones que cumplen los filtros
+    ('comision_id', 'anio_academico').
+
+    Args:
+        filas: resultado de leer_calificaciones ya obtenido para esos filtros
+
+    Returns:
+        dict con 'cantidad', 'promedio', 'desvio', 'minimo', 'maximo',
+        'percentiles' (lista de (p, nota)), 'tasa_aprobacion', 'distribucion'
+        (lista de (rango, cantidad)), 'por_tipo' y 'por_comision' (con 'z_score'
+        del promedio de cada comisión frente al resto). Sin notas devuelve None.
+    """
+    if filas is None:
+        filas = leer_calificaciones(filtros)
+    if not filas:
+        return None
+
+    notas, tipos, comisiones = (np.array(columna) for columna in list(zip(*filas))[:3])
+    notas = notas.astype(np.float64)
+
+    frecuencias, _ = np.histogram(notas, bins=LIMITES_DISTRIBUCION)
+    valores_percentiles = np.percentile(notas, PERCENTILES)
+
+    # Tipos
+    codigos_tipo_unicos, codigos_tipo = np.unique(tipos, return_inverse=True)
+    cantidades, promedios, desvios, tasas = _agrupar(
+        codigos_tipo, notas, len(codigos_tipo_unicos), nota_aprobacion
+    )
+    etiquetas_tipo = dict(TipoCalificacion.choices)
+    por_tipo = [
+        {
+            'tipo': str(tipo),
+            'nombre': etiquetas_tipo.get(tipo, tipo),
+            'cantidad': int(cantidades[i]),
+            'promedio': _redondear(promedios[i]),
+            'desvio': _redondear(desvios[i]),
+            'tasa_aprobacion': _redondear(tasas[i]),
+        }
+        for i, tipo in enumerate(codigos_tipo_unicos)
+    ]
+
+    # Comisiones: z-score del promedio de cada comisión frente al de todas
+    comision_ids, codigos_comision = np.unique(comisiones, return_inverse=True)
+    cantidades, promedios, desvios, tasas = _agrupar(
+        codigos_comision, notas, len(comision_ids), nota_aprobacion
+    )
+    desvio_entre_comisiones = promedios.std()
+    if desvio_entre_comisiones > 0:
+        z_scores = (promedios - promedios.mean()) / desvio_entre_comisiones
+    else:
+        z_scores = np.zeros_like(promedios)
+
+    nombres = {
+        comision_id: f"{materia} - {codigo}"
+        for comision_id, codigo, materia in Comision.objects.filter(
+            id__in=comision_ids.tolist()
+        ).values_list('id', 'codigo', 'materia__nombre')
+    }
+    por_comision = sorted(
+        (
+            {
+                'comision_id': int(comision_id),
+                'nombre': nombres.get(int(comision_id), str(comision_id)),
+                'cantidad': int(cantidades[i]),
+                'promedio': _redondear(promedios[i]),
+                'desvio': _redondear(desvios[i]),
+                'tasa_aprobacion': _redondear(tasas[i]),
+                'z_score': _redondear(z_scores[i]),
+            }
+            for i, comision_id in enumerate(comision_ids)
+        ),
+        key=lambda fila: -fila['z_score']
+    )
+
+    return {
+        'cantidad': len(filas),
+        'promedio': _redondear(notas.mean()),
+        'desvio': _redondear(notas.std()),
+        'minimo': _redondear(notas.min()),
+        'maximo': _redondear(notas.max()),
+        'percentiles': [(p, _redondear(valor)) for p, valor in zip(PERCENTILES, valores_percentiles)],
+        'tasa_aprobacion': _redondear(np.count_nonzero(notas >= nota_aprobacion) * 100 / len(filas)),
+        'nota_aprobacion': nota_aprobacion,
+        'distribucion': [
+            (f"{inicio}-{inicio + 1}", int(cantidad))
+            for inicio, cantidad in zip(LIMITES_DISTRIBUCION[:-1].tolist(), frecuencias)
+        ],
+        'por_tipo': por_tipo,
+        'por_comision': por_comision,
+    }
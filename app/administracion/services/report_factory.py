@@ -1,13 +1,52 @@
+"""
+Generadores de los datos del reporte académico.
+
+Cada generador resuelve todas sus cifras en una sola pasada por su tabla de
+hechos: inscripciones y asistencias con agregación condicional (Count con
+filter=Q(...)) y una consulta agrupada; calificaciones con una lectura columnar
+que se agrupa con NumPy (ver estadisticas_notas). Los rankings por alumno,
+materia o mes se arman en Python a partir de esa única consulta. La cantidad
+de consultas no depende del volumen de datos.
+"""
 from abc import ABC, abstractmethod
+from collections import defaultdict
 from datetime import datetime
+
+import numpy as np
 from django.db import models
-from django.db.models import Avg, Count, Q, Case, When, IntegerField, FloatField, F
+from django.db.models import Count, Q
 from django.db.models.functions import ExtractMonth
 from academico.models import (
     InscripcionAlumnoComision, Calificacion, Asistencia, 
     TipoCalificacion, EstadoMateria, CondicionInscripcion,
     Comision, AnioAcademico
 )
+from administracion.services.estadisticas_notas import NOTA_APROBACION, calcular_estadisticas_notas, leer_calificaciones
+
+def _nombre_alumno(fila):
+    return f"{fila['alumno_comision__alumno__apellido']} {fila['alumno_comision__alumno__nombre']}"
+
+
+def _acumular(acumulados, clave, parcial, total):
+    acumulados[clave][0] += parcial
+    acumulados[clave][1] += total
+
+
+def _porcentaje(parcial, total):
+    return parcial / total * 100 if total > 0 else 0
+
+
+def _promedios_por(etiquetas, notas):
+    """{etiqueta: promedio} de las notas agrupadas por etiqueta (vectorizado)"""
+    claves, codigos = np.unique(etiquetas, return_inverse=True)
+    promedios = np.bincount(codigos, weights=notas) / np.bincount(codigos)
+    return {str(clave): float(promedio) for clave, promedio in zip(claves, promedios)}
+
+
+def _ranking(valores, cantidad):
+    """Los `cantidad` mayores de {etiqueta: valor}, como lista de (etiqueta, valor)"""
+    return sorted(valores.items(), key=lambda item: item[1], reverse=True)[:cantidad]
+
 
 class ReporteGenerator(ABC):
     @abstractmethod
@@ -40,35 +79,32 @@ class ReporteInscripciones(ReporteGenerator):
     """
     
     def generar_datos(self, filtros):
-        inscripciones = InscripcionAlumnoComision.objects.select_related(
-            'alumno', 'comision', 'comision__materia'
-        )
+        inscripciones = InscripcionAlumnoComision.objects.all()
         inscripciones = self._aplicar_filtros_comunes(inscripciones, filtros)
 
-        # 1. Totales básicos
-        total_alumnos = inscripciones.values('alumno').distinct().count()
-        total_materias = inscripciones.values('comision__materia').distinct().count()
-        total_comisiones = inscripciones.values('comision').distinct().count()
-
-        # 2. Estados Académicos
-        # Aprobados: estado_inscripcion = APROBADA
-        aprobados = inscripciones.filter(estado_inscripcion=EstadoMateria.APROBADA).count()
-
-        # Desaprobados: estado_inscripcion = DESAPROBADA o LIBRE
-        desaprobados = inscripciones.filter(
-            Q(estado_inscripcion=EstadoMateria.DESAPROBADA) | 
-            Q(estado_inscripcion=EstadoMateria.LIBRE) |
-            Q(condicion=CondicionInscripcion.LIBRE)
-        ).distinct().count()
-
-        # Regulares (Final Pendiente)
-        regulares = inscripciones.filter(
-            condicion=CondicionInscripcion.REGULAR
-        ).exclude(estado_inscripcion=EstadoMateria.APROBADA).count()
-
-        # En Curso
-        en_curso = inscripciones.filter(condicion=CondicionInscripcion.CURSANDO).count()
-        
+        # Totales y estados académicos en una sola pasada
+        totales = inscripciones.aggregate(
+            total_alumnos=Count('alumno', distinct=True),
+            total_materias=Count('comision__materia', distinct=True),
+            total_comisiones=Count('comision', distinct=True),
+            # Aprobados: estado_inscripcion = APROBADA
+            aprobados=Count('pk', filter=Q(estado_inscripcion=EstadoMateria.APROBADA)),
+            # Desaprobados: estado_inscripcion = DESAPROBADA o LIBRE
+            desaprobados=Count('pk', filter=(
+                Q(estado_inscripcion=EstadoMateria.DESAPROBADA) |
+                Q(estado_inscripcion=EstadoMateria.LIBRE) |
+                Q(condicion=CondicionInscripcion.LIBRE)
+            )),
+            # Regulares (Final Pendiente)
+            regulares=Count('pk', filter=(
+                Q(condicion=CondicionInscripcion.REGULAR) & ~Q(estado_inscripcion=EstadoMateria.APROBADA)
+            )),
+            # En Curso
+            en_curso=Count('pk', filter=Q(condicion=CondicionInscripcion.CURSANDO)),
+        )
+        aprobados, desaprobados = totales['aprobados'], totales['desaprobados']
+        regulares, en_curso = totales['regulares'], totales['en_curso']
+
         # Nombre de comisión para contexto si aplica
         nombre_comision = ""
         if filtros.get('comision_id'):
@@ -78,15 +114,7 @@ class ReporteInscripciones(ReporteGenerator):
 
         return {
             'tipo': 'inscripciones',
-            'estadisticas': {
-                'total_alumnos': total_alumnos,
-                'total_materias': total_materias,
-                'total_comisiones': total_comisiones,
-                'aprobados': aprobados,
-                'desaprobados': desaprobados,
-                'regulares': regulares,
-                'en_curso': en_curso,
-            },
+            'estadisticas': totales,
             'estados_academicos': (aprobados, desaprobados, regulares, en_curso),
             'nombre_comision': nombre_comision,
             'vista_detalle': bool(filtros.get('comision_id'))
@@ -99,88 +127,64 @@ class ReporteNotas(ReporteGenerator):
     """
     
     def generar_datos(self, filtros):
-        inscripciones = InscripcionAlumnoComision.objects.all()
-        inscripciones = self._aplicar_filtros_comunes(inscripciones, filtros)
-        
         es_vista_comision = bool(filtros.get('comision_id'))
 
+        # Una sola lectura de las calificaciones: los promedios por alumno y materia
+        # y las estadísticas de distribución se calculan con NumPy sobre las mismas filas
+        filas = leer_calificaciones(
+            filtros,
+            'alumno_comision__alumno__apellido',
+            'alumno_comision__alumno__nombre',
+            'alumno_comision__comision__materia__nombre'
+        )
+        estadisticas_notas = calcular_estadisticas_notas(filtros, filas=filas)
+
+        promedios_alumno, promedios_materia, aprobadas_alumno = {}, {}, {}
+        if filas:
+            notas, tipos, _, apellidos, nombres, materias = zip(*filas)
+            notas, tipos = np.array(notas, dtype=np.float64), np.array(tipos)
+            alumnos = np.array([f"{apellido} {nombre}" for apellido, nombre in zip(apellidos, nombres)])
+
+            promedios_alumno = _promedios_por(alumnos, notas)
+            promedios_materia = _promedios_por(np.array(materias), notas)
+
+            finales_aprobados = (tipos == TipoCalificacion.FINAL) & (notas >= NOTA_APROBACION)
+            etiquetas, codigos = np.unique(alumnos, return_inverse=True)
+            aprobadas = np.bincount(codigos, weights=finales_aprobados)
+            aprobadas_alumno = {
+                str(alumno): int(cantidad) for alumno, cantidad in zip(etiquetas, aprobadas) if cantidad
+            }
+
         # 1. Promedios (Por alumno o por materia según vista)
         if es_vista_comision:
-            promedios_query = Calificacion.objects.filter(
-                alumno_comision__in=inscripciones
-            ).values(
-                'alumno_comision__alumno__apellido',
-                'alumno_comision__alumno__nombre'
-            ).annotate(
-                promedio=Avg('nota')
-            ).order_by('-promedio')[:15]
-
-            promedios_materias = [
-                (f"{item['alumno_comision__alumno__apellido']} {item['alumno_comision__alumno__nombre']}",
-                 item['promedio'])
-                for item in promedios_query
-            ]
+            promedios_materias = _ranking(promedios_alumno, 15)
         else:
-            promedios_materias_query = Calificacion.objects.filter(
-                alumno_comision__in=inscripciones
-            ).values(
-                'alumno_comision__comision__materia__nombre'
-            ).annotate(
-                promedio=Avg('nota')
-            ).order_by('-promedio')[:15]
-
-            promedios_materias = [
-                (item['alumno_comision__comision__materia__nombre'], item['promedio'])
-                for item in promedios_materias_query
-            ]
+            promedios_materias = _ranking(promedios_materia, 15)
 
         # 2. Top Alumnos por Promedio
-        alumnos_promedios_query = Calificacion.objects.filter(
-            alumno_comision__in=inscripciones
-        ).values(
-            'alumno_comision__alumno__apellido',
-            'alumno_comision__alumno__nombre'
-        ).annotate(
-            promedio=Avg('nota')
-        ).order_by('-promedio')[:10]
-
-        alumnos_promedios = [
-            (f"{item['alumno_comision__alumno__apellido']} {item['alumno_comision__alumno__nombre']}",
-             item['promedio'])
-            for item in alumnos_promedios_query
-        ]
+        alumnos_promedios = _ranking(promedios_alumno, 10)
 
         # 3. Top Alumnos por Materias Aprobadas
-        alumnos_materias_query = Calificacion.objects.filter(
-            alumno_comision__in=inscripciones,
-            tipo=TipoCalificacion.FINAL,
-            nota__gte=6
-        ).values(
-            'alumno_comision__alumno__apellido',
-            'alumno_comision__alumno__nombre'
-        ).annotate(
-            aprobadas=Count('id')
-        ).order_by('-aprobadas')[:10]
-
-        alumnos_materias_aprobadas = [
-            (f"{item['alumno_comision__alumno__apellido']} {item['alumno_comision__alumno__nombre']}",
-             item['aprobadas'])
-            for item in alumnos_materias_query
-        ]
-
-        # 4. Promedio General
-        promedio_general = Calificacion.objects.filter(
-            alumno_comision__in=inscripciones
-        ).aggregate(Avg('nota'))['nota__avg'] or 0
+        alumnos_materias_aprobadas = _ranking(aprobadas_alumno, 10)
+
+        # 4. Promedio General y estadísticas de distribución
+        if estadisticas_notas:
+            resumen = {
+                'promedio_general': estadisticas_notas['promedio'],
+                'desvio_estandar': estadisticas_notas['desvio'],
+                'mediana': dict(estadisticas_notas['percentiles'])[50],
+                'tasa_aprobacion': estadisticas_notas['tasa_aprobacion'],
+            }
+        else:
+            resumen = {'promedio_general': 0}
 
         return {
             'tipo': 'notas',
-            'estadisticas': {
-                'promedio_general': round(promedio_general, 2) if promedio_general else 0,
-            },
+            'estadisticas': resumen,
+            'estadisticas_notas': estadisticas_notas,
             'promedios_materias': promedios_materias,
-            'alumnos_top_promedio': alumnos_promedios[:10],
-            'alumnos_materias_aprobadas': alumnos_materias_aprobadas[:10],
+            'alumnos_top_promedio': alumnos_promedios,
+            'alumnos_materias_aprobadas': alumnos_materias_aprobadas,
         }
 
 
@@ -202,59 +206,51 @@ class ReporteAsistencia(ReporteGenerator):
         if filtros.get('fecha_fin'):
             asistencias_query = asistencias_query.filter(fecha_asistencia__lte=filtros['fecha_fin'])
 
-        # 1. Asistencias por Mes
-        asistencias_mes = asistencias_query.annotate(
+        # Una pasada por las asistencias, agrupada por alumno y mes
+        grupos = asistencias_query.annotate(
             mes=ExtractMonth('fecha_asistencia')
-        ).values('mes').annotate(
-            total=Count('id'),
-            presentes=Count(Case(When(esta_presente=True, then=1), output_field=IntegerField()))
-        ).order_by('mes')
+        ).values(
+            'alumno_comision__alumno__apellido',
+            'alumno_comision__alumno__nombre',
+            'mes'
+        ).annotate(
+            total=Count('pk'),
+            presentes=Count('pk', filter=Q(esta_presente=True))
+        ).order_by()
+
+        asistencias_mes = defaultdict(lambda: [0, 0])
+        asistencias_alumno = defaultdict(lambda: [0, 0])
+        for fila in grupos:
+            _acumular(asistencias_mes, fila['mes'], fila['presentes'], fila['total'])
+            _acumular(asistencias_alumno, _nombre_alumno(fila), fila['presentes'], fila['total'])
 
+        # 1. Asistencias por Mes
         meses_nombres = {1: 'Ene', 2: 'Feb', 3: 'Mar', 4: 'Abr', 5: 'May', 6: 'Jun',
                          7: 'Jul', 8: 'Ago', 9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dic'}
 
         porcentajes_por_mes = {
-            meses_nombres[item['mes']]: (item['presentes'] / item['total'] * 100) if item['total'] > 0 else 0
-            for item in asistencias_mes
+            meses_nombres[mes]: _porcentaje(*asistencias_mes[mes])
+            for mes in sorted(asistencias_mes)
         }
 
         # 2. Top Alumnos por Asistencia
-        alumnos_asistencias_query = Asistencia.objects.filter(
-            alumno_comision__in=inscripciones
-        ).values(
-            'alumno_comision__alumno__apellido',
-            'alumno_comision__alumno__nombre'
-        ).annotate(
-            total=Count('id'),
-            presentes=Count(Case(When(esta_presente=True, then=1), output_field=IntegerField()))
-        ).annotate(
-            porcentaje=Case(
-                When(total__gt=0, then=100.0 * F('presentes') / F('total')),
-                default=0.0,
-                output_field=FloatField()
-            )
-        ).order_by('-porcentaje')[:10]
-
-        alumnos_asistencias = [
-            (f"{item['alumno_comision__alumno__apellido']} {item['alumno_comision__alumno__nombre']}",
-             item['porcentaje'])
-            for item in alumnos_asistencias_query
-        ]
+        alumnos_asistencias = _ranking(
+            {alumno: _porcentaje(presentes, total) for alumno, (presentes, total) in asistencias_alumno.items()}, 10
+        )
 
         # 3. Asistencia General
-        asist_stats = asistencias_query.aggregate(
-            total=Count('id'),
-            presentes=Count(Case(When(esta_presente=True, then=1), output_field=IntegerField()))
+        porcentaje_general = _porcentaje(
+            sum(presentes for presentes, _ in asistencias_mes.values()),
+            sum(total for _, total in asistencias_mes.values())
         )
-        porcentaje_general = (asist_stats['presentes'] / asist_stats['total'] * 100) if asist_stats['total'] > 0 else 0
 
         return {
             'tipo': 'asistencia',
             'estadisticas': {
                 'porcentaje_asistencia_general': round(porcentaje_general, 2),
             },
-            'asistencias_por_mes': dict(porcentajes_por_mes),
-            'alumnos_top_asistencia': alumnos_asistencias[:10],
+            'asistencias_por_mes': porcentajes_por_mes,
+            'alumnos_top_asistencia': alumnos_asistencias,
         }
 
 
@@ -0,0 +1,205 @@
+"""
+Tareas en segundo plano sobre la propia base (sin broker externo).
+
+Las funciones se registran con @registrar_tarea('nombre') en los módulos
+tareas.py de cada app y se encolan con encolar(), que solo inserta una fila en Tarea. El
+comando procesar_tareas las toma con un UPDATE condicional (dos workers nunca
+toman la misma) y las ejecuta en su pool de procesos. Una tarea tomada queda
+bloqueada por DURACION_BLOQUEO, que se renueva con cada avanzar(): si el
+worker muere, al vencer el plazo otro la retoma. Si la función lanza una
+excepción se reintenta con espera exponencial hasta max_intentos y luego queda
+en ERROR. Lo que devuelve la función se guarda como resultado (JSON).
+"""
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from administracion.models import EstadoTarea, Tarea
+
+DURACION_BLOQUEO = timedelta(minutes=10)
+ESPERA_REINTENTO = 30  # segundos; se duplica en cada intento
+
+_registro = {}
+
+
+class TareaDesconocida(Exception):
+    """No hay ninguna función registrada con ese nombre"""
+
+
+def registrar_tarea(nombre, max_intentos=3):
+    """
+    Registra una función como tarea. La función recibe la Tarea y sus
+    parámetros como keywords, y devuelve el resultado (serializable a JSON).
+    """
+    def registrar(funcion):
+        _registro[nombre] = (funcion, max_intentos)
+        return funcion
+    return registrar
+
+
+def tareas_registradas():
+    autodiscover_modules('tareas')
+    return _registro
+
+
+def encolar(nombre, usuario=None, **parametros):
+    """
+    Encola una tarea registrada.
+
+    Returns:
+        Tarea creada (PENDIENTE)
+    """
+    registradas = tareas_registradas()
+    if nombre not in registradas:
+        raise TareaDesconocida(nombre)
+    return Tarea.objects.create(
+        nombre=nombre,
+        parametros=parametros,
+        max_intentos=registradas[nombre][1],
+        disponible_desde=timezone.now(),
+        creado_por=usuario if usuario is not None and usuario.is_authenticated else None,
+    )
+
+
+def nombre_worker():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _disponibles(ahora):
+    # Pendientes cuya espera terminó, o tomadas por un worker que dejó vencer el bloqueo
+    return Tarea.objects.filter(
+        Q(estado=EstadoTarea.PENDIENTE, disponible_desde__lte=ahora)
+        | Q(estado=EstadoTarea.EN_CURSO, bloqueada_hasta__lt=ahora)
+    )
+
+
+def tomar_tarea(worker, candidatas=10):
+    """
+    Toma la próxima tarea disponible para el worker.
+
+    Returns:
+        id de la tarea tomada, o None si no hay ninguna
+    """
+    ahora = timezone.now()
+
+    # Retomadas sin intentos restantes (el worker murió en el último)
+    _disponibles(ahora).filter(estado=EstadoTarea.EN_CURSO, intentos__gte=F('max_intentos')).update(
+        estado=EstadoTarea.ERROR, error='El worker dejó de responder.', bloqueada_hasta=None, fecha_fin=ahora
+    )
+
+    ids = _disponibles(ahora).order_by('disponible_desde', 'pk').values_list('pk', flat=True)[:candidatas]
+    for pk in ids:
+        # Si otro worker la tomó entre la consulta y el UPDATE, no actualiza nada
+        tomadas = _disponibles(ahora).filter(pk=pk).update(
+            estado=EstadoTarea.EN_CURSO,
+            worker=worker,
+            intentos=F('intentos') + 1,
+            bloqueada_hasta=ahora + DURACION_BLOQUEO,
+            fecha_inicio=ahora,
+        )
+        if tomadas:
+            return pk
+    return None
+
+
+def avanzar(tarea, progreso, mensaje=''):
+    """Publica el avance (0 a 100) de la tarea y renueva su bloqueo"""
+    tarea.progreso = max(0, min(100, int(progreso)))
+    tarea.mensaje = mensaje[:255]
+    Tarea.objects.filter(pk=tarea.pk).update(
+        progreso=tarea.progreso, mensaje=tarea.mensaje, bloqueada_hasta=timezone.now() + DURACION_BLOQUEO
+    )
+
+
+def ruta_resultado(tarea, nombre_archivo):
+    """Ruta en TAREAS_RESULTADOS_DIR para el archivo que genera la tarea"""
+    os.makedirs(settings.TAREAS_RESULTADOS_DIR, exist_ok=True)
+    return os.path.join(settings.TAREAS_RESULTADOS_DIR, f'tarea_{tarea.pk}_{nombre_archivo}')
+
+
+def guardar_archivo(tarea, nombre_archivo, contenido):
+    """Guarda el archivo generado por la tarea y lo deja disponible para descargar"""
+    from main.pdf import guardar_pdf
+
+    ruta = ruta_resultado(tarea, nombre_archivo)
+    guardar_pdf(ruta, contenido)
+    registrar_archivo(tarea, ruta)
+    return ruta
+
+
+def registrar_archivo(tarea, ruta):
+    tarea.archivo = ruta
+    Tarea.objects.filter(pk=tarea.pk).update(archivo=ruta)
+
+
+def ejecutar_tarea(tarea_id):
+    """
+    Ejecuta una tarea ya tomada y registra su resultado, un nuevo intento o el error.
+
+    Returns:
+        Tarea actualizada
+    """
+    from institucional.auditoria import get_current_user, set_current_user
+
+    tarea = Tarea.objects.select_related('creado_por').get(pk=tarea_id)
+    # Solo se registra el final si la tarea sigue siendo de este worker
+    propia = Tarea.objects.filter(pk=tarea.pk, worker=tarea.worker, estado=EstadoTarea.EN_CURSO)
+
+    # La auditoría de lo que modifique la tarea queda a nombre de quien la encoló
+    usuario_anterior = get_current_user()
+    set_current_user(tarea.creado_por)
+    try:
+        registradas = tareas_registradas()
+        if tarea.nombre not in registradas:
+            raise TareaDesconocida(tarea.nombre)
+        funcion, _ = registradas[tarea.nombre]
+        resultado = funcion(tarea, **tarea.parametros)
+    except Exception as e:
+        ahora = timezone.now()
+        error = ''.join(traceback.format_exception(e))
+        if tarea.intentos < tarea.max_intentos and not isinstance(e, TareaDesconocida):
+            propia.update(
+                estado=EstadoTarea.PENDIENTE,
+                disponible_desde=ahora + timedelta(seconds=ESPERA_REINTENTO * 2 ** (tarea.intentos - 1)),
+                bloqueada_hasta=None,
+                error=error,
+                mensaje=f'Falló el intento {tarea.intentos} de {tarea.max_intentos}; se reintentará.',
+            )
+        else:
+            propia.update(
+                estado=EstadoTarea.ERROR, bloqueada_hasta=None, error=error, mensaje=str(e)[:255], fecha_fin=ahora
+            )
+    else:
+        propia.update(
+            estado=EstadoTarea.FINALIZADA, progreso=100, resultado=resultado,
+            bloqueada_hasta=None, error='', fecha_fin=timezone.now()
+        )
+    finally:
+        set_current_user(usuario_anterior)
+
+    tarea.refresh_from_db()
+    return tarea
+
+
+def procesar_pendientes(worker=None, limite=None):
+    """
+    Ejecuta en el proceso actual las tareas disponibles, una tras otra.
+
+    Returns:
+        cantidad de tareas ejecutadas
+    """
+    worker = worker or nombre_worker()
+    ejecutadas = 0
+    while limite is None or ejecutadas < limite:
+        tarea_id = tomar_tarea(worker)
+        if tarea_id is None:
+            break
+        ejecutar_tarea(tarea_id)
+        ejecutadas += 1
+    return ejecutadas
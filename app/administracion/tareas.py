@@ -0,0 +1,95 @@
+"""
+Tareas en segundo plano de administración (ver administracion.services.tareas).
+"""
+import sqlite3
+
+from django.db import connection
+from django.utils import timezone
+
+from administracion.services.tareas import avanzar, guardar_archivo, registrar_archivo, registrar_tarea, ruta_resultado
+
+
+# Un reintento volvería a emitir los certificados ya generados
+@registrar_tarea('certificados_lote', max_intentos=1)
+def certificados_lote(tarea, lote_id):
+    from administracion.services.certificados_lote import generar_lote
+
+    lote = generar_lote(
+        lote_id, progreso=lambda generados, total: avanzar(tarea, generados * 100 / total, f'{generados}/{total} certificados')
+    )
+    registrar_archivo(tarea, lote.archivo)
+    return {'lote': lote.pk, 'generados': lote.generados}
+
+
+@registrar_tarea('reporte_academico_pdf')
+def reporte_academico_pdf(tarea, filtros=None):
+    from administracion.reportes_utils import generar_pdf_reporte_academico
+
+    avanzar(tarea, 10, 'Generando gráficos y PDF')
+    contenido = generar_pdf_reporte_academico(filtros)
+    guardar_archivo(tarea, f'reporte_academico_{timezone.now():%Y%m%d_%H%M%S}.pdf', contenido)
+    return {'bytes': len(contenido)}
+
+
+@registrar_tarea('reporte_academico_excel')
+def reporte_academico_excel(tarea, filtros=None):
+    from administracion.reportes_utils import generar_excel_reporte_academico, obtener_datos_reporte_academico
+
+    avanzar(tarea, 10, 'Obteniendo datos')
+    datos_reporte = obtener_datos_reporte_academico(filtros)
+    avanzar(tarea, 50, 'Generando Excel')
+    contenido = generar_excel_reporte_academico(datos_reporte)
+    guardar_archivo(tarea, f'reporte_academico_{timezone.now():%Y%m%d_%H%M%S}.xlsx', contenido)
+    return {'bytes': len(contenido)}
+
+
+@registrar_tarea('backup_sistema')
+def backup_sistema(tarea):
+    """Backup completo sin encriptar (los encriptados se generan en el request: la contraseña no se guarda)"""
+    from administracion.utils import crear_backup_completo
+
+    avanzar(tarea, 10, 'Exportando datos y archivos')
+    buffer, nombre = crear_backup_completo()
+    guardar_archivo(tarea, nombre, buffer.getvalue())
+    return {'archivo': nombre}
+
+
+@registrar_tarea('backup_base')
+def backup_base(tarea):
+    """
+    Copia consistente de la base con la API de backup de SQLite: copia por
+    páginas sin bloquear a los demás procesos, a diferencia de leer el archivo
+    mientras se escribe.
+    """
+    ruta = ruta_resultado(tarea, f'backup_db_{timezone.now():%Y%m%d_%H%M%S}.sqlite3')
+
+    def progreso(estado, restantes, total):
+        avanzar(tarea, (total - restantes) * 100 / total if total else 100, f'{total - restantes}/{total} páginas')
+
+    connection.ensure_connection()
+    destino = sqlite3.connect(ruta)
+    try:
+        connection.connection.backup(destino, pages=1024, progress=progreso)
+    finally:
+        destino.close()
+    registrar_archivo(tarea, ruta)
+    return {'archivo': ruta}
+
+
+@registrar_tarea('verificar_integridad')
+def verificar_integridad(tarea):
+    """Verifica el dígito verificador vertical de todas las tablas que lo registran"""
+    from institucional.digitos_verificadores import GestorDigitosVerificadores
+    from institucional.models import DigitoVerificadorVertical
+
+    tablas = list(DigitoVerificadorVertical.objects.order_by('tabla').values_list('tabla', flat=True))
+    resultado = {}
+    for numero, tabla in enumerate(tablas, start=1):
+        app_label, modelo = tabla.split('.', 1)
+        ok, mensaje = GestorDigitosVerificadores.verificar_integridad_tabla(modelo, app_label)
+        resultado[tabla] = {'ok': ok, 'mensaje': mensaje}
+        avanzar(tarea, numero * 100 / len(tablas), tabla)
+
+    fallidas = [tabla for tabla, estado in resultado.items() if not estado['ok']]
+    avanzar(tarea, 100, f"Tablas con errores: {', '.join(fallidas)}" if fallidas else f'{len(tablas)} tablas íntegras')
+    return {'tablas': resultado, 'fallidas': len(fallidas)}
@@ -7,4 +7,9 @@ urlpatterns = [
     path('reportes/academico/pdf/', views.exportar_reporte_pdf, name='exportar_reporte_pdf'),
     path('reportes/academico/excel/', views.exportar_reporte_excel, name='exportar_reporte_excel'),
     path('backup/descargar/', views.descargar_backup, name='descargar_backup'),
+    path('certificados/lotes/<int:lote_id>/', views.progreso_lote_certificados, name='progreso_lote_certificados'),
+    path('certificados/lotes/<int:lote_id>/descargar/', views.descargar_lote_certificados, name='descargar_lote_certificados'),
+    path('tareas/<int:tarea_id>/', views.progreso_tarea, name='progreso_tarea'),
+    path('tareas/<int:tarea_id>/estado/', views.estado_tarea, name='estado_tarea'),
+    path('tareas/<int:tarea_id>/descargar/', views.descargar_resultado_tarea, name='descargar_resultado_tarea'),
 ]
\ No newline at end of file
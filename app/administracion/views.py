@@ -10,9 +10,10 @@ from .reportes_utils import (
     grafico_aprobados_desaprobados,
     grafico_evolucion_asistencias,
     grafico_comparativo_alumnos,
-    generar_excel_reporte_academico
+    generar_excel_reporte_academico,
+    generar_pdf_reporte_academico
 )
-from main.utils import generar_certificado_pdf
+from .services.tareas import encolar
 from academico.models import Comision, AnioAcademico
 
 @login_required
@@ -113,48 +114,11 @@ def exportar_reporte_pdf(request):
     if request.GET.get('anio'):
         filtros['anio_academico'] = int(request.GET.get('anio'))
 
-    # Obtener datos
-    datos_reporte = obtener_datos_reporte_academico(filtros)
-
-    # Generar gráficos en base64
-    graficos = {}
-
-    if datos_reporte['promedios_materias']:
-        titulo = f"Promedios por Alumno - {datos_reporte.get('nombre_comision', '')}" if datos_reporte.get('vista_detalle') else "Promedios por Materia"
-        graficos['distribucion_notas'] = grafico_distribucion_notas(
-            datos_reporte['promedios_materias'],
-            titulo=titulo
-        )
-
-    aprobados, desaprobados, regulares, en_curso = datos_reporte['estados_academicos']
-    if aprobados > 0 or desaprobados > 0 or regulares > 0 or en_curso > 0:
-        graficos['estados'] = grafico_aprobados_desaprobados(
-            aprobados, desaprobados, regulares, en_curso
-        )
-
-    if datos_reporte['asistencias_por_mes']:
-        graficos['asistencias'] = grafico_evolucion_asistencias(
-            datos_reporte['asistencias_por_mes']
-        )
-
-    if datos_reporte['alumnos_top_promedio']:
-        graficos['comparativo_alumnos'] = grafico_comparativo_alumnos(
-            datos_reporte['alumnos_top_promedio'],
-            metrica='promedio'
-        )
+    if request.GET.get('segundo_plano'):
+        tarea = encolar('reporte_academico_pdf', request.user, filtros=filtros)
+        return redirect('progreso_tarea', tarea.pk)
 
-    # Contexto para PDF
-    contexto = {
-        'datos': datos_reporte,
-        'graficos': graficos,
-        'fecha_generacion': datetime.now().strftime('%d/%m/%Y %H:%M'),
-    }
-
-    # Generar PDF
-    pdf_content = generar_certificado_pdf(
-        contexto,
-        template_name='administracion/reporte_academico_pdf.html'
-    )
+    pdf_content = generar_pdf_reporte_academico(filtros)
 
     # Respuesta
     response = HttpResponse(pdf_content, content_type='application/pdf')
@@ -177,6 +141,10 @@ def exportar_reporte_excel(request):
     if request.GET.get('anio'):
         filtros['anio_academico'] = int(request.GET.get('anio'))
 
+    if request.GET.get('segundo_plano'):
+        tarea = encolar('reporte_academico_excel', request.user, filtros=filtros)
+        return redirect('progreso_tarea', tarea.pk)
+
     # Obtener datos
     datos_reporte = obtener_datos_reporte_academico(filtros)
 
@@ -198,11 +166,16 @@ def exportar_reporte_excel(request):
 def descargar_backup(request):
     """
     Descarga una copia de seguridad de la base de datos (SQLite).
+    Con ?segundo_plano=1 se genera una copia consistente en una tarea.
     """
     import os
     from django.conf import settings
     from django.http import FileResponse
 
+    if request.GET.get('segundo_plano'):
+        tarea = encolar('backup_base', request.user)
+        return redirect('progreso_tarea', tarea.pk)
+
     db_path = settings.DATABASES['default']['NAME']
     
     if not os.path.exists(db_path):
@@ -216,4 +189,83 @@ def descargar_backup(request):
     response['Content-Type'] = 'application/x-sqlite3'
     response['Content-Disposition'] = f'attachment; filename="{filename}"'
     
-    return response
\ No newline at end of file
+    return response
+
+@login_required
+@group_required('Administrativo')
+def progreso_lote_certificados(request, lote_id):
+    """Avance de un lote de certificados; la página se recarga sola hasta que termina"""
+    from django.shortcuts import get_object_or_404
+    from .models import LoteCertificados
+
+    lote = get_object_or_404(LoteCertificados, pk=lote_id)
+    return render(request, 'administracion/lote_certificados.html', {'lote': lote})
+
+
+@login_required
+@group_required('Administrativo')
+def descargar_lote_certificados(request, lote_id):
+    """Descarga el ZIP de un lote de certificados finalizado"""
+    import os
+    from django.http import FileResponse, Http404
+    from django.shortcuts import get_object_or_404
+    from .models import EstadoLoteCertificados, LoteCertificados
+
+    lote = get_object_or_404(LoteCertificados, pk=lote_id)
+    if lote.estado != EstadoLoteCertificados.FINALIZADO or not os.path.exists(lote.archivo):
+        raise Http404('El lote todavía no tiene un ZIP disponible.')
+    return FileResponse(
+        open(lote.archivo, 'rb'), as_attachment=True,
+        filename=f'certificados_{lote.tipo}_lote_{lote.pk}.zip', content_type='application/zip'
+    )
+
+
+def _tarea_del_usuario(request, tarea_id):
+    from django.shortcuts import get_object_or_404
+    from .models import Tarea
+
+    tareas = Tarea.objects.all() if request.user.is_superuser else Tarea.objects.filter(creado_por=request.user)
+    return get_object_or_404(tareas, pk=tarea_id)
+
+
+@login_required
+@group_required('Administrativo', 'Docente')
+def progreso_tarea(request, tarea_id):
+    """Avance de una tarea en segundo plano; la página se recarga sola hasta que termina"""
+    tarea = _tarea_del_usuario(request, tarea_id)
+    return render(request, 'administracion/tarea.html', {'tarea': tarea})
+
+
+@login_required
+@group_required('Administrativo', 'Docente')
+def estado_tarea(request, tarea_id):
+    """Estado de una tarea en JSON, para consultarlo periódicamente desde el navegador"""
+    from django.http import JsonResponse
+    from django.urls import reverse
+
+    tarea = _tarea_del_usuario(request, tarea_id)
+    return JsonResponse({
+        'id': tarea.pk,
+        'nombre': tarea.nombre,
+        'estado': tarea.estado,
+        'progreso': tarea.progreso,
+        'mensaje': tarea.mensaje,
+        'intentos': tarea.intentos,
+        'resultado': tarea.resultado,
+        'descarga': reverse('descargar_resultado_tarea', args=[tarea.pk]) if tarea.archivo else None,
+    })
+
+
+@login_required
+@group_required('Administrativo', 'Docente')
+def descargar_resultado_tarea(request, tarea_id):
+    """Descarga el archivo generado por una tarea finalizada"""
+    import os
+    from django.http import FileResponse, Http404
+    from .models import EstadoTarea
+
+    tarea = _tarea_del_usuario(request, tarea_id)
+    if tarea.estado != EstadoTarea.FINALIZADA or not tarea.archivo or not os.path.exists(tarea.archivo):
+        raise Http404('La tarea no tiene un archivo disponible.')
+    nombre = os.path.basename(tarea.archivo).removeprefix(f'tarea_{tarea.pk}_')
+    return FileResponse(open(tarea.archivo, 'rb'), as_attachment=True, filename=nombre)
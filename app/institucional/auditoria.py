@@ -86,24 +86,50 @@ def registrar_cambio(instance, tipo_accion, valores_anteriores=None, valores_nue
         valores_nuevos: Diccionario con valores después del cambio
         detalles: Texto adicional con detalles del cambio
     """
-    from institucional.models import AuditoriaDatos, TipoAccionDatos
+    registro = _construir_registro(instance, tipo_accion, valores_anteriores, valores_nuevos, detalles)
+    if registro is not None:
+        registro.save()
+
+
+def registrar_cambios(cambios, detalles=None):
+    """
+    Registra varios cambios de auditoría con un único INSERT.
+
+    Args:
+        cambios: Iterable de tuplas (instance, tipo_accion, valores_anteriores, valores_nuevos)
+        detalles: Texto adicional común a todos los registros
+
+    Returns:
+        list: Registros de AuditoriaDatos creados
+    """
+    from institucional.models import AuditoriaDatos
+
+    registros = [
+        registro for registro in (
+            _construir_registro(instance, tipo_accion, anteriores, nuevos, detalles)
+            for instance, tipo_accion, anteriores, nuevos in cambios
+        )
+        if registro is not None
+    ]
+    return AuditoriaDatos.objects.bulk_create(registros)
+
+
+def _construir_registro(instance, tipo_accion, valores_anteriores, valores_nuevos, detalles):
+    from institucional.models import AuditoriaDatos
 
     # No auditar los propios registros de auditoría
     if instance._meta.model_name in ['auditoriadatos', 'auditoriaacceso']:
-        return
-
-    usuario = get_current_user()
-    ip = get_current_ip()
+        return None
 
-    AuditoriaDatos.objects.create(
-        usuario=usuario,
+    return AuditoriaDatos(
+        usuario=get_current_user(),
         tipo_accion=tipo_accion,
         modelo=f"{instance._meta.app_label}.{instance._meta.model_name}",
         objeto_id=str(instance.pk) if instance.pk else "N/A",
         objeto_repr=str(instance)[:255],
         valores_anteriores=valores_anteriores,
         valores_nuevos=valores_nuevos,
-        ip_address=ip,
+        ip_address=get_current_ip(),
         detalles=detalles
     )
 
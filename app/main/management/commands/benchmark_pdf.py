@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test.utils import override_settings
+from main.pdf import cerrar_pool, renderizar_pdf, renderizar_pdfs
+
+class Command(BaseCommand):
+    help = 'Mide cuántos PDFs por segundo se generan en el proceso actual y con el pool de workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--cantidad', type=int, default=50, help='PDFs a generar por medición (default: 50)')
+        parser.add_argument('--workers', type=int, default=4, help='Procesos del pool para la medición concurrente (default: 4)')
+        parser.add_argument(
+            '--template', default='admin/certificado_template.html', help='Template a renderizar'
+        )
+
+    def _contexto(self, numero):
+        return {
+            'alumno': {'nombre': 'Alumno', 'apellido': f'Prueba {numero}', 'dni': f'{numero:08d}', 'legajo': numero},
+            'tipo_certificado': 'Certificado de alumno regular',
+            'institucion': {'nombre': 'Instituto', 'direccion': 'Calle 123'},
+            'fecha_actual': '01/01/2030',
+            'anio_actual': 2030,
+        }
+
+    def _medir(self, nombre, cantidad, renderizar):
+        inicio = time.perf_counter()
+        renderizar()
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(f'{nombre}: {cantidad} PDFs en {segundos:.2f} s ({cantidad / segundos:.1f} PDFs/s)')
+
+    def handle(self, *args, **options):
+        cantidad, workers = options['cantidad'], options['workers']
+        htmls = [render_to_string(options['template'], self._contexto(i)) for i in range(cantidad)]
+
+        # El primer render carga WeasyPrint y las fuentes; se mide aparte
+        self._medir('Primer render', 1, lambda: renderizar_pdf(htmls[0]))
+        self._medir('Secuencial', cantidad, lambda: [renderizar_pdf(html) for html in htmls])
+
+        with override_settings(PDF_WORKERS=workers):
+            cerrar_pool()
+            try:
+                self._medir(f'Arranque del pool ({workers} workers)', workers, lambda: renderizar_pdfs(htmls[:workers]))
+                self._medir(f'Concurrente ({workers} workers)', cantidad, lambda: renderizar_pdfs(htmls))
+            finally:
+                cerrar_pool()
+
+        self.stdout.write(self.style.SUCCESS('✅ Benchmark finalizado'))
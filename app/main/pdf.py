@@ -0,0 +1,121 @@
+"""
+Render de PDFs con WeasyPrint.
+
+renderizar_pdf arma el PDF en memoria (sin archivo temporal) y reutiliza entre
+documentos la configuración de fuentes y la caché de recursos (imágenes
+referenciadas desde base_url) del proceso, que WeasyPrint si no vuelve a cargar
+en cada render.
+
+Para varios documentos, renderizar_pdfs reparte el HTML entre procesos de larga
+vida (PDF_WORKERS) que reciben los trabajos por la cola de un
+ProcessPoolExecutor y mantienen su propio estado caliente. Los templates se
+renderizan antes, en el proceso de Django: los workers solo reciben HTML y
+devuelven bytes, sin tocar la base.
+"""
+import atexit
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+# Estado del proceso (el de Django o cada worker): fuentes y caché de recursos
+_fuentes = None
+_cache_recursos = {}
+_base_url = None
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _base_url_proyecto():
+    # Con la barra final, 'static/img/logo.png' se resuelve dentro del proyecto
+    return os.path.join(str(settings.BASE_DIR), '')
+
+
+def _configuracion_fuentes():
+    global _fuentes
+    if _fuentes is None:
+        from weasyprint.text.fonts import FontConfiguration
+        _fuentes = FontConfiguration()
+    return _fuentes
+
+
+def renderizar_pdf(html, base_url=None):
+    """
+    Convierte HTML a PDF en memoria.
+
+    Args:
+        html: documento ya renderizado
+        base_url: para resolver rutas relativas (por defecto el directorio del proyecto)
+
+    Returns:
+        bytes del PDF
+    """
+    from weasyprint import HTML
+
+    if base_url is None:
+        base_url = _base_url or _base_url_proyecto()
+    return HTML(string=html, base_url=base_url).write_pdf(
+        font_config=_configuracion_fuentes(), cache=_cache_recursos
+    )
+
+
+def guardar_pdf(ruta, contenido):
+    """Escritura atómica: otro proceso nunca ve un PDF a medio escribir"""
+    descriptor, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'wb') as archivo:
+            archivo.write(contenido)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.unlink(temporal)
+        raise
+
+
+def _iniciar_worker(base_url):
+    """Carga WeasyPrint y las fuentes una sola vez, al levantar el worker"""
+    global _base_url
+    _base_url = base_url
+    renderizar_pdf('<html><body><p>.</p></body></html>')
+
+
+def obtener_pool():
+    """Pool de workers de render compartido por el proceso (se crea al primer uso)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PDF_WORKERS,
+                # spawn: los workers no heredan conexiones a la base ni hilos del servidor
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_iniciar_worker,
+                initargs=(_base_url_proyecto(),),
+            )
+            atexit.register(cerrar_pool)
+        return _pool
+
+
+def cerrar_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def renderizar_pdfs(htmls):
+    """
+    Convierte varios documentos a PDF en paralelo, en el orden recibido.
+
+    Con PDF_WORKERS <= 1 o un solo documento se renderiza en el proceso actual.
+
+    Returns:
+        list de bytes
+    """
+    htmls = list(htmls)
+    if settings.PDF_WORKERS <= 1 or len(htmls) <= 1:
+        return [renderizar_pdf(html) for html in htmls]
+    return list(obtener_pool().map(renderizar_pdf, htmls))
@@ -98,6 +98,23 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Las transacciones toman el bloqueo de escritura al empezar y esperan
+            # su turno en lugar de fallar con "database is locked" al escribir
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+        },
+    }
+}
+
+# Caché compartida por todos los procesos del servidor (workers de gunicorn,
+# procesar_tareas): una invalidación hecha en un proceso vale para los demás.
+# La tabla se crea con: python manage.py createcachetable
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'cache_compartida',
     }
 }
 
@@ -158,6 +175,19 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# PDFs generados que se guardan en disco (actas de examen, certificados emitidos y sus ZIPs por lote)
+ACTAS_PDF_DIR = os.getenv('ACTAS_PDF_DIR', os.path.join(BASE_DIR, 'generados', 'actas'))
+CERTIFICADOS_PDF_DIR = os.getenv('CERTIFICADOS_PDF_DIR', os.path.join(BASE_DIR, 'generados', 'certificados', 'pdf'))
+CERTIFICADOS_LOTE_DIR = os.getenv('CERTIFICADOS_LOTE_DIR', os.path.join(BASE_DIR, 'generados', 'certificados'))
+
+# Procesos que renderizan PDFs en paralelo (main.pdf); 1 = en el proceso de Django
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', min(4, os.cpu_count() or 1)))
+
+# Tareas en segundo plano (administracion.services.tareas): procesos del comando
+# procesar_tareas y carpeta de los archivos que generan (reportes, backups)
+TAREAS_PROCESOS = int(os.getenv('TAREAS_PROCESOS', 2))
+TAREAS_RESULTADOS_DIR = os.getenv('TAREAS_RESULTADOS_DIR', os.path.join(BASE_DIR, 'generados', 'tareas'))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -2,7 +2,10 @@ from django.contrib import admin
 from django.contrib.auth import views as auth_views
 from django.urls import include, path
 
-from main.views import LoginEmailView, logout_view, redirect_based_group, download_backup, upload_restore_backup, help_view
+from main.views import (
+    LoginEmailView, logout_view, redirect_based_group, download_backup, upload_restore_backup, help_view,
+    verificar_integridad
+)
 
 admin.site.site_title = "Sitio de administración - Sistema de administración"
 admin.site.site_header = "Administración de sistema educativo"
@@ -12,6 +15,7 @@ urlpatterns = [
     path('i18n/', include('django.conf.urls.i18n')),
     path("admin/backup/descargar/", download_backup, name='admin_backup'),
     path("admin/backup/restaurar/", upload_restore_backup, name='admin_restore_backup'),
+    path("admin/integridad/verificar/", verificar_integridad, name='admin_verificar_integridad'),
     path("admin/", admin.site.urls),
 
     path('redirect', redirect_based_group, name='redirect_login'),
@@ -3,134 +3,155 @@ from django.core.exceptions import PermissionDenied
 
 from django.shortcuts import render
 from django.http import HttpResponse
-from weasyprint import HTML
-import tempfile
-import os
 from datetime import datetime
 from django.conf import settings
+from main.pdf import renderizar_pdf, renderizar_pdfs
 
 def generar_certificado_pdf(contexto, template_name='admin/certificado_template.html'):
     from django.template.loader import render_to_string
     html_string = render_to_string(template_name, context=contexto)
-    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as output:
-        HTML(base_url=settings.BASE_DIR, string=html_string).write_pdf(output.name)
-        with open(output.name, 'rb') as f:
-            pdf_content = f.read()
-        os.unlink(output.name)
+    return renderizar_pdf(html_string)
 
-    return pdf_content
+def generar_certificados_pdf(contextos, template_name='admin/certificado_template.html'):
+    """Varios PDFs del mismo template, renderizados en paralelo por los workers de main.pdf"""
+    from django.template.loader import render_to_string
+    return renderizar_pdfs(render_to_string(template_name, context=contexto) for contexto in contextos)
+
+TIPOS_CERTIFICADO = {
+    'certificado de asistencia': 'asistencia',
+    'certificado de aprobación': 'aprobacion',
+    'certificado de examen': 'examen',
+    'certificado de alumno regular': 'alumno_regular',
+    'certificado de buen comportamiento': 'buen_comportamiento',
+}
 
 def crear_contexto_certificado(alumno, tipo_certificado, institucion, curso=None, materia=None):
-    from academico.models import InscripcionAlumnoComision, Calificacion, Asistencia, TipoCalificacion
-    from django.db.models import Avg, Count, Q
+    return crear_contextos_certificado([alumno], tipo_certificado, institucion, curso, materia)[0]
+
+def crear_contextos_certificado(alumnos, tipo_certificado, institucion, curso=None, materia=None):
+    """
+    Contextos de certificado de varios alumnos con una cantidad fija de
+    consultas por tipo (no una por alumno ni por inscripción).
+
+    Returns:
+        list de contextos, en el orden de los alumnos
+    """
+    from academico.models import InscripcionAlumnoComision, Calificacion, Asistencia, MateriaAnalitico
+    from collections import defaultdict
+    from django.db.models import Count, Q
+
+    alumnos = list(alumnos)
+    ids = [alumno.pk for alumno in alumnos]
+    tipo = tipo_certificado.lower()
+    tipo = TIPOS_CERTIFICADO.get(tipo, tipo)
 
     nombre_archivo = institucion.logo.name
     nombre_archivo_solo = nombre_archivo.split('/')[-1]
+    ahora = datetime.now()
 
     # Contexto base
-    contexto = {
+    contextos = [{
         'alumno': alumno,
         'tipo_certificado': tipo_certificado,
         'curso': curso,
         'materia': materia,
-        'fecha_actual': datetime.now().strftime('%d/%m/%Y'),
-        'anio_actual': datetime.now().year,
+        'fecha_actual': ahora.strftime('%d/%m/%Y'),
+        'anio_actual': ahora.year,
         'institucion': institucion,
         'logo': nombre_archivo_solo,
-    }
+    } for alumno in alumnos]
 
-    # Obtener inscripciones del alumno
-    inscripciones = InscripcionAlumnoComision.objects.filter(
-        alumno=alumno
-    ).select_related('comision', 'comision__materia', 'comision__anio_academico')
+    def inscripciones_por_alumno(**filtros):
+        por_alumno = defaultdict(list)
+        for inscripcion in InscripcionAlumnoComision.objects.filter(alumno_id__in=ids, **filtros).select_related(
+            'comision', 'comision__materia', 'comision__anio_academico'
+        ).order_by('pk'):
+            por_alumno[inscripcion.alumno_id].append(inscripcion)
+        return por_alumno
 
     # Datos adicionales según tipo de certificado
-    if tipo_certificado.lower() in ['certificado de asistencia', 'asistencia']:
-        # Calcular porcentaje de asistencia general
-        total_clases = Asistencia.objects.filter(
-            alumno_comision__alumno=alumno
-        ).count()
-
-        clases_presentes = Asistencia.objects.filter(
-            alumno_comision__alumno=alumno,
-            esta_presente=True
-        ).count()
-
-        porcentaje_asistencia = (clases_presentes / total_clases * 100) if total_clases > 0 else 0
-
-        contexto.update({
-            'total_clases': total_clases,
-            'clases_presentes': clases_presentes,
-            'porcentaje_asistencia': round(porcentaje_asistencia, 2),
-            'materias_cursadas': inscripciones
-        })
-
-    elif tipo_certificado.lower() in ['certificado de aprobación', 'aprobacion']:
-        # Obtener materias aprobadas (nota >= 6 en FINAL)
-        materias_aprobadas = []
-        for inscripcion in inscripciones:
-            calificacion_final = Calificacion.objects.filter(
-                alumno_comision=inscripcion,
-                tipo=TipoCalificacion.FINAL
-            ).first()
-
-            if calificacion_final and calificacion_final.nota >= 6:
-                materias_aprobadas.append({
-                    'materia': inscripcion.comision.materia,
-                    'nota': calificacion_final.nota,
-                    'fecha': calificacion_final.fecha_creacion,
-                    'comision': inscripcion.comision
-                })
-
-        contexto.update({
-            'materias_aprobadas': materias_aprobadas,
-            'cantidad_aprobadas': len(materias_aprobadas)
-        })
-
-    elif tipo_certificado.lower() in ['certificado de examen', 'examen']:
-        # Obtener calificaciones de exámenes finales
-        examenes = []
-        for inscripcion in inscripciones:
-            calificaciones = Calificacion.objects.filter(
-                alumno_comision=inscripcion
-            ).order_by('-fecha_creacion')
-
-            for calif in calificaciones:
-                examenes.append({
-                    'materia': inscripcion.comision.materia,
-                    'tipo': calif.get_tipo_display(),
-                    'nota': calif.nota,
-                    'fecha': calif.fecha_creacion,
-                    'resultado': 'Aprobado' if calif.nota >= 6 else 'No Aprobado'
-                })
-
-        contexto.update({
-            'examenes': examenes,
-            'cantidad_examenes': len(examenes)
-        })
-
-    elif tipo_certificado.lower() in ['certificado de alumno regular', 'alumno_regular']:
+    if tipo == 'asistencia':
+        # Porcentaje de asistencia general, agregado por alumno
+        asistencias = {
+            fila['alumno_comision__alumno_id']: fila
+            for fila in Asistencia.objects.filter(alumno_comision__alumno_id__in=ids).values(
+                'alumno_comision__alumno_id'
+            ).annotate(total=Count('id'), presentes=Count('id', filter=Q(esta_presente=True))).order_by()
+        }
+        inscripciones = inscripciones_por_alumno()
+        for contexto in contextos:
+            fila = asistencias.get(contexto['alumno'].pk, {'total': 0, 'presentes': 0})
+            total_clases, clases_presentes = fila['total'], fila['presentes']
+            porcentaje_asistencia = (clases_presentes / total_clases * 100) if total_clases > 0 else 0
+            contexto.update({
+                'total_clases': total_clases,
+                'clases_presentes': clases_presentes,
+                'porcentaje_asistencia': round(porcentaje_asistencia, 2),
+                'materias_cursadas': inscripciones[contexto['alumno'].pk]
+            })
+
+    elif tipo == 'aprobacion':
+        # Materias aprobadas según el analítico de cada alumno
+        aprobadas = defaultdict(list)
+        for fila in MateriaAnalitico.objects.filter(alumno_id__in=ids, aprobada=True).select_related(
+            'materia', 'cursada__comision'
+        ).order_by('materia__nombre'):
+            aprobadas[fila.alumno_id].append({
+                'materia': fila.materia,
+                'nota': fila.nota_final,
+                'fecha': fila.fecha_aprobacion,
+                'comision': fila.cursada.comision if fila.cursada else None
+            })
+        for contexto in contextos:
+            materias_aprobadas = aprobadas[contexto['alumno'].pk]
+            contexto.update({
+                'materias_aprobadas': materias_aprobadas,
+                'cantidad_aprobadas': len(materias_aprobadas)
+            })
+
+    elif tipo == 'examen':
+        # Calificaciones de todas las cursadas, por inscripción y de la más reciente a la más antigua
+        examenes = defaultdict(list)
+        for calif in Calificacion.objects.filter(alumno_comision__alumno_id__in=ids).select_related(
+            'alumno_comision__comision__materia'
+        ).order_by('alumno_comision_id', '-fecha_creacion'):
+            examenes[calif.alumno_comision.alumno_id].append({
+                'materia': calif.alumno_comision.comision.materia,
+                'tipo': calif.get_tipo_display(),
+                'nota': calif.nota,
+                'fecha': calif.fecha_creacion,
+                'resultado': 'Aprobado' if calif.nota >= 6 else 'No Aprobado'
+            })
+        for contexto in contextos:
+            contexto.update({
+                'examenes': examenes[contexto['alumno'].pk],
+                'cantidad_examenes': len(examenes[contexto['alumno'].pk])
+            })
+
+    elif tipo == 'alumno_regular':
         # Verificar estado de regularidad
-        materias_regulares = inscripciones.filter(
-            estado_inscripcion='REGULAR'
-        )
-
-        contexto.update({
-            'materias_regulares': materias_regulares,
-            'cantidad_materias': materias_regulares.count(),
-            'legajo': alumno.legajo,
-            'estado': alumno.estado
-        })
-
-    elif tipo_certificado.lower() in ['certificado de buen comportamiento', 'buen_comportamiento']:
+        regulares = inscripciones_por_alumno(estado_inscripcion='REGULAR')
+        for contexto in contextos:
+            alumno = contexto['alumno']
+            contexto.update({
+                'materias_regulares': regulares[alumno.pk],
+                'cantidad_materias': len(regulares[alumno.pk]),
+                'legajo': alumno.legajo,
+                'estado': alumno.estado
+            })
+
+    elif tipo == 'buen_comportamiento':
         # Datos de conducta (por ahora solo básicos)
-        contexto.update({
-            'legajo': alumno.legajo,
-            'materias_cursadas': inscripciones,
-            'cantidad_materias': inscripciones.count()
-        })
-
-    return contexto
+        inscripciones = inscripciones_por_alumno()
+        for contexto in contextos:
+            alumno = contexto['alumno']
+            contexto.update({
+                'legajo': alumno.legajo,
+                'materias_cursadas': inscripciones[alumno.pk],
+                'cantidad_materias': len(inscripciones[alumno.pk])
+            })
+
+    return contextos
 
 def group_required(*group_names):
     def in_groups(u):
@@ -46,6 +46,13 @@ def download_backup(request):
         # Obtener contraseña del formulario (si se proporcionó)
         password = request.GET.get('password', '') or request.POST.get('password', '')
 
+        # Sin contraseña se genera en segundo plano; con contraseña se mantiene
+        # en el request para no guardarla en la tabla de tareas
+        if not password:
+            from administracion.services.tareas import encolar
+            tarea = encolar('backup_sistema', request.user)
+            return redirect('progreso_tarea', tarea.pk)
+
         zip_buffer, filename = crear_backup_completo(password if password else None)
 
         # Determinar el content type según si está encriptado
@@ -97,6 +104,16 @@ def upload_restore_backup(request):
 
     return redirect('/admin/')
 
+@staff_member_required
+def verificar_integridad(request):
+    """Encola la verificación del dígito verificador vertical de todas las tablas"""
+    if request.method != 'POST':
+        return redirect('/admin/')
+
+    from administracion.services.tareas import encolar
+    tarea = encolar('verificar_integridad', request.user)
+    return redirect('progreso_tarea', tarea.pk)
+
 @login_required
 def help_view(request):
     from institucional.models import PreguntaFrecuente